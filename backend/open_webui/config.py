@@ -3768,6 +3768,20 @@ WHISPER_MULTILINGUAL = os.getenv('WHISPER_MULTILINGUAL', 'False').lower() == 'tr
 
 WHISPER_LANGUAGE = os.getenv('WHISPER_LANGUAGE', '').lower() or None
 
+# Local transcription runs on WHISPER_MODEL_REPLICAS model instances (the CPU cores are split between them), and
+# up to WHISPER_BATCH_SIZE short clips queued while they are busy are transcribed in one batched call (1 disables)
+WHISPER_MODEL_REPLICAS = os.getenv('WHISPER_MODEL_REPLICAS', '1')
+try:
+    WHISPER_MODEL_REPLICAS = max(int(WHISPER_MODEL_REPLICAS), 1)
+except ValueError:
+    WHISPER_MODEL_REPLICAS = 1
+
+WHISPER_BATCH_SIZE = os.getenv('WHISPER_BATCH_SIZE', '8')
+try:
+    WHISPER_BATCH_SIZE = max(int(WHISPER_BATCH_SIZE), 1)
+except ValueError:
+    WHISPER_BATCH_SIZE = 8
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     'DEEPGRAM_API_KEY',
@@ -386,6 +386,30 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = os.environ.get('DATABASE_ENABLE_SESSION_SHARING', 'False').lower() == 'true'
 
+# Where message writes go: 'blob' rewrites the chat history JSON on every write, 'message' writes only the
+# chat_message row and folds pending rows back into the history blob on read and during periodic compaction
+DATABASE_CHAT_MESSAGE_WRITE_MODE = os.environ.get('DATABASE_CHAT_MESSAGE_WRITE_MODE', 'blob').lower()
+if DATABASE_CHAT_MESSAGE_WRITE_MODE not in ('blob', 'message'):
+    DATABASE_CHAT_MESSAGE_WRITE_MODE = 'blob'
+
+DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL = os.environ.get('DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL', '30')
+try:
+    DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL = int(DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL)
+except ValueError:
+    DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL = 30
+
+# Serve chat search from a full-text index (FTS5 on SQLite, tsvector on PostgreSQL) instead of scanning chat JSON
+ENABLE_CHAT_SEARCH_INDEX = os.environ.get('ENABLE_CHAT_SEARCH_INDEX', 'True').lower() == 'true'
+
+# Seconds between the background runs indexing the chats changed since they were last indexed (and, after the
+# upgrade, every existing chat); searches read the index as it stands, so a chat rewritten as a whole (rather
+# than message by message) is found by its new content once the next run has indexed it
+CHAT_SEARCH_INDEX_INTERVAL = os.environ.get('CHAT_SEARCH_INDEX_INTERVAL', '60')
+try:
+    CHAT_SEARCH_INDEX_INTERVAL = max(int(CHAT_SEARCH_INDEX_INTERVAL), 1)
+except ValueError:
+    CHAT_SEARCH_INDEX_INTERVAL = 60
+
 # Enable public visibility of active user count (when disabled, only admins can see it)
 ENABLE_PUBLIC_ACTIVE_USERS_COUNT = os.environ.get('ENABLE_PUBLIC_ACTIVE_USERS_COUNT', 'True').lower() == 'true'
 
@@ -599,6 +623,37 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# Model lists are cached per upstream connection: fresh for MODELS_CONNECTION_CACHE_TTL
+# seconds (the `models_cache_ttl` key of a connection's API config, in whole seconds,
+# overrides it), then served stale
+# while a background refresh runs for up to MODELS_CONNECTION_CACHE_STALE_TTL more seconds
+MODELS_CONNECTION_CACHE_TTL = os.environ.get('MODELS_CONNECTION_CACHE_TTL', '10')
+try:
+    MODELS_CONNECTION_CACHE_TTL = float(MODELS_CONNECTION_CACHE_TTL)
+except Exception:
+    MODELS_CONNECTION_CACHE_TTL = 10.0
+
+MODELS_CONNECTION_CACHE_STALE_TTL = os.environ.get('MODELS_CONNECTION_CACHE_STALE_TTL', '300')
+try:
+    MODELS_CONNECTION_CACHE_STALE_TTL = float(MODELS_CONNECTION_CACHE_STALE_TTL)
+except Exception:
+    MODELS_CONNECTION_CACHE_STALE_TTL = 300.0
+
+# Most model lists (per connection, and per user when they're user-scoped) and filtered lists kept,
+# the least recently used are evicted beyond it
+MODELS_CACHE_MAX_ENTRIES = os.environ.get('MODELS_CACHE_MAX_ENTRIES', '1000')
+try:
+    MODELS_CACHE_MAX_ENTRIES = max(int(MODELS_CACHE_MAX_ENTRIES), 1)
+except Exception:
+    MODELS_CACHE_MAX_ENTRIES = 1000
+
+# How long a user's access-filtered model list is reused while the model list is unchanged
+MODELS_FILTER_CACHE_TTL = os.environ.get('MODELS_FILTER_CACHE_TTL', '5')
+try:
+    MODELS_FILTER_CACHE_TTL = float(MODELS_FILTER_CACHE_TTL)
+except Exception:
+    MODELS_FILTER_CACHE_TTL = 5.0
+
 
 ####################################
 # CHAT
@@ -715,6 +770,21 @@ else:
     except ValueError:
         WEBSOCKET_EVENT_CALLER_TIMEOUT = 300
 
+# Seconds to coalesce persisted event-emitter updates (message, status, sources, ...) per message before
+# writing them to the database; 0 writes every event immediately. Buffered events are only in memory, so
+# a crash (not a graceful shutdown, which flushes them) loses up to this many seconds of each message
+WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL = os.environ.get('WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL', '0.5')
+try:
+    WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL = float(WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL)
+except ValueError:
+    WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL = 0.5
+
+WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS = os.environ.get('WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS', '50')
+try:
+    WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS = int(WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS)
+except ValueError:
+    WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS = 50
+
 
 REQUESTS_VERIFY = os.environ.get('REQUESTS_VERIFY', 'True').lower() == 'true'
 
@@ -745,6 +815,33 @@ else:
         AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = 10
 
 
+# Keep-alive connection pools for upstream model providers (OpenAI, Ollama), one per origin
+ENABLE_AIOHTTP_CLIENT_POOL = os.environ.get('ENABLE_AIOHTTP_CLIENT_POOL', 'True').lower() == 'true'
+
+# Max concurrent connections per origin, requests beyond it wait for a free one (0 is unlimited)
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get('AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST', '0')
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = max(int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST), 0)
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+# Per-host overrides, e.g. {"gateway.internal:8443": 400, "localhost:11434": 8}
+try:
+    AIOHTTP_CLIENT_POOL_HOST_LIMITS = json.loads(os.environ.get('AIOHTTP_CLIENT_POOL_HOST_LIMITS', '{}'))
+    if not isinstance(AIOHTTP_CLIENT_POOL_HOST_LIMITS, dict):
+        AIOHTTP_CLIENT_POOL_HOST_LIMITS = {}
+except Exception:
+    AIOHTTP_CLIENT_POOL_HOST_LIMITS = {}
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = os.environ.get('AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT', '60')
+
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT)
+except Exception:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 60.0
+
+
 AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = os.environ.get('AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA', '10')
 
 if AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA == '':
@@ -781,6 +878,111 @@ else:
     except Exception:
         RAG_EMBEDDING_TIMEOUT = None
 
+# Vector DB calls of backends without a native async client run on a pool of VECTOR_DB_THREAD_POOL_SIZE threads
+VECTOR_DB_THREAD_POOL_SIZE = os.environ.get('VECTOR_DB_THREAD_POOL_SIZE', '16')
+try:
+    VECTOR_DB_THREAD_POOL_SIZE = max(int(VECTOR_DB_THREAD_POOL_SIZE), 1)
+except ValueError:
+    VECTOR_DB_THREAD_POOL_SIZE = 16
+
+# Documents are embedded and inserted in batches of VECTOR_DB_INSERT_BATCH_SIZE chunks; each batch is inserted as soon
+# as it's embedded while up to VECTOR_DB_INSERT_PIPELINE_DEPTH later batches are embedded, bounding the memory held
+VECTOR_DB_INSERT_BATCH_SIZE = os.environ.get('VECTOR_DB_INSERT_BATCH_SIZE', '512')
+try:
+    VECTOR_DB_INSERT_BATCH_SIZE = max(int(VECTOR_DB_INSERT_BATCH_SIZE), 1)
+except ValueError:
+    VECTOR_DB_INSERT_BATCH_SIZE = 512
+
+VECTOR_DB_INSERT_PIPELINE_DEPTH = os.environ.get('VECTOR_DB_INSERT_PIPELINE_DEPTH', '2')
+try:
+    VECTOR_DB_INSERT_PIPELINE_DEPTH = max(int(VECTOR_DB_INSERT_PIPELINE_DEPTH), 1)
+except ValueError:
+    VECTOR_DB_INSERT_PIPELINE_DEPTH = 2
+
+# Serve hybrid search BM25 scoring from a persistent, incrementally-updated
+# per-collection index instead of rebuilding it from the whole collection per query
+ENABLE_RAG_BM25_INDEX = os.environ.get('ENABLE_RAG_BM25_INDEX', 'True').lower() == 'true'
+
+RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES = os.environ.get('RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES', '100')
+try:
+    RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES = int(RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES)
+except ValueError:
+    RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES = 100
+
+# Number of BM25 indexes each worker keeps in memory, least recently used are evicted (and reloaded from disk)
+RAG_BM25_INDEX_MAX_COLLECTIONS = os.environ.get('RAG_BM25_INDEX_MAX_COLLECTIONS', '64')
+try:
+    RAG_BM25_INDEX_MAX_COLLECTIONS = max(int(RAG_BM25_INDEX_MAX_COLLECTIONS), 1)
+except ValueError:
+    RAG_BM25_INDEX_MAX_COLLECTIONS = 64
+
+# Memoize embeddings by (engine, endpoint, model, prefix, text hash). RAG_EMBEDDING_CACHE_SIZE bounds the
+# in-process LRU (0 disables the cache); RAG_EMBEDDING_CACHE_BACKEND adds a shared 'redis' or on-disk 'disk' tier
+RAG_EMBEDDING_CACHE_SIZE = os.environ.get('RAG_EMBEDDING_CACHE_SIZE', '10000')
+try:
+    RAG_EMBEDDING_CACHE_SIZE = int(RAG_EMBEDDING_CACHE_SIZE)
+except ValueError:
+    RAG_EMBEDDING_CACHE_SIZE = 10000
+
+RAG_EMBEDDING_CACHE_BACKEND = os.environ.get('RAG_EMBEDDING_CACHE_BACKEND', '').lower()
+
+RAG_EMBEDDING_CACHE_TTL = os.environ.get('RAG_EMBEDDING_CACHE_TTL', str(60 * 60 * 24 * 7))
+try:
+    RAG_EMBEDDING_CACHE_TTL = int(RAG_EMBEDDING_CACHE_TTL)
+except ValueError:
+    RAG_EMBEDDING_CACHE_TTL = 60 * 60 * 24 * 7
+
+# Web search results by (engine, normalized query) and fetched pages by URL are cached for WEB_SEARCH_CACHE_TTL
+# seconds (0 disables) in an in-process LRU of up to WEB_SEARCH_CACHE_MAX_SIZE_MB, and shared across nodes when
+# WEB_SEARCH_CACHE_BACKEND is 'redis' (the default with Redis). The pages' chunks hit the embedding cache.
+WEB_SEARCH_CACHE_TTL = os.environ.get('WEB_SEARCH_CACHE_TTL', '3600')
+try:
+    WEB_SEARCH_CACHE_TTL = int(WEB_SEARCH_CACHE_TTL)
+except ValueError:
+    WEB_SEARCH_CACHE_TTL = 3600
+
+WEB_SEARCH_CACHE_MAX_SIZE_MB = os.environ.get('WEB_SEARCH_CACHE_MAX_SIZE_MB', '64')
+try:
+    WEB_SEARCH_CACHE_MAX_SIZE_MB = float(WEB_SEARCH_CACHE_MAX_SIZE_MB)
+except ValueError:
+    WEB_SEARCH_CACHE_MAX_SIZE_MB = 64.0
+
+WEB_SEARCH_CACHE_BACKEND = os.environ.get('WEB_SEARCH_CACHE_BACKEND', 'redis' if REDIS_URL else '').lower()
+
+# Web search result pages are chunked, embedded and inserted as they arrive; with a streaming web loader (safe_web,
+# playwright), after WEB_SEARCH_LOADER_DEADLINE seconds the search proceeds with the pages loaded so far, once at
+# least one arrived (0 waits for every page)
+WEB_SEARCH_LOADER_DEADLINE = os.environ.get('WEB_SEARCH_LOADER_DEADLINE', '10')
+try:
+    WEB_SEARCH_LOADER_DEADLINE = max(float(WEB_SEARCH_LOADER_DEADLINE), 0.0)
+except ValueError:
+    WEB_SEARCH_LOADER_DEADLINE = 10.0
+
+# Batch size for scoring the pooled (query, chunk) pairs of all collections with a local cross-encoder
+RAG_RERANKING_BATCH_SIZE = os.environ.get('RAG_RERANKING_BATCH_SIZE', '32')
+try:
+    RAG_RERANKING_BATCH_SIZE = int(RAG_RERANKING_BATCH_SIZE)
+except ValueError:
+    RAG_RERANKING_BATCH_SIZE = 32
+
+# Files loaded, embedded and inserted at once by each stage of a knowledge reindex job
+KNOWLEDGE_REINDEX_CONCURRENCY = os.environ.get('KNOWLEDGE_REINDEX_CONCURRENCY', '4')
+try:
+    KNOWLEDGE_REINDEX_CONCURRENCY = max(int(KNOWLEDGE_REINDEX_CONCURRENCY), 1)
+except ValueError:
+    KNOWLEDGE_REINDEX_CONCURRENCY = 4
+
+# File processing status streams are pushed status changes as they happen and only re-read the file this often,
+# to notice a deleted file. Without Redis, changes made by other workers or replicas are not pushed, so it is re-read
+# every second.
+FILE_PROCESSING_STATUS_RECHECK_INTERVAL = os.environ.get(
+    'FILE_PROCESSING_STATUS_RECHECK_INTERVAL', '30' if REDIS_URL else '1'
+)
+try:
+    FILE_PROCESSING_STATUS_RECHECK_INTERVAL = max(float(FILE_PROCESSING_STATUS_RECHECK_INTERVAL), 1.0)
+except ValueError:
+    FILE_PROCESSING_STATUS_RECHECK_INTERVAL = 1.0
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -927,6 +1129,15 @@ ENABLE_PIP_INSTALL_FRONTMATTER_REQUIREMENTS = (
 PIP_OPTIONS = os.getenv('PIP_OPTIONS', '').split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv('PIP_PACKAGE_INDEX_OPTIONS', '').split()
 
+# How long a loaded function/tool module is reused before its version is checked against the database again.
+# Content changes are also pushed to other workers and replicas through Redis, without Redis every worker checks
+# on each call (a single worker can't tell whether other replicas share its database).
+PLUGIN_MODULE_CACHE_TTL = os.environ.get('PLUGIN_MODULE_CACHE_TTL', '60' if REDIS_URL else '0')
+try:
+    PLUGIN_MODULE_CACHE_TTL = float(PLUGIN_MODULE_CACHE_TTL)
+except Exception:
+    PLUGIN_MODULE_CACHE_TTL = 0.0
+
 
 ####################################
 # PROGRESSIVE WEB APP OPTIONS
@@ -942,3 +1153,91 @@ EXTERNAL_PWA_MANIFEST_URL = os.environ.get('EXTERNAL_PWA_MANIFEST_URL')
 # Env var values: "true" (anyone), "false" (no one), "members" (only group members).
 _default_group_share = os.environ.get('DEFAULT_GROUP_SHARE_PERMISSION', 'members').strip().lower()
 DEFAULT_GROUP_SHARE_PERMISSION = 'members' if _default_group_share == 'members' else _default_group_share == 'true'
+
+####################################
+# ACCESS GRANT CACHE
+####################################
+
+# Cache each user's group IDs and accessible resource IDs per resource type; entries are dropped on grant and
+# group membership changes (on other nodes through Redis pub/sub), the TTL only bounds a missed invalidation
+ENABLE_ACCESS_GRANT_CACHE = os.environ.get('ENABLE_ACCESS_GRANT_CACHE', 'True').lower() == 'true'
+
+ACCESS_GRANT_CACHE_TTL = os.environ.get('ACCESS_GRANT_CACHE_TTL', '60')
+try:
+    ACCESS_GRANT_CACHE_TTL = float(ACCESS_GRANT_CACHE_TTL)
+except Exception:
+    ACCESS_GRANT_CACHE_TTL = 60.0
+
+ACCESS_GRANT_CACHE_SIZE = os.environ.get('ACCESS_GRANT_CACHE_SIZE', '10000')
+try:
+    ACCESS_GRANT_CACHE_SIZE = int(ACCESS_GRANT_CACHE_SIZE)
+except Exception:
+    ACCESS_GRANT_CACHE_SIZE = 10000
+
+# Authenticated users by token/API key, dropped across nodes when the user changes
+ENABLE_USER_CACHE = os.environ.get('ENABLE_USER_CACHE', 'True').lower() == 'true'
+
+USER_CACHE_TTL = os.environ.get('USER_CACHE_TTL', '10')
+try:
+    USER_CACHE_TTL = float(USER_CACHE_TTL)
+except Exception:
+    USER_CACHE_TTL = 10.0
+
+USER_CACHE_SIZE = os.environ.get('USER_CACHE_SIZE', '10000')
+try:
+    USER_CACHE_SIZE = int(USER_CACHE_SIZE)
+except Exception:
+    USER_CACHE_SIZE = 10000
+
+# Users' last active timestamps are buffered and written in one bulk update every interval (0 writes immediately)
+USER_LAST_ACTIVE_FLUSH_INTERVAL = os.environ.get('USER_LAST_ACTIVE_FLUSH_INTERVAL', '10')
+try:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = float(USER_LAST_ACTIVE_FLUSH_INTERVAL)
+except Exception:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = 10.0
+
+####################################
+# AUDIO
+####################################
+
+# Synthesize long text in sentence segments of up to TTS_SEGMENT_MAX_CHARS characters, TTS_SEGMENT_CONCURRENCY
+# at a time, and stream the audio of each segment as soon as it and the ones before it are ready (0 disables)
+TTS_SEGMENT_MAX_CHARS = os.environ.get('TTS_SEGMENT_MAX_CHARS', '400')
+try:
+    TTS_SEGMENT_MAX_CHARS = int(TTS_SEGMENT_MAX_CHARS)
+except Exception:
+    TTS_SEGMENT_MAX_CHARS = 400
+
+TTS_SEGMENT_CONCURRENCY = os.environ.get('TTS_SEGMENT_CONCURRENCY', '3')
+try:
+    TTS_SEGMENT_CONCURRENCY = max(int(TTS_SEGMENT_CONCURRENCY), 1)
+except Exception:
+    TTS_SEGMENT_CONCURRENCY = 3
+
+# Synthesized speech is cached on disk; the least recently used entries are evicted beyond SPEECH_CACHE_MAX_SIZE_MB
+# and entries unused for SPEECH_CACHE_MAX_AGE seconds are dropped (0 disables either limit)
+SPEECH_CACHE_MAX_SIZE_MB = os.environ.get('SPEECH_CACHE_MAX_SIZE_MB', '1024')
+try:
+    SPEECH_CACHE_MAX_SIZE_MB = float(SPEECH_CACHE_MAX_SIZE_MB)
+except Exception:
+    SPEECH_CACHE_MAX_SIZE_MB = 1024.0
+
+SPEECH_CACHE_MAX_AGE = os.environ.get('SPEECH_CACHE_MAX_AGE', str(60 * 60 * 24 * 30))
+try:
+    SPEECH_CACHE_MAX_AGE = int(SPEECH_CACHE_MAX_AGE)
+except Exception:
+    SPEECH_CACHE_MAX_AGE = 60 * 60 * 24 * 30
+
+# Long recordings are transcribed in chunks of up to TRANSCRIPTION_CHUNK_DURATION seconds, cut on silence where
+# possible, by a pool of TRANSCRIPTION_CONCURRENCY workers shared by all transcriptions
+TRANSCRIPTION_CHUNK_DURATION = os.environ.get('TRANSCRIPTION_CHUNK_DURATION', '600')
+try:
+    TRANSCRIPTION_CHUNK_DURATION = max(int(TRANSCRIPTION_CHUNK_DURATION), 30)
+except Exception:
+    TRANSCRIPTION_CHUNK_DURATION = 600
+
+TRANSCRIPTION_CONCURRENCY = os.environ.get('TRANSCRIPTION_CONCURRENCY', '4')
+try:
+    TRANSCRIPTION_CONCURRENCY = max(int(TRANSCRIPTION_CONCURRENCY), 1)
+except Exception:
+    TRANSCRIPTION_CONCURRENCY = 4
@@ -63,7 +63,10 @@ from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
     app as socket_app,
+    MESSAGE_EVENT_BUFFER,
     periodic_usage_pool_cleanup,
+    periodic_chat_message_compaction,
+    periodic_chat_search_indexing,
     periodic_session_pool_cleanup,
     get_event_emitter,
     get_models_in_use,
@@ -105,6 +108,7 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.retrieval.reindex import resume_stale_reindex_jobs
 
 
 from sqlalchemy.orm import Session
@@ -467,6 +471,9 @@ from open_webui.config import (
 )
 from open_webui.env import (
     ENABLE_CUSTOM_MODEL_FALLBACK,
+    DATABASE_CHAT_MESSAGE_WRITE_MODE,
+    ENABLE_AIOHTTP_CLIENT_POOL,
+    ENABLE_CHAT_SEARCH_INDEX,
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
     AUDIT_INCLUDED_PATHS,
@@ -552,6 +559,12 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.access_cache import ACCESS_GRANT_CACHE, redis_access_grant_cache_listener
+from open_webui.utils.plugin_cache import redis_plugin_module_listener
+from open_webui.utils.file_status import FILE_STATUS_BROKER, redis_file_status_listener
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
+from open_webui.utils.user_cache import USER_CACHE, redis_user_cache_listener
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -641,12 +654,35 @@ async def lifespan(app: FastAPI):
     if app.state.redis is not None:
         app.state.redis_task_command_listener = asyncio.create_task(redis_task_command_listener(app))
 
+        if ACCESS_GRANT_CACHE.enabled:
+            app.state.redis_access_grant_cache_listener = asyncio.create_task(
+                redis_access_grant_cache_listener(app.state.redis)
+            )
+
+        if USER_CACHE.enabled:
+            app.state.redis_user_cache_listener = asyncio.create_task(redis_user_cache_listener(app.state.redis))
+
+        app.state.redis_plugin_module_listener = asyncio.create_task(redis_plugin_module_listener(app.state.redis))
+        app.state.redis_file_status_listener = asyncio.create_task(redis_file_status_listener(app.state.redis))
+
+    FILE_STATUS_BROKER.start(app.state.main_loop)
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
     asyncio.create_task(periodic_session_pool_cleanup())
+    app.state.last_active_flush_task = asyncio.create_task(LAST_ACTIVE_BUFFER.run())
+
+    if DATABASE_CHAT_MESSAGE_WRITE_MODE == 'message':
+        asyncio.create_task(periodic_chat_message_compaction())
+
+    if ENABLE_CHAT_SEARCH_INDEX:
+        asyncio.create_task(periodic_chat_search_indexing())
+
+    if ENABLE_AIOHTTP_CLIENT_POOL:
+        CLIENT_SESSION_POOL.start()
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         try:
@@ -699,14 +735,55 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             log.warning(f'Failed to initialize tool/terminal servers at startup: {e}')
 
+    # Resume the knowledge reindex jobs interrupted by a restart or left behind by another node
+    asyncio.create_task(
+        resume_stale_reindex_jobs(
+            Request(
+                {
+                    'type': 'http',
+                    'asgi.version': '3.0',
+                    'asgi.spec_version': '2.0',
+                    'method': 'POST',
+                    'path': '/internal',
+                    'query_string': b'',
+                    'headers': Headers({}).raw,
+                    'client': ('127.0.0.1', 12345),
+                    'server': ('127.0.0.1', 80),
+                    'scheme': 'http',
+                    'app': app,
+                }
+            )
+        )
+    )
+
     # Mark application as ready to accept traffic from a startup perspective.
     app.state.startup_complete = True
 
     yield
 
+    # Persist any emitter events still waiting in the write-behind buffer
+    await MESSAGE_EVENT_BUFFER.flush_all()
+
+    app.state.last_active_flush_task.cancel()
+    await asyncio.to_thread(LAST_ACTIVE_BUFFER.flush)
+
+    await CLIENT_SESSION_POOL.close()
+
     if hasattr(app.state, 'redis_task_command_listener'):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, 'redis_access_grant_cache_listener'):
+        app.state.redis_access_grant_cache_listener.cancel()
+
+    if hasattr(app.state, 'redis_user_cache_listener'):
+        app.state.redis_user_cache_listener.cancel()
+
+    if hasattr(app.state, 'redis_plugin_module_listener'):
+        app.state.redis_plugin_module_listener.cancel()
+
+    if hasattr(app.state, 'redis_file_status_listener'):
+        app.state.redis_file_status_listener.cancel()
+
 
 app = FastAPI(
     title='Open WebUI',
@@ -0,0 +1,99 @@
+"""add chat search index
+
+Revision ID: 2e3f4a5b6c7d
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = '2e3f4a5b6c7d'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_search_document',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('chat_id', sa.Text(), nullable=False),
+        sa.Column('message_id', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        sa.Column('title', sa.Text(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        'chat_search_document_chat_message_idx',
+        'chat_search_document',
+        ['chat_id', 'message_id'],
+        unique=True,
+    )
+    op.create_index('chat_search_document_user_idx', 'chat_search_document', ['user_id'])
+
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'sqlite':
+        # FTS5 is compiled into nearly every SQLite build; without it chat search keeps using pattern matching
+        try:
+            op.execute("""
+                CREATE VIRTUAL TABLE chat_search_fts USING fts5(
+                    title, content,
+                    content='chat_search_document', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """)
+        except Exception as e:
+            log.warning(f'FTS5 is not available, skipping chat search index: {e}')
+            return
+
+        op.execute("""
+            CREATE TRIGGER chat_search_document_ai AFTER INSERT ON chat_search_document BEGIN
+                INSERT INTO chat_search_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+            """)
+        op.execute("""
+            CREATE TRIGGER chat_search_document_ad AFTER DELETE ON chat_search_document BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+            """)
+        op.execute("""
+            CREATE TRIGGER chat_search_document_au AFTER UPDATE ON chat_search_document BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO chat_search_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+            """)
+    elif dialect_name == 'postgresql':
+        op.execute("""
+            ALTER TABLE chat_search_document ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+            ) STORED
+            """)
+        op.execute(
+            'CREATE INDEX chat_search_document_search_vector_idx ON chat_search_document USING GIN (search_vector)'
+        )
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS chat_search_document_ai')
+        op.execute('DROP TRIGGER IF EXISTS chat_search_document_ad')
+        op.execute('DROP TRIGGER IF EXISTS chat_search_document_au')
+        op.execute('DROP TABLE IF EXISTS chat_search_fts')
+
+    op.drop_index('chat_search_document_user_idx', table_name='chat_search_document')
+    op.drop_index('chat_search_document_chat_message_idx', table_name='chat_search_document')
+    op.drop_table('chat_search_document')
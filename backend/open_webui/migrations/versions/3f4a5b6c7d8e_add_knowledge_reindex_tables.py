@@ -0,0 +1,52 @@
+"""add knowledge reindex tables
+
+Revision ID: 3f4a5b6c7d8e
+Revises: 2e3f4a5b6c7d
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f4a5b6c7d8e'
+down_revision: Union[str, None] = '2e3f4a5b6c7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'knowledge_reindex_job',
+        sa.Column('id', sa.Text(), primary_key=True),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        sa.Column('status', sa.Text(), nullable=False),
+        sa.Column('force', sa.Boolean(), nullable=True),
+        sa.Column('embedding_config', sa.JSON(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('completed', sa.Integer(), nullable=True),
+        sa.Column('skipped', sa.Integer(), nullable=True),
+        sa.Column('failed', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.BigInteger(), nullable=True),
+        sa.Column('updated_at', sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        'knowledge_reindex_file',
+        sa.Column('job_id', sa.Text(), nullable=False),
+        sa.Column('knowledge_id', sa.Text(), nullable=False),
+        sa.Column('file_id', sa.Text(), nullable=False),
+        sa.Column('status', sa.Text(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id', 'knowledge_id', 'file_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('knowledge_reindex_file')
+    op.drop_table('knowledge_reindex_job')
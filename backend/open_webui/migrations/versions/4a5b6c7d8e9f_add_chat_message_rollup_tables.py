@@ -0,0 +1,124 @@
+"""add chat message rollup tables
+
+Revision ID: 4a5b6c7d8e9f
+Revises: 3f4a5b6c7d8e
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = '4a5b6c7d8e9f'
+down_revision: Union[str, None] = '3f4a5b6c7d8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Per message, what ChatMessages.upsert_message adds to the rollups (see get_rollup_contribution)
+MESSAGES_SQL = {
+    'sqlite': """
+        SELECT
+            (CASE WHEN CAST(created_at AS INTEGER) > 10000000000
+                THEN CAST(created_at AS INTEGER) / 1000
+                ELSE CAST(created_at AS INTEGER) END) / 3600 * 3600 AS bucket,
+            chat_id,
+            user_id,
+            COALESCE(model_id, '') AS model_id,
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' THEN 1 ELSE 0 END AS assistant,
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' AND json_type(usage) = 'object'
+                THEN 1 ELSE 0 END AS has_usage,
+            COALESCE(CAST(json_extract(usage, '$.input_tokens') AS INTEGER), 0) AS input_tokens,
+            COALESCE(CAST(json_extract(usage, '$.output_tokens') AS INTEGER), 0) AS output_tokens
+        FROM chat_message
+        WHERE user_id IS NOT NULL AND user_id != '' AND user_id NOT LIKE 'shared-%' AND created_at IS NOT NULL
+    """,
+    'postgresql': """
+        SELECT
+            (CASE WHEN created_at > 10000000000 THEN created_at / 1000 ELSE created_at END) / 3600 * 3600 AS bucket,
+            chat_id,
+            user_id,
+            COALESCE(model_id, '') AS model_id,
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' THEN 1 ELSE 0 END AS assistant,
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' AND json_typeof(usage) = 'object'
+                THEN 1 ELSE 0 END AS has_usage,
+            CASE WHEN json_typeof(usage) = 'object'
+                AND json_extract_path_text(usage, 'input_tokens') ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                THEN TRUNC(CAST(json_extract_path_text(usage, 'input_tokens') AS NUMERIC)) ELSE 0 END AS input_tokens,
+            CASE WHEN json_typeof(usage) = 'object'
+                AND json_extract_path_text(usage, 'output_tokens') ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                THEN TRUNC(CAST(json_extract_path_text(usage, 'output_tokens') AS NUMERIC)) ELSE 0 END AS output_tokens
+        FROM chat_message
+        WHERE user_id IS NOT NULL AND user_id != '' AND user_id NOT LIKE 'shared-%' AND created_at IS NOT NULL
+    """,
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_message_rollup',
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        sa.Column('model_id', sa.Text(), nullable=False),
+        sa.Column('message_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('assistant_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('usage_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('input_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('output_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket', 'user_id', 'model_id'),
+    )
+    op.create_index('chat_message_rollup_user_bucket_idx', 'chat_message_rollup', ['user_id', 'bucket'])
+
+    op.create_table(
+        'chat_rollup',
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('chat_id', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        sa.Column('message_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket', 'chat_id', 'user_id'),
+    )
+
+    # Backfill from the existing messages, aggregated by the database in one pass per table
+    dialect = op.get_bind().dialect.name
+    messages_sql = MESSAGES_SQL.get(dialect)
+    if messages_sql is None:
+        log.warning(f'Skipping the chat message rollup backfill, unsupported dialect: {dialect}')
+        return
+
+    op.execute(
+        f"""
+        INSERT INTO chat_message_rollup
+            (bucket, user_id, model_id, message_count, assistant_count, usage_count, input_tokens, output_tokens)
+        SELECT
+            bucket,
+            user_id,
+            model_id,
+            COUNT(*),
+            SUM(assistant),
+            SUM(has_usage),
+            SUM(CASE WHEN has_usage = 1 THEN input_tokens ELSE 0 END),
+            SUM(CASE WHEN has_usage = 1 THEN output_tokens ELSE 0 END)
+        FROM ({messages_sql}) AS messages
+        GROUP BY bucket, user_id, model_id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO chat_rollup (bucket, chat_id, user_id, message_count)
+        SELECT bucket, chat_id, user_id, COUNT(*)
+        FROM ({messages_sql}) AS messages
+        GROUP BY bucket, chat_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('chat_rollup')
+    op.drop_index('chat_message_rollup_user_bucket_idx', table_name='chat_message_rollup')
+    op.drop_table('chat_message_rollup')
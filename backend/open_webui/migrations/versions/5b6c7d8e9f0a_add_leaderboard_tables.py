@@ -0,0 +1,50 @@
+"""add leaderboard snapshot and feedback tag embedding tables
+
+Revision ID: 5b6c7d8e9f0a
+Revises: 4a5b6c7d8e9f
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5b6c7d8e9f0a'
+down_revision: Union[str, None] = '4a5b6c7d8e9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    leaderboard_snapshot = op.create_table(
+        'leaderboard_snapshot',
+        sa.Column('id', sa.Text(), primary_key=True),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('version', sa.BigInteger(), nullable=True),
+        sa.Column('stale', sa.Boolean(), nullable=True),
+        sa.Column('updated_at', sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        'feedback_tag_embedding',
+        sa.Column('model', sa.Text(), nullable=False),
+        sa.Column('tag', sa.Text(), nullable=False),
+        sa.Column('embedding', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint('model', 'tag'),
+    )
+
+    # Stale, so the first leaderboard read replays the existing feedback
+    op.bulk_insert(
+        leaderboard_snapshot,
+        [{'id': 'elo', 'data': None, 'version': 0, 'stale': True, 'updated_at': int(time.time())}],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('feedback_tag_embedding')
+    op.drop_table('leaderboard_snapshot')
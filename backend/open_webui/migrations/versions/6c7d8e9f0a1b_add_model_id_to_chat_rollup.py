@@ -0,0 +1,87 @@
+"""add model_id to chat_rollup
+
+Revision ID: 6c7d8e9f0a1b
+Revises: 5b6c7d8e9f0a
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = '6c7d8e9f0a1b'
+down_revision: Union[str, None] = '5b6c7d8e9f0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Per message, the chat_rollup row ChatMessages.upsert_message adds it to (see get_rollup_contribution)
+BUCKET_SQL = {
+    'sqlite': """
+        (CASE WHEN CAST(created_at AS INTEGER) > 10000000000
+            THEN CAST(created_at AS INTEGER) / 1000
+            ELSE CAST(created_at AS INTEGER) END) / 3600 * 3600
+    """,
+    'postgresql': """
+        (CASE WHEN created_at > 10000000000 THEN created_at / 1000 ELSE created_at END) / 3600 * 3600
+    """,
+}
+
+
+def create_chat_rollup(table_name: str, with_model_id: bool):
+    op.create_table(
+        table_name,
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('chat_id', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        *([sa.Column('model_id', sa.Text(), nullable=False)] if with_model_id else []),
+        sa.Column('message_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket', 'chat_id', 'user_id', *(['model_id'] if with_model_id else [])),
+    )
+
+
+def upgrade() -> None:
+    # Rebuilt from the messages, the per-model split can't be derived from the existing rows
+    op.drop_table('chat_rollup')
+    create_chat_rollup('chat_rollup', with_model_id=True)
+    op.create_index('chat_rollup_model_chat_idx', 'chat_rollup', ['model_id', 'chat_id'])
+
+    dialect = op.get_bind().dialect.name
+    bucket_sql = BUCKET_SQL.get(dialect)
+    if bucket_sql is None:
+        log.warning(f'Skipping the chat rollup backfill, unsupported dialect: {dialect}')
+        return
+
+    op.execute(
+        f"""
+        INSERT INTO chat_rollup (bucket, chat_id, user_id, model_id, message_count)
+        SELECT bucket, chat_id, user_id, model_id, COUNT(*)
+        FROM (
+            SELECT {bucket_sql} AS bucket, chat_id, user_id, COALESCE(model_id, '') AS model_id
+            FROM chat_message
+            WHERE user_id IS NOT NULL AND user_id != '' AND user_id NOT LIKE 'shared-%' AND created_at IS NOT NULL
+        ) AS messages
+        GROUP BY bucket, chat_id, user_id, model_id
+        """
+    )
+
+
+def downgrade() -> None:
+    create_chat_rollup('chat_rollup_without_model', with_model_id=False)
+    op.execute(
+        """
+        INSERT INTO chat_rollup_without_model (bucket, chat_id, user_id, message_count)
+        SELECT bucket, chat_id, user_id, SUM(message_count)
+        FROM chat_rollup
+        GROUP BY bucket, chat_id, user_id
+        """
+    )
+    op.drop_index('chat_rollup_model_chat_idx', table_name='chat_rollup')
+    op.drop_table('chat_rollup')
+    op.rename_table('chat_rollup_without_model', 'chat_rollup')
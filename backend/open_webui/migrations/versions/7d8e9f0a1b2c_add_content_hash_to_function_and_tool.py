@@ -0,0 +1,47 @@
+"""add content_hash to function and tool
+
+Revision ID: 7d8e9f0a1b2c
+Revises: 6c7d8e9f0a1b
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select
+
+# revision identifiers, used by Alembic.
+revision: str = '7d8e9f0a1b2c'
+down_revision: Union[str, None] = '6c7d8e9f0a1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PLUGIN_TABLES = ['function', 'tool']
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    for table_name in PLUGIN_TABLES:
+        op.add_column(table_name, sa.Column('content_hash', sa.Text(), nullable=True))
+
+        # Same hash as open_webui.utils.plugin_cache.get_content_hash
+        plugin_table = table(
+            table_name,
+            sa.Column('id', sa.String()),
+            sa.Column('content', sa.Text()),
+            sa.Column('content_hash', sa.Text()),
+        )
+        for row in connection.execute(select(plugin_table.c.id, plugin_table.c.content)).fetchall():
+            connection.execute(
+                sa.update(plugin_table)
+                .where(plugin_table.c.id == row.id)
+                .values(content_hash=hashlib.sha256((row.content or '').encode()).hexdigest())
+            )
+
+
+def downgrade() -> None:
+    for table_name in PLUGIN_TABLES:
+        op.drop_column(table_name, 'content_hash')
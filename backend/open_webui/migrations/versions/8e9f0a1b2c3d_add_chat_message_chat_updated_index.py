@@ -0,0 +1,25 @@
+"""add chat_message chat_id, updated_at index
+
+Revision ID: 8e9f0a1b2c3d
+Revises: 7d8e9f0a1b2c
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e9f0a1b2c3d'
+down_revision: Union[str, None] = '7d8e9f0a1b2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('chat_message_chat_updated_idx', 'chat_message', ['chat_id', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('chat_message_chat_updated_idx', table_name='chat_message')
@@ -5,6 +5,7 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, get_db_context
+from open_webui.utils.access_cache import ACCESS_GRANT_CACHE
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, Text, UniqueConstraint, or_, and_
@@ -319,6 +320,7 @@ class AccessGrantsTable:
             db.add(grant)
             db.commit()
             db.refresh(grant)
+            ACCESS_GRANT_CACHE.invalidate_resource_type(resource_type)
             return AccessGrantModel.model_validate(grant)
 
     def revoke_access(
@@ -344,6 +346,8 @@ class AccessGrantsTable:
                 .delete()
             )
             db.commit()
+            if deleted:
+                ACCESS_GRANT_CACHE.invalidate_resource_type(resource_type)
             return deleted > 0
 
     def revoke_all_access(
@@ -363,6 +367,8 @@ class AccessGrantsTable:
                 .delete()
             )
             db.commit()
+            if deleted:
+                ACCESS_GRANT_CACHE.invalidate_resource_type(resource_type)
             return deleted
 
     def set_access_control(
@@ -398,6 +404,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             db.commit()
+            ACCESS_GRANT_CACHE.invalidate_resource_type(resource_type)
 
             return [AccessGrantModel.model_validate(g) for g in results]
 
@@ -434,6 +441,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             db.commit()
+            ACCESS_GRANT_CACHE.invalidate_resource_type(resource_type)
             return [AccessGrantModel.model_validate(g) for g in results]
 
     def get_access_control(
@@ -516,43 +524,17 @@ class AccessGrantsTable:
         - There's a grant for the specific user with the requested permission
         - There's a grant for any of the user's groups with the requested permission
         """
-        with get_db_context(db) as db:
-            # Build conditions for matching grants
-            conditions = [
-                # Public access
-                and_(
-                    AccessGrant.principal_type == 'user',
-                    AccessGrant.principal_id == '*',
-                ),
-                # Direct user access
-                and_(
-                    AccessGrant.principal_type == 'user',
-                    AccessGrant.principal_id == user_id,
-                ),
-            ]
-
-            # Group access
-            if user_group_ids is None:
-                from open_webui.models.groups import Groups
-
-                user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-                user_group_ids = {group.id for group in user_groups}
-
-            if user_group_ids:
-                conditions.append(
-                    and_(
-                        AccessGrant.principal_type == 'group',
-                        AccessGrant.principal_id.in_(user_group_ids),
-                    )
-                )
+        if self._is_cacheable(user_id, user_group_ids, db=db):
+            return resource_id in self.get_user_resource_ids(user_id, resource_type, permission, db=db)
 
+        with get_db_context(db) as db:
             exists = (
                 db.query(AccessGrant)
                 .filter(
                     AccessGrant.resource_type == resource_type,
                     AccessGrant.resource_id == resource_id,
                     AccessGrant.permission == permission,
-                    or_(*conditions),
+                    self._get_principal_filter(user_id, user_group_ids, db=db),
                 )
                 .first()
             )
@@ -575,45 +557,104 @@ class AccessGrantsTable:
         if not resource_ids:
             return set()
 
-        with get_db_context(db) as db:
-            conditions = [
-                and_(
-                    AccessGrant.principal_type == 'user',
-                    AccessGrant.principal_id == '*',
-                ),
-                and_(
-                    AccessGrant.principal_type == 'user',
-                    AccessGrant.principal_id == user_id,
-                ),
-            ]
-
-            if user_group_ids is None:
-                from open_webui.models.groups import Groups
-
-                user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-                user_group_ids = {group.id for group in user_groups}
-
-            if user_group_ids:
-                conditions.append(
-                    and_(
-                        AccessGrant.principal_type == 'group',
-                        AccessGrant.principal_id.in_(user_group_ids),
-                    )
-                )
+        if self._is_cacheable(user_id, user_group_ids, db=db):
+            return set(resource_ids) & self.get_user_resource_ids(user_id, resource_type, permission, db=db)
 
+        with get_db_context(db) as db:
             rows = (
                 db.query(AccessGrant.resource_id)
                 .filter(
                     AccessGrant.resource_type == resource_type,
                     AccessGrant.resource_id.in_(resource_ids),
                     AccessGrant.permission == permission,
-                    or_(*conditions),
+                    self._get_principal_filter(user_id, user_group_ids, db=db),
                 )
                 .distinct()
                 .all()
             )
             return {row[0] for row in rows}
 
+    def get_user_resource_ids(
+        self,
+        user_id: str,
+        resource_type: str,
+        permission: str = 'read',
+        db: Optional[Session] = None,
+    ) -> frozenset[str]:
+        """
+        IDs of every resource of a type the user holds a permission on, through
+        a public, direct or group grant. Resolved with a single query and cached
+        until grants of that type or the user's group memberships change.
+        """
+
+        def fetch():
+            with get_db_context(db) as session:
+                rows = (
+                    session.query(AccessGrant.resource_id)
+                    .filter(
+                        AccessGrant.resource_type == resource_type,
+                        AccessGrant.permission == permission,
+                        self._get_principal_filter(user_id, db=session),
+                    )
+                    .distinct()
+                    .all()
+                )
+                return [row[0] for row in rows]
+
+        return ACCESS_GRANT_CACHE.get_resource_ids(user_id, resource_type, permission, fetch)
+
+    def _is_cacheable(
+        self,
+        user_id: str,
+        user_group_ids: Optional[set[str]] = None,
+        db: Optional[Session] = None,
+    ) -> bool:
+        """Cached resource IDs only answer for the user's actual groups, not a caller-supplied set."""
+        if not ACCESS_GRANT_CACHE.enabled:
+            return False
+        if user_group_ids is None:
+            return True
+
+        from open_webui.models.groups import Groups
+
+        return set(user_group_ids) == Groups.get_group_ids_by_member_id(user_id, db=db)
+
+    def _get_principal_filter(
+        self,
+        user_id: str,
+        user_group_ids: Optional[set[str]] = None,
+        db: Optional[Session] = None,
+    ):
+        """Match grants to the public, to the user, or to any of the user's groups."""
+        conditions = [
+            # Public access
+            and_(
+                AccessGrant.principal_type == 'user',
+                AccessGrant.principal_id == '*',
+            ),
+            # Direct user access
+            and_(
+                AccessGrant.principal_type == 'user',
+                AccessGrant.principal_id == user_id,
+            ),
+        ]
+
+        # Group access
+        if user_group_ids is None:
+            from open_webui.models.groups import Groups
+
+            user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
+
+        if user_group_ids:
+            conditions.append(
+                and_(
+                    AccessGrant.principal_type == 'group',
+                    AccessGrant.principal_id.in_(user_group_ids),
+                )
+            )
+
+        return or_(*conditions)
+
     def get_users_with_access(
         self,
         resource_type: str,
@@ -383,7 +383,7 @@ class ChannelTable:
 
     def get_channels_by_user_id(self, user_id: str, db: Optional[Session] = None) -> list[ChannelModel]:
         with get_db_context(db) as db:
-            user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id, db=db)]
+            user_group_ids = list(Groups.get_group_ids_by_member_id(user_id, db=db))
 
             membership_channels = (
                 db.query(Channel)
@@ -720,7 +720,7 @@ class ChannelTable:
                 return []
 
             # Preload user's group membership
-            user_group_ids = [g.id for g in Groups.get_groups_by_member_id(user_id, db=db)]
+            user_group_ids = list(Groups.get_group_ids_by_member_id(user_id, db=db))
 
             allowed_channels = []
 
@@ -794,7 +794,7 @@ class ChannelTable:
             query = db.query(Channel).filter(Channel.id == id)
 
             # Determine user groups
-            user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id, db=db)]
+            user_group_ids = list(Groups.get_group_ids_by_member_id(user_id, db=db))
 
             # Apply ACL rules
             query = self._has_permission(
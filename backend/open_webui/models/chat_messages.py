@@ -1,7 +1,8 @@
 import json
 import time
 import uuid
-from typing import Any, Optional
+from collections import defaultdict
+from typing import Any, NamedTuple, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, get_db_context
@@ -16,6 +17,8 @@ from sqlalchemy import (
     JSON,
     Index,
     func,
+    literal_column,
+    select,
 )
 
 ####################
@@ -78,6 +81,9 @@ class ChatMessage(Base):
     # Usage (tokens, timing, etc.)
     usage = Column(JSON, nullable=True)
 
+    # Remaining history fields (childrenIds, info, timestamp, ...) not mapped to a column
+    extra = Column(JSON, nullable=True)
+
     # Timestamps
     created_at = Column(BigInteger, index=True)
     updated_at = Column(BigInteger)
@@ -86,9 +92,272 @@ class ChatMessage(Base):
         Index('chat_message_chat_parent_idx', 'chat_id', 'parent_id'),
         Index('chat_message_model_created_idx', 'model_id', 'created_at'),
         Index('chat_message_user_created_idx', 'user_id', 'created_at'),
+        # Pending message lookup per chat, see Chats.get_chat_ids_with_pending_messages
+        Index('chat_message_chat_updated_idx', 'chat_id', 'updated_at'),
     )
 
 
+class ChatMessageRollup(Base):
+    """
+    Hourly message counts and token usage per user and model, kept up to
+    date as messages are written and deleted so analytics never scans
+    chat_message.
+    """
+
+    __tablename__ = 'chat_message_rollup'
+
+    bucket = Column(BigInteger, primary_key=True)  # Start of the hour, epoch seconds (UTC)
+    user_id = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)  # '' for messages without a model
+
+    message_count = Column(BigInteger, nullable=False, default=0)
+    # Assistant messages with a model, and those of them with usage
+    assistant_count = Column(BigInteger, nullable=False, default=0)
+    usage_count = Column(BigInteger, nullable=False, default=0)
+    input_tokens = Column(BigInteger, nullable=False, default=0)
+    output_tokens = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (Index('chat_message_rollup_user_bucket_idx', 'user_id', 'bucket'),)
+
+
+class ChatRollup(Base):
+    """
+    Hourly message counts per chat and model, for counting the chats active
+    in a range and finding the chats that used a model.
+    """
+
+    __tablename__ = 'chat_rollup'
+
+    bucket = Column(BigInteger, primary_key=True)
+    chat_id = Column(Text, primary_key=True)
+    user_id = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)  # '' for messages without a model
+
+    message_count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (Index('chat_rollup_model_chat_idx', 'model_id', 'chat_id'),)
+
+
+class RollupContribution(NamedTuple):
+    """What a single message (or `message_count` messages of one rollup row) adds to the rollups."""
+
+    bucket: int
+    user_id: str
+    model_id: str
+    chat_id: str
+    assistant: int
+    usage: int
+    input_tokens: int
+    output_tokens: int
+    message_count: int = 1
+
+
+def _get_token_count(usage: dict, key: str) -> int:
+    try:
+        return int(float(usage.get(key) or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def get_rollup_contribution(
+    chat_id: str,
+    user_id: Optional[str],
+    role: Optional[str],
+    model_id: Optional[str],
+    usage: Any,
+    created_at: Optional[int],
+) -> Optional[RollupContribution]:
+    """
+    A message's contribution to the rollups, None for messages analytics
+    leaves out (shared chats). Mirrors the backfill of migration 4a5b6c7d8e9f.
+    """
+    if not user_id or user_id.startswith('shared-') or created_at is None:
+        return None
+
+    timestamp = int(created_at)
+    if timestamp > 10_000_000_000:
+        timestamp //= 1000
+
+    assistant = role == 'assistant' and bool(model_id)
+    has_usage = assistant and isinstance(usage, dict)
+    return RollupContribution(
+        bucket=timestamp // 3600 * 3600,
+        user_id=user_id,
+        model_id=model_id or '',
+        chat_id=chat_id,
+        assistant=int(assistant),
+        usage=int(has_usage),
+        input_tokens=_get_token_count(usage, 'input_tokens') if has_usage else 0,
+        output_tokens=_get_token_count(usage, 'output_tokens') if has_usage else 0,
+    )
+
+
+# get_rollup_contribution in SQL, per dialect, to aggregate the contributions of many messages in the
+# database (as the backfill of migration 4a5b6c7d8e9f); `has_usage` gates the token counts
+ROLLUP_CONTRIBUTION_SQL = {
+    'sqlite': {
+        'bucket': """
+            (CASE WHEN CAST(created_at AS INTEGER) > 10000000000
+                THEN CAST(created_at AS INTEGER) / 1000
+                ELSE CAST(created_at AS INTEGER) END) / 3600 * 3600
+        """,
+        'assistant': "CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' THEN 1 ELSE 0 END",
+        'has_usage': """
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' AND json_type(usage) = 'object'
+                THEN 1 ELSE 0 END
+        """,
+        'input_tokens': "COALESCE(CAST(json_extract(usage, '$.input_tokens') AS INTEGER), 0)",
+        'output_tokens': "COALESCE(CAST(json_extract(usage, '$.output_tokens') AS INTEGER), 0)",
+    },
+    'postgresql': {
+        'bucket': '(CASE WHEN created_at > 10000000000 THEN created_at / 1000 ELSE created_at END) / 3600 * 3600',
+        'assistant': "CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' THEN 1 ELSE 0 END",
+        'has_usage': """
+            CASE WHEN role = 'assistant' AND COALESCE(model_id, '') != '' AND json_typeof(usage) = 'object'
+                THEN 1 ELSE 0 END
+        """,
+        'input_tokens': """
+            CASE WHEN json_typeof(usage) = 'object'
+                AND json_extract_path_text(usage, 'input_tokens') ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                THEN TRUNC(CAST(json_extract_path_text(usage, 'input_tokens') AS NUMERIC)) ELSE 0 END
+        """,
+        'output_tokens': """
+            CASE WHEN json_typeof(usage) = 'object'
+                AND json_extract_path_text(usage, 'output_tokens') ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                THEN TRUNC(CAST(json_extract_path_text(usage, 'output_tokens') AS NUMERIC)) ELSE 0 END
+        """,
+    },
+}
+
+
+def get_rollup_contributions(db: Session, *criteria) -> list[RollupContribution]:
+    """
+    The summed contributions of the messages matching `criteria`, one per
+    chat_rollup row, aggregated by the database with a single GROUP BY.
+    """
+    contribution_sql = ROLLUP_CONTRIBUTION_SQL.get(db.bind.dialect.name)
+    if contribution_sql is None:
+        messages = db.query(
+            ChatMessage.chat_id,
+            ChatMessage.user_id,
+            ChatMessage.role,
+            ChatMessage.model_id,
+            ChatMessage.usage,
+            ChatMessage.created_at,
+        ).filter(*criteria)
+        return [contribution for message in messages if (contribution := get_rollup_contribution(*message))]
+
+    bucket = literal_column(contribution_sql['bucket'])
+    model_id = func.coalesce(ChatMessage.model_id, '')
+    has_usage = literal_column(contribution_sql['has_usage'])
+
+    def sum_tokens(key: str):
+        return func.sum(has_usage * literal_column(contribution_sql[key]))
+
+    rows = db.execute(
+        select(
+            bucket,
+            ChatMessage.user_id,
+            model_id,
+            ChatMessage.chat_id,
+            func.sum(literal_column(contribution_sql['assistant'])),
+            func.sum(has_usage),
+            sum_tokens('input_tokens'),
+            sum_tokens('output_tokens'),
+            func.count(),
+        )
+        .where(
+            *criteria,
+            ChatMessage.user_id.isnot(None),
+            ChatMessage.user_id != '',
+            ChatMessage.user_id.notlike('shared-%'),
+            ChatMessage.created_at.isnot(None),
+        )
+        .group_by(bucket, ChatMessage.user_id, model_id, ChatMessage.chat_id)
+    )
+    return [
+        RollupContribution(
+            bucket=int(bucket),
+            user_id=user_id,
+            model_id=model_id,
+            chat_id=chat_id,
+            assistant=int(assistant),
+            usage=int(usage),
+            input_tokens=int(input_tokens),
+            output_tokens=int(output_tokens),
+            message_count=message_count,
+        )
+        for bucket, user_id, model_id, chat_id, assistant, usage, input_tokens, output_tokens, message_count in rows
+    ]
+
+
+def _upsert_increment(db: Session, model, key: dict, values: dict):
+    """Add `values` to the counters of the rollup row `key`, creating it if needed."""
+    dialect = db.bind.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(model).values(**key, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: getattr(model, column) + getattr(stmt.excluded, column) for column in values},
+        )
+        db.execute(stmt)
+    else:
+        updated = (
+            db.query(model)
+            .filter_by(**key)
+            .update(
+                {getattr(model, column): getattr(model, column) + value for column, value in values.items()},
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            db.add(model(**key, **values))
+
+
+def apply_rollup_contributions(db: Session, contributions: list[tuple[Optional[RollupContribution], int]]):
+    """
+    Add (sign 1) or remove (sign -1) message contributions to the rollups,
+    one upsert per affected row. Doesn't commit.
+    """
+    message_rollups = defaultdict(lambda: defaultdict(int))
+    chat_rollups = defaultdict(int)
+    for contribution, sign in contributions:
+        if contribution is None:
+            continue
+
+        values = message_rollups[(contribution.bucket, contribution.user_id, contribution.model_id)]
+        values['message_count'] += sign * contribution.message_count
+        values['assistant_count'] += sign * contribution.assistant
+        values['usage_count'] += sign * contribution.usage
+        values['input_tokens'] += sign * contribution.input_tokens
+        values['output_tokens'] += sign * contribution.output_tokens
+        chat_rollups[(contribution.bucket, contribution.chat_id, contribution.user_id, contribution.model_id)] += (
+            sign * contribution.message_count
+        )
+
+    for (bucket, user_id, model_id), values in message_rollups.items():
+        if any(values.values()):
+            _upsert_increment(
+                db,
+                ChatMessageRollup,
+                {'bucket': bucket, 'user_id': user_id, 'model_id': model_id},
+                dict(values),
+            )
+    for (bucket, chat_id, user_id, model_id), count in chat_rollups.items():
+        if count:
+            _upsert_increment(
+                db,
+                ChatRollup,
+                {'bucket': bucket, 'chat_id': chat_id, 'user_id': user_id, 'model_id': model_id},
+                {'message_count': count},
+            )
+
+
 ####################
 # Pydantic Models
 ####################
@@ -112,16 +381,84 @@ class ChatMessageModel(BaseModel):
     status_history: Optional[list] = None
     error: Optional[dict | str] = None
     usage: Optional[dict] = None
+    extra: Optional[dict] = None
     created_at: int
     updated_at: int
 
 
+# History message keys stored in dedicated columns; everything else goes to `extra`
+MESSAGE_COLUMN_KEYS = {
+    'id',
+    'role',
+    'parent_id',
+    'parentId',
+    'content',
+    'output',
+    'model_id',
+    'model',
+    'files',
+    'sources',
+    'embeds',
+    'done',
+    'status_history',
+    'statusHistory',
+    'error',
+    'usage',
+}
+
+
+def get_message_extra(data: dict) -> dict:
+    return {key: value for key, value in data.items() if key not in MESSAGE_COLUMN_KEYS}
+
+
 ####################
 # Table Operations
 ####################
 
 
 class ChatMessageTable:
+    @staticmethod
+    def to_history_message(message: ChatMessageModel) -> dict:
+        """Rebuild the chat history representation of a stored message."""
+        extra = message.extra or {}
+        history_message = {
+            **extra,
+            'id': message.id[len(message.chat_id) + 1 :],
+            'role': message.role,
+            'parentId': message.parent_id,
+            'content': message.content if message.content is not None else '',
+        }
+
+        for key, value in (
+            ('output', message.output),
+            ('model', message.model_id),
+            ('files', message.files),
+            ('sources', message.sources),
+            ('embeds', message.embeds),
+            ('statusHistory', message.status_history),
+            ('error', message.error),
+        ):
+            if value is not None:
+                history_message[key] = value
+
+        if message.role == 'assistant':
+            history_message['done'] = message.done
+        if message.usage and not (extra.get('info') or {}).get('usage'):
+            history_message['usage'] = message.usage
+
+        return history_message
+
+    @staticmethod
+    def _get_rollup_contribution(message: ChatMessage) -> Optional[RollupContribution]:
+        return get_rollup_contribution(
+            message.chat_id,
+            message.user_id,
+            message.role,
+            message.model_id,
+            message.usage,
+            message.created_at,
+        )
+
     def upsert_message(
         self,
         message_id: str,
@@ -138,12 +475,14 @@ class ChatMessageTable:
             # Use composite ID: {chat_id}-{message_id}
             composite_id = f'{chat_id}-{message_id}'
 
-            existing = db.get(ChatMessage, composite_id)
+            # Locked, so concurrent upserts of the message apply their rollup deltas one after the other
+            existing = db.get(ChatMessage, composite_id, with_for_update=True)
             if existing:
+                previous_contribution = self._get_rollup_contribution(existing)
                 # Update existing
                 if 'role' in data:
                     existing.role = data['role']
-                if 'parent_id' in data:
+                if 'parent_id' in data or 'parentId' in data:
                     existing.parent_id = data.get('parent_id') or data.get('parentId')
                 if 'content' in data:
                     existing.content = data.get('content')
@@ -170,7 +509,15 @@ class ChatMessageTable:
                     usage = info.get('usage') if info else None
                 if usage:
                     existing.usage = usage
+                extra = get_message_extra(data)
+                if extra:
+                    existing.extra = {**(existing.extra or {}), **extra}
                 existing.updated_at = now
+
+                contribution = self._get_rollup_contribution(existing)
+                if contribution != previous_contribution:
+                    apply_rollup_contributions(db, [(previous_contribution, -1), (contribution, 1)])
+
                 db.commit()
                 db.refresh(existing)
                 return ChatMessageModel.model_validate(existing)
@@ -197,10 +544,12 @@ class ChatMessageTable:
                     status_history=data.get('status_history') or data.get('statusHistory'),
                     error=data.get('error'),
                     usage=usage,
+                    extra=get_message_extra(data) or None,
                     created_at=timestamp,
                     updated_at=now,
                 )
                 db.add(message)
+                apply_rollup_contributions(db, [(self._get_rollup_contribution(message), 1)])
                 db.commit()
                 db.refresh(message)
                 return ChatMessageModel.model_validate(message)
@@ -251,6 +600,13 @@ class ChatMessageTable:
             messages = query.order_by(ChatMessage.created_at.desc()).offset(skip).limit(limit).all()
             return [ChatMessageModel.model_validate(message) for message in messages]
 
+    @staticmethod
+    def get_chat_ids_query_by_model_id(model_id: str):
+        """A subquery of the ids of the chats that used a model, from the rollups."""
+        return (
+            select(ChatRollup.chat_id).where(ChatRollup.model_id == model_id, ChatRollup.message_count > 0).distinct()
+        )
+
     def get_chat_ids_by_model_id(
         self,
         model_id: str,
@@ -260,37 +616,65 @@ class ChatMessageTable:
         limit: int = 50,
         db: Optional[Session] = None,
     ) -> list[str]:
-        """Get distinct chat_ids that used a specific model."""
+        """Get distinct chat_ids that used a specific model, from the rollups (hour resolution)."""
 
         with get_db_context(db) as db:
-            query = db.query(
-                ChatMessage.chat_id,
-                func.max(ChatMessage.created_at).label('last_message_at'),
-            ).filter(ChatMessage.model_id == model_id)
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
+            query = db.query(ChatRollup.chat_id).filter(ChatRollup.model_id == model_id)
+            query = self._filter_rollups(db, query, ChatRollup, start_date, end_date)
 
-            # Group by chat_id and order by most recent message in each chat
+            # Group by chat_id and order by the most recent hour with a message in each chat
             # Secondary sort on chat_id ensures deterministic pagination
             # (prevents duplicates across pages when timestamps tie)
             chat_ids = (
-                query.group_by(ChatMessage.chat_id)
-                .order_by(func.max(ChatMessage.created_at).desc(), ChatMessage.chat_id)
+                query.group_by(ChatRollup.chat_id)
+                .having(func.sum(ChatRollup.message_count) > 0)
+                .order_by(func.max(ChatRollup.bucket).desc(), ChatRollup.chat_id)
                 .offset(skip)
                 .limit(limit)
                 .all()
             )
-            return [chat_id for chat_id, _ in chat_ids]
+            return [chat_id for (chat_id,) in chat_ids]
+
+    def delete_messages(self, *criteria, db: Session) -> None:
+        """
+        Delete the messages matching `criteria` and remove them from the
+        rollups. Doesn't commit, so it's part of the caller's transaction.
+        """
+        contributions = get_rollup_contributions(db, *criteria)
+        apply_rollup_contributions(db, [(contribution, -1) for contribution in contributions])
+        db.query(ChatMessage).filter(*criteria).delete(synchronize_session=False)
 
     def delete_messages_by_chat_id(self, chat_id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
-            db.query(ChatMessage).filter_by(chat_id=chat_id).delete()
+            self.delete_messages(ChatMessage.chat_id == chat_id, db=db)
             db.commit()
             return True
 
-    # Analytics methods
+    # Analytics methods, read from the rollups (hour resolution)
+    @staticmethod
+    def _filter_rollups(
+        db: Session,
+        query,
+        model,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
+    ):
+        from open_webui.models.groups import GroupMember
+
+        if start_date:
+            if start_date > 10_000_000_000:
+                start_date //= 1000
+            query = query.filter(model.bucket >= start_date // 3600 * 3600)
+        if end_date:
+            if end_date > 10_000_000_000:
+                end_date //= 1000
+            query = query.filter(model.bucket <= end_date)
+        if group_id:
+            group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
+            query = query.filter(model.user_id.in_(group_users))
+        return query
+
     def get_message_count_by_model(
         self,
         start_date: Optional[int] = None,
@@ -299,149 +683,64 @@ class ChatMessageTable:
         db: Optional[Session] = None,
     ) -> dict[str, int]:
         with get_db_context(db) as db:
-            from sqlalchemy import func
-            from open_webui.models.groups import GroupMember
-
-            query = db.query(ChatMessage.model_id, func.count(ChatMessage.id).label('count')).filter(
-                ChatMessage.role == 'assistant',
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like('shared-%'),
+            count = func.sum(ChatMessageRollup.assistant_count)
+            query = db.query(ChatMessageRollup.model_id, count.label('count')).filter(
+                ChatMessageRollup.assistant_count > 0
             )
+            query = self._filter_rollups(db, query, ChatMessageRollup, start_date, end_date, group_id)
 
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.group_by(ChatMessage.model_id).all()
+            results = query.group_by(ChatMessageRollup.model_id).having(count > 0).all()
             return {row.model_id: row.count for row in results}
 
-    def get_token_usage_by_model(
+    def _get_token_usage(
         self,
+        column,
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
         group_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> dict[str, dict]:
-        """Aggregate token usage by model using database-level aggregation."""
         with get_db_context(db) as db:
-            from sqlalchemy import func, cast, Integer
-            from open_webui.models.groups import GroupMember
-
-            dialect = db.bind.dialect.name
-
-            if dialect == 'sqlite':
-                input_tokens = cast(func.json_extract(ChatMessage.usage, '$.input_tokens'), Integer)
-                output_tokens = cast(func.json_extract(ChatMessage.usage, '$.output_tokens'), Integer)
-            elif dialect == 'postgresql':
-                # Use json_extract_path_text for PostgreSQL JSON columns
-                input_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, 'input_tokens'),
-                    Integer,
-                )
-                output_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, 'output_tokens'),
-                    Integer,
-                )
-            else:
-                raise NotImplementedError(f'Unsupported dialect: {dialect}')
-
+            message_count = func.sum(ChatMessageRollup.usage_count)
             query = db.query(
-                ChatMessage.model_id,
-                func.coalesce(func.sum(input_tokens), 0).label('input_tokens'),
-                func.coalesce(func.sum(output_tokens), 0).label('output_tokens'),
-                func.count(ChatMessage.id).label('message_count'),
-            ).filter(
-                ChatMessage.role == 'assistant',
-                ChatMessage.model_id.isnot(None),
-                ChatMessage.usage.isnot(None),
-                ~ChatMessage.user_id.like('shared-%'),
-            )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
+                column,
+                func.coalesce(func.sum(ChatMessageRollup.input_tokens), 0).label('input_tokens'),
+                func.coalesce(func.sum(ChatMessageRollup.output_tokens), 0).label('output_tokens'),
+                message_count.label('message_count'),
+            ).filter(ChatMessageRollup.usage_count > 0)
+            query = self._filter_rollups(db, query, ChatMessageRollup, start_date, end_date, group_id)
 
-            results = query.group_by(ChatMessage.model_id).all()
+            results = query.group_by(column).having(message_count > 0).all()
 
             return {
-                row.model_id: {
-                    'input_tokens': row.input_tokens,
-                    'output_tokens': row.output_tokens,
-                    'total_tokens': row.input_tokens + row.output_tokens,
-                    'message_count': row.message_count,
+                row[0]: {
+                    'input_tokens': int(row.input_tokens),
+                    'output_tokens': int(row.output_tokens),
+                    'total_tokens': int(row.input_tokens + row.output_tokens),
+                    'message_count': int(row.message_count),
                 }
                 for row in results
             }
 
-    def get_token_usage_by_user(
+    def get_token_usage_by_model(
         self,
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
         group_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> dict[str, dict]:
-        """Aggregate token usage by user using database-level aggregation."""
-        with get_db_context(db) as db:
-            from sqlalchemy import func, cast, Integer
-            from open_webui.models.groups import GroupMember
-
-            dialect = db.bind.dialect.name
-
-            if dialect == 'sqlite':
-                input_tokens = cast(func.json_extract(ChatMessage.usage, '$.input_tokens'), Integer)
-                output_tokens = cast(func.json_extract(ChatMessage.usage, '$.output_tokens'), Integer)
-            elif dialect == 'postgresql':
-                # Use json_extract_path_text for PostgreSQL JSON columns
-                input_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, 'input_tokens'),
-                    Integer,
-                )
-                output_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, 'output_tokens'),
-                    Integer,
-                )
-            else:
-                raise NotImplementedError(f'Unsupported dialect: {dialect}')
-
-            query = db.query(
-                ChatMessage.user_id,
-                func.coalesce(func.sum(input_tokens), 0).label('input_tokens'),
-                func.coalesce(func.sum(output_tokens), 0).label('output_tokens'),
-                func.count(ChatMessage.id).label('message_count'),
-            ).filter(
-                ChatMessage.role == 'assistant',
-                ChatMessage.user_id.isnot(None),
-                ChatMessage.usage.isnot(None),
-                ~ChatMessage.user_id.like('shared-%'),
-            )
+        """Token usage by model, summed from the hourly rollups."""
+        return self._get_token_usage(ChatMessageRollup.model_id, start_date, end_date, group_id, db)
 
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.group_by(ChatMessage.user_id).all()
-
-            return {
-                row.user_id: {
-                    'input_tokens': row.input_tokens,
-                    'output_tokens': row.output_tokens,
-                    'total_tokens': row.input_tokens + row.output_tokens,
-                    'message_count': row.message_count,
-                }
-                for row in results
-            }
+    def get_token_usage_by_user(
+        self,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> dict[str, dict]:
+        """Token usage by user, summed from the hourly rollups."""
+        return self._get_token_usage(ChatMessageRollup.user_id, start_date, end_date, group_id, db)
 
     def get_message_count_by_user(
         self,
@@ -451,22 +750,11 @@ class ChatMessageTable:
         db: Optional[Session] = None,
     ) -> dict[str, int]:
         with get_db_context(db) as db:
-            from sqlalchemy import func
-            from open_webui.models.groups import GroupMember
-
-            query = db.query(ChatMessage.user_id, func.count(ChatMessage.id).label('count')).filter(
-                ~ChatMessage.user_id.like('shared-%')
-            )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
+            count = func.sum(ChatMessageRollup.message_count)
+            query = db.query(ChatMessageRollup.user_id, count.label('count'))
+            query = self._filter_rollups(db, query, ChatMessageRollup, start_date, end_date, group_id)
 
-            results = query.group_by(ChatMessage.user_id).all()
+            results = query.group_by(ChatMessageRollup.user_id).having(count > 0).all()
             return {row.user_id: row.count for row in results}
 
     def get_message_count_by_chat(
@@ -477,116 +765,95 @@ class ChatMessageTable:
         db: Optional[Session] = None,
     ) -> dict[str, int]:
         with get_db_context(db) as db:
-            from sqlalchemy import func
-            from open_webui.models.groups import GroupMember
+            count = func.sum(ChatRollup.message_count)
+            query = db.query(ChatRollup.chat_id, count.label('count'))
+            query = self._filter_rollups(db, query, ChatRollup, start_date, end_date, group_id)
 
-            query = db.query(ChatMessage.chat_id, func.count(ChatMessage.id).label('count')).filter(
-                ~ChatMessage.user_id.like('shared-%')
-            )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.group_by(ChatMessage.chat_id).all()
+            results = query.group_by(ChatRollup.chat_id).having(count > 0).all()
             return {row.chat_id: row.count for row in results}
 
-    def get_daily_message_counts_by_model(
+    def _get_message_counts_by_bucket(
         self,
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
         group_id: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> dict[str, dict[str, int]]:
-        """Get message counts grouped by day and model."""
+    ) -> list:
+        """Assistant message counts by hour and model."""
         with get_db_context(db) as db:
-            from datetime import datetime, timedelta
-            from open_webui.models.groups import GroupMember
-
-            query = db.query(ChatMessage.created_at, ChatMessage.model_id).filter(
-                ChatMessage.role == 'assistant',
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like('shared-%'),
+            count = func.sum(ChatMessageRollup.assistant_count)
+            query = db.query(ChatMessageRollup.bucket, ChatMessageRollup.model_id, count.label('count')).filter(
+                ChatMessageRollup.assistant_count > 0
             )
+            query = self._filter_rollups(db, query, ChatMessageRollup, start_date, end_date, group_id)
 
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id).subquery()
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.all()
+            return query.group_by(ChatMessageRollup.bucket, ChatMessageRollup.model_id).having(count > 0).all()
 
-            # Group by date -> model -> count
-            daily_counts: dict[str, dict[str, int]] = {}
-            for timestamp, model_id in results:
-                date_str = datetime.fromtimestamp(_normalize_timestamp(timestamp)).strftime('%Y-%m-%d')
+    def get_daily_message_counts_by_model(
+        self,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> dict[str, dict[str, int]]:
+        """Get message counts grouped by day and model."""
+        from datetime import datetime, timedelta
+
+        results = self._get_message_counts_by_bucket(start_date, end_date, group_id, db)
+
+        # Group by date -> model -> count
+        daily_counts: dict[str, dict[str, int]] = {}
+        for bucket, model_id, count in results:
+            date_str = datetime.fromtimestamp(_normalize_timestamp(bucket)).strftime('%Y-%m-%d')
+            if date_str not in daily_counts:
+                daily_counts[date_str] = {}
+            daily_counts[date_str][model_id] = daily_counts[date_str].get(model_id, 0) + count
+
+        # Fill in missing days
+        if start_date and end_date:
+            current = datetime.fromtimestamp(_normalize_timestamp(start_date))
+            end_dt = datetime.fromtimestamp(_normalize_timestamp(end_date))
+            while current <= end_dt:
+                date_str = current.strftime('%Y-%m-%d')
                 if date_str not in daily_counts:
                     daily_counts[date_str] = {}
-                daily_counts[date_str][model_id] = daily_counts[date_str].get(model_id, 0) + 1
+                current += timedelta(days=1)
 
-            # Fill in missing days
-            if start_date and end_date:
-                current = datetime.fromtimestamp(_normalize_timestamp(start_date))
-                end_dt = datetime.fromtimestamp(_normalize_timestamp(end_date))
-                while current <= end_dt:
-                    date_str = current.strftime('%Y-%m-%d')
-                    if date_str not in daily_counts:
-                        daily_counts[date_str] = {}
-                    current += timedelta(days=1)
-
-            return daily_counts
+        return daily_counts
 
     def get_hourly_message_counts_by_model(
         self,
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> dict[str, dict[str, int]]:
         """Get message counts grouped by hour and model."""
-        with get_db_context(db) as db:
-            from datetime import datetime, timedelta
-
-            query = db.query(ChatMessage.created_at, ChatMessage.model_id).filter(
-                ChatMessage.role == 'assistant',
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like('shared-%'),
+        from datetime import datetime, timedelta
+
+        results = self._get_message_counts_by_bucket(start_date, end_date, group_id, db)
+
+        # Group by hour -> model -> count
+        hourly_counts: dict[str, dict[str, int]] = {}
+        for bucket, model_id, count in results:
+            hour_str = datetime.fromtimestamp(_normalize_timestamp(bucket)).strftime('%Y-%m-%d %H:00')
+            if hour_str not in hourly_counts:
+                hourly_counts[hour_str] = {}
+            hourly_counts[hour_str][model_id] = hourly_counts[hour_str].get(model_id, 0) + count
+
+        # Fill in missing hours
+        if start_date and end_date:
+            current = datetime.fromtimestamp(_normalize_timestamp(start_date)).replace(
+                minute=0, second=0, microsecond=0
             )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-
-            results = query.all()
-
-            # Group by hour -> model -> count
-            hourly_counts: dict[str, dict[str, int]] = {}
-            for timestamp, model_id in results:
-                hour_str = datetime.fromtimestamp(_normalize_timestamp(timestamp)).strftime('%Y-%m-%d %H:00')
+            end_dt = datetime.fromtimestamp(_normalize_timestamp(end_date))
+            while current <= end_dt:
+                hour_str = current.strftime('%Y-%m-%d %H:00')
                 if hour_str not in hourly_counts:
                     hourly_counts[hour_str] = {}
-                hourly_counts[hour_str][model_id] = hourly_counts[hour_str].get(model_id, 0) + 1
+                current += timedelta(hours=1)
 
-            # Fill in missing hours
-            if start_date and end_date:
-                current = datetime.fromtimestamp(_normalize_timestamp(start_date)).replace(
-                    minute=0, second=0, microsecond=0
-                )
-                end_dt = datetime.fromtimestamp(_normalize_timestamp(end_date))
-                while current <= end_dt:
-                    hour_str = current.strftime('%Y-%m-%d %H:00')
-                    if hour_str not in hourly_counts:
-                        hourly_counts[hour_str] = {}
-                    current += timedelta(hours=1)
-
-            return hourly_counts
+        return hourly_counts
 
 
 ChatMessages = ChatMessageTable()
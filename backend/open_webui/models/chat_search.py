@@ -0,0 +1,237 @@
+import logging
+import re
+import time
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    Index,
+    Integer,
+    Text,
+    text,
+)
+
+log = logging.getLogger(__name__)
+
+####################
+# Chat search index
+#
+# Each chat is indexed as one document row per message plus a title row
+# (message_id ''). SQLite keeps an FTS5 table in sync with the rows through
+# triggers; PostgreSQL uses a generated, GIN-indexed tsvector column. Both are
+# created by migration, see 2e3f4a5b6c7d_add_chat_search_index.
+####################
+
+TITLE_MESSAGE_ID = ''
+
+
+class ChatSearchDocument(Base):
+    __tablename__ = 'chat_search_document'
+
+    # Integer key so it can serve as the FTS5 rowid
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, nullable=False)
+    message_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+
+    title = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index('chat_search_document_chat_message_idx', 'chat_id', 'message_id', unique=True),
+        Index('chat_search_document_user_idx', 'user_id'),
+    )
+
+
+def get_message_text(content: Any) -> str:
+    """Plain text of a message's content, which is a string or a list of blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return '\n'.join(
+            block.get('text', '') if isinstance(block, dict) else str(block)
+            for block in content
+            if isinstance(block, (dict, str))
+        )
+    return ''
+
+
+def _get_search_terms(search_text: str) -> list[str]:
+    return re.findall(r'\w+', search_text.lower())
+
+
+class ChatSearchTable:
+    def __init__(self):
+        self._available: dict[str, bool] = {}
+
+    def is_available(self, db: Session) -> bool:
+        """Whether the dialect-specific full-text index exists (FTS5 may be missing from SQLite builds)."""
+        dialect_name = db.bind.dialect.name
+        if dialect_name not in self._available:
+            try:
+                if dialect_name == 'sqlite':
+                    db.execute(text('SELECT 1 FROM chat_search_fts LIMIT 1'))
+                    self._available[dialect_name] = True
+                elif dialect_name == 'postgresql':
+                    db.execute(text('SELECT search_vector FROM chat_search_document LIMIT 1'))
+                    self._available[dialect_name] = True
+                else:
+                    self._available[dialect_name] = False
+            except Exception as e:
+                log.warning(f'Chat search index is not available, falling back to pattern matching: {e}')
+                db.rollback()
+                self._available[dialect_name] = False
+        return self._available[dialect_name]
+
+    def _upsert_document(
+        self,
+        db: Session,
+        chat_id: str,
+        message_id: str,
+        user_id: str,
+        title: Optional[str],
+        content: Optional[str],
+        now: int,
+    ):
+        document = db.query(ChatSearchDocument).filter_by(chat_id=chat_id, message_id=message_id).first()
+        if document:
+            document.title = title
+            document.content = content
+            document.updated_at = now
+        else:
+            db.add(
+                ChatSearchDocument(
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    user_id=user_id,
+                    title=title,
+                    content=content,
+                    updated_at=now,
+                )
+            )
+
+    def upsert_message(
+        self,
+        chat_id: str,
+        message_id: str,
+        user_id: str,
+        content: Any,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Index a single message as it is written."""
+        with get_db_context(db) as db:
+            self._upsert_document(
+                db,
+                chat_id,
+                message_id,
+                user_id,
+                None,
+                get_message_text(content),
+                int(time.time()),
+            )
+            db.commit()
+
+    def index_chat(
+        self,
+        chat_id: str,
+        user_id: str,
+        title: str,
+        messages: dict,
+        updated_at: int,
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        Replace all documents of a chat. The title row records the `updated_at`
+        of the chat it indexed, its indexed version, which is how stale chats
+        are detected.
+        """
+        with get_db_context(db) as db:
+            db.query(ChatSearchDocument).filter_by(chat_id=chat_id).delete()
+            db.add(
+                ChatSearchDocument(
+                    chat_id=chat_id,
+                    message_id=TITLE_MESSAGE_ID,
+                    user_id=user_id,
+                    title=title,
+                    content=None,
+                    updated_at=updated_at,
+                )
+            )
+            for message_id, message in messages.items():
+                if isinstance(message, dict):
+                    db.add(
+                        ChatSearchDocument(
+                            chat_id=chat_id,
+                            message_id=message_id,
+                            user_id=user_id,
+                            title=None,
+                            content=get_message_text(message.get('content')),
+                            updated_at=updated_at,
+                        )
+                    )
+            db.commit()
+
+    def advance_chat(self, chat_id: str, from_updated_at: int, to_updated_at: int, db: Session) -> None:
+        """
+        Record that the index of a chat indexed at `from_updated_at` is still
+        current at `to_updated_at`, after a write whose messages were indexed
+        as they were written. Doesn't commit.
+        """
+        db.query(ChatSearchDocument).filter_by(
+            chat_id=chat_id, message_id=TITLE_MESSAGE_ID, updated_at=from_updated_at
+        ).update({'updated_at': to_updated_at}, synchronize_session=False)
+
+    def get_ranked_chat_ids_query(self, user_id: str, search_text: str, db: Session):
+        """
+        Subquery of (chat_id, score) for the user's chats matching every term
+        of `search_text` as a prefix, higher score first. None when the text
+        has no searchable terms.
+        """
+        terms = _get_search_terms(search_text)
+        if not terms:
+            return None
+
+        dialect_name = db.bind.dialect.name
+        if dialect_name == 'sqlite':
+            # Quoted prefix queries, so user input is never parsed as FTS5 syntax
+            match = ' '.join(f'"{term}"*' for term in terms)
+            # bm25() is negative, lower is better; the title column is weighted higher. It cannot be
+            # aggregated directly, and the LIMIT keeps SQLite from flattening the subquery into the join
+            statement = text("""
+                SELECT d.chat_id AS chat_id, -MIN(m.rank) AS score
+                FROM (
+                    SELECT rowid, bm25(chat_search_fts, 10.0, 1.0) AS rank
+                    FROM chat_search_fts
+                    WHERE chat_search_fts MATCH :match
+                    LIMIT -1
+                ) AS m
+                JOIN chat_search_document AS d ON d.id = m.rowid
+                WHERE d.user_id = :user_id
+                GROUP BY d.chat_id
+                """)
+        elif dialect_name == 'postgresql':
+            match = ' & '.join(f'{term}:*' for term in terms)
+            statement = text("""
+                SELECT d.chat_id AS chat_id, MAX(ts_rank(d.search_vector, to_tsquery('simple', :match))) AS score
+                FROM chat_search_document AS d
+                WHERE d.search_vector @@ to_tsquery('simple', :match) AND d.user_id = :user_id
+                GROUP BY d.chat_id
+                """)
+        else:
+            return None
+
+        return (
+            statement.bindparams(match=match, user_id=user_id)
+            .columns(chat_id=Text, score=Float)
+            .subquery('chat_search_rank')
+        )
+
+
+ChatSearch = ChatSearchTable()
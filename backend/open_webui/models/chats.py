@@ -8,7 +8,9 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
-from open_webui.models.chat_messages import ChatMessage, ChatMessages
+from open_webui.models.chat_messages import ChatMessage, ChatMessageModel, ChatMessages
+from open_webui.models.chat_search import ChatSearch, ChatSearchDocument, TITLE_MESSAGE_ID
+from open_webui.env import DATABASE_CHAT_MESSAGE_WRITE_MODE, ENABLE_CHAT_SEARCH_INDEX
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
 
 from pydantic import BaseModel, ConfigDict
@@ -319,6 +321,15 @@ class ChatTable:
             except Exception as e:
                 log.warning(f'Failed to write initial messages to chat_message table: {e}')
 
+            # Searchable right away rather than after the next background indexing run
+            if ENABLE_CHAT_SEARCH_INDEX:
+                try:
+                    messages = chat_item.chat.get('history', {}).get('messages', {})
+                    ChatSearch.index_chat(id, user_id, chat_item.title, messages, chat_item.updated_at, db=db)
+                except Exception as e:
+                    db.rollback()
+                    log.warning(f'Failed to index chat {id} for search: {e}')
+
             return ChatModel.model_validate(chat_item) if chat_item else None
 
     def _chat_import_form_to_chat_model(self, user_id: str, form_data: ChatImportForm) -> ChatModel:
@@ -423,6 +434,15 @@ class ChatTable:
 
             return ChatModel.model_validate(chat)
 
+    def get_tag_counts_by_chat_ids(self, chat_ids, db: Optional[Session] = None) -> dict[str, int]:
+        """How many of the chats have each tag, `chat_ids` being a list or a subquery."""
+        tag_counts = {}
+        with get_db_context(db) as db:
+            for (meta,) in db.query(Chat.meta).filter(Chat.id.in_(chat_ids)).all():
+                for tag in (meta or {}).get('tags', []):
+                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        return tag_counts
+
     def get_chat_title_by_id(self, id: str) -> Optional[str]:
         with get_db_context() as db:
             result = db.query(Chat.title).filter_by(id=id).first()
@@ -437,7 +457,58 @@ class ChatTable:
 
         return chat.chat.get('history', {}).get('messages', {}) or {}
 
+    def _apply_pending_messages(self, chat: ChatModel, db: Session) -> ChatModel:
+        """
+        In message write mode, overlay chat_message rows written since the
+        history blob was last saved, so readers see the latest messages
+        before compaction folds them into the blob.
+        """
+        if DATABASE_CHAT_MESSAGE_WRITE_MODE != 'message':
+            return chat
+
+        pending = (
+            db.query(ChatMessage)
+            .filter(ChatMessage.chat_id == chat.id, ChatMessage.updated_at >= chat.updated_at)
+            .order_by(ChatMessage.updated_at.asc(), ChatMessage.created_at.asc())
+            .all()
+        )
+        if not pending:
+            return chat
+
+        history = {**chat.chat.get('history', {})}
+        messages = {**history.get('messages', {})}
+        for row in pending:
+            message = ChatMessages.to_history_message(ChatMessageModel.model_validate(row))
+            messages[message['id']] = {**messages.get(message['id'], {}), **message}
+            history['currentId'] = message['id']
+
+        history['messages'] = messages
+        chat.chat = {**chat.chat, 'history': history}
+        return chat
+
+    def _get_latest_message(self, id: str, message_id: str, db: Session) -> Optional[tuple[str, dict]]:
+        """
+        Return (user_id, message) for a chat message, reading the chat_message
+        row when it is newer than the history blob and the blob otherwise.
+        """
+        result = db.query(Chat.user_id, Chat.updated_at).filter_by(id=id).first()
+        if result is None:
+            return None
+
+        user_id, updated_at = result
+        row = db.get(ChatMessage, f'{id}-{message_id}')
+        if row is not None and row.updated_at >= updated_at:
+            return user_id, ChatMessages.to_history_message(ChatMessageModel.model_validate(row))
+
+        chat = db.query(Chat.chat).filter_by(id=id).scalar() or {}
+        return user_id, chat.get('history', {}).get('messages', {}).get(message_id, {})
+
     def get_message_by_id_and_message_id(self, id: str, message_id: str) -> Optional[dict]:
+        if DATABASE_CHAT_MESSAGE_WRITE_MODE == 'message':
+            with get_db_context() as db:
+                result = self._get_latest_message(id, message_id, db)
+                return result[1] if result else None
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
@@ -447,15 +518,38 @@ class ChatTable:
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
+        """
+        Merge a message into the chat history. In message write mode only the
+        chat_message row is written and None is returned; the history blob is
+        brought up to date by compact_chat_messages_by_id.
+        """
         # Sanitize message content for null characters before upserting
         if isinstance(message.get('content'), str):
             message['content'] = sanitize_text_for_db(message['content'])
 
+        if DATABASE_CHAT_MESSAGE_WRITE_MODE == 'message':
+            with get_db_context() as db:
+                result = self._get_latest_message(id, message_id, db)
+                if result is None:
+                    return None
+
+                user_id, existing = result
+                ChatMessages.upsert_message(
+                    message_id=message_id,
+                    chat_id=id,
+                    user_id=user_id,
+                    data={**existing, **message},
+                    db=db,
+                )
+                self._index_message(id, message_id, user_id, message, db=db)
+                return None
+
+        chat = self.get_chat_by_id(id)
+        if chat is None:
+            return None
+
         user_id = chat.user_id
+        updated_at = chat.updated_at
         chat = chat.chat
         history = chat.get('history', {})
 
@@ -482,15 +576,134 @@ class ChatTable:
         except Exception as e:
             log.warning(f'Failed to write to chat_message table: {e}')
 
-        return self.update_chat_by_id(id, chat)
+        indexed = self._index_message(id, message_id, user_id, message)
+        return self._update_chat_keeping_search_index(id, chat, updated_at, indexed)
+
+    def _index_message(
+        self, id: str, message_id: str, user_id: str, message: dict, db: Optional[Session] = None
+    ) -> bool:
+        """Index a message as it is written, returns whether the index is up to date with it."""
+        if not ENABLE_CHAT_SEARCH_INDEX or 'content' not in message:
+            return True
+        try:
+            ChatSearch.upsert_message(id, message_id, user_id, message['content'], db=db)
+            return True
+        except Exception as e:
+            log.warning(f'Failed to update chat search index: {e}')
+            return False
+
+    def _update_chat_keeping_search_index(
+        self, id: str, chat: dict, updated_at: int, indexed: bool = True, db: Optional[Session] = None
+    ) -> Optional[ChatModel]:
+        """
+        update_chat_by_id for writes whose changes are already in the search
+        index (single messages, statuses, compaction): bumping `updated_at`
+        would otherwise mark the chat stale and have it re-indexed.
+        """
+        with get_db_context(db) as db:
+            result = self.update_chat_by_id(id, chat, db=db)
+            if result is not None and indexed and ENABLE_CHAT_SEARCH_INDEX:
+                try:
+                    ChatSearch.advance_chat(id, updated_at, result.updated_at, db=db)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    log.debug(f'Failed to advance the search index of chat {id}: {e}')
+            return result
+
+    def refresh_search_index(
+        self,
+        user_id: Optional[str] = None,
+        batch_size: int = 100,
+        max_batches: int = 10,
+        db: Optional[Session] = None,
+    ) -> tuple[int, bool]:
+        """
+        Re-index up to `max_batches` batches of the chats (of a user, or of
+        everyone) never indexed or changed since they were last indexed.
+        Returns how many were indexed and whether none are left stale. A chat
+        that fails to index is logged and left stale for the next run.
+        """
+        indexed = 0
+        attempted = []
+        complete = True
+        with get_db_context(db) as db:
+            for _ in range(max_batches):
+                query = (
+                    db.query(Chat.id)
+                    .outerjoin(
+                        ChatSearchDocument,
+                        and_(
+                            ChatSearchDocument.chat_id == Chat.id,
+                            ChatSearchDocument.message_id == TITLE_MESSAGE_ID,
+                        ),
+                    )
+                    .filter(
+                        or_(
+                            ChatSearchDocument.id.is_(None),
+                            ChatSearchDocument.updated_at.is_(None),
+                            ChatSearchDocument.updated_at < Chat.updated_at,
+                        )
+                    )
+                )
+                if user_id:
+                    query = query.filter(Chat.user_id == user_id)
+                if attempted:
+                    query = query.filter(Chat.id.notin_(attempted))
+
+                stale_chat_ids = [chat_id for (chat_id,) in query.limit(batch_size).all()]
+                if not stale_chat_ids:
+                    return indexed, complete
+
+                for chat_id in stale_chat_ids:
+                    attempted.append(chat_id)
+                    try:
+                        chat = self.get_chat_by_id(chat_id, db=db)
+                        if chat is not None:
+                            messages = chat.chat.get('history', {}).get('messages', {})
+                            ChatSearch.index_chat(chat.id, chat.user_id, chat.title, messages, chat.updated_at, db=db)
+                        else:
+                            row = db.query(Chat.user_id, Chat.title, Chat.updated_at).filter_by(id=chat_id).first()
+                            if row is None:
+                                continue  # Deleted since
+                            # Unreadable, only its title is searchable
+                            ChatSearch.index_chat(chat_id, row.user_id, row.title, {}, row.updated_at, db=db)
+                        indexed += 1
+                    except Exception as e:
+                        db.rollback()
+                        complete = False
+                        log.warning(f'Failed to index chat {chat_id} for search: {e}')
+
+                if len(stale_chat_ids) < batch_size:
+                    return indexed, complete
+
+        # There may be more stale chats than a run handles
+        return indexed, False
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
+        if DATABASE_CHAT_MESSAGE_WRITE_MODE == 'message':
+            with get_db_context() as db:
+                result = self._get_latest_message(id, message_id, db)
+                if result is None or not result[1]:
+                    return None
+
+                user_id, existing = result
+                ChatMessages.upsert_message(
+                    message_id=message_id,
+                    chat_id=id,
+                    user_id=user_id,
+                    data={**existing, 'statusHistory': [*existing.get('statusHistory', []), status]},
+                    db=db,
+                )
+                return None
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
 
+        updated_at = chat.updated_at
         chat = chat.chat
         history = chat.get('history', {})
 
@@ -500,7 +713,34 @@ class ChatTable:
             history['messages'][message_id]['statusHistory'] = status_history
 
         chat['history'] = history
-        return self.update_chat_by_id(id, chat)
+        return self._update_chat_keeping_search_index(id, chat, updated_at)
+
+    def get_chat_ids_with_pending_messages(self, limit: int = 100, db: Optional[Session] = None) -> list[str]:
+        """
+        Chats whose chat_message rows may be newer than their history blob.
+        Timestamps are in seconds, so rows from the same second as the blob
+        count as pending, as on read; compacting them again is harmless.
+
+        Each chat is probed through chat_message_chat_updated_idx, stopping at
+        its first pending row instead of joining every message.
+        """
+        with get_db_context(db) as db:
+            pending = exists().where(
+                ChatMessage.chat_id == Chat.id,
+                ChatMessage.updated_at >= Chat.updated_at,
+            )
+            result = db.query(Chat.id).filter(pending).limit(limit).all()
+            return [chat_id for (chat_id,) in result]
+
+    def compact_chat_messages_by_id(self, id: str, db: Optional[Session] = None) -> Optional[ChatModel]:
+        """Fold pending chat_message rows back into the chat history blob."""
+        with get_db_context(db) as db:
+            chat = self.get_chat_by_id(id, db=db)
+            if chat is None:
+                return None
+
+            # The pending messages were indexed as they were written
+            return self._update_chat_keeping_search_index(id, chat.chat, chat.updated_at, db=db)
 
     def add_message_files_by_id_and_message_id(self, id: str, message_id: str, files: list[dict]) -> list[dict]:
         with get_db_context() as db:
@@ -583,9 +823,7 @@ class ChatTable:
             with get_db_context(db) as db:
                 # Use subquery to delete chat_messages for shared chats
                 shared_chat_id_subquery = db.query(Chat.id).filter_by(user_id=f'shared-{chat_id}').scalar_subquery()
-                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(shared_chat_id_subquery)).delete(
-                    synchronize_session=False
-                )
+                ChatMessages.delete_messages(ChatMessage.chat_id.in_(shared_chat_id_subquery), db=db)
                 db.query(Chat).filter_by(user_id=f'shared-{chat_id}').delete()
                 db.commit()
 
@@ -876,7 +1114,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._apply_pending_messages(ChatModel.model_validate(chat_item), db=db)
         except Exception:
             return None
 
@@ -898,7 +1136,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._apply_pending_messages(ChatModel.model_validate(chat), db=db)
         except Exception:
             return None
 
@@ -1015,7 +1253,8 @@ class ChatTable:
         db: Optional[Session] = None,
     ) -> list[ChatModel]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats based on a search query, allowing pagination using skip and limit.
+        Free text is ranked through the chat search index when it is available.
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
@@ -1088,7 +1327,19 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc(), Chat.id)
+            # Rank by the full-text index when available, otherwise match chat JSON below. The index is
+            # read as it stands: messages are indexed as they are written and the background indexer
+            # (periodic_chat_search_indexing) catches up on the rest, searches never index themselves
+            ranked = None
+            if search_text and ENABLE_CHAT_SEARCH_INDEX and ChatSearch.is_available(db):
+                ranked = ChatSearch.get_ranked_chat_ids_query(user_id, search_text, db)
+
+            if ranked is not None:
+                query = query.join(ranked, ranked.c.chat_id == Chat.id).order_by(
+                    ranked.c.score.desc(), Chat.updated_at.desc(), Chat.id
+                )
+            else:
+                query = query.order_by(Chat.updated_at.desc(), Chat.id)
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
@@ -1102,11 +1353,12 @@ class ChatTable:
                     ')'
                 )
                 sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(Chat.title.ilike(bindparam('title_key')), sqlite_content_clause).params(
-                        title_key=f'%{search_text}%', content_key=search_text
+                if ranked is None:
+                    query = query.filter(
+                        or_(Chat.title.ilike(bindparam('title_key')), sqlite_content_clause).params(
+                            title_key=f'%{search_text}%', content_key=search_text
+                        )
                     )
-                )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if 'none' in tag_ids:
@@ -1138,29 +1390,30 @@ class ChatTable:
                 # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
                 # the JSON representation for \u0000 before attempting text extraction
 
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
+                if ranked is None:
+                    # Safety filter: JSON field must not contain \u0000
+                    query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
 
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
+                    # Safety filter: title must not contain actual null bytes
+                    query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
 
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
+                    postgres_content_sql = """
+                    EXISTS (
+                        SELECT 1
+                        FROM json_array_elements(Chat.chat->'messages') AS message
+                        WHERE json_typeof(message->'content') = 'string'
+                        AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
+                    )
+                    """
 
-                postgres_content_clause = text(postgres_content_sql)
+                    postgres_content_clause = text(postgres_content_sql)
 
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam('title_key')),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f'%{search_text}%', content_key=search_text.lower())
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam('title_key')),
+                            postgres_content_clause,
+                        )
+                    ).params(title_key=f'%{search_text}%', content_key=search_text.lower())
 
                 # Check if there are any tags to filter, it should have all the tags
                 if 'none' in tag_ids:
@@ -1393,7 +1646,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
-                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatMessages.delete_messages(ChatMessage.chat_id == id, db=db)
+                db.query(ChatSearchDocument).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1404,7 +1658,8 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
-                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatMessages.delete_messages(ChatMessage.chat_id == id, db=db)
+                db.query(ChatSearchDocument).filter_by(chat_id=id, user_id=user_id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1418,9 +1673,8 @@ class ChatTable:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
                 chat_id_subquery = db.query(Chat.id).filter_by(user_id=user_id).subquery()
-                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_id_subquery)).delete(
-                    synchronize_session=False
-                )
+                ChatMessages.delete_messages(ChatMessage.chat_id.in_(chat_id_subquery), db=db)
+                db.query(ChatSearchDocument).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1432,7 +1686,8 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat_id_subquery = db.query(Chat.id).filter_by(user_id=user_id, folder_id=folder_id).subquery()
-                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_id_subquery)).delete(
+                ChatMessages.delete_messages(ChatMessage.chat_id.in_(chat_id_subquery), db=db)
+                db.query(ChatSearchDocument).filter(ChatSearchDocument.chat_id.in_(chat_id_subquery)).delete(
                     synchronize_session=False
                 )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
@@ -1466,7 +1721,7 @@ class ChatTable:
 
                 # Use subquery to delete chat_messages for shared chats
                 shared_id_subq = db.query(Chat.id).filter(Chat.user_id.in_(shared_chat_ids)).subquery()
-                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(shared_id_subq)).delete(synchronize_session=False)
+                ChatMessages.delete_messages(ChatMessage.chat_id.in_(shared_id_subq), db=db)
                 db.query(Chat).filter(Chat.user_id.in_(shared_chat_ids)).delete()
                 db.commit()
 
@@ -1,14 +1,14 @@
 import logging
 import time
 import uuid
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, PrimaryKeyConstraint
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +45,125 @@ class FeedbackModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+####################
+# Leaderboard
+####################
+#
+# The Elo leaderboard (rating, wins and losses, and tag counts per model) is
+# kept as a snapshot, updated in the same transaction as the feedback. Edits
+# that can't be applied incrementally, such as changing or removing a past
+# rating, mark it stale and the next read replays all the feedback.
+#
+# Ratings are replayed in (created_at, id) order, and Elo depends on the
+# order, so a new rating only applies incrementally if it sorts after the last
+# one applied (the snapshot's "position"). Ratings given within the same
+# second can sort before it, which also marks the snapshot stale.
+
+LEADERBOARD_SNAPSHOT_ID = 'elo'
+
+ELO_INITIAL_RATING = 1000.0
+ELO_K_FACTOR = 32  # Standard Elo K-factor for rating volatility
+
+
+class LeaderboardSnapshot(Base):
+    __tablename__ = 'leaderboard_snapshot'
+
+    id = Column(Text, primary_key=True)
+    # {"models": {model_id: {"rating", "won", "lost"}}, "tags": {model_id: {tag: count}},
+    #  "position": [created_at, id] of the last rating applied}
+    data = Column(JSON, nullable=True)
+    version = Column(BigInteger, default=0)  # Bumped by every change, for compare-and-set updates
+    stale = Column(Boolean, default=True)
+    updated_at = Column(BigInteger)
+
+
+class FeedbackTagEmbedding(Base):
+    """Embeddings of feedback tags, so each tag is encoded once per embedding model."""
+
+    __tablename__ = 'feedback_tag_embedding'
+
+    model = Column(Text, nullable=False)
+    tag = Column(Text, nullable=False)
+    embedding = Column(JSON, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (PrimaryKeyConstraint('model', 'tag'),)
+
+
+class LeaderboardFeedbacks(NamedTuple):
+    """All the feedback compiled for replaying the leaderboard, in the order it was given."""
+
+    matches: list[tuple[str, list[str], bool]]  # (model_id, sibling_model_ids, won)
+    tags: list[str]  # Distinct tags of the matches
+    tag_indices: list[int]  # Indices into tags of each match's tags, flattened
+    tag_lengths: list[int]  # Number of tags of each match
+    tag_counts: dict[str, dict[str, int]]
+    position: Optional[list]  # [created_at, id] of the last match
+
+
+def get_elo_match(data: Optional[dict]) -> Optional[tuple[str, list[str], bool]]:
+    """
+    The comparison a feedback records: the rated model, its opponents (the
+    sibling models) and whether it won. None if the feedback isn't a rating.
+    """
+    data = data or {}
+    winner_id = data.get('model_id')
+    rating_value = str(data.get('rating', ''))
+    if not winner_id or rating_value not in ('1', '-1'):
+        return None
+    return winner_id, list(data.get('sibling_model_ids') or []), rating_value == '1'
+
+
+def apply_elo_match(stats: dict, winner_id: str, opponent_ids: list[str], won: bool, weight: float = 1.0):
+    """
+    Adjust the ratings of a model and its opponents for one comparison:
+    new_rating = old_rating + K * (actual - expected), so upsets move the
+    ratings more. `weight` scales the adjustment (query-based re-ranking).
+    """
+    for opponent_id in opponent_ids:
+        winner = stats.setdefault(winner_id, {'rating': ELO_INITIAL_RATING, 'won': 0, 'lost': 0})
+        opponent = stats.setdefault(opponent_id, {'rating': ELO_INITIAL_RATING, 'won': 0, 'lost': 0})
+        expected = 1 / (1 + 10 ** ((opponent['rating'] - winner['rating']) / 400))
+
+        winner['rating'] += ELO_K_FACTOR * ((1 if won else 0) - expected) * weight
+        opponent['rating'] += ELO_K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
+
+        if won:
+            winner['won'] += 1
+            opponent['lost'] += 1
+        else:
+            winner['lost'] += 1
+            opponent['won'] += 1
+
+
+def calculate_elo(matches: list[tuple[str, list[str], bool]], weights: Optional[list[float]] = None) -> dict:
+    """
+    Replay the comparisons from a rating of 1000 for every model.
+
+    Returns: {model_id: {"rating": float, "won": int, "lost": int}}
+    """
+    stats = {}
+    for i, (winner_id, opponent_ids, won) in enumerate(matches):
+        apply_elo_match(stats, winner_id, opponent_ids, won, 1.0 if weights is None else weights[i])
+    return stats
+
+
+def add_tag_counts(tag_counts: dict, data: Optional[dict], sign: int = 1):
+    """Count (or uncount, with sign -1) the tags of a feedback for its model."""
+    data = data or {}
+    model_id = data.get('model_id')
+    if not model_id:
+        return
+
+    for tag in data.get('tags', []):
+        counts = tag_counts.setdefault(model_id, {})
+        counts[tag] = counts.get(tag, 0) + sign
+        if counts[tag] <= 0:
+            del counts[tag]
+        if not counts:
+            del tag_counts[model_id]
+
+
 ####################
 # Forms
 ####################
@@ -68,13 +187,6 @@ class FeedbackIdResponse(BaseModel):
     updated_at: int
 
 
-class LeaderboardFeedbackData(BaseModel):
-    """Minimal feedback data for leaderboard computation (excludes snapshot/meta)."""
-
-    id: str
-    data: Optional[dict] = None
-
-
 class RatingData(BaseModel):
     rating: Optional[str | int] = None
     model_id: Optional[str] = None
@@ -139,6 +251,10 @@ class ModelHistoryResponse(BaseModel):
 
 
 class FeedbackTable:
+    def __init__(self):
+        # (snapshot version, compiled feedback) of the last replay
+        self._leaderboard_feedbacks: Optional[tuple[int, LeaderboardFeedbacks]] = None
+
     def insert_new_feedback(
         self, user_id: str, form_data: FeedbackForm, db: Optional[Session] = None
     ) -> Optional[FeedbackModel]:
@@ -157,6 +273,10 @@ class FeedbackTable:
             try:
                 result = Feedback(**feedback.model_dump())
                 db.add(result)
+                position = [feedback.created_at, feedback.id]
+                self._update_leaderboard(
+                    db, lambda leaderboard: self._add_to_leaderboard(leaderboard, feedback.data, position)
+                )
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -204,6 +324,23 @@ class FeedbackTable:
         except Exception:
             return []
 
+    def get_ratings_by_chat_ids(
+        self, chat_ids, start_date: Optional[int] = None, db: Optional[Session] = None
+    ) -> list[tuple[int, int]]:
+        """(created_at, rating) of the rated feedbacks in the chats, `chat_ids` being a list or a subquery."""
+        with get_db_context(db) as db:
+            query = db.query(Feedback.created_at, Feedback.data).filter(
+                Feedback.meta['chat_id'].as_string().in_(chat_ids)
+            )
+            if start_date:
+                query = query.filter(Feedback.created_at >= start_date)
+
+            return [
+                (created_at, data['rating'])
+                for created_at, data in query.all()
+                if isinstance(data, dict) and 'rating' in data
+            ]
+
     def get_feedback_items(
         self,
         filter: dict = {},
@@ -288,12 +425,186 @@ class FeedbackTable:
                 .all()
             ]
 
-    def get_feedbacks_for_leaderboard(self, db: Optional[Session] = None) -> list[LeaderboardFeedbackData]:
-        """Fetch only id and data for leaderboard computation (excludes snapshot/meta)."""
+    def get_leaderboard(self, db: Optional[Session] = None) -> dict:
+        """
+        The leaderboard snapshot, replayed from all the feedback first if it's stale.
+
+        Returns: {"models": {model_id: {"rating", "won", "lost"}}, "tags": {model_id: {tag: count}}}
+        """
         with get_db_context(db) as db:
-            return [
-                LeaderboardFeedbackData(id=row.id, data=row.data) for row in db.query(Feedback.id, Feedback.data).all()
-            ]
+            snapshot = self._get_leaderboard_snapshot(db)
+            if snapshot is not None and not snapshot.stale and snapshot.data is not None:
+                return snapshot.data
+
+            version = snapshot.version if snapshot is not None else 0
+            feedbacks = self.get_leaderboard_feedbacks(version=version, db=db)
+            data = {
+                'models': calculate_elo(feedbacks.matches),
+                'tags': feedbacks.tag_counts,
+                'position': feedbacks.position,
+            }
+
+            # Unless feedback changed meanwhile, then it stays stale
+            values = {'data': data, 'stale': False, 'version': version + 1, 'updated_at': int(time.time())}
+            try:
+                if snapshot is None:
+                    db.add(LeaderboardSnapshot(id=LEADERBOARD_SNAPSHOT_ID, **values))
+                    updated = 1
+                else:
+                    updated = (
+                        db.query(LeaderboardSnapshot)
+                        .filter_by(id=LEADERBOARD_SNAPSHOT_ID, version=version)
+                        .update(values, synchronize_session=False)
+                    )
+                db.commit()
+                if updated:
+                    self._leaderboard_feedbacks = (version + 1, feedbacks)
+            except Exception as e:
+                db.rollback()
+                log.warning(f'Failed to save the leaderboard snapshot: {e}')
+            return data
+
+    def get_leaderboard_feedbacks(
+        self, version: Optional[int] = None, db: Optional[Session] = None
+    ) -> LeaderboardFeedbacks:
+        """
+        All the rating feedback compiled for replaying the leaderboard (with
+        similarity weights), cached by snapshot version.
+        """
+        with get_db_context(db) as db:
+            if version is None:
+                snapshot = self._get_leaderboard_snapshot(db)
+                version = snapshot.version if snapshot is not None else 0
+
+            cached = self._leaderboard_feedbacks
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            matches = []
+            tag_ids = {}
+            tag_indices = []
+            tag_lengths = []
+            tag_counts = {}
+            position = None
+            rows = (
+                db.query(Feedback.data, Feedback.created_at, Feedback.id)
+                .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+                .yield_per(1000)
+            )
+            for data, created_at, id in rows:
+                add_tag_counts(tag_counts, data)
+                match = get_elo_match(data)
+                if match is None:
+                    continue
+
+                tags = (data or {}).get('tags', [])
+                matches.append(match)
+                position = [created_at, id]
+                tag_indices.extend(tag_ids.setdefault(tag, len(tag_ids)) for tag in tags)
+                tag_lengths.append(len(tags))
+
+            feedbacks = LeaderboardFeedbacks(
+                matches=matches,
+                tags=list(tag_ids),
+                tag_indices=tag_indices,
+                tag_lengths=tag_lengths,
+                tag_counts=tag_counts,
+                position=position,
+            )
+            self._leaderboard_feedbacks = (version, feedbacks)
+            return feedbacks
+
+    def get_tag_embeddings(self, model: str, tags: list[str], db: Optional[Session] = None) -> dict[str, list[float]]:
+        with get_db_context(db) as db:
+            embeddings = {}
+            # Chunked to stay under the database's bound parameter limit
+            for i in range(0, len(tags), 1000):
+                rows = db.query(FeedbackTagEmbedding.tag, FeedbackTagEmbedding.embedding).filter(
+                    FeedbackTagEmbedding.model == model,
+                    FeedbackTagEmbedding.tag.in_(tags[i : i + 1000]),
+                )
+                embeddings.update({row.tag: row.embedding for row in rows})
+            return embeddings
+
+    def insert_tag_embeddings(self, model: str, embeddings: dict[str, list[float]], db: Optional[Session] = None):
+        with get_db_context(db) as db:
+            try:
+                now = int(time.time())
+                for tag, embedding in embeddings.items():
+                    db.merge(FeedbackTagEmbedding(model=model, tag=tag, embedding=embedding, created_at=now))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                log.warning(f'Failed to save feedback tag embeddings: {e}')
+
+    @staticmethod
+    def _get_leaderboard_snapshot(db: Session):
+        return (
+            db.query(
+                LeaderboardSnapshot.data,
+                LeaderboardSnapshot.version,
+                LeaderboardSnapshot.stale,
+            )
+            .filter_by(id=LEADERBOARD_SNAPSHOT_ID)
+            .first()
+        )
+
+    def _update_leaderboard(self, db: Session, update: Callable[[dict], bool]):
+        """
+        Apply a feedback change to the leaderboard snapshot, in the caller's
+        transaction. `update` changes the snapshot data in place, or returns
+        False if the change can't be applied incrementally, and the snapshot
+        is marked stale instead.
+        """
+        snapshot = self._get_leaderboard_snapshot(db)
+        if snapshot is None:
+            return
+
+        values = {'stale': True}
+        if not snapshot.stale and snapshot.data is not None:
+            data = snapshot.data
+            if update(data):
+                values = {'data': data}
+
+        now = int(time.time())
+        updated = (
+            db.query(LeaderboardSnapshot)
+            .filter_by(id=LEADERBOARD_SNAPSHOT_ID, version=snapshot.version)
+            .update({**values, 'version': snapshot.version + 1, 'updated_at': now}, synchronize_session=False)
+        )
+        if not updated:
+            # Changed concurrently, replay it on the next read
+            db.query(LeaderboardSnapshot).filter_by(id=LEADERBOARD_SNAPSHOT_ID).update(
+                {'stale': True, 'version': LeaderboardSnapshot.version + 1, 'updated_at': now},
+                synchronize_session=False,
+            )
+
+    @staticmethod
+    def _add_to_leaderboard(leaderboard: dict, data: Optional[dict], position: list) -> bool:
+        match = get_elo_match(data)
+        if match is not None:
+            last = leaderboard.get('position')
+            if last is not None and tuple(position) < tuple(last):
+                # A replay would apply it before ratings already applied
+                return False
+            apply_elo_match(leaderboard.setdefault('models', {}), *match)
+            leaderboard['position'] = position
+        add_tag_counts(leaderboard.setdefault('tags', {}), data)
+        return True
+
+    @staticmethod
+    def _clear_leaderboard(leaderboard: dict) -> bool:
+        leaderboard.update({'models': {}, 'tags': {}, 'position': None})
+        return True
+
+    @staticmethod
+    def _change_in_leaderboard(leaderboard: dict, data: Optional[dict], new_data: Optional[dict]) -> bool:
+        """Only tag changes apply incrementally, a changed rating means replaying the ratings after it."""
+        if get_elo_match(data) != get_elo_match(new_data):
+            return False
+        add_tag_counts(leaderboard.setdefault('tags', {}), data, -1)
+        add_tag_counts(leaderboard['tags'], new_data)
+        return True
 
     def get_model_evaluation_history(
         self, model_id: str, days: int = 30, db: Optional[Session] = None
@@ -381,7 +692,11 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data, new_data = feedback.data, form_data.data.model_dump()
+                self._update_leaderboard(
+                    db, lambda leaderboard: self._change_in_leaderboard(leaderboard, data, new_data)
+                )
+                feedback.data = new_data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -405,7 +720,11 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data, new_data = feedback.data, form_data.data.model_dump()
+                self._update_leaderboard(
+                    db, lambda leaderboard: self._change_in_leaderboard(leaderboard, data, new_data)
+                )
+                feedback.data = new_data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -421,6 +740,9 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id).first()
             if not feedback:
                 return False
+            self._update_leaderboard(
+                db, lambda leaderboard: self._change_in_leaderboard(leaderboard, feedback.data, None)
+            )
             db.delete(feedback)
             db.commit()
             return True
@@ -430,6 +752,9 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id, user_id=user_id).first()
             if not feedback:
                 return False
+            self._update_leaderboard(
+                db, lambda leaderboard: self._change_in_leaderboard(leaderboard, feedback.data, None)
+            )
             db.delete(feedback)
             db.commit()
             return True
@@ -437,12 +762,16 @@ class FeedbackTable:
     def delete_feedbacks_by_user_id(self, user_id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             result = db.query(Feedback).filter_by(user_id=user_id).delete()
+            if result:
+                # Removes ratings from anywhere in the history, so they're replayed
+                self._update_leaderboard(db, lambda leaderboard: False)
             db.commit()
             return result > 0
 
     def delete_all_feedbacks(self, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             result = db.query(Feedback).delete()
+            self._update_leaderboard(db, self._clear_leaderboard)
             db.commit()
             return result > 0
 
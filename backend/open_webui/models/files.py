@@ -4,6 +4,7 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.utils.file_status import FILE_STATUS_BROKER
 from open_webui.utils.misc import sanitize_metadata
 from pydantic import BaseModel, ConfigDict, model_validator
 from sqlalchemy import BigInteger, Column, String, Text, JSON
@@ -353,6 +354,14 @@ class FilesTable:
                 file.data = {**(file.data if file.data else {}), **data}
                 file.updated_at = int(time.time())
                 db.commit()
+
+                if 'status' in data:
+                    FILE_STATUS_BROKER.publish(
+                        file.id,
+                        file.user_id,
+                        file.data.get('status'),
+                        file.data.get('error') if file.data.get('status') == 'failed' else None,
+                    )
                 return FileModel.model_validate(file)
             except Exception as e:
                 return None
@@ -5,6 +5,7 @@ from typing import Optional
 from sqlalchemy.orm import Session, defer
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserModel, UserResponse
+from open_webui.utils.plugin_cache import PLUGIN_MODULE_VERSIONS, get_content_hash, get_plugin_version
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -25,6 +26,8 @@ class Function(Base):
     name = Column(Text)
     type = Column(Text)
     content = Column(Text)
+    # sha256 of content, written with it, to tell whether a loaded module is outdated
+    content_hash = Column(Text)
     meta = Column(JSONField)
     valves = Column(JSONField)
     is_active = Column(Boolean)
@@ -126,7 +129,7 @@ class FunctionsTable:
 
         try:
             with get_db_context(db) as db:
-                result = Function(**function.model_dump())
+                result = Function(**function.model_dump(), content_hash=get_content_hash(function.content))
                 db.add(result)
                 db.commit()
                 db.refresh(result)
@@ -160,6 +163,7 @@ class FunctionsTable:
                         db.query(Function).filter_by(id=func.id).update(
                             {
                                 **func.model_dump(),
+                                'content_hash': get_content_hash(func.content),
                                 'user_id': user_id,
                                 'updated_at': int(time.time()),
                             }
@@ -168,6 +172,7 @@ class FunctionsTable:
                         new_func = Function(
                             **{
                                 **func.model_dump(),
+                                'content_hash': get_content_hash(func.content),
                                 'user_id': user_id,
                                 'updated_at': int(time.time()),
                             }
@@ -180,6 +185,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                PLUGIN_MODULE_VERSIONS.invalidate_all()
 
                 return [FunctionModel.model_validate(func) for func in db.query(Function).all()]
         except Exception as e:
@@ -194,6 +200,12 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_version_by_id(self, id: str, db: Optional[Session] = None) -> Optional[tuple]:
+        """`updated_at` and content hash of a function, to tell whether its loaded module is outdated."""
+        with get_db_context(db) as db:
+            row = db.query(Function.updated_at, Function.content_hash).filter_by(id=id).first()
+            return get_plugin_version(*row) if row else None
+
     def get_functions_by_ids(self, ids: list[str], db: Optional[Session] = None) -> list[FunctionModel]:
         """
         Batch fetch multiple functions by their IDs in a single query.
@@ -383,6 +395,8 @@ class FunctionsTable:
     def update_function_by_id(self, id: str, updated: dict, db: Optional[Session] = None) -> Optional[FunctionModel]:
         with get_db_context(db) as db:
             try:
+                if 'content' in updated:
+                    updated = {**updated, 'content_hash': get_content_hash(updated['content'])}
                 db.query(Function).filter_by(id=id).update(
                     {
                         **updated,
@@ -390,6 +404,8 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                if 'content' in updated:
+                    PLUGIN_MODULE_VERSIONS.invalidate('function', id)
                 function = db.get(Function, id)
                 return FunctionModel.model_validate(function) if function else None
             except Exception:
@@ -414,6 +430,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                PLUGIN_MODULE_VERSIONS.invalidate('function', id)
 
                 return True
             except Exception:
@@ -7,6 +7,7 @@ import uuid
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.env import DEFAULT_GROUP_SHARE_PERMISSION
+from open_webui.utils.access_cache import ACCESS_GRANT_CACHE
 
 from open_webui.models.files import FileMetadataResponse
 
@@ -300,6 +301,20 @@ class GroupTable:
                 .all()
             ]
 
+    def get_group_ids_by_member_id(self, user_id: str, db: Optional[Session] = None) -> set[str]:
+        """IDs of the groups a user belongs to, cached until the user's memberships change."""
+
+        def fetch():
+            with get_db_context(db) as session:
+                return [
+                    row[0]
+                    for row in session.query(Group.id)
+                    .join(GroupMember, GroupMember.group_id == Group.id)
+                    .filter(GroupMember.user_id == user_id)
+                ]
+
+        return set(ACCESS_GRANT_CACHE.get_group_ids(user_id, fetch))
+
     def get_groups_by_member_ids(
         self, user_ids: list[str], db: Optional[Session] = None
     ) -> dict[str, list[GroupModel]]:
@@ -353,6 +368,10 @@ class GroupTable:
 
     def set_group_user_ids_by_id(self, group_id: str, user_ids: list[str], db: Optional[Session] = None) -> None:
         with get_db_context(db) as db:
+            existing_user_ids = [
+                row[0] for row in db.query(GroupMember.user_id).filter(GroupMember.group_id == group_id)
+            ]
+
             # Delete existing members
             db.query(GroupMember).filter(GroupMember.group_id == group_id).delete()
 
@@ -371,6 +390,7 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            ACCESS_GRANT_CACHE.invalidate_users([*existing_user_ids, *user_ids])
 
     def get_group_member_count_by_id(self, id: str, db: Optional[Session] = None) -> int:
         with get_db_context(db) as db:
@@ -415,6 +435,7 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                ACCESS_GRANT_CACHE.invalidate_all()
                 return True
         except Exception:
             return False
@@ -424,6 +445,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                ACCESS_GRANT_CACHE.invalidate_all()
 
                 return True
             except Exception:
@@ -449,6 +471,7 @@ class GroupTable:
                     db.query(Group).filter_by(id=group.id).update({'updated_at': int(time.time())})
 
                 db.commit()
+                ACCESS_GRANT_CACHE.invalidate_users([user_id])
                 return True
 
             except Exception:
@@ -542,6 +565,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                if groups_to_add or groups_to_remove:
+                    ACCESS_GRANT_CACHE.invalidate_users([user_id])
                 return True
 
             except Exception as e:
@@ -583,6 +608,7 @@ class GroupTable:
                 group.updated_at = now
                 db.commit()
                 db.refresh(group)
+                ACCESS_GRANT_CACHE.invalidate_users(user_ids or [])
 
                 return GroupModel.model_validate(group)
 
@@ -615,6 +641,7 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+                ACCESS_GRANT_CACHE.invalidate_users(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
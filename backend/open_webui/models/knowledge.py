@@ -348,7 +348,7 @@ class KnowledgeTable:
             return False
         if knowledge.user_id == user_id:
             return True
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
         return AccessGrants.has_access(
             user_id=user_id,
             resource_type='knowledge',
@@ -362,7 +362,7 @@ class KnowledgeTable:
         self, user_id: str, permission: str = 'write', db: Optional[Session] = None
     ) -> list[KnowledgeUserModel]:
         knowledge_bases = self.get_knowledge_bases(db=db)
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
         return [
             knowledge_base
             for knowledge_base in knowledge_bases
@@ -395,7 +395,7 @@ class KnowledgeTable:
         if knowledge.user_id == user_id:
             return knowledge
 
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
         if AccessGrants.has_access(
             user_id=user_id,
             resource_type='knowledge',
@@ -512,6 +512,11 @@ class KnowledgeTable:
         except Exception:
             return []
 
+    def get_file_ids_by_id(self, knowledge_id: str, db: Optional[Session] = None) -> list[str]:
+        with get_db_context(db) as db:
+            rows = db.query(KnowledgeFile.file_id).filter(KnowledgeFile.knowledge_id == knowledge_id).all()
+            return [file_id for (file_id,) in rows]
+
     def get_file_metadatas_by_id(self, knowledge_id: str, db: Optional[Session] = None) -> list[FileMetadataResponse]:
         try:
             with get_db_context(db) as db:
@@ -0,0 +1,202 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Boolean, Column, Integer, PrimaryKeyConstraint, Text
+
+log = logging.getLogger(__name__)
+
+####################
+# Knowledge reindex jobs
+#
+# A job re-embeds the files of every knowledge base into the knowledge base
+# collections. Each file it finishes is checkpointed, so a job interrupted by a
+# restart resumes with the files it had not finished yet.
+####################
+
+# A file is checkpointed 'indexing' before its chunks are replaced, so a file
+# interrupted halfway is indexed again instead of being taken as unchanged
+FILE_STATUS_INDEXING = 'indexing'
+FILE_STATUS_DONE = 'done'
+FILE_STATUS_SKIPPED = 'skipped'
+FILE_STATUS_FAILED = 'failed'
+
+
+class KnowledgeReindexJob(Base):
+    __tablename__ = 'knowledge_reindex_job'
+
+    id = Column(Text, primary_key=True)
+    user_id = Column(Text, nullable=False)
+
+    # pending, running, completed, failed or cancelled
+    status = Column(Text, nullable=False)
+    force = Column(Boolean, default=False)
+    embedding_config = Column(JSON, nullable=True)
+
+    total = Column(Integer, default=0)
+    completed = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    errors = Column(JSON, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class KnowledgeReindexFile(Base):
+    __tablename__ = 'knowledge_reindex_file'
+
+    job_id = Column(Text, nullable=False)
+    knowledge_id = Column(Text, nullable=False)
+    file_id = Column(Text, nullable=False)
+
+    status = Column(Text, nullable=False)
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (PrimaryKeyConstraint('job_id', 'knowledge_id', 'file_id'),)
+
+
+class KnowledgeReindexJobModel(BaseModel):
+    id: str
+    user_id: str
+
+    status: str
+    force: bool = False
+    embedding_config: Optional[dict] = None
+
+    total: int = 0
+    completed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: Optional[list] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class KnowledgeReindexTable:
+    def insert_new_job(
+        self,
+        user_id: str,
+        force: bool = False,
+        embedding_config: Optional[dict] = None,
+        db: Optional[Session] = None,
+    ) -> KnowledgeReindexJobModel:
+        with get_db_context(db) as db:
+            job = KnowledgeReindexJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status='pending',
+                force=force,
+                embedding_config=embedding_config,
+                total=0,
+                completed=0,
+                skipped=0,
+                failed=0,
+                errors=[],
+                created_at=int(time.time()),
+                updated_at=int(time.time()),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return KnowledgeReindexJobModel.model_validate(job)
+
+    def get_job_by_id(self, id: str, db: Optional[Session] = None) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(KnowledgeReindexJob, id)
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_latest_job(self, db: Optional[Session] = None) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.query(KnowledgeReindexJob).order_by(KnowledgeReindexJob.created_at.desc()).first()
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_jobs_by_status(self, statuses: list[str], db: Optional[Session] = None) -> list[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            jobs = db.query(KnowledgeReindexJob).filter(KnowledgeReindexJob.status.in_(statuses)).all()
+            return [KnowledgeReindexJobModel.model_validate(job) for job in jobs]
+
+    def update_job_by_id(
+        self, id: str, updated: dict, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            db.query(KnowledgeReindexJob).filter_by(id=id).update({**updated, 'updated_at': int(time.time())})
+            db.commit()
+            job = db.get(KnowledgeReindexJob, id)
+            if job:
+                db.refresh(job)
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def claim_job(self, id: str, updated_at: int, db: Optional[Session] = None) -> bool:
+        """
+        Take over a job whose runner stopped updating it. Only succeeds if the
+        job was not updated since `updated_at`, so one node claims it.
+        """
+        with get_db_context(db) as db:
+            claimed = (
+                db.query(KnowledgeReindexJob)
+                .filter_by(id=id, updated_at=updated_at)
+                .update({'status': 'running', 'updated_at': int(time.time())})
+            )
+            db.commit()
+            return claimed > 0
+
+    def get_file_statuses(self, job_id: str, db: Optional[Session] = None) -> dict[tuple[str, str], str]:
+        """{(knowledge_id, file_id): status} of the files checkpointed by a job."""
+        with get_db_context(db) as db:
+            rows = (
+                db.query(
+                    KnowledgeReindexFile.knowledge_id,
+                    KnowledgeReindexFile.file_id,
+                    KnowledgeReindexFile.status,
+                )
+                .filter_by(job_id=job_id)
+                .all()
+            )
+            return {(knowledge_id, file_id): status for knowledge_id, file_id, status in rows}
+
+    def set_file_status(
+        self,
+        job_id: str,
+        knowledge_id: str,
+        file_id: str,
+        status: str,
+        error: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> None:
+        with get_db_context(db) as db:
+            updated = (
+                db.query(KnowledgeReindexFile)
+                .filter_by(job_id=job_id, knowledge_id=knowledge_id, file_id=file_id)
+                .update({'status': status, 'error': error, 'updated_at': int(time.time())})
+            )
+            if not updated:
+                db.add(
+                    KnowledgeReindexFile(
+                        job_id=job_id,
+                        knowledge_id=knowledge_id,
+                        file_id=file_id,
+                        status=status,
+                        error=error,
+                        updated_at=int(time.time()),
+                    )
+                )
+            db.commit()
+
+    def delete_file_statuses(self, job_id: str, db: Optional[Session] = None) -> None:
+        with get_db_context(db) as db:
+            db.query(KnowledgeReindexFile).filter_by(job_id=job_id).delete()
+            db.commit()
+
+
+KnowledgeReindex = KnowledgeReindexTable()
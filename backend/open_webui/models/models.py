@@ -245,7 +245,7 @@ class ModelsTable:
         self, user_id: str, permission: str = 'write', db: Optional[Session] = None
     ) -> list[ModelUserResponse]:
         models = self.get_models(db=db)
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
         return [
             model
             for model in models
@@ -251,7 +251,7 @@ class NoteTable:
         db: Optional[Session] = None,
     ) -> list[NoteModel]:
         with get_db_context(db) as db:
-            user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id, db=db)]
+            user_group_ids = list(Groups.get_group_ids_by_member_id(user_id, db=db))
 
             query = db.query(Note).order_by(Note.updated_at.desc())
             query = self._has_permission(db, query, {'user_id': user_id, 'group_ids': user_group_ids}, permission)
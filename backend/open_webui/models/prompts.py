@@ -223,7 +223,7 @@ class PromptsTable:
         self, user_id: str, permission: str = 'write', db: Optional[Session] = None
     ) -> list[PromptUserResponse]:
         prompts = self.get_prompts(db=db)
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
         return [
             prompt
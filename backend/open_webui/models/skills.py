@@ -196,7 +196,7 @@ class SkillsTable:
         self, user_id: str, permission: str = 'write', db: Optional[Session] = None
     ) -> list[SkillUserModel]:
         skills = self.get_skills(db=db)
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
         return [
             skill
@@ -7,6 +7,7 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserResponse
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrantModel, AccessGrants
+from open_webui.utils.plugin_cache import PLUGIN_MODULE_VERSIONS, get_content_hash, get_plugin_version
 
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import BigInteger, Column, String, Text
@@ -27,6 +28,8 @@ class Tool(Base):
     user_id = Column(String)
     name = Column(Text)
     content = Column(Text)
+    # sha256 of content, written with it, to tell whether a loaded module is outdated
+    content_hash = Column(Text)
     specs = Column(JSONField)
     meta = Column(JSONField)
     valves = Column(JSONField)
@@ -124,6 +127,7 @@ class ToolsTable:
                 result = Tool(
                     **{
                         **form_data.model_dump(exclude={'access_grants'}),
+                        'content_hash': get_content_hash(form_data.content),
                         'specs': specs,
                         'user_id': user_id,
                         'updated_at': int(time.time()),
@@ -150,6 +154,12 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_version_by_id(self, id: str, db: Optional[Session] = None) -> Optional[tuple]:
+        """`updated_at` and content hash of a tool, to tell whether its loaded module is outdated."""
+        with get_db_context(db) as db:
+            row = db.query(Tool.updated_at, Tool.content_hash).filter_by(id=id).first()
+            return get_plugin_version(*row) if row else None
+
     def get_tools(self, defer_content: bool = False, db: Optional[Session] = None) -> list[ToolUserModel]:
         with get_db_context(db) as db:
             query = db.query(Tool).order_by(Tool.updated_at.desc())
@@ -189,7 +199,7 @@ class ToolsTable:
         db: Optional[Session] = None,
     ) -> list[ToolUserModel]:
         tools = self.get_tools(defer_content=defer_content, db=db)
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
         return [
             tool
@@ -266,8 +276,12 @@ class ToolsTable:
         try:
             with get_db_context(db) as db:
                 access_grants = updated.pop('access_grants', None)
+                if 'content' in updated:
+                    updated = {**updated, 'content_hash': get_content_hash(updated['content'])}
                 db.query(Tool).filter_by(id=id).update({**updated, 'updated_at': int(time.time())})
                 db.commit()
+                if 'content' in updated:
+                    PLUGIN_MODULE_VERSIONS.invalidate('tool', id)
                 if access_grants is not None:
                     AccessGrants.set_access_grants('tool', id, access_grants, db=db)
 
@@ -283,6 +297,7 @@ class ToolsTable:
                 AccessGrants.revoke_all_access('tool', id, db=db)
                 db.query(Tool).filter_by(id=id).delete()
                 db.commit()
+                PLUGIN_MODULE_VERSIONS.invalidate('tool', id)
 
                 return True
         except Exception:
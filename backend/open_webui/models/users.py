@@ -12,6 +12,7 @@ from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.user_cache import USER_CACHE
 from open_webui.utils.validate import validate_profile_image_url
 
 
@@ -28,7 +29,7 @@ from sqlalchemy import (
     select,
     cast,
 )
-from sqlalchemy import or_, case, func
+from sqlalchemy import bindparam, or_, case, func, update
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
@@ -551,6 +552,7 @@ class UsersTable:
                     return None
                 user.role = role
                 db.commit()
+                USER_CACHE.invalidate_users([id])
                 db.refresh(user)
                 return UserModel.model_validate(user)
         except Exception:
@@ -567,6 +569,7 @@ class UsersTable:
                 for key, value in form_data.model_dump(exclude_none=True).items():
                     setattr(user, key, value)
                 db.commit()
+                USER_CACHE.invalidate_users([id])
                 db.refresh(user)
                 return UserModel.model_validate(user)
         except Exception:
@@ -582,6 +585,7 @@ class UsersTable:
                     return None
                 user.profile_image_url = profile_image_url
                 db.commit()
+                USER_CACHE.invalidate_users([id])
                 db.refresh(user)
                 return UserModel.model_validate(user)
         except Exception:
@@ -601,6 +605,20 @@ class UsersTable:
         except Exception:
             return None
 
+    def update_last_active_by_ids(self, last_active_at: dict[str, int], db: Optional[Session] = None) -> None:
+        """Set the last active timestamp of many users in one statement, by user ID."""
+        if not last_active_at:
+            return
+
+        with get_db_context(db) as db:
+            db.execute(
+                update(User.__table__)
+                .where(User.__table__.c.id == bindparam('user_id'))
+                .values(last_active_at=bindparam('timestamp')),
+                [{'user_id': id, 'timestamp': timestamp} for id, timestamp in last_active_at.items()],
+            )
+            db.commit()
+
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -627,6 +645,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({'oauth': oauth})
                 db.commit()
+                USER_CACHE.invalidate_users([id])
 
                 return UserModel.model_validate(user)
 
@@ -659,6 +678,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({'scim': scim})
                 db.commit()
+                USER_CACHE.invalidate_users([id])
 
                 return UserModel.model_validate(user)
 
@@ -674,6 +694,7 @@ class UsersTable:
                 for key, value in updated.items():
                     setattr(user, key, value)
                 db.commit()
+                USER_CACHE.invalidate_users([id])
                 db.refresh(user)
                 return UserModel.model_validate(user)
         except Exception as e:
@@ -696,6 +717,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({'settings': user_settings})
                 db.commit()
+                USER_CACHE.invalidate_users([id])
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -714,6 +736,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    USER_CACHE.invalidate_users([id])
 
                 return True
             else:
@@ -734,6 +757,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                USER_CACHE.invalidate_users([id])
 
                 now = int(time.time())
                 new_api_key = ApiKey(
@@ -756,6 +780,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                USER_CACHE.invalidate_users([id])
                 return True
         except Exception:
             return False
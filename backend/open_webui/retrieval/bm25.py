@@ -0,0 +1,520 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import pickle
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    ENABLE_RAG_BM25_INDEX,
+    RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES,
+    RAG_BM25_INDEX_MAX_COLLECTIONS,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+####################
+# Persistent BM25 inverted index
+#
+# Hybrid search used to fetch every chunk of a collection and rebuild a
+# BM25Retriever for every single query. Instead, each collection keeps an
+# inverted index on disk (snapshot + append-only journal) that is updated as
+# chunks are inserted and deleted, and is queried directly.
+####################
+
+# Okapi BM25 parameters, same defaults as rank_bm25.BM25Okapi
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_EPSILON = 0.25
+
+# Web search results land in a fresh collection per query, they are neither cached nor persisted
+EPHEMERAL_COLLECTION_PREFIXES = ('web-search-',)
+
+
+def tokenize(text: str) -> list[str]:
+    # Mirrors the default preprocessing of langchain's BM25Retriever
+    return text.split()
+
+
+def get_enriched_text(text: str, metadata: dict) -> str:
+    metadata_parts = [text]
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get('name'):
+        filename = metadata['name']
+        filename_tokens = filename.replace('_', ' ').replace('-', ' ').replace('.', ' ')
+        metadata_parts.append(f'Filename: {filename} {filename_tokens} {filename_tokens}')
+
+    # Add title if available
+    if metadata.get('title'):
+        metadata_parts.append(f'Title: {metadata["title"]}')
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get('headings') and isinstance(metadata['headings'], list):
+        headings = ' > '.join(str(h) for h in metadata['headings'])
+        metadata_parts.append(f'Section: {headings}')
+
+    # Add source URL/path if available
+    if metadata.get('source'):
+        metadata_parts.append(f'Source: {metadata["source"]}')
+
+    # Add snippet for web search results
+    if metadata.get('snippet'):
+        metadata_parts.append(f'Snippet: {metadata["snippet"]}')
+
+    return ' '.join(metadata_parts)
+
+
+def _matches_filter(metadata: dict, filter: dict) -> bool:
+    return all(metadata.get(key) == value for key, value in filter.items())
+
+
+class BM25Index:
+    """
+    In-memory inverted index over the chunks of a single collection.
+
+    Documents live in slots; deleting a document leaves a tombstone that is
+    reclaimed when the index is compacted.
+    """
+
+    def __init__(self, enriched: bool = False):
+        self.enriched = enriched
+        self.version = 0
+        self.lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self.ids: list[Optional[str]] = []
+        self.texts: list[Optional[str]] = []
+        self.metadatas: list[Optional[dict]] = []
+        self.doc_terms: list[Optional[tuple[str, ...]]] = []
+        self.doc_lens: list[int] = []
+
+        self.slots: dict[str, int] = {}
+        self.postings: dict[str, dict[int, int]] = {}
+        self.total_len = 0
+
+        self._idf: Optional[dict[str, float]] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        state['_idf'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _index_text(self, text: str, metadata: dict) -> str:
+        return get_enriched_text(text, metadata) if self.enriched else text
+
+    def _add_one(self, id: str, text: str, metadata: dict):
+        if id in self.slots:
+            self._remove_slot(self.slots[id])
+
+        tokens = tokenize(self._index_text(text, metadata))
+        term_freqs = Counter(tokens)
+
+        slot = len(self.ids)
+        self.ids.append(id)
+        self.texts.append(text)
+        self.metadatas.append(metadata)
+        self.doc_terms.append(tuple(term_freqs.keys()))
+        self.doc_lens.append(len(tokens))
+        self.slots[id] = slot
+        self.total_len += len(tokens)
+
+        for term, freq in term_freqs.items():
+            self.postings.setdefault(term, {})[slot] = freq
+
+    def _remove_slot(self, slot: int):
+        for term in self.doc_terms[slot] or ():
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(slot, None)
+                if not posting:
+                    del self.postings[term]
+
+        self.total_len -= self.doc_lens[slot]
+        del self.slots[self.ids[slot]]
+
+        self.ids[slot] = None
+        self.texts[slot] = None
+        self.metadatas[slot] = None
+        self.doc_terms[slot] = None
+        self.doc_lens[slot] = 0
+
+    def add(self, items: list[dict]):
+        with self.lock:
+            for item in items:
+                self._add_one(str(item['id']), item['text'], item.get('metadata') or {})
+            self._idf = None
+
+    def delete(self, ids: Optional[list[str]] = None, filter: Optional[dict] = None):
+        with self.lock:
+            slots = set()
+            if ids:
+                slots.update(self.slots[str(id)] for id in ids if str(id) in self.slots)
+            if filter:
+                slots.update(slot for slot in self.slots.values() if _matches_filter(self.metadatas[slot], filter))
+
+            for slot in slots:
+                self._remove_slot(slot)
+            self._idf = None
+
+            # Reclaim tombstones once they make up most of the slots
+            if len(self.ids) > 64 and len(self.slots) < len(self.ids) // 2:
+                self.rebuild()
+
+    def rebuild(self, enriched: Optional[bool] = None):
+        with self.lock:
+            items = [
+                {'id': self.ids[slot], 'text': self.texts[slot], 'metadata': self.metadatas[slot]}
+                for slot in sorted(self.slots.values())
+            ]
+            if enriched is not None:
+                self.enriched = enriched
+
+            self._clear()
+            self.add(items)
+
+    def _get_idf(self) -> dict[str, float]:
+        if self._idf is None:
+            num_docs = len(self.slots)
+            idf = {}
+            negative_terms = []
+            idf_sum = 0.0
+
+            for term, posting in self.postings.items():
+                value = math.log(num_docs - len(posting) + 0.5) - math.log(len(posting) + 0.5)
+                idf[term] = value
+                idf_sum += value
+                if value < 0:
+                    negative_terms.append(term)
+
+            # Floor negative idf values like BM25Okapi does
+            if idf:
+                eps = BM25_EPSILON * idf_sum / len(idf)
+                for term in negative_terms:
+                    idf[term] = eps
+
+            self._idf = idf
+        return self._idf
+
+    def search(self, query: str, k: int) -> list[tuple[str, dict, float]]:
+        """Return up to k (text, metadata, score) tuples, best first."""
+        with self.lock:
+            if not self.slots:
+                return []
+
+            idf = self._get_idf()
+            avg_len = self.total_len / len(self.slots) or 1.0
+
+            scores: dict[int, float] = {}
+            # Only documents sharing at least one term with the query are touched
+            for term in tokenize(query):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                term_idf = idf[term]
+                for slot, freq in posting.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lens[slot] / avg_len)
+                    scores[slot] = scores.get(slot, 0.0) + term_idf * (freq * (BM25_K1 + 1) / (freq + norm))
+
+            top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+            return [(self.texts[slot], dict(self.metadatas[slot]), score) for slot, score in top]
+
+
+class BM25IndexStore:
+    """
+    Keeps one BM25Index per collection, persisted under CACHE_DIR.
+
+    Each collection is stored as a pickled snapshot plus a JSON-lines journal
+    of the mutations applied since; the journal is folded into a new snapshot
+    once it grows past RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES. Indexes are built
+    lazily from the vector DB the first time a collection is queried.
+
+    At most RAG_BM25_INDEX_MAX_COLLECTIONS indexes are kept in memory, the
+    least recently used ones are evicted and reloaded from disk when needed.
+    Ephemeral collections (web search results) are built per query instead.
+
+    When Redis is configured, a per-collection version counter is bumped on
+    every mutation so that other nodes drop their stale copy.
+    """
+
+    def __init__(self, directory: Path, max_collections: int = RAG_BM25_INDEX_MAX_COLLECTIONS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_collections = max_collections
+
+        self._indexes: OrderedDict[str, BM25Index] = OrderedDict()
+        self._indexes_lock = threading.Lock()
+        self._signatures: dict[str, tuple] = {}
+        self._journal_entries: dict[str, int] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+        self._redis = get_redis_client()
+
+    def _lock(self, collection_name: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(collection_name, threading.Lock())
+
+    @staticmethod
+    def _is_ephemeral(collection_name: str) -> bool:
+        return collection_name.startswith(EPHEMERAL_COLLECTION_PREFIXES)
+
+    def _cache(self, collection_name: str, index: BM25Index):
+        with self._indexes_lock:
+            self._indexes[collection_name] = index
+            self._indexes.move_to_end(collection_name)
+            while len(self._indexes) > self.max_collections:
+                evicted, _ = self._indexes.popitem(last=False)
+                # Forget the signature so the evicted index is reloaded from disk on next use
+                self._signatures.pop(evicted, None)
+                self._journal_entries.pop(evicted, None)
+
+    def _uncache(self, collection_name: str):
+        with self._indexes_lock:
+            self._indexes.pop(collection_name, None)
+
+    def _paths(self, collection_name: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(collection_name.encode()).hexdigest()
+        return (self.directory / f'{key}.snapshot', self.directory / f'{key}.journal')
+
+    def _signature(self, collection_name: str) -> tuple:
+        # Changes when another worker sharing the same directory touched the index
+        signature = []
+        for path in self._paths(collection_name):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _version_key(self, collection_name: str) -> str:
+        return f'{REDIS_KEY_PREFIX}:bm25:version:{collection_name}'
+
+    def _get_remote_version(self, collection_name: str) -> Optional[int]:
+        if self._redis is None:
+            return None
+        try:
+            return int(self._redis.get(self._version_key(collection_name)) or 0)
+        except Exception as e:
+            log.debug(f'Failed to read BM25 index version for {collection_name}: {e}')
+            return None
+
+    def _bump_remote_version(self, collection_name: str) -> Optional[int]:
+        if self._redis is None:
+            return None
+        try:
+            return int(self._redis.incr(self._version_key(collection_name)))
+        except Exception as e:
+            log.debug(f'Failed to bump BM25 index version for {collection_name}: {e}')
+            return None
+
+    def _save_snapshot(self, collection_name: str, index: BM25Index):
+        snapshot_path, journal_path = self._paths(collection_name)
+        tmp_path = snapshot_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+        journal_path.unlink(missing_ok=True)
+
+        self._journal_entries[collection_name] = 0
+        self._signatures[collection_name] = self._signature(collection_name)
+
+    def _append_journal(self, collection_name: str, index: BM25Index, entry: dict):
+        if self._journal_entries.get(collection_name, 0) >= RAG_BM25_INDEX_JOURNAL_MAX_ENTRIES:
+            self._save_snapshot(collection_name, index)
+            return
+
+        _, journal_path = self._paths(collection_name)
+        with open(journal_path, 'a') as f:
+            f.write(json.dumps({**entry, 'version': index.version}, default=str) + '\n')
+
+        self._journal_entries[collection_name] = self._journal_entries.get(collection_name, 0) + 1
+        self._signatures[collection_name] = self._signature(collection_name)
+
+    def _load(self, collection_name: str) -> Optional[BM25Index]:
+        snapshot_path, journal_path = self._paths(collection_name)
+        if not snapshot_path.exists():
+            return None
+
+        try:
+            with open(snapshot_path, 'rb') as f:
+                index: BM25Index = pickle.load(f)
+
+            entries = 0
+            if journal_path.exists():
+                with open(journal_path, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        entry = json.loads(line)
+                        self._apply(index, entry)
+                        index.version = entry.get('version', index.version)
+                        entries += 1
+
+            self._journal_entries[collection_name] = entries
+            self._signatures[collection_name] = self._signature(collection_name)
+            return index
+        except Exception as e:
+            log.warning(f'Discarding unreadable BM25 index for {collection_name}: {e}')
+            self._discard(collection_name)
+            return None
+
+    def _build(self, collection_name: str, enriched: bool) -> Optional[BM25Index]:
+        log.info(f'Building BM25 index for collection {collection_name}')
+        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        if not result or not result.documents or not result.documents[0]:
+            return None
+
+        index = BM25Index(enriched=enriched)
+        index.add(
+            [
+                {'id': id, 'text': text, 'metadata': metadata or {}}
+                for id, text, metadata in zip(result.ids[0], result.documents[0], result.metadatas[0])
+            ]
+        )
+        return index
+
+    def _discard(self, collection_name: str):
+        self._uncache(collection_name)
+        self._signatures.pop(collection_name, None)
+        self._journal_entries.pop(collection_name, None)
+        for path in self._paths(collection_name):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _apply(index: BM25Index, entry: dict):
+        if entry['op'] == 'add':
+            index.add(entry['items'])
+        elif entry['op'] == 'delete':
+            index.delete(ids=entry.get('ids'), filter=entry.get('filter'))
+
+    def _get_local(self, collection_name: str) -> Optional[BM25Index]:
+        index = self._indexes.get(collection_name)
+        if index is None or self._signatures.get(collection_name) != self._signature(collection_name):
+            index = self._load(collection_name)
+            if index is None:
+                self._uncache(collection_name)
+                return None
+        self._cache(collection_name, index)
+
+        remote_version = self._get_remote_version(collection_name)
+        if remote_version is not None and remote_version != index.version:
+            # Another node changed the collection, our copy is stale
+            self._discard(collection_name)
+            return None
+
+        return index
+
+    def get_index(self, collection_name: str, enriched: bool = False) -> Optional[BM25Index]:
+        """Return the index for a collection, building it on first use. None if the collection is empty."""
+        if self._is_ephemeral(collection_name):
+            return self._build(collection_name, enriched)
+
+        with self._lock(collection_name):
+            index = self._get_local(collection_name)
+
+            if index is None:
+                remote_version = self._get_remote_version(collection_name)
+                index = self._build(collection_name, enriched)
+                if index is None:
+                    return None
+                index.version = remote_version or 0
+                self._cache(collection_name, index)
+                self._save_snapshot(collection_name, index)
+            elif index.enriched != enriched:
+                index.rebuild(enriched=enriched)
+                self._save_snapshot(collection_name, index)
+
+            return index
+
+    def _mutate(self, collection_name: str, entry: dict):
+        if self._is_ephemeral(collection_name):
+            return
+
+        with self._lock(collection_name):
+            try:
+                index = self._get_local(collection_name)
+                remote_version = self._bump_remote_version(collection_name)
+
+                if index is None:
+                    # Nothing indexed locally yet, it will be built from the vector DB when first queried
+                    return
+
+                if remote_version is not None and remote_version != index.version + 1:
+                    self._discard(collection_name)
+                    return
+
+                self._apply(index, entry)
+                index.version = remote_version if remote_version is not None else index.version + 1
+                self._append_journal(collection_name, index, entry)
+            except Exception as e:
+                log.warning(f'Failed to update BM25 index for {collection_name}, discarding it: {e}')
+                self._discard(collection_name)
+
+    def add(self, collection_name: str, items: list[dict]):
+        """Index new or updated chunks. Items use the VectorItem shape (id, text, metadata)."""
+        if not ENABLE_RAG_BM25_INDEX:
+            return
+        self._mutate(
+            collection_name,
+            {
+                'op': 'add',
+                'items': [
+                    {'id': str(item['id']), 'text': item['text'], 'metadata': item.get('metadata') or {}}
+                    for item in items
+                ],
+            },
+        )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if not ENABLE_RAG_BM25_INDEX:
+            return
+        self._mutate(collection_name, {'op': 'delete', 'ids': ids, 'filter': filter})
+
+    def drop(self, collection_name: str):
+        if not ENABLE_RAG_BM25_INDEX or self._is_ephemeral(collection_name):
+            return
+        with self._lock(collection_name):
+            self._bump_remote_version(collection_name)
+            self._discard(collection_name)
+
+    def reset(self):
+        if not ENABLE_RAG_BM25_INDEX:
+            return
+        for collection_name in list(self._indexes.keys()):
+            self.drop(collection_name)
+        for path in self.directory.glob('*'):
+            path.unlink(missing_ok=True)
+
+        if self._redis is not None:
+            try:
+                for key in self._redis.scan_iter(match=self._version_key('*')):
+                    self._redis.delete(key)
+            except Exception as e:
+                log.debug(f'Failed to clear BM25 index versions: {e}')
+
+
+BM25_INDEX = BM25IndexStore(CACHE_DIR / 'bm25')
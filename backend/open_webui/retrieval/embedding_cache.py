@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    RAG_EMBEDDING_CACHE_BACKEND,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+####################
+# Embedding cache
+#
+# Identical text (the same file indexed into several knowledge bases, repeated
+# user queries) used to be re-embedded every time. Embeddings are memoized by
+# engine, endpoint, model, prefix and a hash of the text: first in a bounded in-process
+# LRU, then in an optional shared tier (Redis or a SQLite file in CACHE_DIR).
+####################
+
+
+def get_embedding_cache_key(engine: str, url: Optional[str], model: str, prefix: Optional[str], text: str) -> str:
+    # The endpoint is part of the key, two servers may serve different weights under the same model name
+    return hashlib.sha256(
+        '\0'.join([engine or '', (url or '').rstrip('/'), model or '', prefix or '', text]).encode()
+    ).hexdigest()
+
+
+class RedisEmbeddingCacheBackend:
+    def __init__(self, redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f'{REDIS_KEY_PREFIX}:embedding:{key}'
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        values = self.redis.mget([self._key(key) for key in keys])
+        return [json.loads(value) if value else None for value in values]
+
+    def set_many(self, items: dict[str, list[float]]):
+        pipe = self.redis.pipeline()
+        for key, embedding in items.items():
+            pipe.set(self._key(key), json.dumps(embedding), ex=self.ttl or None)
+        pipe.execute()
+
+
+class DiskEmbeddingCacheBackend:
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: Path, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS embedding (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at INTEGER)'
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        min_created_at = int(time.time()) - self.ttl if self.ttl else 0
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f'SELECT key, value FROM embedding WHERE created_at >= ? AND key IN ({",".join("?" * len(chunk))})',
+                    [min_created_at, *chunk],
+                ).fetchall()
+                found.update(rows)
+        return [json.loads(found[key]) if key in found else None for key in keys]
+
+    def set_many(self, items: dict[str, list[float]]):
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO embedding (key, value, created_at) VALUES (?, ?, ?)',
+                [(key, json.dumps(embedding), now) for key, embedding in items.items()],
+            )
+            self._writes += len(items)
+            if self.ttl and self._writes >= self.PRUNE_EVERY:
+                self._writes = 0
+                self._conn.execute('DELETE FROM embedding WHERE created_at < ?', (now - self.ttl,))
+            self._conn.commit()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache. Lookups and stores are batched so a whole
+    document costs one round-trip to the shared tier.
+    """
+
+    def __init__(self, max_size: int, backend=None):
+        self.max_size = max_size
+        self.backend = backend
+        self._lru: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _remember(self, key: str, embedding: list[float]):
+        self._lru[key] = embedding
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        with self._lock:
+            results = []
+            for key in keys:
+                embedding = self._lru.get(key)
+                if embedding is not None:
+                    self._lru.move_to_end(key)
+                results.append(embedding)
+
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        if missing and self.backend is not None:
+            try:
+                shared = self.backend.get_many([keys[i] for i in missing])
+            except Exception as e:
+                log.warning(f'Embedding cache lookup failed: {e}')
+                shared = [None] * len(missing)
+
+            with self._lock:
+                for i, embedding in zip(missing, shared):
+                    if embedding is not None:
+                        results[i] = embedding
+                        self._remember(keys[i], embedding)
+
+        return results
+
+    def set_many(self, items: dict[str, list[float]]):
+        if not items:
+            return
+
+        with self._lock:
+            for key, embedding in items.items():
+                self._remember(key, embedding)
+
+        if self.backend is not None:
+            try:
+                self.backend.set_many(items)
+            except Exception as e:
+                log.warning(f'Embedding cache store failed: {e}')
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+
+def get_embedding_cache_backend(backend: str):
+    if backend == 'redis':
+        redis = get_redis_client()
+        if redis is None:
+            log.warning('RAG_EMBEDDING_CACHE_BACKEND is redis but Redis is not configured, using in-process cache only')
+            return None
+        return RedisEmbeddingCacheBackend(redis, RAG_EMBEDDING_CACHE_TTL)
+    elif backend == 'disk':
+        return DiskEmbeddingCacheBackend(CACHE_DIR / 'embeddings' / 'embeddings.db', RAG_EMBEDDING_CACHE_TTL)
+    elif backend:
+        log.warning(f'Unknown RAG_EMBEDDING_CACHE_BACKEND: {backend}, using in-process cache only')
+    return None
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    max_size=RAG_EMBEDDING_CACHE_SIZE,
+    backend=get_embedding_cache_backend(RAG_EMBEDDING_CACHE_BACKEND) if RAG_EMBEDDING_CACHE_SIZE > 0 else None,
+)
@@ -0,0 +1,496 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.documents import Document
+
+from open_webui.config import RAG_EMBEDDING_CONTENT_PREFIX
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import KNOWLEDGE_REINDEX_CONCURRENCY, RAG_EMBEDDING_TIMEOUT
+from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.knowledge_reindex import (
+    FILE_STATUS_DONE,
+    FILE_STATUS_FAILED,
+    FILE_STATUS_INDEXING,
+    FILE_STATUS_SKIPPED,
+    KnowledgeReindex,
+    KnowledgeReindexJobModel,
+)
+from open_webui.models.users import UserModel, Users
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import (
+    get_docs_embedding_function,
+    get_embedding_config_snapshot,
+    split_docs,
+)
+from open_webui.utils.misc import calculate_sha256_string, sanitize_text_for_db
+
+log = logging.getLogger(__name__)
+
+####################
+# Knowledge reindex engine
+#
+# Files go through three stages connected by bounded queues: load (read the
+# file's content, split it into chunks, or skip it if unchanged), embed, and
+# insert (replace the file's chunks in its knowledge base collection). Each
+# stage runs `concurrency` workers, so one file is embedded while the next is
+# split and the previous is written.
+#
+# A file's new chunks are inserted before its old ones are deleted, so a
+# failed file keeps its previous chunks. A knowledge base embedded with
+# another embedding config (whose vectors may have another dimension) can't
+# hold the new chunks next to the old ones: its collection is dropped once,
+# right before its first file is inserted.
+####################
+
+# Jobs still running or waiting to run
+ACTIVE_JOB_STATUSES = ['pending', 'running']
+
+# The runner of a job writes its progress this often; a job not updated for
+# REINDEX_JOB_STALE_AFTER seconds lost its runner and is resumed by any node
+REINDEX_JOB_HEARTBEAT_INTERVAL = 10
+REINDEX_JOB_STALE_AFTER = 60
+
+# Errors kept on a job, the most recent ones
+REINDEX_JOB_MAX_ERRORS = 50
+
+# Jobs running on this node, by job ID
+REINDEXERS: dict[str, 'KnowledgeReindexer'] = {}
+
+
+@dataclass
+class ReindexItem:
+    knowledge_id: str
+    file_id: str
+
+    # The file was interrupted halfway through a previous run
+    redo: bool = False
+
+    texts: Optional[list[str]] = None
+    metadatas: Optional[list[dict]] = None
+    embeddings: Optional[list] = None
+
+
+def is_same_embedding_config(stored, embedding_config: dict) -> bool:
+    # Some vector DBs store nested metadata as its string form
+    return stored == embedding_config or stored == str(embedding_config)
+
+
+class KnowledgeReindexer:
+    def __init__(
+        self,
+        request: Request,
+        user: UserModel,
+        job: KnowledgeReindexJobModel,
+        concurrency: int = KNOWLEDGE_REINDEX_CONCURRENCY,
+    ):
+        self.request = request
+        self.user = user
+        self.job = job
+        self.concurrency = concurrency
+
+        self.embedding_config = get_embedding_config_snapshot(request)
+        self.embedding_function = get_docs_embedding_function(request)
+
+        self.total = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = list(job.errors or [])
+
+        # Knowledge bases to rebuild with the new embedding config, and those already dropped
+        self.rebuild: set[str] = set()
+        self.dropped: set[str] = set()
+        self._drop_lock = threading.Lock()
+
+        self.cancelled = False
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        self.task = asyncio.create_task(self.run())
+        REINDEXERS[self.job.id] = self
+        return self.task
+
+    def cancel(self):
+        self.cancelled = True
+        if self.task is not None:
+            self.task.cancel()
+
+    async def run(self):
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            items = await run_in_threadpool(self._get_pending_items)
+            log.info(
+                f'Reindexing {len(items)} of {self.total} knowledge files (job {self.job.id}, force={self.job.force})'
+            )
+            await self._flush()
+
+            await self._run_pipeline(items)
+            await run_in_threadpool(self._purge_removed_files)
+
+            await self._finish('completed')
+            log.info(
+                f'Reindexing completed (job {self.job.id}): {self.completed} indexed, '
+                f'{self.skipped} unchanged, {self.failed} failed'
+            )
+        except asyncio.CancelledError:
+            # Without an explicit cancel the node is shutting down: leave the
+            # job running so it is resumed once its heartbeat goes stale
+            if self.cancelled:
+                await asyncio.shield(self._finish('cancelled'))
+            raise
+        except Exception as e:
+            log.exception(f'Reindexing failed (job {self.job.id}): {e}')
+            self.errors = [*self.errors, {'error': str(e)}][-REINDEX_JOB_MAX_ERRORS:]
+            await self._finish('failed')
+        finally:
+            heartbeat.cancel()
+            REINDEXERS.pop(self.job.id, None)
+
+    async def _finish(self, status: str):
+        await self._flush(status=status)
+        # Checkpoints only matter to resume a job that is still running
+        await run_in_threadpool(KnowledgeReindex.delete_file_statuses, self.job.id)
+
+    def _get_pending_items(self) -> list[ReindexItem]:
+        statuses = KnowledgeReindex.get_file_statuses(self.job.id)
+
+        items = []
+        self.total = 0
+        for knowledge_base in Knowledges.get_knowledge_bases():
+            file_ids = Knowledges.get_file_ids_by_id(knowledge_base.id)
+            if self._is_embedded_with_other_config(knowledge_base.id, file_ids):
+                self.rebuild.add(knowledge_base.id)
+
+            for file_id in file_ids:
+                self.total += 1
+                status = statuses.get((knowledge_base.id, file_id))
+                if status == FILE_STATUS_DONE:
+                    self.completed += 1
+                elif status == FILE_STATUS_SKIPPED:
+                    self.skipped += 1
+                elif status == FILE_STATUS_FAILED:
+                    self.failed += 1
+                else:
+                    items.append(
+                        ReindexItem(
+                            knowledge_id=knowledge_base.id,
+                            file_id=file_id,
+                            redo=status == FILE_STATUS_INDEXING,
+                        )
+                    )
+        return items
+
+    def _is_embedded_with_other_config(self, collection_name: str, file_ids: list[str]) -> bool:
+        """Whether the collection's chunks, judged by the first file that has any, use another embedding config."""
+        if not VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+            return False
+
+        for file_id in file_ids:
+            result = VECTOR_DB_CLIENT.query(collection_name=collection_name, filter={'file_id': file_id}, limit=1)
+            if result is not None and result.ids and result.ids[0]:
+                metadata = result.metadatas[0][0] or {}
+                return not is_same_embedding_config(metadata.get('embedding_config'), self.embedding_config)
+        return False
+
+    def _purge_removed_files(self):
+        """Delete the chunks of files no longer in their knowledge base."""
+        for knowledge_base in Knowledges.get_knowledge_bases():
+            if knowledge_base.id in self.dropped:
+                continue
+            if not VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
+                continue
+
+            try:
+                result = VECTOR_DB_CLIENT.get(collection_name=knowledge_base.id)
+                if result is None or not result.metadatas:
+                    continue
+
+                file_ids = set(Knowledges.get_file_ids_by_id(knowledge_base.id))
+                removed_file_ids = {
+                    metadata.get('file_id')
+                    for metadata in result.metadatas[0]
+                    if metadata and metadata.get('file_id') and metadata.get('file_id') not in file_ids
+                }
+                for file_id in removed_file_ids:
+                    VECTOR_DB_CLIENT.delete(collection_name=knowledge_base.id, filter={'file_id': file_id})
+                    BM25_INDEX.delete(knowledge_base.id, filter={'file_id': file_id})
+
+                if removed_file_ids:
+                    log.info(f'Purged the chunks of {len(removed_file_ids)} removed files from {knowledge_base.id}')
+            except Exception as e:
+                log.warning(f'Failed to purge removed files from knowledge base {knowledge_base.id}: {e}')
+
+    async def _run_pipeline(self, items: list[ReindexItem]):
+        load_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        embed_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        insert_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        stages = [
+            (load_queue, self._load, embed_queue),
+            (embed_queue, self._embed, insert_queue),
+            (insert_queue, self._insert, None),
+        ]
+        workers = [
+            asyncio.create_task(self._worker(queue, stage, next_queue))
+            for queue, stage, next_queue in stages
+            for _ in range(self.concurrency)
+        ]
+
+        try:
+            for item in items:
+                await load_queue.put(item)
+
+            # A stage marks an item done only after handing it to the next stage
+            for queue, _, _ in stages:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self, queue: asyncio.Queue, stage, next_queue: Optional[asyncio.Queue]):
+        while True:
+            item = await queue.get()
+            try:
+                if await stage(item) and next_queue is not None:
+                    await next_queue.put(item)
+            except Exception as e:
+                log.error(f'Error reindexing file {item.file_id} in knowledge base {item.knowledge_id}: {e}')
+                self.failed += 1
+                self.errors = [
+                    *self.errors,
+                    {'knowledge_id': item.knowledge_id, 'file_id': item.file_id, 'error': str(e)},
+                ][-REINDEX_JOB_MAX_ERRORS:]
+                try:
+                    await run_in_threadpool(
+                        KnowledgeReindex.set_file_status,
+                        self.job.id,
+                        item.knowledge_id,
+                        item.file_id,
+                        FILE_STATUS_FAILED,
+                        str(e),
+                    )
+                except Exception as e:
+                    log.warning(f'Failed to checkpoint reindex job {self.job.id}: {e}')
+            finally:
+                queue.task_done()
+
+    async def _load(self, item: ReindexItem) -> bool:
+        if await run_in_threadpool(self._load_file, item):
+            return True
+
+        self.skipped += 1
+        await run_in_threadpool(
+            KnowledgeReindex.set_file_status, self.job.id, item.knowledge_id, item.file_id, FILE_STATUS_SKIPPED
+        )
+        return False
+
+    def _load_file(self, item: ReindexItem) -> bool:
+        """Split a file into the chunks to embed. False if its chunks are up to date."""
+        file = Files.get_file_by_id(item.file_id)
+        if file is None:
+            raise ValueError(ERROR_MESSAGES.NOT_FOUND)
+
+        content = (file.data or {}).get('content', '')
+        hash = calculate_sha256_string(content)
+
+        if not (self.job.force or item.redo):
+            result = VECTOR_DB_CLIENT.query(
+                collection_name=item.knowledge_id,
+                filter={'file_id': file.id},
+                limit=1,
+            )
+            if result is not None and result.ids and result.ids[0]:
+                metadata = result.metadatas[0][0] or {}
+                if metadata.get('hash') == hash and is_same_embedding_config(
+                    metadata.get('embedding_config'), self.embedding_config
+                ):
+                    return False
+
+        # Same source as process_file: the file's own chunks, or its extracted content
+        result = VECTOR_DB_CLIENT.query(collection_name=f'file-{file.id}', filter={'file_id': file.id})
+        if result is not None and result.ids and len(result.ids[0]) > 0:
+            docs = [
+                Document(
+                    page_content=result.documents[0][idx],
+                    metadata=result.metadatas[0][idx],
+                )
+                for idx in range(len(result.ids[0]))
+            ]
+        else:
+            docs = [
+                Document(
+                    page_content=content,
+                    metadata={
+                        **file.meta,
+                        'name': file.filename,
+                        'created_by': file.user_id,
+                        'file_id': file.id,
+                        'source': file.filename,
+                    },
+                )
+            ]
+
+        docs = split_docs(self.request, docs)
+        if len(docs) == 0:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+        item.texts = [sanitize_text_for_db(doc.page_content) for doc in docs]
+        item.metadatas = [
+            {
+                **doc.metadata,
+                'file_id': file.id,
+                'name': file.filename,
+                'hash': hash,
+                'embedding_config': self.embedding_config,
+            }
+            for doc in docs
+        ]
+        return True
+
+    async def _embed(self, item: ReindexItem) -> bool:
+        item.embeddings = await asyncio.wait_for(
+            self.embedding_function(
+                [text.replace('\n', ' ') for text in item.texts],
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=self.user,
+            ),
+            timeout=RAG_EMBEDDING_TIMEOUT,
+        )
+        return True
+
+    async def _insert(self, item: ReindexItem) -> bool:
+        await run_in_threadpool(self._insert_file, item)
+        self.completed += 1
+        return True
+
+    def _insert_file(self, item: ReindexItem):
+        KnowledgeReindex.set_file_status(self.job.id, item.knowledge_id, item.file_id, FILE_STATUS_INDEXING)
+
+        items = [
+            {
+                'id': str(uuid.uuid4()),
+                'text': text,
+                'vector': item.embeddings[idx],
+                'metadata': item.metadatas[idx],
+            }
+            for idx, text in enumerate(item.texts)
+        ]
+
+        if item.knowledge_id in self.rebuild:
+            self._drop_collection(item.knowledge_id)
+
+        # The file's previous chunks (and those of an interrupted run), deleted once the new ones are in
+        result = VECTOR_DB_CLIENT.query(collection_name=item.knowledge_id, filter={'file_id': item.file_id})
+        previous_ids = result.ids[0] if result is not None and result.ids else []
+
+        VECTOR_DB_CLIENT.insert(collection_name=item.knowledge_id, items=items)
+        BM25_INDEX.add(item.knowledge_id, items)
+
+        if previous_ids:
+            VECTOR_DB_CLIENT.delete(collection_name=item.knowledge_id, ids=previous_ids)
+            BM25_INDEX.delete(item.knowledge_id, ids=previous_ids)
+
+        KnowledgeReindex.set_file_status(self.job.id, item.knowledge_id, item.file_id, FILE_STATUS_DONE)
+
+    def _drop_collection(self, collection_name: str):
+        with self._drop_lock:
+            if collection_name in self.dropped:
+                return
+
+            log.info(f'Dropping knowledge base {collection_name} to rebuild it with the new embedding config')
+            if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+            BM25_INDEX.drop(collection_name)
+            self.dropped.add(collection_name)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(REINDEX_JOB_HEARTBEAT_INTERVAL)
+            try:
+                job = await run_in_threadpool(KnowledgeReindex.get_job_by_id, self.job.id)
+                if job is None or job.status == 'cancelled':
+                    # Cancelled from another node
+                    self.cancel()
+                    return
+                await self._flush()
+            except Exception as e:
+                log.warning(f'Failed to update reindex job {self.job.id}: {e}')
+
+    async def _flush(self, status: Optional[str] = None):
+        updated = {
+            'total': self.total,
+            'completed': self.completed,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+        if status:
+            updated['status'] = status
+        await run_in_threadpool(KnowledgeReindex.update_job_by_id, self.job.id, updated)
+
+
+def get_active_reindex_job() -> Optional[KnowledgeReindexJobModel]:
+    jobs = KnowledgeReindex.get_jobs_by_status(ACTIVE_JOB_STATUSES)
+    return max(jobs, key=lambda job: job.created_at) if jobs else None
+
+
+async def start_reindex_job(request: Request, user: UserModel, force: bool = False) -> KnowledgeReindexJobModel:
+    """Start reindexing every knowledge base, or return the job already doing so."""
+    job = await run_in_threadpool(get_active_reindex_job)
+    if job is not None:
+        return job
+
+    job = await run_in_threadpool(
+        KnowledgeReindex.insert_new_job,
+        user.id,
+        force,
+        get_embedding_config_snapshot(request),
+    )
+    job = await run_in_threadpool(KnowledgeReindex.update_job_by_id, job.id, {'status': 'running'})
+    KnowledgeReindexer(request, user, job).start()
+    return job
+
+
+async def cancel_reindex_job() -> Optional[KnowledgeReindexJobModel]:
+    job = await run_in_threadpool(get_active_reindex_job)
+    if job is None:
+        return None
+
+    job = await run_in_threadpool(KnowledgeReindex.update_job_by_id, job.id, {'status': 'cancelled'})
+    if job.id in REINDEXERS:
+        REINDEXERS[job.id].cancel()
+    return job
+
+
+async def resume_stale_reindex_jobs(request: Request):
+    """Resume the reindex jobs whose runner stopped, after a restart or on another node."""
+    while True:
+        try:
+            for job in await run_in_threadpool(KnowledgeReindex.get_jobs_by_status, ACTIVE_JOB_STATUSES):
+                if job.id in REINDEXERS or job.updated_at > time.time() - REINDEX_JOB_STALE_AFTER:
+                    continue
+
+                if not await run_in_threadpool(KnowledgeReindex.claim_job, job.id, job.updated_at):
+                    continue
+
+                user = await run_in_threadpool(Users.get_user_by_id, job.user_id)
+                if user is None:
+                    await run_in_threadpool(KnowledgeReindex.update_job_by_id, job.id, {'status': 'failed'})
+                    continue
+
+                log.info(f'Resuming reindex job {job.id}')
+                KnowledgeReindexer(request, user, job).start()
+        except Exception as e:
+            log.warning(f'Failed to resume reindex jobs: {e}')
+
+        await asyncio.sleep(REINDEX_JOB_STALE_AFTER)
@@ -6,7 +6,6 @@ import requests
 import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
@@ -21,6 +20,8 @@ from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX, BM25Index, get_enriched_text
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE, get_embedding_cache_key
 
 
 from open_webui.models.users import UserModel
@@ -33,8 +34,10 @@ from open_webui.models.access_grants import AccessGrants
 from open_webui.utils.access_control.files import has_access_to_file
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.models.base_reranker import BaseReranker
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
@@ -45,6 +48,8 @@ from open_webui.env import (
     OFFLINE_MODE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
     AIOHTTP_CLIENT_SESSION_SSL,
+    ENABLE_RAG_BM25_INDEX,
+    RAG_RERANKING_BATCH_SIZE,
 )
 from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
@@ -121,7 +126,7 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        result = await VECTOR_DB_CLIENT.asearch(
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -144,6 +149,23 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    top_k: int
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        results = []
+        for text, metadata, _ in self.index.search(query, self.top_k):
+            metadata[CHUNK_HASH_KEY] = _content_hash(text)
+            results.append(
+                Document(
+                    metadata=metadata,
+                    page_content=text,
+                )
+            )
+        return results
+
+
 def query_doc(collection_name: str, query_embedding: list[float], k: int, user: UserModel = None):
     try:
         log.debug(f'query_doc:doc {collection_name}')
@@ -162,6 +184,24 @@ def query_doc(collection_name: str, query_embedding: list[float], k: int, user:
         raise e
 
 
+async def aquery_doc(collection_name: str, query_embedding: list[float], k: int, user: UserModel = None):
+    try:
+        log.debug(f'aquery_doc:doc {collection_name}')
+        result = await VECTOR_DB_CLIENT.asearch(
+            collection_name=collection_name,
+            vectors=[query_embedding],
+            limit=k,
+        )
+
+        if result:
+            log.info(f'aquery_doc:result {result.ids} {result.metadatas}')
+
+        return result
+    except Exception as e:
+        log.exception(f'Error querying doc {collection_name} with limit {k}: {e}')
+        raise e
+
+
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f'get_doc:doc {collection_name}')
@@ -177,52 +217,32 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get('name'):
-            filename = metadata['name']
-            filename_tokens = filename.replace('_', ' ').replace('-', ' ').replace('.', ' ')
-            metadata_parts.append(f'Filename: {filename} {filename_tokens} {filename_tokens}')
-
-        # Add title if available
-        if metadata.get('title'):
-            metadata_parts.append(f'Title: {metadata["title"]}')
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get('headings') and isinstance(metadata['headings'], list):
-            headings = ' > '.join(str(h) for h in metadata['headings'])
-            metadata_parts.append(f'Section: {headings}')
-
-        # Add source URL/path if available
-        if metadata.get('source'):
-            metadata_parts.append(f'Source: {metadata["source"]}')
-
-        # Add snippet for web search results
-        if metadata.get('snippet'):
-            metadata_parts.append(f'Snippet: {metadata["snippet"]}')
-
-        enriched_texts.append(' '.join(metadata_parts))
-
-    return enriched_texts
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
 
-async def query_doc_with_hybrid_search(
+def get_hybrid_retriever(
     collection_name: str,
     collection_result: GetResult,
-    query: str,
     embedding_function,
     k: int,
-    reranking_function,
-    k_reranker: int,
-    r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
-) -> dict:
-    try:
+    bm25_index: Optional[BM25Index] = None,
+) -> Optional[EnsembleRetriever]:
+    """BM25 + vector search ensemble for a collection, None if it has no documents."""
+    if bm25_index is not None:
+        # Persistent BM25 index, the collection does not need to be fetched
+        if len(bm25_index) == 0:
+            log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
+            return None
+
+        log.debug(f'query_doc_with_hybrid_search:doc {collection_name}')
+
+        bm25_retriever = BM25IndexRetriever(index=bm25_index, top_k=k)
+    else:
         # First check if collection_result has the required attributes
         if (
             not collection_result
@@ -230,7 +250,7 @@ async def query_doc_with_hybrid_search(
             or not hasattr(collection_result, 'metadatas')
         ):
             log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
-            return {'documents': [], 'metadatas': [], 'distances': []}
+            return None
 
         # Now safely check the documents content after confirming attributes exist
         if (
@@ -239,7 +259,7 @@ async def query_doc_with_hybrid_search(
             or not collection_result.documents[0]
         ):
             log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
-            return {'documents': [], 'metadatas': [], 'distances': []}
+            return None
 
         log.debug(f'query_doc_with_hybrid_search:doc {collection_name}')
 
@@ -257,31 +277,80 @@ async def query_doc_with_hybrid_search(
         )
         bm25_retriever.k = k
 
-        vector_search_retriever = VectorSearchRetriever(
-            collection_name=collection_name,
-            embedding_function=embedding_function,
-            top_k=k,
+    vector_search_retriever = VectorSearchRetriever(
+        collection_name=collection_name,
+        embedding_function=embedding_function,
+        top_k=k,
+    )
+
+    # Use CHUNK_HASH_KEY for dedup so enriched BM25 texts don't defeat RRF
+    if hybrid_bm25_weight <= 0:
+        return EnsembleRetriever(
+            retrievers=[vector_search_retriever],
+            weights=[1.0],
+            id_key=CHUNK_HASH_KEY,
+        )
+    elif hybrid_bm25_weight >= 1:
+        return EnsembleRetriever(
+            retrievers=[bm25_retriever],
+            weights=[1.0],
+            id_key=CHUNK_HASH_KEY,
+        )
+    else:
+        return EnsembleRetriever(
+            retrievers=[bm25_retriever, vector_search_retriever],
+            weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
+            id_key=CHUNK_HASH_KEY,
         )
 
-        # Use CHUNK_HASH_KEY for dedup so enriched BM25 texts don't defeat RRF
-        if hybrid_bm25_weight <= 0:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[vector_search_retriever],
-                weights=[1.0],
-                id_key=CHUNK_HASH_KEY,
-            )
-        elif hybrid_bm25_weight >= 1:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever],
-                weights=[1.0],
-                id_key=CHUNK_HASH_KEY,
-            )
+
+def get_hybrid_search_result(documents: list[Document], k: int, k_reranker: int) -> dict:
+    distances = [d.metadata.get('score') for d in documents]
+    metadatas = [d.metadata for d in documents]
+    documents = [d.page_content for d in documents]
+
+    # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
+    if k < k_reranker:
+        sorted_items = sorted(zip(distances, documents, metadatas), key=lambda x: x[0], reverse=True)
+        sorted_items = sorted_items[:k]
+
+        if sorted_items:
+            distances, documents, metadatas = map(list, zip(*sorted_items))
         else:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever, vector_search_retriever],
-                weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
-                id_key=CHUNK_HASH_KEY,
-            )
+            distances, documents, metadatas = [], [], []
+
+    return {
+        'distances': [distances],
+        'documents': [documents],
+        'metadatas': [metadatas],
+    }
+
+
+async def query_doc_with_hybrid_search(
+    collection_name: str,
+    collection_result: GetResult,
+    query: str,
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    hybrid_bm25_weight: float,
+    enable_enriched_texts: bool = False,
+    bm25_index: Optional[BM25Index] = None,
+) -> dict:
+    try:
+        ensemble_retriever = get_hybrid_retriever(
+            collection_name=collection_name,
+            collection_result=collection_result,
+            embedding_function=embedding_function,
+            k=k,
+            hybrid_bm25_weight=hybrid_bm25_weight,
+            enable_enriched_texts=enable_enriched_texts,
+            bm25_index=bm25_index,
+        )
+        if ensemble_retriever is None:
+            return {'documents': [], 'metadatas': [], 'distances': []}
 
         compressor = RerankCompressor(
             embedding_function=embedding_function,
@@ -294,27 +363,7 @@ async def query_doc_with_hybrid_search(
             base_compressor=compressor, base_retriever=ensemble_retriever
         )
 
-        result = await compression_retriever.ainvoke(query)
-
-        distances = [d.metadata.get('score') for d in result]
-        documents = [d.page_content for d in result]
-        metadatas = [d.metadata for d in result]
-
-        # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
-        if k < k_reranker:
-            sorted_items = sorted(zip(distances, documents, metadatas), key=lambda x: x[0], reverse=True)
-            sorted_items = sorted_items[:k]
-
-            if sorted_items:
-                distances, documents, metadatas = map(list, zip(*sorted_items))
-            else:
-                distances, documents, metadatas = [], [], []
-
-        result = {
-            'distances': [distances],
-            'documents': [documents],
-            'metadatas': [metadatas],
-        }
+        result = get_hybrid_search_result(await compression_retriever.ainvoke(query), k, k_reranker)
 
         log.info('query_doc_with_hybrid_search:result ' + f'{result["metadatas"]} {result["distances"]}')
         return result
@@ -411,16 +460,34 @@ async def query_collection(
     embedding_function,
     k: int,
 ) -> dict:
+    return (await query_collections(request, [collection_names], queries, embedding_function, k))[0]
+
+
+async def query_collections(
+    request,
+    collection_name_groups: list[list[str]],
+    queries: list[str],
+    embedding_function,
+    k: int,
+) -> list[dict]:
+    """
+    Query each group of collections, returning the merged results of each
+    group. The vector searches of all the groups are batched into a single
+    search of every query across every collection.
+    """
+    results = [None] * len(collection_name_groups)
+
     # When request is provided, try hybrid search + reranking if enabled
     if request and request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
+        reranking_function = (
+            (lambda query, documents: request.app.state.RERANKING_FUNCTION(query, documents))
+            if request.app.state.RERANKING_FUNCTION
+            else None
+        )
         try:
-            reranking_function = (
-                (lambda query, documents: request.app.state.RERANKING_FUNCTION(query, documents))
-                if request.app.state.RERANKING_FUNCTION
-                else None
-            )
-            return await query_collection_with_hybrid_search(
-                collection_names=collection_names,
+            # One candidate pool and reranker pass across every group
+            results = await query_collection_groups_with_hybrid_search(
+                collection_name_groups=collection_name_groups,
                 queries=queries,
                 embedding_function=embedding_function,
                 k=k,
@@ -433,46 +500,44 @@ async def query_collection(
         except Exception as e:
             log.debug(f'Hybrid search failed, falling back to vector search: {e}')
 
-    results = []
-    error = False
+    pending = [index for index, result in enumerate(results) if result is None]
+    if not pending:
+        return results
 
-    def process_query_collection(collection_name, query_embedding):
-        try:
-            if collection_name:
-                result = query_doc(
-                    collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
-                )
-                if result is not None:
-                    return result.model_dump(), None
-            return None, None
-        except Exception as e:
-            log.exception(f'Error when querying the collection: {e}')
-            return None, e
+    collection_names = [
+        collection_name for index in pending for collection_name in collection_name_groups[index] if collection_name
+    ]
 
     # Generate all query embeddings (in one call)
     query_embeddings = await embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
-    log.debug(f'query_collection: processing {len(queries)} queries across {len(collection_names)} collections')
+    log.debug(f'query_collections: searching {len(queries)} queries across {len(collection_names)} collections')
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(process_query_collection, collection_name, query_embedding)
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    search_results = {}
+    if collection_names:
+        try:
+            search_results = await VECTOR_DB_CLIENT.asearch_batch(
+                collection_names=collection_names,
+                vectors=query_embeddings,
+                limit=k,
+            )
+        except Exception as e:
+            log.exception(f'Error when querying the collections: {e}')
+
+    for index in pending:
+        query_results = []
+        for collection_name in collection_name_groups[index]:
+            result = search_results.get(collection_name)
+            if result is None:
+                continue
 
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
+            # One result per query, as merge_and_sort_query_results reads the first row of each
+            result = result.model_dump()
+            for row in range(len(result['ids'] or [])):
+                query_results.append({key: [rows[row]] for key, rows in result.items() if rows is not None})
 
-    if error and not results:
-        log.warning('All collection queries failed. No results returned.')
+        results[index] = merge_and_sort_query_results(query_results, k=k)
 
-    return merge_and_sort_query_results(results, k=k)
+    return results
 
 
 async def query_collection_with_hybrid_search(
@@ -486,36 +551,84 @@ async def query_collection_with_hybrid_search(
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
 ) -> dict:
-    results = []
-    error = False
-    # Fetch collection data once per collection sequentially
+    result = (
+        await query_collection_groups_with_hybrid_search(
+            [collection_names],
+            queries,
+            embedding_function,
+            k,
+            reranking_function,
+            k_reranker,
+            r,
+            hybrid_bm25_weight,
+            enable_enriched_texts,
+        )
+    )[0]
+    if result is None:
+        raise Exception('Hybrid search failed for all collections. Using Non-hybrid search as fallback.')
+    return result
+
+
+async def query_collection_groups_with_hybrid_search(
+    collection_name_groups: list[list[str]],
+    queries: list[str],
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    hybrid_bm25_weight: float,
+    enable_enriched_texts: bool = False,
+) -> list[Optional[dict]]:
+    """
+    Hybrid search of each group of collections, returning the merged results
+    of each group, None for a group whose every collection failed. The BM25
+    and vector candidates of every group are pooled, so each unique (query,
+    chunk) pair is scored once, in a single reranker pass.
+    """
+    collection_names = list(
+        dict.fromkeys(
+            collection_name
+            for collection_names in collection_name_groups
+            for collection_name in collection_names
+            if collection_name
+        )
+    )
+
+    # Fetch collection data (or its persistent BM25 index) once per collection sequentially
     # Avoid fetching the same data multiple times later
     collection_results = {}
     for collection_name in collection_names:
         try:
-            log.debug(f'query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}')
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+            if ENABLE_RAG_BM25_INDEX:
+                log.debug(f'query_collection_with_hybrid_search:BM25_INDEX.get_index:collection {collection_name}')
+                collection_results[collection_name] = await asyncio.to_thread(
+                    BM25_INDEX.get_index, collection_name, enable_enriched_texts
+                )
+            else:
+                log.debug(f'query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}')
+                collection_results[collection_name] = await VECTOR_DB_CLIENT.aget(collection_name=collection_name)
         except Exception as e:
             log.exception(f'Failed to fetch collection {collection_name}: {e}')
             collection_results[collection_name] = None
 
     log.info(f'Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections...')
 
-    async def process_query(collection_name, query):
+    async def retrieve_candidates(collection_name, query):
         try:
-            result = await query_doc_with_hybrid_search(
+            collection_result = collection_results[collection_name]
+            ensemble_retriever = get_hybrid_retriever(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
-                query=query,
+                collection_result=None if ENABLE_RAG_BM25_INDEX else collection_result,
                 embedding_function=embedding_function,
                 k=k,
-                reranking_function=reranking_function,
-                k_reranker=k_reranker,
-                r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                bm25_index=collection_result if ENABLE_RAG_BM25_INDEX else None,
             )
-            return result, None
+            if ensemble_retriever is None:
+                return [], None
+            return await ensemble_retriever.ainvoke(query), None
         except Exception as e:
             log.exception(f'Error when querying the collection with hybrid_search: {e}')
             return None, e
@@ -529,19 +642,65 @@ async def query_collection_with_hybrid_search(
         for query in queries
     ]
 
-    # Run all queries in parallel using asyncio.gather
-    task_results = await asyncio.gather(*[process_query(collection_name, query) for collection_name, query in tasks])
+    # Retrieve candidates for all collections and queries in parallel
+    task_results = dict(
+        zip(
+            tasks,
+            await asyncio.gather(*[retrieve_candidates(collection_name, query) for collection_name, query in tasks]),
+        )
+    )
 
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
+    def get_pair_key(query, doc):
+        return query, doc.metadata.get(CHUNK_HASH_KEY) or _content_hash(doc.page_content)
+
+    # Pool the candidates of every group, collection and query so each unique (query, chunk)
+    # pair is scored exactly once, in a single reranker pass (batched by RAG_RERANKING_BATCH_SIZE)
+    pool = {}
+    for (_, query), (candidates, err) in task_results.items():
+        for doc in candidates or []:
+            pool.setdefault(get_pair_key(query, doc), doc)
+
+    scores = None
+    if pool:
+        pair_keys = list(pool.keys())
+        log.debug(f'query_collection_with_hybrid_search:reranking {len(pair_keys)} unique candidates')
+        pooled_scores = await score_documents(
+            [query for query, _ in pair_keys],
+            list(pool.values()),
+            embedding_function,
+            reranking_function,
+        )
+        if pooled_scores is not None:
+            scores = dict(zip(pair_keys, pooled_scores))
+        else:
+            log.warning('No valid scores found, check your reranking function. Returning original documents.')
 
-    if error and not results:
-        raise Exception('Hybrid search failed for all collections. Using Non-hybrid search as fallback.')
+    group_results = []
+    for collection_names in collection_name_groups:
+        results = []
+        error = False
+        for collection_name in dict.fromkeys(collection_names):
+            for query in queries:
+                candidates, err = task_results.get((collection_name, query), (None, None))
+                if err is not None:
+                    error = True
+                    continue
+                if candidates is None:
+                    # Its data failed to fetch
+                    continue
+
+                if scores is not None:
+                    candidates = select_reranked_documents(
+                        candidates,
+                        [scores[get_pair_key(query, doc)] for doc in candidates],
+                        k_reranker,
+                        r,
+                    )
+                results.append(get_hybrid_search_result(candidates, k, k_reranker))
 
-    return merge_and_sort_query_results(results, k=k)
+        group_results.append(None if error and not results else merge_and_sort_query_results(results, k=k))
+
+    return group_results
 
 
 def generate_openai_batch_embeddings(
@@ -597,14 +756,13 @@ async def agenerate_openai_batch_embeddings(
     if ENABLE_FORWARD_USER_INFO_HEADERS and user:
         headers = include_user_info_headers(headers, user)
 
-    async with aiohttp.ClientSession(
-        trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         async with session.post(
             f'{url}/embeddings',
             headers=headers,
             json=form_data,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         ) as r:
             r.raise_for_status()
             data = await r.json()
@@ -679,14 +837,13 @@ async def agenerate_azure_openai_batch_embeddings(
     if ENABLE_FORWARD_USER_INFO_HEADERS and user:
         headers = include_user_info_headers(headers, user)
 
-    async with aiohttp.ClientSession(
-        trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         async with session.post(
             full_url,
             headers=headers,
             json=form_data,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         ) as r:
             r.raise_for_status()
             data = await r.json()
@@ -752,14 +909,13 @@ async def agenerate_ollama_batch_embeddings(
     if ENABLE_FORWARD_USER_INFO_HEADERS and user:
         headers = include_user_info_headers(headers, user)
 
-    async with aiohttp.ClientSession(
-        trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         async with session.post(
             f'{url}/api/embed',
             headers=headers,
             json=form_data,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         ) as r:
             if r.status != 200:
                 error_data = await r.json()
@@ -772,6 +928,55 @@ async def agenerate_ollama_batch_embeddings(
                 raise ValueError("Unexpected Ollama embeddings response: missing 'embeddings' key")
 
 
+def get_cached_embedding_function(
+    embedding_function, embedding_engine: str, embedding_model: str, url: Optional[str] = None
+) -> Awaitable:
+    """
+    Serve embeddings from EMBEDDING_CACHE and only send texts that are not
+    cached (deduplicated) on to `embedding_function` for batching.
+    """
+    if not EMBEDDING_CACHE.enabled:
+        return embedding_function
+
+    async def cached_embedding_function(query, prefix=None, user=None):
+        texts = query if isinstance(query, list) else [query]
+        keys = [get_embedding_cache_key(embedding_engine, url, embedding_model, prefix, text) for text in texts]
+        embeddings = await asyncio.to_thread(EMBEDDING_CACHE.get_many, keys)
+
+        missing = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(keys[i], texts[i])
+
+        if missing:
+            log.debug(f'Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses')
+            missing_texts = list(missing.values())
+            generated = await embedding_function(
+                missing_texts if isinstance(query, list) else missing_texts[0],
+                prefix=prefix,
+                user=user,
+            )
+            if generated is None:
+                return None
+            if not isinstance(query, list):
+                generated = [generated]
+            if len(generated) != len(missing_texts):
+                raise ValueError(
+                    f'Embedding engine {embedding_engine or "sentence-transformers"} returned '
+                    f'{len(generated)} embeddings for {len(missing_texts)} texts'
+                )
+
+            generated = dict(zip(missing.keys(), generated))
+            embeddings = [
+                generated[key] if embedding is None else embedding for key, embedding in zip(keys, embeddings)
+            ]
+            await asyncio.to_thread(EMBEDDING_CACHE.set_many, generated)
+
+        return embeddings if isinstance(query, list) else embeddings[0]
+
+    return cached_embedding_function
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -798,7 +1003,7 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return get_cached_embedding_function(async_embedding_function, embedding_engine, embedding_model)
     elif embedding_engine in ['ollama', 'openai', 'azure_openai']:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -851,7 +1056,7 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return get_cached_embedding_function(async_embedding_function, embedding_engine, embedding_model, url)
     else:
         raise ValueError(f'Unknown embedding engine: {embedding_engine}')
 
@@ -911,16 +1116,41 @@ async def generate_embeddings(
 
 
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
+    """
+    Returns `rerank(query, documents, user=None)`. `query` is either one query
+    for all documents or a list with one query per document, so candidates of
+    several queries can be scored in a single call.
+    """
     if reranking_function is None:
         return None
-    if reranking_engine == 'external':
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
-        )
-    else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents]
-        )
+
+    def rerank(query, documents, user=None):
+        queries = query if isinstance(query, list) else [query] * len(documents)
+        pairs = [(query, doc.page_content) for query, doc in zip(queries, documents)]
+
+        if not isinstance(reranking_function, BaseReranker):
+            # sentence-transformers CrossEncoder scores pairs of mixed queries in fixed-size batches
+            return reranking_function.predict(pairs, batch_size=RAG_RERANKING_BATCH_SIZE)
+
+        # ColBERT and external rerankers take one query per call
+        groups = {}
+        for idx, (query, _) in enumerate(pairs):
+            groups.setdefault(query, []).append(idx)
+
+        scores = [None] * len(pairs)
+        for indices in groups.values():
+            group_pairs = [pairs[idx] for idx in indices]
+            if reranking_engine == 'external':
+                group_scores = reranking_function.predict(group_pairs, user=user)
+            else:
+                group_scores = reranking_function.predict(group_pairs)
+            if group_scores is None:
+                return None
+            for idx, score in zip(indices, list(group_scores)):
+                scores[idx] = score
+        return scores
+
+    return rerank
 
 
 async def get_sources_from_items(
@@ -941,6 +1171,8 @@ async def get_sources_from_items(
 
     extracted_collections = []
     query_results = []
+    # (index in query_results, item, collection names) of the items vector searched together after the loop
+    pending_queries = []
 
     for item in items:
         query_result = None
@@ -1138,19 +1370,14 @@ async def get_sources_from_items(
                 log.debug(f'skipping {item} as it has already been extracted')
                 continue
 
-            try:
-                if full_context:
+            if full_context:
+                try:
                     query_result = get_all_items_from_collections(collection_names)
-                else:
-                    query_result = await query_collection(
-                        request,
-                        collection_names=collection_names,
-                        queries=queries,
-                        embedding_function=embedding_function,
-                        k=k,
-                    )
-            except Exception as e:
-                log.exception(e)
+                except Exception as e:
+                    log.exception(e)
+            else:
+                pending_queries.append((len(query_results), item, list(collection_names)))
+                query_results.append(None)
 
             extracted_collections.extend(collection_names)
 
@@ -1159,8 +1386,29 @@ async def get_sources_from_items(
                 del item['data']
             query_results.append({**query_result, 'file': item})
 
+    if pending_queries:
+        try:
+            pending_results = await query_collections(
+                request,
+                collection_name_groups=[collection_names for _, _, collection_names in pending_queries],
+                queries=queries,
+                embedding_function=embedding_function,
+                k=k,
+            )
+        except Exception as e:
+            log.exception(e)
+            pending_results = [None] * len(pending_queries)
+
+        for (index, item, _), query_result in zip(pending_queries, pending_results):
+            if query_result:
+                if 'data' in item:
+                    del item['data']
+                query_results[index] = {**query_result, 'file': item}
+
     sources = []
     for query_result in query_results:
+        if query_result is None:
+            continue
         try:
             if 'documents' in query_result:
                 if 'metadatas' in query_result:
@@ -1259,41 +1507,67 @@ class RerankCompressor(BaseDocumentCompressor):
         query: str,
         callbacks: Optional[Callbacks] = None,
     ) -> Sequence[Document]:
-        reranking = self.reranking_function is not None
-
-        scores = None
-        if reranking:
-            scores = await asyncio.to_thread(self.reranking_function, query, documents)
-        else:
-            from sentence_transformers import util
-
-            query_embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
-            )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+        scores = await score_documents(
+            [query] * len(documents),
+            list(documents),
+            self.embedding_function,
+            self.reranking_function,
+        )
 
         if scores is not None:
-            docs_with_scores = list(
-                zip(
-                    documents,
-                    scores.tolist() if not isinstance(scores, list) else scores,
-                )
-            )
-            if self.r_score:
-                docs_with_scores = [(d, s) for d, s in docs_with_scores if s >= self.r_score]
-
-            result = sorted(docs_with_scores, key=operator.itemgetter(1), reverse=True)
-            final_results = []
-            for doc, doc_score in result[: self.top_n]:
-                metadata = doc.metadata
-                metadata['score'] = doc_score
-                doc = Document(
-                    page_content=doc.page_content,
-                    metadata=metadata,
-                )
-                final_results.append(doc)
-            return final_results
+            return select_reranked_documents(documents, scores, self.top_n, self.r_score)
         else:
             log.warning('No valid scores found, check your reranking function. Returning original documents.')
             return documents
+
+
+async def score_documents(
+    queries: list[str],
+    documents: list[Document],
+    embedding_function,
+    reranking_function,
+) -> Optional[list[float]]:
+    """
+    Relevance of each document to the query at the same position, from the
+    reranker in one call or, without one, from embedding cosine similarity.
+    """
+    if not documents:
+        return []
+
+    if reranking_function is not None:
+        scores = await asyncio.to_thread(reranking_function, queries, documents)
+    else:
+        from sentence_transformers import util
+
+        unique_queries = list(dict.fromkeys(queries))
+        query_embeddings = await embedding_function(unique_queries, RAG_EMBEDDING_QUERY_PREFIX)
+        document_embeddings = await embedding_function(
+            [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+        )
+        similarities = util.cos_sim(query_embeddings, document_embeddings)
+        query_indices = {query: idx for idx, query in enumerate(unique_queries)}
+        scores = [similarities[query_indices[query]][idx].item() for idx, query in enumerate(queries)]
+
+    if scores is None:
+        return None
+    return scores.tolist() if not isinstance(scores, list) else scores
+
+
+def select_reranked_documents(
+    documents: Sequence[Document],
+    scores: list[float],
+    top_n: int,
+    r_score: float,
+) -> list[Document]:
+    docs_with_scores = list(zip(documents, scores))
+    if r_score:
+        docs_with_scores = [(d, s) for d, s in docs_with_scores if s >= r_score]
+
+    result = sorted(docs_with_scores, key=operator.itemgetter(1), reverse=True)
+    return [
+        Document(
+            page_content=doc.page_content,
+            metadata={**doc.metadata, 'score': doc_score},
+        )
+        for doc, doc_score in result[:top_n]
+    ]
@@ -1,3 +1,4 @@
+import asyncio
 import chromadb
 import logging
 from chromadb import Settings
@@ -29,6 +30,8 @@ log = logging.getLogger(__name__)
 
 
 class ChromaClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         settings_dict = {
             'allow_reset': True,
@@ -39,6 +42,7 @@ class ChromaClient(VectorDBBase):
         if CHROMA_CLIENT_AUTH_CREDENTIALS is not None:
             settings_dict['chroma_client_auth_credentials'] = CHROMA_CLIENT_AUTH_CREDENTIALS
 
+        self.settings_dict = settings_dict
         if CHROMA_HTTP_HOST != '':
             self.client = chromadb.HttpClient(
                 host=CHROMA_HTTP_HOST,
@@ -57,6 +61,55 @@ class ChromaClient(VectorDBBase):
                 database=CHROMA_DATABASE,
             )
 
+    def _create_async_client(self):
+        # Only the HTTP client has an async counterpart, the embedded one stays on the thread pool
+        if CHROMA_HTTP_HOST == '':
+            return None
+        return asyncio.ensure_future(
+            chromadb.AsyncHttpClient(
+                host=CHROMA_HTTP_HOST,
+                port=CHROMA_HTTP_PORT,
+                headers=CHROMA_HTTP_HEADERS,
+                ssl=CHROMA_HTTP_SSL,
+                tenant=CHROMA_TENANT,
+                database=CHROMA_DATABASE,
+                settings=Settings(**self.settings_dict),
+            )
+        )
+
+    async def _get_async_http_client(self):
+        client = self.get_async_client()
+        if client is None:
+            return None
+        try:
+            return await client
+        except Exception as e:
+            log.warning(f'Failed to connect the async chroma client: {e}')
+            return None
+
+    def _result_to_search_result(self, result) -> SearchResult:
+        # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
+        # https://docs.trychroma.com/docs/collections/configure cosine equation
+        distances = [[(2 - dist) / 2 for dist in row] for row in result['distances']]
+
+        return SearchResult(
+            **{
+                'ids': result['ids'],
+                'distances': distances,
+                'documents': result['documents'],
+                'metadatas': result['metadatas'],
+            }
+        )
+
+    def _result_to_get_result(self, result) -> GetResult:
+        return GetResult(
+            **{
+                'ids': [result['ids']],
+                'documents': [result['documents']],
+                'metadatas': [result['metadatas']],
+            }
+        )
+
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
         collection_names = self.client.list_collections()
@@ -82,21 +135,7 @@ class ChromaClient(VectorDBBase):
                     n_results=limit,
                     where=filter,
                 )
-
-                # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
-                # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result['distances'][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
-
-                return SearchResult(
-                    **{
-                        'ids': result['ids'],
-                        'distances': distances,
-                        'documents': result['documents'],
-                        'metadatas': result['metadatas'],
-                    }
-                )
+                return self._result_to_search_result(result)
             return None
         except Exception as e:
             return None
@@ -110,14 +149,7 @@ class ChromaClient(VectorDBBase):
                     where=filter,
                     limit=limit,
                 )
-
-                return GetResult(
-                    **{
-                        'ids': [result['ids']],
-                        'documents': [result['documents']],
-                        'metadatas': [result['metadatas']],
-                    }
-                )
+                return self._result_to_get_result(result)
             return None
         except Exception:
             return None
@@ -127,13 +159,65 @@ class ChromaClient(VectorDBBase):
         collection = self.client.get_collection(name=collection_name)
         if collection:
             result = collection.get()
-            return GetResult(
-                **{
-                    'ids': [result['ids']],
-                    'documents': [result['documents']],
-                    'metadatas': [result['metadatas']],
-                }
-            )
+            return self._result_to_get_result(result)
+        return None
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = await self._get_async_http_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+        return collection_name in await client.list_collections()
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = await self._get_async_http_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            if collection:
+                result = await collection.query(
+                    query_embeddings=vectors,
+                    n_results=limit,
+                    where=filter,
+                )
+                return self._result_to_search_result(result)
+            return None
+        except Exception:
+            return None
+
+    async def aquery(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        client = await self._get_async_http_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit=limit)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            if collection:
+                result = await collection.get(
+                    where=filter,
+                    limit=limit,
+                )
+                return self._result_to_get_result(result)
+            return None
+        except Exception:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = await self._get_async_http_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        collection = await client.get_collection(name=collection_name)
+        if collection:
+            result = await collection.get()
+            return self._result_to_get_result(result)
         return None
 
     def insert(self, collection_name: str, items: list[VectorItem]):
@@ -2,10 +2,10 @@
 NOTE: This vector database integration is community-supported and maintained on a best-effort basis.
 """
 
-from elasticsearch import Elasticsearch, BadRequestError
+from elasticsearch import AsyncElasticsearch, Elasticsearch, BadRequestError
 from typing import Optional
 import ssl
-from elasticsearch.helpers import bulk, scan
+from elasticsearch.helpers import async_scan, bulk, scan
 
 from open_webui.retrieval.vector.utils import process_metadata
 from open_webui.retrieval.vector.main import (
@@ -13,6 +13,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    stack_search_results,
 )
 from open_webui.config import (
     ELASTICSEARCH_URL,
@@ -36,18 +37,22 @@ class ElasticsearchClient(VectorDBBase):
 
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
-        self.client = Elasticsearch(
-            hosts=[ELASTICSEARCH_URL],
-            ca_certs=ELASTICSEARCH_CA_CERTS,
-            api_key=ELASTICSEARCH_API_KEY,
-            cloud_id=ELASTICSEARCH_CLOUD_ID,
-            basic_auth=(
+        self.client_kwargs = {
+            'hosts': [ELASTICSEARCH_URL],
+            'ca_certs': ELASTICSEARCH_CA_CERTS,
+            'api_key': ELASTICSEARCH_API_KEY,
+            'cloud_id': ELASTICSEARCH_CLOUD_ID,
+            'basic_auth': (
                 (ELASTICSEARCH_USERNAME, ELASTICSEARCH_PASSWORD)
                 if ELASTICSEARCH_USERNAME and ELASTICSEARCH_PASSWORD
                 else None
             ),
-            ssl_assert_fingerprint=SSL_ASSERT_FINGERPRINT,
-        )
+            'ssl_assert_fingerprint': SSL_ASSERT_FINGERPRINT,
+        }
+        self.client = Elasticsearch(**self.client_kwargs)
+
+    def _create_async_client(self):
+        return AsyncElasticsearch(**self.client_kwargs)
 
     # Status: works
     def _get_index_name(self, dimension: int) -> str:
@@ -103,6 +108,53 @@ class ElasticsearchClient(VectorDBBase):
             metadatas=[metadatas],
         )
 
+    def _search_body(self, collection_name: str, vectors: list[list[float]], limit: int) -> dict:
+        return {
+            'size': limit,
+            '_source': ['text', 'metadata'],
+            'query': {
+                'script_score': {
+                    'query': {'bool': {'filter': [{'term': {'collection': collection_name}}]}},
+                    'script': {
+                        'source': "cosineSimilarity(params.vector, 'vector') + 1.0",
+                        'params': {'vector': vectors[0]},  # Assuming single query vector
+                    },
+                }
+            },
+        }
+
+    def _msearch_searches(self, collection_names: list[str], vectors: list[list[float]], limit: int) -> list[dict]:
+        searches = []
+        for collection_name in collection_names:
+            for vector in vectors:
+                searches.append({'index': self._get_index_name(len(vector)), 'ignore_unavailable': True})
+                searches.append(self._search_body(collection_name, [vector], limit))
+        return searches
+
+    def _msearch_result_to_search_results(
+        self, collection_names: list[str], num_vectors: int, result
+    ) -> dict[str, Optional[SearchResult]]:
+        responses = [
+            None if 'error' in response else self._result_to_search_result(response) for response in result['responses']
+        ]
+        return {
+            collection_name: stack_search_results(responses[index * num_vectors : (index + 1) * num_vectors])
+            for index, collection_name in enumerate(collection_names)
+        }
+
+    def _query_body(self, collection_name: str, filter: dict) -> dict:
+        return {
+            'query': {
+                'bool': {
+                    'filter': [
+                        *[{'term': {field: value}} for field, value in filter.items()],
+                        {'term': {'collection': collection_name}},
+                    ]
+                }
+            },
+            '_source': ['text', 'metadata'],
+        }
+
     # Status: works
     def _create_index(self, dimension: int):
         body = {
@@ -139,8 +191,7 @@ class ElasticsearchClient(VectorDBBase):
 
     # Status: works
     def has_collection(self, collection_name) -> bool:
-        query_body = {'query': {'bool': {'filter': []}}}
-        query_body['query']['bool']['filter'].append({'term': {'collection': collection_name}})
+        query_body = {'query': {'bool': {'filter': [{'term': {'collection': collection_name}}]}}}
 
         try:
             result = self.client.count(index=f'{self.index_prefix}*', body=query_body)
@@ -161,44 +212,37 @@ class ElasticsearchClient(VectorDBBase):
         filter: Optional[dict] = None,
         limit: int = 10,
     ) -> Optional[SearchResult]:
-        query = {
-            'size': limit,
-            '_source': ['text', 'metadata'],
-            'query': {
-                'script_score': {
-                    'query': {'bool': {'filter': [{'term': {'collection': collection_name}}]}},
-                    'script': {
-                        'source': "cosineSimilarity(params.vector, 'vector') + 1.0",
-                        'params': {'vector': vectors[0]},  # Assuming single query vector
-                    },
-                }
-            },
-        }
-
-        result = self.client.search(index=self._get_index_name(len(vectors[0])), body=query)
+        result = self.client.search(
+            index=self._get_index_name(len(vectors[0])), body=self._search_body(collection_name, vectors, limit)
+        )
 
         return self._result_to_search_result(result)
 
+    def search_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        # One multi search request for all the vectors and collections
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = self.client.msearch(searches=self._msearch_searches(collection_names, vectors, limit))
+        return self._msearch_result_to_search_results(collection_names, len(vectors), result)
+
     # Status: only tested halfwat
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
         if not self.has_collection(collection_name):
             return None
 
-        query_body = {
-            'query': {'bool': {'filter': []}},
-            '_source': ['text', 'metadata'],
-        }
-
-        for field, value in filter.items():
-            query_body['query']['bool']['filter'].append({'term': {field: value}})
-        query_body['query']['bool']['filter'].append({'term': {'collection': collection_name}})
-        size = limit if limit else 10
-
         try:
             result = self.client.search(
                 index=f'{self.index_prefix}*',
-                body=query_body,
-                size=size,
+                body=self._query_body(collection_name, filter),
+                size=limit if limit else 10,
             )
 
             return self._result_to_get_result(result)
@@ -217,12 +261,84 @@ class ElasticsearchClient(VectorDBBase):
     # Status: works
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
-        query = {
-            'query': {'bool': {'filter': [{'term': {'collection': collection_name}}]}},
-            '_source': ['text', 'metadata'],
-        }
-        results = list(scan(self.client, index=f'{self.index_prefix}*', query=query))
+        results = list(scan(self.client, index=f'{self.index_prefix}*', query=self._query_body(collection_name, {})))
+
+        return self._scan_result_to_get_result(results)
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = self.get_async_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+
+        query_body = {'query': {'bool': {'filter': [{'term': {'collection': collection_name}}]}}}
+        try:
+            result = await client.count(index=f'{self.index_prefix}*', body=query_body)
+            return result.body['count'] > 0
+        except Exception:
+            return None
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        result = await client.search(
+            index=self._get_index_name(len(vectors[0])), body=self._search_body(collection_name, vectors, limit)
+        )
+        return self._result_to_search_result(result)
+
+    async def asearch_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch_batch(collection_names, vectors, filter=filter, limit=limit)
+
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = await client.msearch(searches=self._msearch_searches(collection_names, vectors, limit))
+        return self._msearch_result_to_search_results(collection_names, len(vectors), result)
 
+    async def aquery(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit=limit)
+
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            result = await client.search(
+                index=f'{self.index_prefix}*',
+                body=self._query_body(collection_name, filter),
+                size=limit if limit else 10,
+            )
+            return self._result_to_get_result(result)
+        except Exception:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        results = [
+            hit
+            async for hit in async_scan(
+                client, index=f'{self.index_prefix}*', query=self._query_body(collection_name, {})
+            )
+        ]
         return self._scan_result_to_get_result(results)
 
     # Status: works
@@ -2,7 +2,7 @@
 NOTE: This vector database integration is community-supported and maintained on a best-effort basis.
 """
 
-from pymilvus import MilvusClient as Client
+from pymilvus import AsyncMilvusClient, MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 from pymilvus import connections, Collection
 
@@ -34,12 +34,17 @@ log = logging.getLogger(__name__)
 
 
 class MilvusClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         self.collection_prefix = 'open_webui'
-        if MILVUS_TOKEN is None:
-            self.client = Client(uri=MILVUS_URI, db_name=MILVUS_DB)
-        else:
-            self.client = Client(uri=MILVUS_URI, db_name=MILVUS_DB, token=MILVUS_TOKEN)
+        self.client_kwargs = {'uri': MILVUS_URI, 'db_name': MILVUS_DB}
+        if MILVUS_TOKEN is not None:
+            self.client_kwargs['token'] = MILVUS_TOKEN
+        self.client = Client(**self.client_kwargs)
+
+    def _create_async_client(self):
+        return AsyncMilvusClient(**self.client_kwargs)
 
     def _result_to_get_result(self, result) -> GetResult:
         ids = []
@@ -197,6 +202,34 @@ class MilvusClient(VectorDBBase):
         )
         return self._result_to_search_result(result)
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = self.get_async_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+
+        collection_name = collection_name.replace('-', '_')
+        return await client.has_collection(collection_name=f'{self.collection_prefix}_{collection_name}')
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        collection_name = collection_name.replace('-', '_')
+        result = await client.search(
+            collection_name=f'{self.collection_prefix}_{collection_name}',
+            data=vectors,
+            limit=limit,
+            output_fields=['data', 'metadata'],
+        )
+        return self._result_to_search_result(result)
+
     def query(self, collection_name: str, filter: dict, limit: int = -1):
         connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
 
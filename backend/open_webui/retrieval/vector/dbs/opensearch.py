@@ -2,7 +2,7 @@
 NOTE: This vector database integration is community-supported and maintained on a best-effort basis.
 """
 
-from opensearchpy import OpenSearch
+from opensearchpy import AsyncOpenSearch, OpenSearch
 from opensearchpy.helpers import bulk
 from typing import Optional
 
@@ -12,6 +12,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    stack_search_results,
 )
 from open_webui.config import (
     OPENSEARCH_URI,
@@ -25,12 +26,16 @@ from open_webui.config import (
 class OpenSearchClient(VectorDBBase):
     def __init__(self):
         self.index_prefix = 'open_webui'
-        self.client = OpenSearch(
-            hosts=[OPENSEARCH_URI],
-            use_ssl=OPENSEARCH_SSL,
-            verify_certs=OPENSEARCH_CERT_VERIFY,
-            http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
-        )
+        self.client_kwargs = {
+            'hosts': [OPENSEARCH_URI],
+            'use_ssl': OPENSEARCH_SSL,
+            'verify_certs': OPENSEARCH_CERT_VERIFY,
+            'http_auth': (OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
+        }
+        self.client = OpenSearch(**self.client_kwargs)
+
+    def _create_async_client(self):
+        return AsyncOpenSearch(**self.client_kwargs)
 
     def _get_index_name(self, collection_name: str) -> str:
         return f'{self.index_prefix}_{collection_name}'
@@ -72,6 +77,55 @@ class OpenSearchClient(VectorDBBase):
             metadatas=[metadatas],
         )
 
+    def _search_body(self, vectors: list[list[float | int]], limit: int) -> dict:
+        return {
+            'size': limit,
+            '_source': ['text', 'metadata'],
+            'query': {
+                'script_score': {
+                    'query': {'match_all': {}},
+                    'script': {
+                        'source': '(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0',
+                        'params': {
+                            'field': 'vector',
+                            'query_value': vectors[0],
+                        },  # Assuming single query vector
+                    },
+                }
+            },
+        }
+
+    def _msearch_body(self, collection_names: list[str], vectors: list[list[float | int]], limit: int) -> list[dict]:
+        body = []
+        for collection_name in collection_names:
+            for vector in vectors:
+                body.append({'index': self._get_index_name(collection_name), 'ignore_unavailable': True})
+                body.append(self._search_body([vector], limit))
+        return body
+
+    def _msearch_result_to_search_results(
+        self, collection_names: list[str], num_vectors: int, result
+    ) -> dict[str, Optional[SearchResult]]:
+        responses = [
+            None if 'error' in response else self._result_to_search_result(response) for response in result['responses']
+        ]
+        return {
+            collection_name: stack_search_results(responses[index * num_vectors : (index + 1) * num_vectors])
+            for index, collection_name in enumerate(collection_names)
+        }
+
+    def _query_body(self, filter: dict) -> dict:
+        return {
+            'query': {
+                'bool': {
+                    'filter': [
+                        {'term': {'metadata.' + str(field) + '.keyword': value}} for field, value in filter.items()
+                    ]
+                }
+            },
+            '_source': ['text', 'metadata'],
+        }
+
     def _create_index(self, collection_name: str, dimension: int):
         body = {
             'settings': {'index': {'knn': True}},
@@ -125,49 +179,42 @@ class OpenSearchClient(VectorDBBase):
             if not self.has_collection(collection_name):
                 return None
 
-            query = {
-                'size': limit,
-                '_source': ['text', 'metadata'],
-                'query': {
-                    'script_score': {
-                        'query': {'match_all': {}},
-                        'script': {
-                            'source': '(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0',
-                            'params': {
-                                'field': 'vector',
-                                'query_value': vectors[0],
-                            },  # Assuming single query vector
-                        },
-                    }
-                },
-            }
-
-            result = self.client.search(index=self._get_index_name(collection_name), body=query)
+            result = self.client.search(
+                index=self._get_index_name(collection_name), body=self._search_body(vectors, limit)
+            )
 
             return self._result_to_search_result(result)
 
         except Exception as e:
             return None
 
+    def search_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        # One multi search request for all the vectors and collections, missing indices give no results
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        try:
+            result = self.client.msearch(body=self._msearch_body(collection_names, vectors, limit))
+            return self._msearch_result_to_search_results(collection_names, len(vectors), result)
+        except Exception:
+            return {collection_name: None for collection_name in collection_names}
+
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
         if not self.has_collection(collection_name):
             return None
 
-        query_body = {
-            'query': {'bool': {'filter': []}},
-            '_source': ['text', 'metadata'],
-        }
-
-        for field, value in filter.items():
-            query_body['query']['bool']['filter'].append({'term': {'metadata.' + str(field) + '.keyword': value}})
-
-        size = limit if limit else 10000
-
         try:
             result = self.client.search(
                 index=self._get_index_name(collection_name),
-                body=query_body,
-                size=size,
+                body=self._query_body(filter),
+                size=limit if limit else 10000,
             )
 
             return self._result_to_get_result(result)
@@ -185,6 +232,81 @@ class OpenSearchClient(VectorDBBase):
         result = self.client.search(index=self._get_index_name(collection_name), body=query)
         return self._result_to_get_result(result)
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = self.get_async_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+        return await client.indices.exists(index=self._get_index_name(collection_name))
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        try:
+            if not await self.ahas_collection(collection_name):
+                return None
+
+            result = await client.search(
+                index=self._get_index_name(collection_name), body=self._search_body(vectors, limit)
+            )
+            return self._result_to_search_result(result)
+        except Exception:
+            return None
+
+    async def asearch_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch_batch(collection_names, vectors, filter=filter, limit=limit)
+
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        try:
+            result = await client.msearch(body=self._msearch_body(collection_names, vectors, limit))
+            return self._msearch_result_to_search_results(collection_names, len(vectors), result)
+        except Exception:
+            return {collection_name: None for collection_name in collection_names}
+
+    async def aquery(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit=limit)
+
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            result = await client.search(
+                index=self._get_index_name(collection_name),
+                body=self._query_body(filter),
+                size=limit if limit else 10000,
+            )
+            return self._result_to_get_result(result)
+        except Exception:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        query = {'query': {'match_all': {}}, '_source': ['text', 'metadata']}
+        result = await client.search(index=self._get_index_name(collection_name), body=query)
+        return self._result_to_get_result(result)
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         self._create_index_if_not_exists(collection_name=collection_name, dimension=len(items[0]['vector']))
 
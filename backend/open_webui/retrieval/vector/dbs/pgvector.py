@@ -1,4 +1,5 @@
 from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
 import json
 from sqlalchemy import (
@@ -17,6 +18,8 @@ from sqlalchemy import (
     Table,
     values,
 )
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
@@ -34,6 +37,7 @@ from open_webui.retrieval.vector.main import (
     SearchResult,
     GetResult,
 )
+from open_webui.env import DATABASE_URL
 from open_webui.config import (
     PGVECTOR_DB_URL,
     PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH,
@@ -69,6 +73,56 @@ def pgcrypto_decrypt(col, key, outtype='text'):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+# libpq connection parameters asyncpg doesn't understand. It sends unknown parameters to the server as settings,
+# which rejects these, so they're dropped (connect_timeout and fallback_application_name are translated)
+LIBPQ_ONLY_PARAMS = {
+    'channel_binding',
+    'client_encoding',
+    'connect_timeout',
+    'fallback_application_name',
+    'gssdelegation',
+    'gssencmode',
+    'hostaddr',
+    'keepalives',
+    'keepalives_count',
+    'keepalives_idle',
+    'keepalives_interval',
+    'load_balance_hosts',
+    'replication',
+    'require_auth',
+    'requirepeer',
+    'requiressl',
+    'service',
+    'sslcompression',
+    'sslsni',
+    'tcp_user_timeout',
+}
+
+
+def get_asyncpg_connect_args(database_url: str) -> tuple[str, dict]:
+    """The DSN and keyword arguments of asyncpg.connect() for a SQLAlchemy/libpq database URL."""
+    url = make_url(database_url)
+    query = dict(url.query)
+    kwargs = {}
+
+    connect_timeout = query.get('connect_timeout')
+    if connect_timeout:
+        try:
+            kwargs['timeout'] = float(connect_timeout)
+        except ValueError:
+            pass
+    if 'fallback_application_name' in query and 'application_name' not in query:
+        query['application_name'] = query['fallback_application_name']
+
+    dropped = sorted(LIBPQ_ONLY_PARAMS.intersection(query) - {'connect_timeout', 'fallback_application_name'})
+    if dropped:
+        log.info(f'Connection parameters not supported by asyncpg, ignored for async pgvector queries: {dropped}')
+
+    query = {key: value for key, value in query.items() if key not in LIBPQ_ONLY_PARAMS}
+    dsn = url.set(drivername='postgresql', query=query).render_as_string(hide_password=False)
+    return dsn, kwargs
+
+
 class DocumentChunk(Base):
     __tablename__ = 'document_chunk'
 
@@ -390,6 +444,163 @@ class PgvectorClient(VectorDBBase):
             log.exception(f'Error during upsert: {e}')
             raise
 
+    def _search_statement(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ):
+        """
+        Nearest neighbours of each vector in each collection, the query of the
+        i-th collection and j-th vector having qid i * len(vectors) + j.
+        """
+
+        def vector_expr(vector):
+            return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+
+        # Create the values for query vectors
+        qid_col = column('qid', Integer)
+        q_collection_col = column('q_collection_name', Text)
+        q_vector_col = column('q_vector', VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        query_vectors = (
+            values(qid_col, q_collection_col, q_vector_col)
+            .data(
+                [
+                    (collection_idx * len(vectors) + idx, collection_name, vector_expr(vector))
+                    for collection_idx, collection_name in enumerate(collection_names)
+                    for idx, vector in enumerate(vectors)
+                ]
+            )
+            .alias('query_vectors')
+        )
+
+        result_fields = [
+            DocumentChunk.id,
+        ]
+        if PGVECTOR_PGCRYPTO:
+            result_fields.append(pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label('text'))
+            result_fields.append(
+                pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB).label('vmetadata')
+            )
+        else:
+            result_fields.append(DocumentChunk.text)
+            result_fields.append(DocumentChunk.vmetadata)
+        result_fields.append((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label('distance'))
+
+        # Build the lateral subquery for each query vector
+        where_clauses = [DocumentChunk.collection_name == query_vectors.c.q_collection_name]
+
+        # Apply metadata filter if provided
+        if filter:
+            for key, value in filter.items():
+                if isinstance(value, dict) and '$in' in value:
+                    # Handle $in operator: {"field": {"$in": [values]}}
+                    in_values = value['$in']
+                    if PGVECTOR_PGCRYPTO:
+                        where_clauses.append(
+                            pgcrypto_decrypt(
+                                DocumentChunk.vmetadata,
+                                PGVECTOR_PGCRYPTO_KEY,
+                                JSONB,
+                            )[key].astext.in_([str(v) for v in in_values])
+                        )
+                    else:
+                        where_clauses.append(DocumentChunk.vmetadata[key].astext.in_([str(v) for v in in_values]))
+                else:
+                    # Handle simple equality: {"field": "value"}
+                    if PGVECTOR_PGCRYPTO:
+                        where_clauses.append(
+                            pgcrypto_decrypt(
+                                DocumentChunk.vmetadata,
+                                PGVECTOR_PGCRYPTO_KEY,
+                                JSONB,
+                            )[key].astext
+                            == str(value)
+                        )
+                    else:
+                        where_clauses.append(DocumentChunk.vmetadata[key].astext == str(value))
+
+        subq = (
+            select(*result_fields)
+            .where(*where_clauses)
+            .order_by((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)))
+        )
+        if limit is not None:
+            subq = subq.limit(limit)
+        subq = subq.lateral('result')
+
+        # Build the main query by joining query_vectors and the lateral subquery
+        return (
+            select(
+                query_vectors.c.qid,
+                subq.c.id,
+                subq.c.text,
+                subq.c.vmetadata,
+                subq.c.distance,
+            )
+            .select_from(query_vectors)
+            .join(subq, true())
+            .order_by(query_vectors.c.qid, subq.c.distance)
+        )
+
+    def _rows_to_search_result(self, results, num_queries: int) -> SearchResult:
+        ids = [[] for _ in range(num_queries)]
+        distances = [[] for _ in range(num_queries)]
+        documents = [[] for _ in range(num_queries)]
+        metadatas = [[] for _ in range(num_queries)]
+
+        for row in results:
+            qid = int(row.qid)
+            ids[qid].append(row.id)
+            # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+            # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+            distances[qid].append((2.0 - row.distance) / 2.0)
+            documents[qid].append(row.text)
+            metadatas[qid].append(row.vmetadata)
+
+        return SearchResult(ids=ids, distances=distances, documents=documents, metadatas=metadatas)
+
+    def _split_search_result(
+        self, result: SearchResult, collection_names: List[str], num_vectors: int
+    ) -> Dict[str, Optional[SearchResult]]:
+        def rows(values, index):
+            return values[index * num_vectors : (index + 1) * num_vectors]
+
+        return {
+            collection_name: SearchResult(
+                ids=rows(result.ids, index),
+                distances=rows(result.distances, index),
+                documents=rows(result.documents, index),
+                metadatas=rows(result.metadatas, index),
+            )
+            for index, collection_name in enumerate(collection_names)
+        }
+
+    def _select_chunks(
+        self, collection_name: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None
+    ):
+        where_clauses = [DocumentChunk.collection_name == collection_name]
+        if PGVECTOR_PGCRYPTO:
+            fields = [
+                DocumentChunk.id,
+                pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label('text'),
+                pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB).label('vmetadata'),
+            ]
+            for key, value in (filter or {}).items():
+                where_clauses.append(
+                    pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB)[key].astext == str(value)
+                )
+        else:
+            fields = [DocumentChunk.id, DocumentChunk.text, DocumentChunk.vmetadata]
+            for key, value in (filter or {}).items():
+                where_clauses.append(DocumentChunk.vmetadata[key].astext == str(value))
+
+        stmt = select(*fields).where(*where_clauses)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
     def search(
         self,
         collection_name: str,
@@ -403,121 +614,41 @@ class PgvectorClient(VectorDBBase):
 
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-
-            # Create the values for query vectors
-            qid_col = column('qid', Integer)
-            q_vector_col = column('q_vector', VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data([(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)])
-                .alias('query_vectors')
-            )
 
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label('text'))
-                result_fields.append(
-                    pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB).label('vmetadata')
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label('distance'))
-
-            # Build the lateral subquery for each query vector
-            where_clauses = [DocumentChunk.collection_name == collection_name]
-
-            # Apply metadata filter if provided
-            if filter:
-                for key, value in filter.items():
-                    if isinstance(value, dict) and '$in' in value:
-                        # Handle $in operator: {"field": {"$in": [values]}}
-                        in_values = value['$in']
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext.in_([str(v) for v in in_values])
-                            )
-                        else:
-                            where_clauses.append(DocumentChunk.vmetadata[key].astext.in_([str(v) for v in in_values]))
-                    else:
-                        # Handle simple equality: {"field": "value"}
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext
-                                == str(value)
-                            )
-                        else:
-                            where_clauses.append(DocumentChunk.vmetadata[key].astext == str(value))
-
-            subq = (
-                select(*result_fields)
-                .where(*where_clauses)
-                .order_by((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)))
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral('result')
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
-                )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
-
-            result_proxy = self.session.execute(stmt)
+            result_proxy = self.session.execute(self._search_statement([collection_name], vectors, filter, limit))
             results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
-
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
-
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
-
             self.session.rollback()  # read-only transaction
-            return SearchResult(ids=ids, distances=distances, documents=documents, metadatas=metadatas)
+            return self._rows_to_search_result(results, len(vectors))
         except Exception as e:
             self.session.rollback()
             log.exception(f'Error during search: {e}')
             return None
 
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        # All the vectors and collections are searched in one statement
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        try:
+            vectors = [self.adjust_vector_length(vector) for vector in vectors]
+            results = self.session.execute(self._search_statement(collection_names, vectors, filter, limit)).all()
+            self.session.rollback()  # read-only transaction
+
+            result = self._rows_to_search_result(results, len(collection_names) * len(vectors))
+            return self._split_search_result(result, collection_names, len(vectors))
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f'Error during batch search: {e}')
+            return {collection_name: None for collection_name in collection_names}
+
     def query(self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None) -> Optional[GetResult]:
         try:
             if PGVECTOR_PGCRYPTO:
@@ -649,6 +780,154 @@ class PgvectorClient(VectorDBBase):
     def close(self) -> None:
         pass
 
+    def _create_async_client(self):
+        # Served natively over asyncpg when it's installed, the other operations stay on the thread pool
+        try:
+            import asyncpg
+        except ImportError:
+            return None
+
+        # asyncpg parses the libpq DSN itself (sslmode, sslrootcert, target_session_attrs, options, ...)
+        dsn, connect_kwargs = get_asyncpg_connect_args(PGVECTOR_DB_URL or DATABASE_URL)
+
+        async def connect():
+            return await asyncpg.connect(dsn, **connect_kwargs)
+
+        url = 'postgresql+asyncpg://'
+        if isinstance(PGVECTOR_POOL_SIZE, int) and PGVECTOR_POOL_SIZE > 0:
+            return create_async_engine(
+                url,
+                async_creator=connect,
+                pool_size=PGVECTOR_POOL_SIZE,
+                max_overflow=PGVECTOR_POOL_MAX_OVERFLOW,
+                pool_timeout=PGVECTOR_POOL_TIMEOUT,
+                pool_recycle=PGVECTOR_POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+        elif isinstance(PGVECTOR_POOL_SIZE, int):
+            return create_async_engine(url, async_creator=connect, pool_pre_ping=True, poolclass=NullPool)
+        return create_async_engine(url, async_creator=connect, pool_pre_ping=True)
+
+    # A failure of the native client falls back to the thread-pool (psycopg2) path, so a connection or driver
+    # problem specific to asyncpg shows in the logs instead of silently returning no results. The fallback is
+    # remembered, later calls go to the thread pool directly instead of failing over asyncpg first.
+
+    async def _fall_back(self, engine, operation: str, e: Exception):
+        if self.__dict__.get('_async_client_state', (None, None))[1] is not engine:
+            # Another call already fell back
+            return
+
+        log.warning(f'{operation} over asyncpg failed, using the thread pool from now on: {e}')
+        self._async_client_state = (asyncio.get_running_loop(), None)
+        try:
+            await engine.dispose()
+        except Exception:
+            pass
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        engine = self.get_async_client()
+        if engine is not None:
+            try:
+                async with engine.connect() as connection:
+                    result = await connection.execute(
+                        select(DocumentChunk.id).where(DocumentChunk.collection_name == collection_name).limit(1)
+                    )
+                    return result.first() is not None
+            except Exception as e:
+                await self._fall_back(engine, 'Checking collection existence', e)
+
+        return await super().ahas_collection(collection_name)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if not vectors:
+            return None
+
+        engine = self.get_async_client()
+        if engine is not None:
+            try:
+                adjusted_vectors = [self.adjust_vector_length(vector) for vector in vectors]
+                async with engine.connect() as connection:
+                    result = await connection.execute(
+                        self._search_statement([collection_name], adjusted_vectors, filter, limit)
+                    )
+                    return self._rows_to_search_result(result.all(), len(adjusted_vectors))
+            except Exception as e:
+                await self._fall_back(engine, 'Search', e)
+
+        return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+    async def asearch_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        engine = self.get_async_client()
+        if engine is not None:
+            try:
+                adjusted_vectors = [self.adjust_vector_length(vector) for vector in vectors]
+                async with engine.connect() as connection:
+                    results = await connection.execute(
+                        self._search_statement(collection_names, adjusted_vectors, filter, limit)
+                    )
+                    result = self._rows_to_search_result(results.all(), len(collection_names) * len(adjusted_vectors))
+                return self._split_search_result(result, collection_names, len(adjusted_vectors))
+            except Exception as e:
+                await self._fall_back(engine, 'Batch search', e)
+
+        return await self.run_sync(self.search_batch, collection_names, vectors, filter=filter, limit=limit)
+
+    async def aquery(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        engine = self.get_async_client()
+        if engine is not None:
+            try:
+                async with engine.connect() as connection:
+                    results = (await connection.execute(self._select_chunks(collection_name, filter, limit))).all()
+
+                if not results:
+                    return None
+                return GetResult(
+                    ids=[[row.id for row in results]],
+                    documents=[[row.text for row in results]],
+                    metadatas=[[row.vmetadata for row in results]],
+                )
+            except Exception as e:
+                await self._fall_back(engine, 'Query', e)
+
+        return await super().aquery(collection_name, filter, limit=limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        engine = self.get_async_client()
+        if engine is not None:
+            try:
+                async with engine.connect() as connection:
+                    results = (await connection.execute(self._select_chunks(collection_name))).all()
+
+                if not results and not PGVECTOR_PGCRYPTO:
+                    return None
+                return GetResult(
+                    ids=[[row.id for row in results]],
+                    documents=[[row.text for row in results]],
+                    metadatas=[[row.vmetadata for row in results]],
+                )
+            except Exception as e:
+                await self._fall_back(engine, 'Get', e)
+
+        return await super().aget(collection_name)
+
     def has_collection(self, collection_name: str) -> bool:
         try:
             exists = (
@@ -3,10 +3,11 @@ NOTE: This vector database integration is community-supported and maintained on
 """
 
 from typing import Optional
+import asyncio
 import logging
 from urllib.parse import urlparse
 
-from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
@@ -15,6 +16,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    stack_search_results,
 )
 from open_webui.config import (
     QDRANT_URI,
@@ -53,20 +55,24 @@ class QdrantClient(VectorDBBase):
         http_port = parsed.port or 6333  # default REST port
 
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+            self.client_kwargs = {
+                'host': host,
+                'port': http_port,
+                'grpc_port': self.GRPC_PORT,
+                'prefer_grpc': self.PREFER_GRPC,
+                'api_key': self.QDRANT_API_KEY,
+                'timeout': self.QDRANT_TIMEOUT,
+            }
         else:
-            self.client = Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=QDRANT_TIMEOUT,
-            )
+            self.client_kwargs = {
+                'url': self.QDRANT_URI,
+                'api_key': self.QDRANT_API_KEY,
+                'timeout': QDRANT_TIMEOUT,
+            }
+        self.client = Qclient(**self.client_kwargs)
+
+    def _create_async_client(self):
+        return AsyncQdrantClient(**self.client_kwargs) if self.client else None
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -87,6 +93,28 @@ class QdrantClient(VectorDBBase):
             }
         )
 
+    def _result_to_search_result(self, points) -> SearchResult:
+        get_result = self._result_to_get_result(points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances=[[(point.score + 1.0) / 2.0 for point in points]],
+        )
+
+    def _filter_to_conditions(self, filter: dict) -> list:
+        return [
+            models.FieldCondition(key=f'metadata.{key}', match=models.MatchValue(value=value))
+            for key, value in filter.items()
+        ]
+
+    def _query_requests(self, vectors: list[list[float | int]], limit: Optional[int]) -> list[models.QueryRequest]:
+        return [
+            models.QueryRequest(query=vector, limit=NO_LIMIT if limit is None else limit, with_payload=True)
+            for vector in vectors
+        ]
+
     def _create_collection(self, collection_name: str, dimension: int):
         collection_name_with_prefix = f'{self.collection_prefix}_{collection_name}'
         self.client.create_collection(
@@ -158,14 +186,30 @@ class QdrantClient(VectorDBBase):
             query=vectors[0],
             limit=limit,
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._result_to_search_result(query_response.points)
+
+    def search_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        # All the vectors of a collection are searched in one request
+        results = {}
+        for collection_name in dict.fromkeys(collection_names):
+            try:
+                responses = self.client.query_batch_points(
+                    collection_name=f'{self.collection_prefix}_{collection_name}',
+                    requests=self._query_requests(vectors, limit),
+                )
+                results[collection_name] = stack_search_results(
+                    [self._result_to_search_result(response.points) for response in responses]
+                )
+            except Exception as e:
+                log.exception(f"Error searching collection '{collection_name}': {e}")
+                results[collection_name] = None
+        return results
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
@@ -175,15 +219,9 @@ class QdrantClient(VectorDBBase):
             if limit is None:
                 limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(key=f'metadata.{key}', match=models.MatchValue(value=value))
-                )
-
             points = self.client.scroll(
                 collection_name=f'{self.collection_prefix}_{collection_name}',
-                scroll_filter=models.Filter(should=field_conditions),
+                scroll_filter=models.Filter(should=self._filter_to_conditions(filter)),
                 limit=limit,
             )
             return self._result_to_get_result(points[0])
@@ -199,6 +237,85 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = self.get_async_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+        return await client.collection_exists(f'{self.collection_prefix}_{collection_name}')
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        query_response = await client.query_points(
+            collection_name=f'{self.collection_prefix}_{collection_name}',
+            query=vectors[0],
+            limit=NO_LIMIT if limit is None else limit,
+        )
+        return self._result_to_search_result(query_response.points)
+
+    async def asearch_batch(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch_batch(collection_names, vectors, filter=filter, limit=limit)
+
+        async def search_collection(collection_name: str) -> Optional[SearchResult]:
+            try:
+                responses = await client.query_batch_points(
+                    collection_name=f'{self.collection_prefix}_{collection_name}',
+                    requests=self._query_requests(vectors, limit),
+                )
+                return stack_search_results([self._result_to_search_result(response.points) for response in responses])
+            except Exception as e:
+                log.exception(f"Error searching collection '{collection_name}': {e}")
+                return None
+
+        collection_names = list(dict.fromkeys(collection_names))
+        results = await asyncio.gather(*[search_collection(collection_name) for collection_name in collection_names])
+        return dict(zip(collection_names, results))
+
+    async def aquery(self, collection_name: str, filter: dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit=limit)
+
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            points = await client.scroll(
+                collection_name=f'{self.collection_prefix}_{collection_name}',
+                scroll_filter=models.Filter(should=self._filter_to_conditions(filter)),
+                limit=NO_LIMIT if limit is None else limit,
+            )
+            return self._result_to_get_result(points[0])
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        points = await client.scroll(
+            collection_name=f'{self.collection_prefix}_{collection_name}',
+            limit=NO_LIMIT,
+        )
+        return self._result_to_get_result(points[0])
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]['vector']))
@@ -2,6 +2,7 @@
 NOTE: This vector database integration is community-supported and maintained on a best-effort basis.
 """
 
+import asyncio
 import logging
 from typing import Optional, Tuple, List, Dict, Any
 from urllib.parse import urlparse
@@ -22,8 +23,9 @@ from open_webui.retrieval.vector.main import (
     SearchResult,
     VectorDBBase,
     VectorItem,
+    stack_search_results,
 )
-from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
@@ -62,22 +64,23 @@ class QdrantClient(VectorDBBase):
         host = parsed.hostname or self.QDRANT_URI
         http_port = parsed.port or 6333  # default REST port
 
-        self.client = (
-            Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+        self.client_kwargs = (
+            {
+                'host': host,
+                'port': http_port,
+                'grpc_port': self.GRPC_PORT,
+                'prefer_grpc': self.PREFER_GRPC,
+                'api_key': self.QDRANT_API_KEY,
+                'timeout': self.QDRANT_TIMEOUT,
+            }
             if self.PREFER_GRPC
-            else Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+            else {
+                'url': self.QDRANT_URI,
+                'api_key': self.QDRANT_API_KEY,
+                'timeout': self.QDRANT_TIMEOUT,
+            }
         )
+        self.client = Qclient(**self.client_kwargs)
 
         # Main collection types for multi-tenancy
         self.MEMORY_COLLECTION = f'{self.collection_prefix}_memories'
@@ -86,6 +89,9 @@ class QdrantClient(VectorDBBase):
         self.WEB_SEARCH_COLLECTION = f'{self.collection_prefix}_web-search'
         self.HASH_BASED_COLLECTION = f'{self.collection_prefix}_hash-based'
 
+    def _create_async_client(self):
+        return AsyncQdrantClient(**self.client_kwargs)
+
     def _result_to_get_result(self, points) -> GetResult:
         ids, documents, metadatas = [], [], []
         for point in points:
@@ -95,6 +101,15 @@ class QdrantClient(VectorDBBase):
             metadatas.append(payload['metadata'])
         return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
 
+    def _result_to_search_result(self, points) -> SearchResult:
+        get_result = self._result_to_get_result(points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            distances=[[(point.score + 1.0) / 2.0 for point in points]],
+        )
+
     def _get_collection_and_tenant_id(self, collection_name: str) -> Tuple[str, str]:
         """
         Maps the traditional collection name to multi-tenant collection and tenant ID.
@@ -130,6 +145,44 @@ class QdrantClient(VectorDBBase):
         else:
             return self.KNOWLEDGE_COLLECTION, tenant_id
 
+    def _group_by_collection(self, collection_names: List[str]) -> Dict[str, List[str]]:
+        """Group collection names by the multi-tenant collection holding them."""
+        groups = {}
+        for collection_name in dict.fromkeys(collection_names):
+            mt_collection, _ = self._get_collection_and_tenant_id(collection_name)
+            groups.setdefault(mt_collection, []).append(collection_name)
+        return groups
+
+    def _query_requests(
+        self, collection_names: List[str], vectors: List[List[float | int]], limit: Optional[int]
+    ) -> List[models.QueryRequest]:
+        requests = []
+        for collection_name in collection_names:
+            _, tenant_id = self._get_collection_and_tenant_id(collection_name)
+            requests.extend(
+                models.QueryRequest(
+                    query=vector,
+                    filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+                    limit=NO_LIMIT if limit is None else limit,
+                    with_payload=True,
+                )
+                for vector in vectors
+            )
+        return requests
+
+    def _responses_to_search_results(
+        self, collection_names: List[str], num_vectors: int, responses
+    ) -> Dict[str, Optional[SearchResult]]:
+        return {
+            collection_name: stack_search_results(
+                [
+                    self._result_to_search_result(response.points)
+                    for response in responses[index * num_vectors : (index + 1) * num_vectors]
+                ]
+            )
+            for index, collection_name in enumerate(collection_names)
+        }
+
     def _create_multi_tenant_collection(self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION):
         """
         Creates a collection with multi-tenancy configuration and payload indexes for tenant_id and metadata fields.
@@ -263,13 +316,34 @@ class QdrantClient(VectorDBBase):
             limit=limit,
             query_filter=models.Filter(must=[tenant_filter]),
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._result_to_search_result(query_response.points)
+
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float | int]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """
+        Search the vectors of all the tenants sharing a multi-tenant collection in one request.
+        """
+        results = {collection_name: None for collection_name in collection_names}
+        if not self.client or not vectors:
+            return results
+
+        for mt_collection, tenant_collections in self._group_by_collection(collection_names).items():
+            try:
+                if not self.client.collection_exists(collection_name=mt_collection):
+                    continue
+                responses = self.client.query_batch_points(
+                    collection_name=mt_collection,
+                    requests=self._query_requests(tenant_collections, vectors, limit),
+                )
+                results.update(self._responses_to_search_results(tenant_collections, len(vectors), responses))
+            except Exception as e:
+                log.exception(f'Error searching collection {mt_collection}: {e}')
+        return results
 
     def query(self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None):
         """
@@ -311,6 +385,118 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        client = self.get_async_client()
+        if client is None:
+            return await super().ahas_collection(collection_name)
+
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await client.collection_exists(collection_name=mt_collection):
+            return False
+        count_result = await client.count(
+            collection_name=mt_collection,
+            count_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        )
+        return count_result.count > 0
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[float | int]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter=filter, limit=limit)
+
+        if not vectors:
+            return None
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
+            return None
+
+        query_response = await client.query_points(
+            collection_name=mt_collection,
+            query=vectors[0],
+            limit=limit,
+            query_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        )
+        return self._result_to_search_result(query_response.points)
+
+    async def asearch_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float | int]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().asearch_batch(collection_names, vectors, filter=filter, limit=limit)
+
+        results = {collection_name: None for collection_name in collection_names}
+        if not vectors:
+            return results
+
+        async def search_collection(mt_collection: str, tenant_collections: List[str]):
+            try:
+                if not await client.collection_exists(collection_name=mt_collection):
+                    return
+                responses = await client.query_batch_points(
+                    collection_name=mt_collection,
+                    requests=self._query_requests(tenant_collections, vectors, limit),
+                )
+                results.update(self._responses_to_search_results(tenant_collections, len(vectors), responses))
+            except Exception as e:
+                log.exception(f'Error searching collection {mt_collection}: {e}')
+
+        await asyncio.gather(
+            *[
+                search_collection(mt_collection, tenant_collections)
+                for mt_collection, tenant_collections in self._group_by_collection(collection_names).items()
+            ]
+        )
+        return results
+
+    async def aquery(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit=limit)
+
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, query returns None")
+            return None
+
+        field_conditions = [_metadata_filter(k, v) for k, v in filter.items()]
+        points = await client.scroll(
+            collection_name=mt_collection,
+            scroll_filter=models.Filter(must=[_tenant_filter(tenant_id), *field_conditions]),
+            limit=NO_LIMIT if limit is None else limit,
+        )
+        return self._result_to_get_result(points[0])
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = self.get_async_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, get returns None")
+            return None
+
+        points = await client.scroll(
+            collection_name=mt_collection,
+            scroll_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+            limit=NO_LIMIT,
+        )
+        return self._result_to_get_result(points[0])
+
     def upsert(self, collection_name: str, items: List[VectorItem]):
         """
         Upsert items with tenant ID.
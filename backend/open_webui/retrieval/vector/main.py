@@ -1,7 +1,21 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
+from open_webui.env import VECTOR_DB_THREAD_POOL_SIZE
+
+log = logging.getLogger(__name__)
+
+# Runs the sync calls of backends without a native async client, so a slow vector DB
+# doesn't tie up the default executor shared with the rest of the app
+VECTOR_DB_EXECUTOR = ThreadPoolExecutor(max_workers=VECTOR_DB_THREAD_POOL_SIZE, thread_name_prefix='vector-db')
+
 
 class VectorItem(BaseModel):
     id: str
@@ -20,6 +34,22 @@ class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+def stack_search_results(results: List[Optional[SearchResult]]) -> Optional[SearchResult]:
+    """
+    Stack single vector search results into one SearchResult with a row per
+    result, the row of a missing result being empty. None if all are missing.
+    """
+    if all(result is None for result in results):
+        return None
+
+    rows = {'ids': [], 'distances': [], 'documents': [], 'metadatas': []}
+    for result in results:
+        for key, values in rows.items():
+            result_rows = getattr(result, key, None) if result is not None else None
+            values.append(result_rows[0] if result_rows else [])
+    return SearchResult(**rows)
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -29,8 +59,23 @@ class VectorDBBase(ABC):
 
     Any custom vector database integration must inherit from this class and
     implement all abstract methods.
+
+    Each method has an async counterpart (`asearch`, `ainsert`, ...) which by
+    default runs the sync method on the vector DB thread pool. Backends with a
+    native async client return it from `_create_async_client` and override
+    the async methods they serve natively.
+
+    `search_batch` searches many vectors across many collections at once. By
+    default it issues one search per vector and collection (one per collection
+    when `multi_vector_search` is set), backends able to do it in fewer round
+    trips override it.
     """
 
+    _async_client_lock = threading.Lock()
+
+    # Whether `search` returns a row per query vector rather than only using the first one
+    multi_vector_search: bool = False
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -62,6 +107,32 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """
+        Search every vector in every collection. Returns the result of each
+        collection with a row per vector, None for a collection that doesn't
+        exist or couldn't be searched.
+        """
+        results = {}
+        for collection_name in dict.fromkeys(collection_names):
+            try:
+                if self.multi_vector_search:
+                    results[collection_name] = self.search(collection_name, vectors, filter=filter, limit=limit)
+                else:
+                    results[collection_name] = stack_search_results(
+                        [self.search(collection_name, [vector], filter=filter, limit=limit) for vector in vectors]
+                    )
+            except Exception as e:
+                log.exception(f'Error searching collection {collection_name}: {e}')
+                results[collection_name] = None
+        return results
+
     @abstractmethod
     def query(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
         """Query vectors from a collection using metadata filter."""
@@ -86,3 +157,94 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def _create_async_client(self) -> Any:
+        """The backend's native async client, None if it has none."""
+        return None
+
+    def get_async_client(self) -> Any:
+        """
+        The native async client, created on first use and bound to that event
+        loop. None when the backend has none or it's called from another loop,
+        in which case the async methods fall back to the thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        state = self.__dict__.get('_async_client_state')
+        if state is None:
+            with self._async_client_lock:
+                state = self.__dict__.get('_async_client_state')
+                if state is None:
+                    try:
+                        client = self._create_async_client()
+                    except Exception as e:
+                        log.warning(f'Failed to create the async client of {type(self).__name__}: {e}')
+                        client = None
+                    state = self._async_client_state = (loop, client)
+        return state[1] if state[0] is loop else None
+
+    async def run_sync(self, func, *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            VECTOR_DB_EXECUTOR, functools.partial(func, *args, **kwargs)
+        )
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.run_sync(self.has_collection, collection_name)
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        return await self.run_sync(self.delete_collection, collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self.run_sync(self.insert, collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self.run_sync(self.upsert, collection_name, items)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        return await self.run_sync(self.search, collection_name, vectors, filter=filter, limit=limit)
+
+    async def asearch_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        async def search_collection(collection_name: str) -> Optional[SearchResult]:
+            try:
+                if self.multi_vector_search:
+                    return await self.asearch(collection_name, vectors, filter=filter, limit=limit)
+                return stack_search_results(
+                    await asyncio.gather(
+                        *[self.asearch(collection_name, [vector], filter=filter, limit=limit) for vector in vectors]
+                    )
+                )
+            except Exception as e:
+                log.exception(f'Error searching collection {collection_name}: {e}')
+                return None
+
+        collection_names = list(dict.fromkeys(collection_names))
+        results = await asyncio.gather(*[search_collection(collection_name) for collection_name in collection_names])
+        return dict(zip(collection_names, results))
+
+    async def aquery(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
+        return await self.run_sync(self.query, collection_name, filter, limit=limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        return await self.run_sync(self.get, collection_name)
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await self.run_sync(self.delete, collection_name, ids=ids, filter=filter)
+
+    async def areset(self) -> None:
+        return await self.run_sync(self.reset)
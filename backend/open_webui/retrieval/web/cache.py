@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    WEB_SEARCH_CACHE_BACKEND,
+    WEB_SEARCH_CACHE_MAX_SIZE_MB,
+    WEB_SEARCH_CACHE_TTL,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+####################
+# Web search cache
+#
+# The same popular queries used to pay the search API and re-fetch every
+# result page each time. Search results are cached by engine, its settings and
+# normalized query, and fetched pages by URL (their chunks' embeddings are then
+# served by the embedding cache): first in an in-process LRU bounded by size,
+# then in Redis, shared across nodes. Entries expire after WEB_SEARCH_CACHE_TTL.
+####################
+
+SEARCH_NAMESPACE = 'search'
+PAGE_NAMESPACE = 'page'
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+
+def get_web_search_cache_key(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+class RedisWebSearchCacheBackend:
+    def __init__(self, redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f'{REDIS_KEY_PREFIX}:web_search:{namespace}:{key}'
+
+    def get_many(self, namespace: str, keys: list[str]) -> list[Optional[str]]:
+        # A pipeline rather than MGET, the keys may live on different cluster slots
+        pipe = self.redis.pipeline()
+        for key in keys:
+            pipe.get(self._key(namespace, key))
+        return pipe.execute()
+
+    def set_many(self, namespace: str, items: dict[str, str]):
+        pipe = self.redis.pipeline()
+        for key, value in items.items():
+            pipe.set(self._key(namespace, key), value, ex=self.ttl)
+        pipe.execute()
+
+
+class WebSearchCache:
+    """
+    Two-tier cache of JSON-serializable values. The in-process tier keeps
+    the serialized values, so its size budget is measured on them and every hit
+    returns a fresh copy.
+    """
+
+    def __init__(self, ttl: int, max_size: int, backend=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.backend = backend
+
+        self._lock = threading.Lock()
+        self._lru: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _remember(self, key: tuple[str, str], value: str, expires_at: float):
+        if len(value) > self.max_size:
+            return
+
+        self._forget(key)
+        self._lru[key] = (expires_at, value)
+        self._size += len(value)
+        while self._size > self.max_size:
+            _, (_, evicted) = self._lru.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _forget(self, key: tuple[str, str]):
+        entry = self._lru.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def get_many(self, namespace: str, keys: list[str]) -> list[Optional[Any]]:
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._lru.get((namespace, key))
+                if entry is not None and entry[0] <= now:
+                    self._forget((namespace, key))
+                    entry = None
+                if entry is not None:
+                    self._lru.move_to_end((namespace, key))
+                values.append(entry[1] if entry is not None else None)
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing and self.backend is not None:
+            try:
+                shared = self.backend.get_many(namespace, [keys[i] for i in missing])
+            except Exception as e:
+                log.warning(f'Web search cache lookup failed: {e}')
+                shared = [None] * len(missing)
+
+            with self._lock:
+                for i, value in zip(missing, shared):
+                    if value is not None:
+                        values[i] = value
+                        # The shared entry's remaining lifetime isn't known, so it's kept for at most a TTL more
+                        self._remember((namespace, keys[i]), value, now + self.ttl)
+
+        return [json.loads(value) if value is not None else None for value in values]
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        return self.get_many(namespace, [key])[0]
+
+    def set_many(self, namespace: str, items: dict[str, Any]):
+        if not self.enabled or not items:
+            return
+
+        serialized = {key: json.dumps(value, default=str) for key, value in items.items()}
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in serialized.items():
+                self._remember((namespace, key), value, expires_at)
+
+        if self.backend is not None:
+            try:
+                self.backend.set_many(namespace, serialized)
+            except Exception as e:
+                log.warning(f'Web search cache store failed: {e}')
+
+    def set(self, namespace: str, key: str, value: Any):
+        self.set_many(namespace, {key: value})
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._size = 0
+
+
+def get_web_search_cache_backend(backend: str):
+    if backend == 'redis':
+        redis = get_redis_client()
+        if redis is None:
+            log.warning('WEB_SEARCH_CACHE_BACKEND is redis but Redis is not configured, using in-process cache only')
+            return None
+        return RedisWebSearchCacheBackend(redis, WEB_SEARCH_CACHE_TTL)
+    elif backend:
+        log.warning(f'Unknown WEB_SEARCH_CACHE_BACKEND: {backend}, using in-process cache only')
+    return None
+
+
+WEB_SEARCH_CACHE = WebSearchCache(
+    ttl=WEB_SEARCH_CACHE_TTL,
+    max_size=int(WEB_SEARCH_CACHE_MAX_SIZE_MB * 1024 * 1024),
+    backend=get_web_search_cache_backend(WEB_SEARCH_CACHE_BACKEND) if WEB_SEARCH_CACHE_TTL > 0 else None,
+)
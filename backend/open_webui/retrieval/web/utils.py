@@ -616,18 +616,33 @@ class SafeWebBaseLoader(WebBaseLoader):
                 log.exception(f'Error loading {path}: {e}')
 
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {'source': path}
-            if title := soup.find('title'):
-                metadata['title'] = title.get_text()
-            if description := soup.find('meta', attrs={'name': 'description'}):
-                metadata['description'] = description.get('content', 'No description found.')
-            if html := soup.find('html'):
-                metadata['language'] = html.get('lang', 'No language found.')
-            yield Document(page_content=text, metadata=metadata)
+        """
+        Async lazy load text from the url(s) in web_path, yielding each page
+        as soon as it's fetched rather than once the slowest one is.
+        """
+        semaphore = asyncio.Semaphore(self.requests_per_second)
+
+        async def fetch(path: str) -> tuple[str, str]:
+            return path, await self._fetch_with_rate_limit(path, semaphore)
+
+        tasks = [asyncio.ensure_future(fetch(path)) for path in self.web_paths]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                path, result = await next_result
+                soup = self._unpack_fetch_results([result], [path])[0]
+                text = soup.get_text(**self.bs_get_text_kwargs)
+                metadata = {'source': path}
+                if title := soup.find('title'):
+                    metadata['title'] = title.get_text()
+                if description := soup.find('meta', attrs={'name': 'description'}):
+                    metadata['description'] = description.get('content', 'No description found.')
+                if html := soup.find('html'):
+                    metadata['language'] = html.get('lang', 'No language found.')
+                yield Document(page_content=text, metadata=metadata)
+        finally:
+            # Stopped early (deadline or error), don't keep fetching
+            for task in tasks:
+                task.cancel()
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
@@ -193,7 +193,9 @@ async def get_daily_stats(
 ):
     """Get message counts grouped by model for time-series chart."""
     if granularity == 'hourly':
-        counts = ChatMessages.get_hourly_message_counts_by_model(start_date=start_date, end_date=end_date, db=db)
+        counts = ChatMessages.get_hourly_message_counts_by_model(
+            start_date=start_date, end_date=end_date, group_id=group_id, db=db
+        )
     else:
         counts = ChatMessages.get_daily_message_counts_by_model(
             start_date=start_date, end_date=end_date, group_id=group_id, db=db
@@ -361,15 +363,8 @@ async def get_model_overview(
 ):
     """Get model overview with feedback history and chat tags."""
 
-    # Get chat IDs that used this model
-    chat_ids = ChatMessages.get_chat_ids_by_model_id(
-        model_id=model_id,
-        start_date=None,
-        end_date=None,
-        skip=0,
-        limit=10000,  # Get all chats
-        db=db,
-    )
+    # The chats that used this model, from the rollups
+    chat_ids = ChatMessages.get_chat_ids_query_by_model_id(model_id)
 
     # Get feedback history per day
     history_counts: dict[str, dict] = defaultdict(lambda: {'won': 0, 'lost': 0})
@@ -380,22 +375,16 @@ async def get_model_overview(
     if days > 0:
         start_dt = now - timedelta(days=days)
 
-    for chat_id in chat_ids:
-        feedbacks = Feedbacks.get_feedbacks_by_chat_id(chat_id, db=db)
-        for fb in feedbacks:
-            if fb.data and 'rating' in fb.data:
-                rating = fb.data['rating']
-                fb_date = datetime.fromtimestamp(fb.created_at)
-
-                # Filter by date range
-                if start_dt and fb_date < start_dt:
-                    continue
-
-                date_str = fb_date.strftime('%Y-%m-%d')
-                if rating == 1:
-                    history_counts[date_str]['won'] += 1
-                elif rating == -1:
-                    history_counts[date_str]['lost'] += 1
+    # The rated feedbacks of all those chats in one query
+    ratings = Feedbacks.get_ratings_by_chat_ids(
+        chat_ids, start_date=int(start_dt.timestamp()) if start_dt else None, db=db
+    )
+    for created_at, rating in ratings:
+        date_str = datetime.fromtimestamp(created_at).strftime('%Y-%m-%d')
+        if rating == 1:
+            history_counts[date_str]['won'] += 1
+        elif rating == -1:
+            history_counts[date_str]['lost'] += 1
 
     # Fill in missing days
     history = []
@@ -423,12 +412,7 @@ async def get_model_overview(
             current += timedelta(days=1)
 
     # Get chat tags
-    tag_counts: dict[str, int] = defaultdict(int)
-    for chat_id in chat_ids:
-        chat = Chats.get_chat_by_id(chat_id, db=db)
-        if chat and chat.meta:
-            for tag in chat.meta.get('tags', []):
-                tag_counts[tag] += 1
+    tag_counts = Chats.get_tag_counts_by_chat_ids(chat_ids, db=db)
 
     # Sort by count and take top 10
     tags = [TagEntry(tag=tag, count=count) for tag, count in sorted(tag_counts.items(), key=lambda x: -x[1])[:10]]
@@ -1,19 +1,25 @@
+import asyncio
+import bisect
 import hashlib
+import io
+import itertools
 import json
 import logging
 import os
+import re
+import subprocess
 import uuid
 import html
 import base64
+from collections import deque
 from functools import lru_cache
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import AsyncGenerator, Iterator, Optional
 
 from fnmatch import fnmatch
 import aiohttp
-import aiofiles
 import requests
 import mimetypes
 
@@ -29,7 +35,8 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -37,6 +44,9 @@ from open_webui.utils.misc import strict_match_mime_type
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+from open_webui.utils.speech_cache import SPEECH_CACHE
+from open_webui.utils.whisper_pool import WHISPER_MODEL_POOL
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_COMPUTE_TYPE,
@@ -56,6 +66,10 @@ from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     DEVICE_TYPE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    TTS_SEGMENT_CONCURRENCY,
+    TTS_SEGMENT_MAX_CHARS,
+    TRANSCRIPTION_CHUNK_DURATION,
+    TRANSCRIPTION_CONCURRENCY,
 )
 
 router = APIRouter()
@@ -68,8 +82,8 @@ AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to byte
 
 log = logging.getLogger(__name__)
 
-SPEECH_CACHE_DIR = CACHE_DIR / 'audio' / 'speech'
-SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Shared by all transcriptions, so concurrent uploads queue instead of each starting a thread per chunk
+TRANSCRIPTION_EXECUTOR = ThreadPoolExecutor(max_workers=TRANSCRIPTION_CONCURRENCY, thread_name_prefix='transcription')
 
 
 ##########################################
@@ -114,12 +128,72 @@ def is_audio_conversion_required(file_path):
         return False
 
 
+def run_ffmpeg(args: list[str]) -> subprocess.CompletedProcess:
+    """
+    Run ffmpeg (the binary pydub is configured with). ffmpeg decodes and
+    encodes as a stream, so unlike an AudioSegment the audio is never held
+    in memory as a whole.
+    """
+    return subprocess.run(
+        [AudioSegment.converter, '-hide_banner', '-nostdin', '-nostats', '-y', *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def get_audio_duration(file_path) -> Optional[float]:
+    try:
+        return float(mediainfo(file_path).get('duration'))
+    except Exception as e:
+        log.error(f'Error getting audio duration: {e}')
+        return None
+
+
+SILENCE_PATTERN = re.compile(r'silence_(start|end): (-?[\d.]+)')
+
+
+def detect_silences(file_path, noise: str = '-35dB', min_duration: float = 0.5) -> list[tuple[float, float]]:
+    """(start, end) in seconds of each silence in the audio."""
+    result = run_ffmpeg(
+        ['-i', file_path, '-vn', '-af', f'silencedetect=noise={noise}:d={min_duration}', '-f', 'null', '-']
+    )
+
+    silences = []
+    start = None
+    for kind, value in SILENCE_PATTERN.findall(result.stderr):
+        if kind == 'start':
+            start = max(float(value), 0.0)
+        elif start is not None:
+            silences.append((start, float(value)))
+            start = None
+    return silences
+
+
+def get_split_points(duration: float, chunk_duration: float, silences: list[tuple[float, float]]) -> list[float]:
+    """
+    Where to cut audio into chunks of at most `chunk_duration` seconds: in the
+    middle of the last silence in the final quarter of each chunk, or at the
+    chunk's full length if there is none.
+    """
+    midpoints = sorted((start + end) / 2 for start, end in silences)
+
+    points = []
+    start = 0.0
+    while duration - start > chunk_duration:
+        end = start + chunk_duration
+        idx = bisect.bisect_left(midpoints, end) - 1
+        cut = midpoints[idx] if idx >= 0 and midpoints[idx] > end - chunk_duration / 4 else end
+        points.append(cut)
+        start = cut
+    return points
+
+
 def convert_audio_to_mp3(file_path):
     """Convert audio file to mp3 format."""
     try:
         output_path = os.path.splitext(file_path)[0] + '.mp3'
-        audio = AudioSegment.from_file(file_path)
-        audio.export(output_path, format='mp3')
+        run_ffmpeg(['-loglevel', 'error', '-i', file_path, '-vn', '-f', 'mp3', output_path])
         log.info(f'Converted {file_path} to {output_path}')
         return output_path
     except Exception as e:
@@ -128,25 +202,18 @@ def convert_audio_to_mp3(file_path):
 
 
 def set_faster_whisper_model(model: str, auto_update: bool = False):
-    whisper_model = None
-    if model:
-        from faster_whisper import WhisperModel
-
-        faster_whisper_kwargs = {
-            'model_size_or_path': model,
-            'device': DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == 'cuda' else 'cpu',
-            'compute_type': WHISPER_COMPUTE_TYPE,
-            'download_root': WHISPER_MODEL_DIR,
-            'local_files_only': not auto_update,
-        }
+    if not model:
+        WHISPER_MODEL_POOL.unload()
+        return None
 
-        try:
-            whisper_model = WhisperModel(**faster_whisper_kwargs)
-        except Exception:
-            log.warning('WhisperModel initialization failed, attempting download with local_files_only=False')
-            faster_whisper_kwargs['local_files_only'] = False
-            whisper_model = WhisperModel(**faster_whisper_kwargs)
-    return whisper_model
+    WHISPER_MODEL_POOL.load(
+        model,
+        device=DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == 'cuda' else 'cpu',
+        compute_type=WHISPER_COMPUTE_TYPE,
+        download_root=WHISPER_MODEL_DIR,
+        auto_update=auto_update,
+    )
+    return WHISPER_MODEL_POOL
 
 
 ##########################################
@@ -265,6 +332,7 @@ async def update_audio_config(request: Request, form_data: AudioConfigUpdateForm
             form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
         )
     else:
+        WHISPER_MODEL_POOL.unload()
         request.app.state.faster_whisper_model = None
 
     return {
@@ -314,242 +382,342 @@ def load_speech_pipeline(request):
         )
 
 
-@router.post('/speech')
-async def speech(request: Request, user=Depends(get_verified_user)):
-    if request.app.state.config.TTS_ENGINE == '':
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?。！？…])\s+|\n+')
 
-    if user.role != 'admin' and not has_permission(user.id, 'chat.tts', request.app.state.config.USER_PERMISSIONS):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
 
-    body = await request.body()
-    name = hashlib.sha256(
-        body
-        + str(request.app.state.config.TTS_ENGINE).encode('utf-8')
-        + str(request.app.state.config.TTS_MODEL).encode('utf-8')
-    ).hexdigest()
+def split_speech_segments(text: str, max_chars: int = TTS_SEGMENT_MAX_CHARS) -> list[str]:
+    """
+    Split text into segments of whole sentences of up to `max_chars`
+    characters, with the first sentence on its own so it is heard sooner.
+    A sentence longer than `max_chars` is split between words.
+    """
+    if max_chars <= 0:
+        return [text]
+
+    sentences = []
+    for sentence in SENTENCE_END_PATTERN.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            sentences.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    if not sentences:
+        return [text]
+
+    segments = [sentences[0]]
+    current = ''
+    for sentence in sentences[1:]:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f'{current} {sentence}' if current else sentence
+    if current:
+        segments.append(current)
+    return segments
+
+
+def is_segmentable_speech(request: Request, payload: dict) -> bool:
+    """Whether the engine returns MP3, whose segments play back-to-back when concatenated."""
+    engine = request.app.state.config.TTS_ENGINE
+    if engine == 'openai':
+        return payload.get('response_format') in (None, 'mp3')
+    if engine == 'elevenlabs':
+        return True
+    if engine == 'azure':
+        return 'mp3' in (request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT or '')
+    return False
 
-    file_path = SPEECH_CACHE_DIR.joinpath(f'{name}.mp3')
-    file_body_path = SPEECH_CACHE_DIR.joinpath(f'{name}.json')
 
-    # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
+async def synthesize_openai_speech(request: Request, payload: dict, user) -> bytes:
+    url = request.app.state.config.TTS_OPENAI_API_BASE_URL
 
-    payload = None
+    r = None
     try:
-        payload = json.loads(body.decode('utf-8'))
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {request.app.state.config.TTS_OPENAI_API_KEY}',
+        }
+        if ENABLE_FORWARD_USER_INFO_HEADERS:
+            headers = include_user_info_headers(headers, user)
+
+        async with CLIENT_SESSION_POOL.session(url) as session:
+            r = await session.post(
+                url=f'{url}/audio/speech',
+                json=payload,
+                headers=headers,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            )
+
+            r.raise_for_status()
+            return await r.read()
+
     except Exception as e:
         log.exception(e)
-        raise HTTPException(status_code=400, detail='Invalid JSON payload')
+        detail = None
 
-    r = None
-    if request.app.state.config.TTS_ENGINE == 'openai':
-        payload['model'] = request.app.state.config.TTS_MODEL
+        status_code = 500
+        detail = f'Open WebUI: Server Connection Error'
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-                payload = {
-                    **payload,
-                    **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
-                }
+        if r is not None:
+            status_code = r.status
 
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Bearer {request.app.state.config.TTS_OPENAI_API_KEY}',
-                }
-                if ENABLE_FORWARD_USER_INFO_HEADERS:
-                    headers = include_user_info_headers(headers, user)
+            try:
+                res = await r.json()
+                if 'error' in res:
+                    detail = f'External: {res["error"]}'
+            except Exception:
+                detail = f'External: {e}'
 
-                r = await session.post(
-                    url=f'{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech',
-                    json=payload,
-                    headers=headers,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                )
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+        )
 
+
+async def synthesize_elevenlabs_speech(request: Request, payload: dict) -> bytes:
+    voice_id = payload.get('voice', '')
+
+    r = None
+    try:
+        async with CLIENT_SESSION_POOL.session(ELEVENLABS_API_BASE_URL) as session:
+            async with session.post(
+                f'{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}',
+                json={
+                    'text': payload['input'],
+                    'model_id': request.app.state.config.TTS_MODEL,
+                    'voice_settings': {'stability': 0.5, 'similarity_boost': 0.5},
+                },
+                headers={
+                    'Accept': 'audio/mpeg',
+                    'Content-Type': 'application/json',
+                    'xi-api-key': request.app.state.config.TTS_API_KEY,
+                },
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            ) as r:
                 r.raise_for_status()
+                return await r.read()
 
-                async with aiofiles.open(file_path, 'wb') as f:
-                    await f.write(await r.read())
+    except Exception as e:
+        log.exception(e)
+        detail = None
 
-                async with aiofiles.open(file_body_path, 'w') as f:
-                    await f.write(json.dumps(payload))
+        try:
+            if r.status != 200:
+                res = await r.json()
+                if 'error' in res:
+                    detail = f'External: {res["error"].get("message", "")}'
+        except Exception:
+            detail = f'External: {e}'
 
-            return FileResponse(file_path)
+        raise HTTPException(
+            status_code=getattr(r, 'status', 500) if r else 500,
+            detail=detail if detail else 'Open WebUI: Server Connection Error',
+        )
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
 
-            status_code = 500
-            detail = f'Open WebUI: Server Connection Error'
+async def synthesize_azure_speech(request: Request, payload: dict) -> bytes:
+    region = request.app.state.config.TTS_AZURE_SPEECH_REGION or 'eastus'
+    base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
+    language = request.app.state.config.TTS_VOICE
+    locale = '-'.join(request.app.state.config.TTS_VOICE.split('-')[:2])
+    output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+    url = base_url or f'https://{region}.tts.speech.microsoft.com'
 
-            if r is not None:
-                status_code = r.status
+    r = None
+    try:
+        data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
+            <voice name="{language}">{html.escape(payload['input'])}</voice>
+        </speak>"""
+        async with CLIENT_SESSION_POOL.session(url) as session:
+            async with session.post(
+                url + '/cognitiveservices/v1',
+                headers={
+                    'Ocp-Apim-Subscription-Key': request.app.state.config.TTS_API_KEY,
+                    'Content-Type': 'application/ssml+xml',
+                    'X-Microsoft-OutputFormat': output_format,
+                },
+                data=data,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            ) as r:
+                r.raise_for_status()
+                return await r.read()
 
-                try:
-                    res = await r.json()
-                    if 'error' in res:
-                        detail = f'External: {res["error"]}'
-                except Exception:
-                    detail = f'External: {e}'
+    except Exception as e:
+        log.exception(e)
+        detail = None
 
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+        try:
+            if r.status != 200:
+                res = await r.json()
+                if 'error' in res:
+                    detail = f'External: {res["error"].get("message", "")}'
+        except Exception:
+            detail = f'External: {e}'
 
-    elif request.app.state.config.TTS_ENGINE == 'elevenlabs':
-        voice_id = payload.get('voice', '')
+        raise HTTPException(
+            status_code=getattr(r, 'status', 500) if r else 500,
+            detail=detail if detail else 'Open WebUI: Server Connection Error',
+        )
 
-        if voice_id not in get_available_voices(request):
-            raise HTTPException(
-                status_code=400,
-                detail='Invalid voice id',
-            )
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-                async with session.post(
-                    f'{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}',
-                    json={
-                        'text': payload['input'],
-                        'model_id': request.app.state.config.TTS_MODEL,
-                        'voice_settings': {'stability': 0.5, 'similarity_boost': 0.5},
-                    },
-                    headers={
-                        'Accept': 'audio/mpeg',
-                        'Content-Type': 'application/json',
-                        'xi-api-key': request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+def synthesize_transformers_speech(request: Request, payload: dict) -> bytes:
+    import torch
+    import soundfile as sf
 
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        await f.write(await r.read())
+    load_speech_pipeline(request)
 
-                    async with aiofiles.open(file_body_path, 'w') as f:
-                        await f.write(json.dumps(payload))
+    embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
 
-            return FileResponse(file_path)
+    speaker_index = 6799
+    try:
+        speaker_index = embeddings_dataset['filename'].index(request.app.state.config.TTS_MODEL)
+    except Exception:
+        pass
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+    speaker_embedding = torch.tensor(embeddings_dataset[speaker_index]['xvector']).unsqueeze(0)
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if 'error' in res:
-                        detail = f'External: {res["error"].get("message", "")}'
-            except Exception:
-                detail = f'External: {e}'
+    speech = request.app.state.speech_synthesiser(
+        payload['input'],
+        forward_params={'speaker_embeddings': speaker_embedding},
+    )
 
-            raise HTTPException(
-                status_code=getattr(r, 'status', 500) if r else 500,
-                detail=detail if detail else 'Open WebUI: Server Connection Error',
-            )
+    audio = io.BytesIO()
+    sf.write(audio, speech['audio'], samplerate=speech['sampling_rate'], format='MP3')
+    return audio.getvalue()
 
+
+async def synthesize_speech(request: Request, payload: dict, user) -> bytes:
+    if request.app.state.config.TTS_ENGINE == 'openai':
+        return await synthesize_openai_speech(request, payload, user)
+    elif request.app.state.config.TTS_ENGINE == 'elevenlabs':
+        return await synthesize_elevenlabs_speech(request, payload)
     elif request.app.state.config.TTS_ENGINE == 'azure':
-        try:
-            payload = json.loads(body.decode('utf-8'))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail='Invalid JSON payload')
+        return await synthesize_azure_speech(request, payload)
+    elif request.app.state.config.TTS_ENGINE == 'transformers':
+        return await run_in_threadpool(synthesize_transformers_speech, request, payload)
 
-        region = request.app.state.config.TTS_AZURE_SPEECH_REGION or 'eastus'
-        base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
-        language = request.app.state.config.TTS_VOICE
-        locale = '-'.join(request.app.state.config.TTS_VOICE.split('-')[:2])
-        output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=ERROR_MESSAGES.NOT_FOUND,
+    )
 
-        try:
-            data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
-                <voice name="{language}">{html.escape(payload['input'])}</voice>
-            </speak>"""
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-                async with session.post(
-                    (base_url or f'https://{region}.tts.speech.microsoft.com') + '/cognitiveservices/v1',
-                    headers={
-                        'Ocp-Apim-Subscription-Key': request.app.state.config.TTS_API_KEY,
-                        'Content-Type': 'application/ssml+xml',
-                        'X-Microsoft-OutputFormat': output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
 
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        await f.write(await r.read())
+async def synthesize_speech_segments(
+    request: Request,
+    payload: dict,
+    segments: list[str],
+    user,
+    concurrency: int = TTS_SEGMENT_CONCURRENCY,
+) -> AsyncGenerator[bytes, None]:
+    """The audio of each segment in order, synthesizing up to `concurrency` segments ahead."""
+    pending = deque()
+    segments = iter(segments)
+    try:
+        for segment in itertools.islice(segments, concurrency):
+            pending.append(asyncio.create_task(synthesize_speech(request, {**payload, 'input': segment}, user)))
+
+        while pending:
+            audio = await pending.popleft()
+            segment = next(segments, None)
+            if segment is not None:
+                pending.append(asyncio.create_task(synthesize_speech(request, {**payload, 'input': segment}, user)))
+            yield audio
+    finally:
+        for task in pending:
+            task.cancel()
+
 
-                    async with aiofiles.open(file_body_path, 'w') as f:
-                        await f.write(json.dumps(payload))
+@router.post('/speech')
+async def speech(request: Request, user=Depends(get_verified_user)):
+    if request.app.state.config.TTS_ENGINE == '':
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
 
-                    return FileResponse(file_path)
+    if user.role != 'admin' and not has_permission(user.id, 'chat.tts', request.app.state.config.USER_PERMISSIONS):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+        )
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+    body = await request.body()
+    name = hashlib.sha256(
+        body
+        + str(request.app.state.config.TTS_ENGINE).encode('utf-8')
+        + str(request.app.state.config.TTS_MODEL).encode('utf-8')
+    ).hexdigest()
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if 'error' in res:
-                        detail = f'External: {res["error"].get("message", "")}'
-            except Exception:
-                detail = f'External: {e}'
+    # Check if the file already exists in the cache
+    file_path = await run_in_threadpool(SPEECH_CACHE.get, name)
+    if file_path:
+        return FileResponse(file_path)
 
+    payload = None
+    try:
+        payload = json.loads(body.decode('utf-8'))
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(status_code=400, detail='Invalid JSON payload')
+
+    if request.app.state.config.TTS_ENGINE == 'openai':
+        payload = {
+            **payload,
+            'model': request.app.state.config.TTS_MODEL,
+            **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
+        }
+    elif request.app.state.config.TTS_ENGINE == 'elevenlabs':
+        if payload.get('voice', '') not in get_available_voices(request):
             raise HTTPException(
-                status_code=getattr(r, 'status', 500) if r else 500,
-                detail=detail if detail else 'Open WebUI: Server Connection Error',
+                status_code=400,
+                detail='Invalid voice id',
             )
 
-    elif request.app.state.config.TTS_ENGINE == 'transformers':
-        payload = None
-        try:
-            payload = json.loads(body.decode('utf-8'))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail='Invalid JSON payload')
+    segments = [payload.get('input', '')]
+    if is_segmentable_speech(request, payload):
+        segments = split_speech_segments(payload.get('input', ''))
 
-        import torch
-        import soundfile as sf
-
-        load_speech_pipeline(request)
+    if len(segments) == 1:
+        audio = await synthesize_speech(request, payload, user)
+        file_path = await run_in_threadpool(SPEECH_CACHE.put, name, audio, payload)
+        return FileResponse(file_path)
 
-        embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
+    # Stream each segment as soon as it is ready. The first one is awaited
+    # here so an upstream error is still returned as an error response.
+    audio_segments = synthesize_speech_segments(request, payload, segments, user)
+    try:
+        first_segment = await anext(audio_segments)
+    except BaseException:
+        await audio_segments.aclose()
+        raise
 
-        speaker_index = 6799
+    async def stream_audio():
+        audio = [first_segment]
         try:
-            speaker_index = embeddings_dataset['filename'].index(request.app.state.config.TTS_MODEL)
-        except Exception:
-            pass
-
-        speaker_embedding = torch.tensor(embeddings_dataset[speaker_index]['xvector']).unsqueeze(0)
-
-        speech = request.app.state.speech_synthesiser(
-            payload['input'],
-            forward_params={'speaker_embeddings': speaker_embedding},
-        )
-
-        sf.write(file_path, speech['audio'], samplerate=speech['sampling_rate'])
+            yield first_segment
+            async for segment in audio_segments:
+                audio.append(segment)
+                yield segment
+        except Exception as e:
+            # The 200 status is already sent, so the stream is aborted instead of
+            # ending cleanly: clients see a failed body, not truncated audio
+            log.exception(f'Error synthesizing speech segment {len(audio) + 1} of {len(segments)}: {e}')
+            raise
+        finally:
+            await audio_segments.aclose()
 
-        async with aiofiles.open(file_body_path, 'w') as f:
-            await f.write(json.dumps(payload))
+        await run_in_threadpool(SPEECH_CACHE.put, name, b''.join(audio), payload)
 
-        return FileResponse(file_path)
+    return StreamingResponse(stream_audio(), media_type='audio/mpeg')
 
 
 def transcription_handler(request, file_path, metadata, user=None):
@@ -568,18 +736,18 @@ def transcription_handler(request, file_path, metadata, user=None):
         if request.app.state.faster_whisper_model is None:
             request.app.state.faster_whisper_model = set_faster_whisper_model(request.app.state.config.WHISPER_MODEL)
 
+        # Queued on the shared replicas, batched with other short clips under load
         model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
+        result = model.transcribe(
             file_path,
             beam_size=5,
             vad_filter=WHISPER_VAD_FILTER,
             language=languages[0],
             multilingual=WHISPER_MULTILINGUAL,
         )
-        log.info("Detected language '%s' with probability %f" % (info.language, info.language_probability))
+        log.info("Detected language '%s' with probability %f" % (result.language, result.language_probability))
 
-        transcript = ''.join([segment.text for segment in list(segments)])
-        data = {'text': transcript.strip()}
+        data = {'text': result.text.strip()}
 
         # save the transcript to a json file
         transcript_file = f'{file_dir}/{id}.json'
@@ -1014,21 +1182,21 @@ def transcription_handler(request, file_path, metadata, user=None):
             )
 
 
-def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None, user=None):
+def iter_transcribe(request: Request, file_path: str, metadata: Optional[dict] = None, user=None) -> Iterator[dict]:
+    """
+    Transcribe audio chunk by chunk on the shared transcription pool, yielding
+    {'index', 'total', 'text'} for each chunk in order as soon as it and the
+    chunks before it are done.
+    """
     log.info(f'transcribe: {file_path} {metadata}')
 
     if is_audio_conversion_required(file_path):
         file_path = convert_audio_to_mp3(file_path)
 
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
-
     # Always produce a list of chunk paths (could be one entry if small)
     try:
         chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f'Chunk paths: {chunk_paths}')
+        log.debug(f'Chunk paths: {chunk_paths}')
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -1036,26 +1204,26 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
             detail=ERROR_MESSAGES.DEFAULT(e),
         )
 
-    results = []
+    futures = [
+        TRANSCRIPTION_EXECUTOR.submit(transcription_handler, request, chunk_path, metadata, user)
+        for chunk_path in chunk_paths
+    ]
     try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(transcription_handler, request, chunk_path, metadata, user)
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
-            for future in futures:
-                try:
-                    results.append(future.result())
-                except HTTPException:
-                    raise
-                except Exception as transcribe_exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f'Error transcribing chunk: {transcribe_exc}',
-                    )
+        for idx, future in enumerate(futures):
+            try:
+                result = future.result()
+            except HTTPException:
+                raise
+            except Exception as transcribe_exc:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f'Error transcribing chunk: {transcribe_exc}',
+                )
+            yield {**result, 'index': idx, 'total': len(futures)}
     finally:
+        for future in futures:
+            future.cancel()
+
         # Clean up only the temporary chunks, never the original file
         for chunk_path in chunk_paths:
             if chunk_path != file_path and os.path.isfile(chunk_path):
@@ -1064,76 +1232,100 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
                 except Exception:
                     pass
 
+
+def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None, user=None):
+    results = list(iter_transcribe(request, file_path, metadata, user))
     return {
         'text': ' '.join([result['text'] for result in results]),
     }
 
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[0]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
-
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
-
-        compressed_path = os.path.join(file_dir, f'{id}_compressed.mp3')
-        audio.export(compressed_path, format='mp3', bitrate='32k')
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
-
-        return compressed_path
-    else:
-        return file_path
-
-
-def split_audio(file_path, max_bytes, format='mp3', bitrate='32k'):
+def split_audio(
+    file_path,
+    max_bytes,
+    format='mp3',
+    bitrate='32k',
+    chunk_duration: int = TRANSCRIPTION_CHUNK_DURATION,
+):
     """
-    Splits audio into chunks not exceeding max_bytes.
+    Splits audio into chunks not exceeding max_bytes nor chunk_duration seconds,
+    cut on silence where possible and compressed to 16kHz mono.
     Returns a list of chunk file paths. If audio fits, returns list with original path.
     """
     file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+    duration = get_audio_duration(file_path)
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+    # Longest chunk that fits in max_bytes at this bitrate, with headroom for container overhead
+    bits_per_second = int(bitrate.rstrip('k')) * 1000
+    chunk_duration = min(chunk_duration, max_bytes * 8 / bits_per_second * 0.9)
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
+    if file_size <= max_bytes and (duration is None or duration <= chunk_duration):
+        return [file_path]  # Nothing to split
 
-    base, _ = os.path.splitext(file_path)
+    if duration is None:
+        raise Exception('Audio duration could not be read.')
 
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f'{base}_chunk_{i}.{format}'
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+    split_points = []
+    if duration > chunk_duration:
+        try:
+            silences = detect_silences(file_path)
+        except Exception as e:
+            log.warning(f'Silence detection failed, splitting at fixed intervals: {e}')
+            silences = []
+        split_points = get_split_points(duration, chunk_duration, silences)
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+    base, _ = os.path.splitext(file_path)
 
-        if os.path.getsize(chunk_path) > max_bytes:
+    # A single pass over the file writes every chunk
+    run_ffmpeg(
+        [
+            '-loglevel',
+            'error',
+            '-i',
+            file_path,
+            '-vn',
+            '-ac',
+            '1',
+            '-ar',
+            '16000',
+            '-b:a',
+            bitrate,
+            '-f',
+            'segment',
+            '-reset_timestamps',
+            '1',
+            *(
+                ['-segment_times', ','.join(f'{point:.3f}' for point in split_points)]
+                if split_points
+                else ['-segment_time', str(int(duration) + 1)]
+            ),
+            f'{base}_chunk_%d.{format}',
+        ]
+    )
+
+    chunks = [f'{base}_chunk_{i}.{format}' for i in range(len(split_points) + 1)]
+    chunks = [chunk_path for chunk_path in chunks if os.path.isfile(chunk_path)]
+
+    if any(os.path.getsize(chunk_path) > max_bytes for chunk_path in chunks):
+        for chunk_path in chunks:
             os.remove(chunk_path)
-            raise Exception('Audio chunk cannot be reduced below max file size.')
-
-        chunks.append(chunk_path)
-        start = end
-        i += 1
+        raise Exception('Audio chunk cannot be reduced below max file size.')
 
     return chunks
 
 
+@router.get('/transcriptions/metrics')
+async def get_transcription_metrics(user=Depends(get_admin_user)):
+    """Queue depth and latency of the local whisper model replicas."""
+    return {'model': WHISPER_MODEL_POOL.model_name, **WHISPER_MODEL_POOL.get_metrics()}
+
+
 @router.post('/transcriptions')
 def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     if user.role != 'admin' and not has_permission(user.id, 'chat.stt', request.app.state.config.USER_PERMISSIONS):
@@ -1176,6 +1368,27 @@ def transcription(
             if language:
                 metadata = {'language': language}
 
+            if stream:
+                # Send the transcript of each chunk as soon as it is ready, then the whole one
+                def event_stream():
+                    texts = []
+                    try:
+                        for result in iter_transcribe(request, file_path, metadata, user):
+                            texts.append(result['text'])
+                            yield f'data: {json.dumps(result)}\n\n'
+                    except HTTPException as e:
+                        yield f'data: {json.dumps({"error": e.detail})}\n\n'
+                        return
+                    except Exception as e:
+                        log.exception(e)
+                        yield f'data: {json.dumps({"error": "Transcription failed."})}\n\n'
+                        return
+
+                    done = {'text': ' '.join(texts), 'filename': os.path.basename(file_path), 'done': True}
+                    yield f'data: {json.dumps(done)}\n\n'
+
+                return StreamingResponse(event_stream(), media_type='text/event-stream')
+
             result = transcribe(request, file_path, metadata, user)
 
             return {
@@ -932,7 +932,7 @@ async def update_chat_message_by_id(
         {
             'content': form_data.content,
         },
-    )
+    ) or Chats.get_chat_by_id(id)
 
     event_emitter = get_event_emitter(
         {
@@ -12,10 +12,11 @@ from open_webui.models.feedbacks import (
     FeedbackForm,
     FeedbackUserResponse,
     FeedbackListResponse,
-    LeaderboardFeedbackData,
+    LeaderboardFeedbacks,
     ModelHistoryEntry,
     ModelHistoryResponse,
     Feedbacks,
+    calculate_elo,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -42,6 +43,10 @@ router = APIRouter()
 #    - K=32 controls how much ratings can change per match
 #    - expected = probability of winning based on current ratings
 #
+# The ratings are kept up to date as feedback is given (see the leaderboard
+# snapshot in models/feedbacks.py), so the plain leaderboard doesn't replay
+# the feedback history.
+#
 # Query-based re-ranking (optional):
 #    When a user searches for a topic (e.g., "coding"), we want to show
 #    which models perform best FOR THAT TOPIC. We do this by:
@@ -50,6 +55,7 @@ router = APIRouter()
 #    3. Feedbacks about "coding" contribute more to the final ranking
 #    4. Feedbacks about unrelated topics (e.g., "cooking") contribute less
 #    This gives topic-specific leaderboards without needing separate data.
+#    Tag embeddings are stored, so only the query is encoded per request.
 
 import os
 
@@ -69,86 +75,22 @@ def _get_embedding_model():
     return _embedding_model
 
 
-def _calculate_elo(feedbacks: list[LeaderboardFeedbackData], similarities: dict = None) -> dict:
-    """
-    Calculate Elo ratings for models based on user feedback.
-
-    Each feedback represents a comparison where a user rated one model
-    against its opponents (sibling_model_ids). Rating=1 means the model won,
-    rating=-1 means it lost.
-
-    The Elo system adjusts ratings based on:
-    - Current rating difference (upsets cause bigger swings)
-    - Optional similarity weights (for query-based filtering)
-
-    Returns: {model_id: {"rating": float, "won": int, "lost": int}}
-    """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
-    model_stats = {}
-
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {'rating': 1000.0, 'won': 0, 'lost': 0}
-        return model_stats[model_id]
-
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get('model_id')
-        rating_value = str(data.get('rating', ''))
-        if not winner_id or rating_value not in ('1', '-1'):
-            continue
-
-        won = rating_value == '1'
-        weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
-
-        for opponent_id in data.get('sibling_model_ids') or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent['rating'] - winner['rating']) / 400))
-
-            winner['rating'] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent['rating'] += K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-
-            if won:
-                winner['won'] += 1
-                opponent['lost'] += 1
-            else:
-                winner['lost'] += 1
-                opponent['won'] += 1
-
-    return model_stats
-
-
-def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
+def _get_top_tags(tag_counts: dict, limit: int = 5) -> dict:
     """
-    Count tag occurrences per model and return the most frequent ones.
-
-    Each feedback can have tags describing the conversation topic.
-    This aggregates those tags per model to show what topics each model
-    is commonly used for.
+    The most frequent tags of each model's feedback, to show what topics
+    each model is commonly used for.
 
     Returns: {model_id: [{"tag": str, "count": int}, ...]}
     """
-    from collections import defaultdict
-
-    tag_counts = defaultdict(lambda: defaultdict(int))
-
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        model_id = data.get('model_id')
-        if model_id:
-            for tag in data.get('tags', []):
-                tag_counts[model_id][tag] += 1
-
     return {
         model_id: [{'tag': tag, 'count': count} for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]]
         for model_id, tags in tag_counts.items()
     }
 
 
-def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
+def _compute_similarities(feedbacks: LeaderboardFeedbacks, query: str) -> Optional[list[float]]:
     """
-    Compute how relevant each feedback is to a search query.
+    Compute how relevant each rating is to a search query.
 
     Uses embeddings to find semantic similarity between the query and
     each feedback's tags. Higher similarity means the feedback is more
@@ -157,38 +99,45 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
     This is used to weight Elo calculations - feedbacks matching the
     query have more influence on the final rankings.
 
-    Returns: {feedback_id: similarity_score (0-1)}
+    Returns: the similarity (0-1) of each of feedbacks.matches, None when
+    there is nothing to weight by.
     """
     import numpy as np
 
+    if not feedbacks.tags:
+        return None
+
     embedding_model = _get_embedding_model()
     if not embedding_model:
-        return {}
-
-    all_tags = list({tag for feedback in feedbacks if feedback.data for tag in feedback.data.get('tags', [])})
-    if not all_tags:
-        return {}
+        return None
 
+    embeddings = Feedbacks.get_tag_embeddings(EMBEDDING_MODEL_NAME, feedbacks.tags)
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
+        missing_tags = [tag for tag in feedbacks.tags if tag not in embeddings]
+        if missing_tags:
+            missing_embeddings = dict(zip(missing_tags, embedding_model.encode(missing_tags).tolist()))
+            Feedbacks.insert_tag_embeddings(EMBEDDING_MODEL_NAME, missing_embeddings)
+            embeddings.update(missing_embeddings)
         query_embedding = embedding_model.encode([query])[0]
     except Exception as e:
         log.error(f'Embedding error: {e}')
-        return {}
+        return None
 
     # Vectorized cosine similarity
+    tag_embeddings = np.array([embeddings[tag] for tag in feedbacks.tags], dtype=np.float32)
     tag_norms = np.linalg.norm(tag_embeddings, axis=1)
     query_norm = np.linalg.norm(query_embedding)
-    similarities = np.dot(tag_embeddings, query_embedding) / (tag_norms * query_norm + 1e-9)
-    tag_similarity_map = dict(zip(all_tags, similarities.tolist()))
+    tag_similarities = np.dot(tag_embeddings, query_embedding) / (tag_norms * query_norm + 1e-9)
 
-    return {
-        feedback.id: max(
-            (tag_similarity_map.get(tag, 0) for tag in (feedback.data or {}).get('tags', [])),
-            default=0,
-        )
-        for feedback in feedbacks
-    }
+    # Each rating is as relevant as its most similar tag, 0 without tags
+    tag_lengths = np.array(feedbacks.tag_lengths, dtype=np.int64)
+    similarities = np.zeros(len(tag_lengths))
+    tagged = tag_lengths > 0
+    if tagged.any():
+        offsets = np.concatenate(([0], np.cumsum(tag_lengths)[:-1]))
+        tag_indices = np.array(feedbacks.tag_indices, dtype=np.int64)
+        similarities[tagged] = np.maximum.reduceat(tag_similarities[tag_indices], offsets[tagged])
+    return similarities.tolist()
 
 
 class LeaderboardEntry(BaseModel):
@@ -211,14 +160,16 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    leaderboard = Feedbacks.get_leaderboard(db=db)
+    elo_stats = leaderboard.get('models', {})
 
-    similarities = None
     if query and query.strip():
+        feedbacks = Feedbacks.get_leaderboard_feedbacks(db=db)
         similarities = await run_in_threadpool(_compute_similarities, feedbacks, query.strip())
+        if similarities is not None:
+            elo_stats = calculate_elo(feedbacks.matches, similarities)
 
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+    tags_by_model = _get_top_tags(leaderboard.get('tags', {}))
 
     entries = sorted(
         [
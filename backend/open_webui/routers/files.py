@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 import asyncio
+import time
 
 from fastapi import (
     BackgroundTasks,
@@ -26,6 +27,7 @@ from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -49,7 +51,9 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
+from open_webui.env import FILE_PROCESSING_STATUS_RECHECK_INTERVAL
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.file_status import FILE_STATUS_BROKER
 from open_webui.utils.misc import strict_match_mime_type
 from pydantic import BaseModel
 
@@ -391,6 +395,7 @@ async def delete_all_files(user=Depends(get_admin_user), db: Session = Depends(g
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            BM25_INDEX.reset()
         except Exception as e:
             log.exception(e)
             log.error('Error deleting files')
@@ -449,32 +454,40 @@ async def get_file_process_status(
         if stream:
             MAX_FILE_PROCESSING_DURATION = 3600 * 2
 
+            def get_status_event(file_id):
+                file_item = Files.get_file_by_id(file_id)  # Creates own session
+                if not file_item:
+                    return {'status': 'not_found'}
+
+                data = file_item.model_dump().get('data', {})
+                event = {'status': data.get('status')}
+                if event['status'] == 'failed':
+                    event['error'] = data.get('error')
+                return event
+
             async def event_stream(file_id):
                 # NOTE: We intentionally do NOT capture the request's db session here.
-                # Each poll creates its own short-lived session to avoid holding a
-                # connection for hours. A WebSocket push would be more efficient.
-                for _ in range(MAX_FILE_PROCESSING_DURATION):
-                    file_item = Files.get_file_by_id(file_id)  # Creates own session
-                    if file_item:
-                        data = file_item.model_dump().get('data', {})
-                        status = data.get('status')
-
-                        if status:
-                            event = {'status': status}
-                            if status == 'failed':
-                                event['error'] = data.get('error')
-
-                            yield f'data: {json.dumps(event)}\n\n'
-                            if status in ('completed', 'failed'):
-                                break
-                        else:
+                # Status changes are pushed through FILE_STATUS_BROKER; the file is only
+                # re-read, with its own short-lived session, to catch a missed change.
+                async with FILE_STATUS_BROKER.subscribe(file_id) as queue:
+                    deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+                    event = get_status_event(file_id)
+                    while True:
+                        if not event.get('status'):
                             # Legacy
                             break
-                    else:
-                        yield f'data: {json.dumps({"status": "not_found"})}\n\n'
-                        break
 
-                    await asyncio.sleep(1)
+                        yield f'data: {json.dumps(event)}\n\n'
+                        if event['status'] in ('completed', 'failed', 'not_found'):
+                            break
+                        if time.monotonic() >= deadline:
+                            break
+
+                        try:
+                            event = await asyncio.wait_for(queue.get(), timeout=FILE_PROCESSING_STATUS_RECHECK_INTERVAL)
+                            event = {key: event[key] for key in ('status', 'error') if key in event}
+                        except asyncio.TimeoutError:
+                            event = get_status_event(file_id)
 
             return StreamingResponse(
                 event_stream(file.id),
@@ -559,6 +572,7 @@ def update_file_data_content_by_id(
             try:
                 # Remove old embeddings for this file from the KB collection
                 VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'file_id': id})
+                BM25_INDEX.delete(knowledge.id, filter={'file_id': id})
                 # Re-add from the now-updated file-{file_id} collection
                 process_file(
                     request,
@@ -767,8 +781,10 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user), db: Sessio
             # Clean KB embeddings (same logic as /knowledge/{id}/file/remove)
             try:
                 VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'file_id': id})
+                BM25_INDEX.delete(knowledge.id, filter={'file_id': id})
                 if file.hash:
                     VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'hash': file.hash})
+                    BM25_INDEX.delete(knowledge.id, filter={'hash': file.hash})
             except Exception as e:
                 log.debug(f'KB embedding cleanup for {knowledge.id}: {e}')
 
@@ -777,6 +793,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user), db: Sessio
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f'file-{id}')
+                BM25_INDEX.drop(f'file-{id}')
             except Exception as e:
                 log.exception(e)
                 log.error('Error deleting files')
@@ -2,7 +2,6 @@ from typing import List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from fastapi.responses import StreamingResponse
-from fastapi.concurrency import run_in_threadpool
 import logging
 import io
 import zipfile
@@ -19,7 +18,10 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.knowledge_reindex import KnowledgeReindex, KnowledgeReindexJobModel
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.reindex import cancel_reindex_job, start_reindex_job
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -118,12 +120,11 @@ async def get_knowledge_bases(
     skip = (page - 1) * limit
 
     filter = {}
-    groups = Groups.get_groups_by_member_id(user.id, db=db)
-    user_group_ids = {group.id for group in groups}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     if not user.role == 'admin' or not BYPASS_ADMIN_ACCESS_CONTROL:
-        if groups:
-            filter['group_ids'] = [group.id for group in groups]
+        if user_group_ids:
+            filter['group_ids'] = list(user_group_ids)
 
         filter['user_id'] = user.id
 
@@ -174,12 +175,11 @@ async def search_knowledge_bases(
     if view_option:
         filter['view_option'] = view_option
 
-    groups = Groups.get_groups_by_member_id(user.id, db=db)
-    user_group_ids = {group.id for group in groups}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     if not user.role == 'admin' or not BYPASS_ADMIN_ACCESS_CONTROL:
-        if groups:
-            filter['group_ids'] = [group.id for group in groups]
+        if user_group_ids:
+            filter['group_ids'] = list(user_group_ids)
 
         filter['user_id'] = user.id
 
@@ -227,9 +227,9 @@ async def search_knowledge_files(
     if query:
         filter['query'] = query
 
-    groups = Groups.get_groups_by_member_id(user.id, db=db)
-    if groups:
-        filter['group_ids'] = [group.id for group in groups]
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
+    if user_group_ids:
+        filter['group_ids'] = list(user_group_ids)
 
     filter['user_id'] = user.id
 
@@ -290,59 +290,34 @@ async def create_new_knowledge(
 ############################
 
 
-@router.post('/reindex', response_model=bool)
+@router.post('/reindex', response_model=KnowledgeReindexJobModel)
 async def reindex_knowledge_files(
     request: Request,
+    force: bool = False,
     user=Depends(get_verified_user),
-    db: Session = Depends(get_session),
 ):
+    """
+    Start reindexing the files of every knowledge base in the background, or
+    return the job already doing so. Files whose content and embedding config
+    did not change since they were indexed are skipped, unless `force` is set.
+    """
     if user.role != 'admin':
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    knowledge_bases = Knowledges.get_knowledge_bases(db=db)
+    return await start_reindex_job(request, user, force=force)
 
-    log.info(f'Starting reindexing for {len(knowledge_bases)} knowledge bases')
 
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id, db=db)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_base.id)
-            except Exception as e:
-                log.error(f'Error deleting collection {knowledge_base.id}: {str(e)}')
-                continue  # Skip, don't raise
-
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(file_id=file.id, collection_name=knowledge_base.id),
-                        user=user,
-                        db=db,
-                    )
-                except Exception as e:
-                    log.error(f'Error processing file {file.filename} (ID: {file.id}): {str(e)}')
-                    failed_files.append({'file_id': file.id, 'error': str(e)})
-                    continue
-
-        except Exception as e:
-            log.error(f'Error processing knowledge base {knowledge_base.id}: {str(e)}')
-            # Don't raise, just continue
-            continue
+@router.get('/reindex/status', response_model=Optional[KnowledgeReindexJobModel])
+async def get_reindex_knowledge_files_status(user=Depends(get_admin_user)):
+    return KnowledgeReindex.get_latest_job()
 
-        if failed_files:
-            log.warning(f'Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}')
-            for failed in failed_files:
-                log.warning(f'File ID: {failed["file_id"]}, Error: {failed["error"]}')
 
-    log.info(f'Reindexing completed.')
-    return True
+@router.post('/reindex/cancel', response_model=Optional[KnowledgeReindexJobModel])
+async def cancel_reindex_knowledge_files(user=Depends(get_admin_user)):
+    return await cancel_reindex_job()
 
 
 ############################
@@ -734,6 +709,7 @@ def update_file_from_knowledge_by_id(
 
     # Remove content from the vector database
     VECTOR_DB_CLIENT.delete(collection_name=knowledge.id, filter={'file_id': form_data.file_id})
+    BM25_INDEX.delete(knowledge.id, filter={'file_id': form_data.file_id})
 
     # Add content to the vector database
     try:
@@ -822,6 +798,9 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={'hash': file.hash}
         )  # Remove by hash as well in case of duplicates
+
+        BM25_INDEX.delete(knowledge.id, filter={'file_id': form_data.file_id})
+        BM25_INDEX.delete(knowledge.id, filter={'hash': file.hash})
     except Exception as e:
         log.debug('This was most likely caused by bypassing embedding processing')
         log.debug(e)
@@ -833,6 +812,7 @@ def remove_file_from_knowledge_by_id(
             file_collection = f'file-{form_data.file_id}'
             if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
                 VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+            BM25_INDEX.drop(file_collection)
         except Exception as e:
             log.debug('This was most likely caused by bypassing embedding processing')
             log.debug(e)
@@ -918,6 +898,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user), db: S
     except Exception as e:
         log.debug(e)
         pass
+    BM25_INDEX.drop(id)
 
     # Remove knowledge base embedding
     remove_knowledge_base_metadata_embedding(id)
@@ -961,6 +942,7 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user), db: Se
     except Exception as e:
         log.debug(e)
         pass
+    BM25_INDEX.drop(id)
 
     knowledge = Knowledges.reset_knowledge_by_id(id=id, db=db)
     return knowledge
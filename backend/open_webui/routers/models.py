@@ -86,12 +86,11 @@ async def get_models(
         filter['direction'] = direction
 
     # Pre-fetch user group IDs once - used for both filter and write_access check
-    groups = Groups.get_groups_by_member_id(user.id, db=db)
-    user_group_ids = {group.id for group in groups}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     if not user.role == 'admin' or not BYPASS_ADMIN_ACCESS_CONTROL:
-        if groups:
-            filter['group_ids'] = [group.id for group in groups]
+        if user_group_ids:
+            filter['group_ids'] = list(user_group_ids)
 
         filter['user_id'] = user.id
 
@@ -18,6 +18,13 @@ from aiocache import cached
 import requests
 
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+from open_webui.utils.models_cache import (
+    MODEL_LIST_CACHE,
+    copy_model_list_response,
+    get_connection_cache_key,
+    get_connection_cache_ttl,
+)
 from open_webui.models.chats import Chats
 from open_webui.models.users import UserModel
 
@@ -86,7 +93,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             headers = {
                 'Content-Type': 'application/json',
                 **({'Authorization': f'Bearer {key}'} if key else {}),
@@ -99,6 +106,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                 url,
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -117,9 +125,10 @@ async def send_post_request(
     metadata: Optional[dict] = None,
 ):
     r = None
+    session = None
     streaming = False
     try:
-        session = aiohttp.ClientSession(trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT))
+        session = CLIENT_SESSION_POOL.get_session(url)
 
         headers = {
             'Content-Type': 'application/json',
@@ -136,6 +145,7 @@ async def send_post_request(
             data=payload,
             headers=headers,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         if r.ok is False:
@@ -215,10 +225,7 @@ async def verify_connection(form_data: ConnectionVerificationForm, user=Depends(
     url = form_data.url
     key = form_data.key
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             headers = {
                 **({'Authorization': f'Bearer {key}'} if key else {}),
@@ -231,6 +238,7 @@ async def verify_connection(form_data: ConnectionVerificationForm, user=Depends(
                 f'{url}/api/version',
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
             ) as r:
                 if r.status != 200:
                     detail = f'HTTP Error: {r.status}'
@@ -310,12 +318,21 @@ def merge_ollama_models_lists(model_lists):
 async def get_all_models(request: Request, user: UserModel = None):
     log.info('get_all_models()')
     if request.app.state.config.ENABLE_OLLAMA_API:
+
+        def get_connection_models(url, key=None, api_config=None):
+            """The connection's model list from MODEL_LIST_CACHE, refreshed in the background once stale."""
+            return MODEL_LIST_CACHE.get(
+                get_connection_cache_key('ollama', url, key, api_config, user),
+                lambda: send_get_request(f'{url}/api/tags', key, user=user),
+                ttl=get_connection_cache_ttl(api_config),
+            )
+
         request_tasks = []
         for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f'{url}/api/tags', user=user))
+                request_tasks.append(get_connection_models(url))
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -326,11 +343,12 @@ async def get_all_models(request: Request, user: UserModel = None):
                 key = api_config.get('key', None)
 
                 if enable:
-                    request_tasks.append(send_get_request(f'{url}/api/tags', key, user=user))
+                    request_tasks.append(get_connection_models(url, key, api_config))
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
-        responses = await asyncio.gather(*request_tasks)
+        # Copied, as cached lists are shared between calls and get modified below
+        responses = [copy_model_list_response(response) for response in await asyncio.gather(*request_tasks)]
 
         for idx, response in enumerate(responses):
             if response:
@@ -374,7 +392,15 @@ async def get_all_models(request: Request, user: UserModel = None):
         }
 
         try:
-            loaded_models = await get_ollama_loaded_models(request, user=user)
+            loaded_models = await MODEL_LIST_CACHE.get(
+                get_connection_cache_key(
+                    'ollama_loaded',
+                    ','.join(request.app.state.config.OLLAMA_BASE_URLS),
+                    api_config=request.app.state.config.OLLAMA_API_CONFIGS,
+                    user=user,
+                ),
+                lambda: get_ollama_loaded_models(request, user=user),
+            )
             expires_map = {m['model']: m['expires_at'] for m in loaded_models['models'] if 'expires_at' in m}
 
             for m in models['models']:
@@ -396,7 +422,7 @@ async def get_filtered_models(models, user, db=None):
     # Filter models based on user access control
     model_ids = [model['model'] for model in models.get('models', [])]
     model_infos = {model_info.id: model_info for model_info in Models.get_models_by_ids(model_ids, db=db)}
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
     accessible_model_ids = AccessGrants.get_accessible_resource_ids(
@@ -1287,7 +1313,7 @@ async def generate_chat_completion(
 
         # Check if user has access to the model
         if not bypass_filter and user.role == 'user':
-            user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1396,7 +1422,7 @@ async def generate_openai_completion(
 
         # Check if user has access to the model
         if user.role == 'user':
-            user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1482,7 +1508,7 @@ async def generate_openai_chat_completion(
 
         # Check if user has access to the model
         if user.role == 'user':
-            user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1554,7 +1580,7 @@ async def generate_anthropic_messages(
 
         # Check if user has access to the model
         if user.role == 'user':
-            user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1654,7 +1680,7 @@ async def get_openai_models(
         # Filter models based on user access control
         model_ids = [model['id'] for model in models]
         model_infos = {model_info.id: model_info for model_info in Models.get_models_by_ids(model_ids, db=db)}
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
         # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
         accessible_model_ids = AccessGrants.get_accessible_resource_ids(
@@ -1716,8 +1742,8 @@ async def download_file_stream(ollama_url, file_url, file_path, file_name, chunk
 
     timeout = aiohttp.ClientTimeout(total=600)  # Set the timeout
 
-    async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-        async with session.get(file_url, headers=headers, ssl=AIOHTTP_CLIENT_SESSION_SSL) as response:
+    async with CLIENT_SESSION_POOL.session(file_url) as session:
+        async with session.get(file_url, headers=headers, ssl=AIOHTTP_CLIENT_SESSION_SSL, timeout=timeout) as response:
             total_size = int(response.headers.get('content-length', 0)) + current_size
 
             with open(file_path, 'ab+') as file:
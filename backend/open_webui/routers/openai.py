@@ -28,9 +28,6 @@ from open_webui.internal.db import get_session
 from open_webui.models.models import Models
 from open_webui.models.access_grants import AccessGrants
 from open_webui.models.groups import Groups
-from open_webui.config import (
-    CACHE_DIR,
-)
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -58,6 +55,14 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+from open_webui.utils.speech_cache import SPEECH_CACHE
+from open_webui.utils.models_cache import (
+    MODEL_LIST_CACHE,
+    copy_model_list_response,
+    get_connection_cache_key,
+    get_connection_cache_ttl,
+)
 from open_webui.utils.anthropic import is_anthropic_url, get_anthropic_models
 
 log = logging.getLogger(__name__)
@@ -81,7 +86,7 @@ async def send_get_request(
 ):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             if request and config:
                 headers, cookies = await get_headers_and_cookies(request, url, key, config, user=user)
             else:
@@ -98,6 +103,7 @@ async def send_get_request(
                 headers=headers,
                 cookies=cookies,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -287,13 +293,9 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         body = await request.body()
         name = hashlib.sha256(body).hexdigest()
 
-        SPEECH_CACHE_DIR = CACHE_DIR / 'audio' / 'speech'
-        SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        file_path = SPEECH_CACHE_DIR.joinpath(f'{name}.mp3')
-        file_body_path = SPEECH_CACHE_DIR.joinpath(f'{name}.json')
-
         # Check if the file already exists in the cache
-        if file_path.is_file():
+        file_path = SPEECH_CACHE.get(name)
+        if file_path:
             return FileResponse(file_path)
 
         url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
@@ -317,13 +319,12 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
             r.raise_for_status()
 
-            # Save the streaming content to a file
-            with open(file_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            with open(file_body_path, 'w') as f:
-                json.dump(json.loads(body.decode('utf-8')), f)
+            # Save the streaming content to the cache
+            file_path = SPEECH_CACHE.put(
+                name,
+                b''.join(r.iter_content(chunk_size=8192)),
+                json.loads(body.decode('utf-8')),
+            )
 
             # Return the saved file
             return FileResponse(file_path)
@@ -374,10 +375,18 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             api_keys += [''] * (num_urls - num_keys)
             request.app.state.config.OPENAI_API_KEYS = api_keys
 
+    def get_connection_models(idx, url, api_config=None):
+        """The connection's model list from MODEL_LIST_CACHE, refreshed in the background once stale."""
+        return MODEL_LIST_CACHE.get(
+            get_connection_cache_key('openai', url, api_keys[idx], api_config, user),
+            lambda: get_models_request(request, url, api_keys[idx], user=user, config=api_config),
+            ttl=get_connection_cache_ttl(api_config),
+        )
+
     request_tasks = []
     for idx, url in enumerate(api_base_urls):
         if (str(idx) not in api_configs) and (url not in api_configs):  # Legacy support
-            request_tasks.append(get_models_request(request, url, api_keys[idx], user=user))
+            request_tasks.append(get_connection_models(idx, url))
         else:
             api_config = api_configs.get(
                 str(idx),
@@ -389,7 +398,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
 
             if enable:
                 if len(model_ids) == 0:
-                    request_tasks.append(get_models_request(request, url, api_keys[idx], user=user, config=api_config))
+                    request_tasks.append(get_connection_models(idx, url, api_config))
                 else:
                     model_list = {
                         'object': 'list',
@@ -409,7 +418,8 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             else:
                 request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
-    responses = await asyncio.gather(*request_tasks)
+    # Copied, as cached lists are shared between calls and get modified below
+    responses = [copy_model_list_response(response) for response in await asyncio.gather(*request_tasks)]
 
     for idx, response in enumerate(responses):
         if response:
@@ -450,7 +460,7 @@ async def get_filtered_models(models, user, db=None):
     # Filter models based on user access control
     model_ids = [model['id'] for model in models.get('data', [])]
     model_infos = {model_info.id: model_info for model_info in Models.get_models_by_ids(model_ids, db=db)}
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
     accessible_model_ids = AccessGrants.get_accessible_resource_ids(
@@ -565,10 +575,7 @@ async def get_models(request: Request, url_idx: Optional[int] = None, user=Depen
         )
 
         r = None
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-        ) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             try:
                 headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
 
@@ -587,6 +594,7 @@ async def get_models(request: Request, url_idx: Optional[int] = None, user=Depen
                         headers=headers,
                         cookies=cookies,
                         ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
                     ) as r:
                         if r.status != 200:
                             error_detail = f'HTTP Error: {r.status}'
@@ -650,11 +658,9 @@ async def verify_connection(
     key = form_data.key
 
     api_config = form_data.config or {}
+    timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
 
@@ -670,6 +676,7 @@ async def verify_connection(
                     headers=headers,
                     cookies=cookies,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=timeout,
                 ) as r:
                     try:
                         response_data = await r.json()
@@ -696,6 +703,7 @@ async def verify_connection(
                     headers=headers,
                     cookies=cookies,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=timeout,
                 ) as r:
                     try:
                         response_data = await r.json()
@@ -1046,7 +1054,7 @@ async def generate_chat_completion(
 
         # Check if user has access to the model
         if not bypass_filter and user.role == 'user':
-            user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1169,7 +1177,7 @@ async def generate_chat_completion(
     response = None
 
     try:
-        session = aiohttp.ClientSession(trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT))
+        session = CLIENT_SESSION_POOL.get_session(request_url)
 
         r = await session.request(
             method='POST',
@@ -1178,6 +1186,7 @@ async def generate_chat_completion(
             headers=headers,
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -1256,16 +1265,14 @@ async def embeddings(request: Request, form_data: dict, user):
 
     headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = CLIENT_SESSION_POOL.get_session(url)
         r = await session.request(
             method='POST',
             url=f'{url}/embeddings',
             data=body,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         if 'text/event-stream' in r.headers.get('Content-Type', ''):
@@ -1370,10 +1377,7 @@ async def responses(
         else:
             request_url = f'{url}/responses'
 
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = CLIENT_SESSION_POOL.get_session(request_url)
         r = await session.request(
             method='POST',
             url=request_url,
@@ -1381,6 +1385,7 @@ async def responses(
             headers=headers,
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -1476,10 +1481,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f'{url}/{path}'
 
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = CLIENT_SESSION_POOL.get_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
@@ -1487,6 +1489,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             headers=headers,
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -6,10 +6,13 @@ import shutil
 import asyncio
 
 import re
+import itertools
+import time
 import uuid
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -45,12 +48,20 @@ from sqlalchemy.orm import Session
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
+from open_webui.retrieval.web.cache import (
+    PAGE_NAMESPACE,
+    SEARCH_NAMESPACE,
+    WEB_SEARCH_CACHE,
+    get_web_search_cache_key,
+    normalize_query,
+)
 from open_webui.retrieval.web.main import SearchResult
 from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.web.ollama import search_ollama_cloud
@@ -87,7 +98,7 @@ from open_webui.retrieval.utils import (
     get_model_path,
     query_collection,
     query_collection_with_hybrid_search,
-    query_doc,
+    aquery_doc,
     query_doc_with_hybrid_search,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
@@ -112,12 +123,16 @@ from open_webui.config import (
 from open_webui.env import (
     DEVICE_TYPE,
     DOCKER,
+    ENABLE_RAG_BM25_INDEX,
     RAG_EMBEDDING_TIMEOUT,
     SENTENCE_TRANSFORMERS_BACKEND,
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_SIGMOID_ACTIVATION_FUNCTION,
+    VECTOR_DB_INSERT_BATCH_SIZE,
+    VECTOR_DB_INSERT_PIPELINE_DEPTH,
+    WEB_SEARCH_LOADER_DEADLINE,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -1319,6 +1334,186 @@ def merge_docs_to_target_size(
     return processed_chunks
 
 
+def get_embedding_config_snapshot(request: Request) -> dict:
+    """The embedding engine and model stored with each chunk, to tell which config embedded it."""
+    return {
+        'engine': request.app.state.config.RAG_EMBEDDING_ENGINE,
+        'model': request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+
+def get_docs_embedding_function(request: Request):
+    return get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == 'openai'
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == 'ollama'
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == 'openai'
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == 'ollama'
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == 'azure_openai'
+            else None
+        ),
+        enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
+        concurrent_requests=request.app.state.config.RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    )
+
+
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
+        log.info('Using markdown header text splitter')
+        # Define headers to split on - covering most common markdown header levels
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=[
+                ('#', 'Header 1'),
+                ('##', 'Header 2'),
+                ('###', 'Header 3'),
+                ('####', 'Header 4'),
+                ('#####', 'Header 5'),
+                ('######', 'Header 6'),
+            ],
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        header_split_docs = []
+        for doc in docs:
+            header_split_docs.extend(
+                [
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata},
+                    )
+                    for split_chunk in markdown_splitter.split_text(doc.page_content)
+                ]
+            )
+
+        docs = header_split_docs
+        if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
+            docs = merge_docs_to_target_size(request, docs)
+
+    if request.app.state.config.TEXT_SPLITTER in ['', 'character']:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == 'token':
+        log.info(f'Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}')
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT('Invalid text splitter'))
+
+    return docs
+
+
+def insert_texts_to_vector_db(
+    request: Request,
+    collection_name: str,
+    texts: list[str],
+    metadatas: list[dict],
+    user=None,
+) -> int:
+    """
+    Embed and insert texts batch by batch: each batch is inserted as soon as
+    it's embedded while the next ones are embedded on the main loop, up to
+    VECTOR_DB_INSERT_PIPELINE_DEPTH batches ahead, so only those batches'
+    embeddings are held at once. The chunks already inserted are removed
+    again if a later batch fails.
+    """
+    embedding_function = get_docs_embedding_function(request)
+
+    # RAG_EMBEDDING_TIMEOUT bounds the embedding of the whole document, not each batch
+    deadline = time.monotonic() + RAG_EMBEDDING_TIMEOUT if RAG_EMBEDDING_TIMEOUT else None
+
+    def embed(start: int):
+        # Run async embedding in sync context using the main event loop
+        # This allows the main loop to stay responsive to health checks during long operations
+        return asyncio.run_coroutine_threadsafe(
+            embedding_function(
+                [text.replace('\n', ' ') for text in texts[start : start + VECTOR_DB_INSERT_BATCH_SIZE]],
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            ),
+            request.app.state.main_loop,
+        )
+
+    starts = iter(range(0, len(texts), VECTOR_DB_INSERT_BATCH_SIZE))
+    pending = deque((start, embed(start)) for start in itertools.islice(starts, VECTOR_DB_INSERT_PIPELINE_DEPTH))
+    inserted_ids = []
+    try:
+        while pending:
+            start, future = pending.popleft()
+            embeddings = future.result(timeout=max(deadline - time.monotonic(), 0) if deadline else None)
+            batch = texts[start : start + VECTOR_DB_INSERT_BATCH_SIZE]
+            if embeddings is None or len(embeddings) != len(batch):
+                raise ValueError(
+                    f'Embedding returned {len(embeddings) if embeddings is not None else 0} vectors '
+                    f'for a batch of {len(batch)} texts'
+                )
+
+            # Keep the pipeline full while this batch is written
+            next_start = next(starts, None)
+            if next_start is not None:
+                pending.append((next_start, embed(next_start)))
+
+            items = [
+                {
+                    'id': str(uuid.uuid4()),
+                    'text': text,
+                    'vector': embeddings[idx],
+                    'metadata': metadatas[start + idx],
+                }
+                for idx, text in enumerate(batch)
+            ]
+            VECTOR_DB_CLIENT.insert(
+                collection_name=collection_name,
+                items=items,
+            )
+            BM25_INDEX.add(collection_name, items)
+            inserted_ids.extend(item['id'] for item in items)
+            log.debug(f'added {len(inserted_ids)}/{len(texts)} items to collection {collection_name}')
+    except Exception:
+        for _, future in pending:
+            future.cancel()
+
+        if inserted_ids:
+            log.warning(f'removing {len(inserted_ids)} items partially added to collection {collection_name}')
+            try:
+                VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=inserted_ids)
+                BM25_INDEX.delete(collection_name, ids=inserted_ids)
+            except Exception as e:
+                log.exception(f'Error removing partially added items from {collection_name}: {e}')
+        raise
+
+    return len(inserted_ids)
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1369,57 +1564,7 @@ def save_docs_to_vector_db(
                     raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
-            log.info('Using markdown header text splitter')
-            # Define headers to split on - covering most common markdown header levels
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=[
-                    ('#', 'Header 1'),
-                    ('##', 'Header 2'),
-                    ('###', 'Header 3'),
-                    ('####', 'Header 4'),
-                    ('#####', 'Header 5'),
-                    ('######', 'Header 6'),
-                ],
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            split_docs = []
-            for doc in docs:
-                split_docs.extend(
-                    [
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata},
-                        )
-                        for split_chunk in markdown_splitter.split_text(doc.page_content)
-                    ]
-                )
-
-            docs = split_docs
-            if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
-                docs = merge_docs_to_target_size(request, docs)
-
-        if request.app.state.config.TEXT_SPLITTER in ['', 'character']:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == 'token':
-            log.info(f'Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}')
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT('Invalid text splitter'))
+        docs = split_docs(request, docs)
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1429,10 +1574,7 @@ def save_docs_to_vector_db(
         {
             **doc.metadata,
             **(metadata if metadata else {}),
-            'embedding_config': {
-                'engine': request.app.state.config.RAG_EMBEDDING_ENGINE,
-                'model': request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
+            'embedding_config': get_embedding_config_snapshot(request),
         }
         for doc in docs
     ]
@@ -1443,76 +1585,16 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25_INDEX.drop(collection_name)
                 log.info(f'deleting existing collection {collection_name}')
             elif add is False:
                 log.info(f'collection {collection_name} already exists, overwrite is False and add is False')
                 return True
 
-        log.info(f'generating embeddings for {collection_name}')
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == 'openai'
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == 'ollama'
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == 'openai'
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == 'ollama'
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == 'azure_openai'
-                else None
-            ),
-            enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
-            concurrent_requests=request.app.state.config.RAG_EMBEDDING_CONCURRENT_REQUESTS,
-        )
-
-        # Run async embedding in sync context using the main event loop
-        # This allows the main loop to stay responsive to health checks during long operations
-        embedding_timeout = RAG_EMBEDDING_TIMEOUT
+        log.info(f'generating embeddings and adding to collection {collection_name}')
+        count = insert_texts_to_vector_db(request, collection_name, texts, metadatas, user=user)
 
-        future = asyncio.run_coroutine_threadsafe(
-            embedding_function(
-                list(map(lambda x: x.replace('\n', ' '), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
-            ),
-            request.app.state.main_loop,
-        )
-        embeddings = future.result(timeout=embedding_timeout)
-        log.info(f'embeddings generated {len(embeddings)} for {len(texts)} items')
-
-        items = [
-            {
-                'id': str(uuid.uuid4()),
-                'text': text,
-                'vector': embeddings[idx],
-                'metadata': metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
-
-        log.info(f'adding to collection {collection_name}')
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
-
-        log.info(f'added {len(items)} items to collection {collection_name}')
+        log.info(f'added {count} items to collection {collection_name}')
         return True
     except Exception as e:
         log.exception(e)
@@ -1557,6 +1639,7 @@ def process_file(
                 try:
                     # /files/{file_id}/data/content/update
                     VECTOR_DB_CLIENT.delete_collection(collection_name=f'file-{file.id}')
+                    BM25_INDEX.drop(f'file-{file.id}')
                 except Exception:
                     # Audio file upload pipeline
                     pass
@@ -1747,7 +1830,7 @@ def process_file(
             with get_db() as session:
                 Files.update_file_data_by_id(
                     file.id,
-                    {'status': 'failed'},
+                    {'status': 'failed', 'error': str(e)},
                     db=session,
                 )
                 # Clear the hash so the file can be re-uploaded after fixing the issue
@@ -1865,6 +1948,34 @@ async def process_web(
         )
 
 
+# Search engines sent the user (with ENABLE_FORWARD_USER_INFO_HEADERS), cached per user
+USER_SCOPED_SEARCH_ENGINES = {'perplexity_search', 'external', 'yandex'}
+
+# Per engine, the settings (besides the query, result count and domain filter) that change its results.
+# Their values are part of the search cache key, so reconfiguring an engine doesn't serve the old results
+SEARCH_ENGINE_CONFIG_KEYS = {
+    'searxng': ('SEARXNG_QUERY_URL', 'SEARXNG_LANGUAGE'),
+    'yacy': ('YACY_QUERY_URL',),
+    'google_pse': ('GOOGLE_PSE_ENGINE_ID',),
+    'duckduckgo': ('DDGS_BACKEND',),
+    'searchapi': ('SEARCHAPI_ENGINE',),
+    'serpapi': ('SERPAPI_ENGINE',),
+    'jina': ('JINA_API_BASE_URL',),
+    'bing': ('BING_SEARCH_V7_ENDPOINT',),
+    'azure': ('AZURE_AI_SEARCH_ENDPOINT', 'AZURE_AI_SEARCH_INDEX_NAME'),
+    'perplexity': ('PERPLEXITY_MODEL', 'PERPLEXITY_SEARCH_CONTEXT_USAGE'),
+    'perplexity_search': ('PERPLEXITY_SEARCH_API_URL',),
+    'firecrawl': ('FIRECRAWL_API_BASE_URL',),
+    'external': ('EXTERNAL_WEB_SEARCH_URL',),
+    'yandex': ('YANDEX_WEB_SEARCH_URL', 'YANDEX_WEB_SEARCH_CONFIG'),
+}
+
+
+def get_search_engine_config(request: Request, engine: str) -> dict:
+    """The current values of the settings that shape the engine's results, see SEARCH_ENGINE_CONFIG_KEYS."""
+    return {key: getattr(request.app.state.config, key, None) for key in SEARCH_ENGINE_CONFIG_KEYS.get(engine, ())}
+
+
 def search_web(request: Request, engine: str, query: str, user=None) -> list[SearchResult]:
     """Search the web using a search engine and return the results as a list of SearchResult objects.
     Will look for a search engine API key in environment variables in the following order:
@@ -1884,10 +1995,31 @@ def search_web(request: Request, engine: str, query: str, user=None) -> list[Sea
     - SOUGOU_API_SID + SOUGOU_API_SK
     - SEARCHAPI_API_KEY + SEARCHAPI_ENGINE (by default `google`)
     - SERPAPI_API_KEY + SERPAPI_ENGINE (by default `google`)
+    Results are cached by engine, its configuration and the normalized query (see WEB_SEARCH_CACHE).
     Args:
         query (str): The query to search for
     """
+    cache_key = get_web_search_cache_key(
+        engine,
+        get_search_engine_config(request, engine),
+        normalize_query(query),
+        request.app.state.config.WEB_SEARCH_RESULT_COUNT,
+        request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+        # Engines sent the user may tailor the results to them
+        user.id if user and engine in USER_SCOPED_SEARCH_ENGINES else None,
+    )
+    cached = WEB_SEARCH_CACHE.get(SEARCH_NAMESPACE, cache_key)
+    if cached is not None:
+        log.debug(f'web search cache hit for {engine} query {query!r}')
+        return [SearchResult(**item) for item in cached]
+
+    results = _search_web(request, engine, query, user)
+    if results and all(isinstance(item, SearchResult) for item in results):
+        WEB_SEARCH_CACHE.set(SEARCH_NAMESPACE, cache_key, [item.model_dump() for item in results])
+    return results
+
 
+def _search_web(request: Request, engine: str, query: str, user=None) -> list[SearchResult]:
     # TODO: add playwright to search the web
     if engine == 'ollama_cloud':
         return search_ollama_cloud(
@@ -2167,6 +2299,124 @@ def search_web(request: Request, engine: str, query: str, user=None) -> list[Sea
         raise Exception('No search engine API key found in environment variables')
 
 
+async def stream_web_pages(request: Request, urls: list[str]) -> AsyncIterator[Document]:
+    """
+    Yield the documents of the urls as they're loaded: the pages fetched in
+    the last WEB_SEARCH_CACHE_TTL seconds from the cache first, then the
+    others as each one arrives.
+    """
+    cache_keys = {url: get_web_search_cache_key(request.app.state.config.WEB_LOADER_ENGINE, url) for url in urls}
+    cached = await asyncio.to_thread(WEB_SEARCH_CACHE.get_many, PAGE_NAMESPACE, list(cache_keys.values()))
+
+    missing_urls = []
+    for url, page in zip(cache_keys, cached):
+        if page is None:
+            missing_urls.append(url)
+            continue
+        for doc in page:
+            yield Document(page_content=doc['page_content'], metadata=doc['metadata'])
+
+    log.debug(f'web pages: {len(cache_keys) - len(missing_urls)} cached, {len(missing_urls)} to fetch')
+    if not missing_urls:
+        return
+
+    loader = get_web_loader(
+        missing_urls,
+        verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
+        requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
+        trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+    )
+    pages = {}
+    async for doc in loader.alazy_load():
+        source = doc.metadata.get('source')
+        # Pages that failed to load (no content) aren't cached, they're retried next time
+        if source in cache_keys and doc.page_content.strip():
+            pages.setdefault(source, []).append({'page_content': doc.page_content, 'metadata': doc.metadata})
+            await asyncio.to_thread(WEB_SEARCH_CACHE.set, PAGE_NAMESPACE, cache_keys[source], pages[source])
+        yield doc
+
+
+# Web loader engines that yield each page as it's fetched, rather than all of them from one API call
+STREAMING_WEB_LOADER_ENGINES = ('', 'safe_web', 'playwright')
+
+
+async def load_web_pages(
+    request: Request,
+    urls: list[str],
+    collection_name: Optional[str] = None,
+    user=None,
+) -> list[Document]:
+    """
+    Load the documents of the urls. With a loader that streams pages, the
+    search proceeds with the pages loaded once WEB_SEARCH_LOADER_DEADLINE
+    seconds have passed and at least one page arrived. With a
+    collection_name, the pages are chunked, embedded and inserted into the
+    (emptied) collection as they arrive, while the others load, so one slow
+    site doesn't hold back the whole search.
+    """
+    saver = None
+    if collection_name:
+        queue = asyncio.Queue()
+
+        def reset_collection():
+            if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25_INDEX.drop(collection_name)
+
+        async def save_batch(docs: list[Document]):
+            try:
+                await run_in_threadpool(save_docs_to_vector_db, request, docs, collection_name, add=True, user=user)
+            except Exception as e:
+                sources = [doc.metadata.get('source') for doc in docs]
+                log.debug(f'error saving docs of {sources}: {e}')
+
+        async def save_pages():
+            # The pages queued while the previous batch was embedded, in one batch
+            done = False
+            while not done:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                if None in batch:
+                    done = True
+                    batch = batch[: batch.index(None)]
+                if batch:
+                    await save_batch(batch)
+
+        await run_in_threadpool(reset_collection)
+        saver = asyncio.create_task(save_pages())
+
+    docs = []
+    pages = stream_web_pages(request, urls)
+    deadline = (
+        time.monotonic() + WEB_SEARCH_LOADER_DEADLINE
+        if WEB_SEARCH_LOADER_DEADLINE and request.app.state.config.WEB_LOADER_ENGINE in STREAMING_WEB_LOADER_ENGINES
+        else None
+    )
+    try:
+        while True:
+            try:
+                # Never proceed without any page
+                timeout = max(deadline - time.monotonic(), 0) if deadline and docs else None
+                doc = await asyncio.wait_for(anext(pages), timeout)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                log.info(f'web search: proceeding with {len(docs)} pages loaded within {WEB_SEARCH_LOADER_DEADLINE}s')
+                break
+
+            docs.append(doc)
+            if saver is not None and doc.page_content.strip():
+                queue.put_nowait(doc)
+    finally:
+        await pages.aclose()
+        if saver is not None:
+            queue.put_nowait(None)
+            await saver
+
+    return docs
+
+
 @router.post('/process/web/search')
 async def process_web_search(request: Request, form_data: SearchForm, user=Depends(get_verified_user)):
     if not request.app.state.config.ENABLE_WEB_SEARCH:
@@ -2249,6 +2499,11 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
         )
 
     try:
+        # Create a single collection for all documents
+        collection_name = None
+        if not request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
+            collection_name = f'web-search-{calculate_sha256_string("-".join(form_data.queries))}'[:63]
+
         if request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER:
             search_results = [item for result in search_results for item in result if result]
 
@@ -2265,14 +2520,22 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
                 for result in search_results
                 if hasattr(result, 'snippet') and result.snippet is not None
             ]
+
+            if collection_name:
+                try:
+                    await run_in_threadpool(
+                        save_docs_to_vector_db,
+                        request,
+                        docs,
+                        collection_name,
+                        overwrite=True,
+                        user=user,
+                    )
+                except Exception as e:
+                    log.debug(f'error saving docs: {e}')
         else:
-            loader = get_web_loader(
-                urls,
-                verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
-                requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
-                trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
-            )
-            docs = await loader.aload()
+            # Saved to the collection page by page as they load
+            docs = await load_web_pages(request, urls, collection_name=collection_name, user=user)
 
         urls = [
             doc.metadata.get('source') for doc in docs if doc.metadata.get('source')
@@ -2297,21 +2560,6 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
                 'loaded_count': len(docs),
             }
         else:
-            # Create a single collection for all documents
-            collection_name = f'web-search-{calculate_sha256_string("-".join(form_data.queries))}'[:63]
-
-            try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
-                    request,
-                    docs,
-                    collection_name,
-                    overwrite=True,
-                    user=user,
-                )
-            except Exception as e:
-                log.debug(f'error saving docs: {e}')
-
             return {
                 'status': True,
                 'collection_names': [collection_name],
@@ -2375,12 +2623,19 @@ async def query_doc_handler(
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (form_data.hybrid is None or form_data.hybrid):
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
+            bm25_index = None
+            if ENABLE_RAG_BM25_INDEX:
+                bm25_index = await asyncio.to_thread(BM25_INDEX.get_index, form_data.collection_name)
+            else:
+                collection_results[form_data.collection_name] = await VECTOR_DB_CLIENT.aget(
+                    collection_name=form_data.collection_name
+                )
+            if ENABLE_RAG_BM25_INDEX and bm25_index is None:
+                return {'documents': [], 'metadatas': [], 'distances': []}
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
+                collection_result=collection_results.get(form_data.collection_name),
+                bm25_index=bm25_index,
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2404,7 +2659,7 @@ async def query_doc_handler(
             query_embedding = await request.app.state.EMBEDDING_FUNCTION(
                 form_data.query, prefix=RAG_EMBEDDING_QUERY_PREFIX, user=user
             )
-            return query_doc(
+            return await aquery_doc(
                 collection_name=form_data.collection_name,
                 query_embedding=query_embedding,
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -2515,6 +2770,7 @@ def delete_entries_from_collection(
                 collection_name=form_data.collection_name,
                 metadata={'hash': hash},
             )
+            BM25_INDEX.delete(form_data.collection_name, filter={'hash': hash})
             return {'status': True}
         else:
             return {'status': False}
@@ -2526,6 +2782,7 @@ def delete_entries_from_collection(
 @router.post('/reset/db')
 def reset_vector_db(user=Depends(get_admin_user), db: Session = Depends(get_session)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEX.reset()
     Knowledges.delete_all_knowledge(db=db)
 
 
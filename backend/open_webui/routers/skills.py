@@ -45,7 +45,7 @@ async def get_skills(
     if user.role == 'admin' and BYPASS_ADMIN_ACCESS_CONTROL:
         skills = Skills.get_skills(db=db)
     else:
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
         all_skills = Skills.get_skills(db=db)
         skills = [
             skill
@@ -89,9 +89,9 @@ async def get_skill_list(
         filter['view_option'] = view_option
 
     if not (user.role == 'admin' and BYPASS_ADMIN_ACCESS_CONTROL):
-        groups = Groups.get_groups_by_member_id(user.id, db=db)
-        if groups:
-            filter['group_ids'] = [group.id for group in groups]
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
+        if user_group_ids:
+            filter['group_ids'] = list(user_group_ids)
 
         filter['user_id'] = user.id
 
@@ -52,7 +52,7 @@ def _sanitize_proxy_path(path: str) -> str | None:
 async def list_terminal_servers(request: Request, user=Depends(get_verified_user)):
     """Return terminal servers the authenticated user has access to."""
     connections = request.app.state.config.TERMINAL_SERVER_CONNECTIONS or []
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
 
     return [
         {
@@ -82,7 +82,7 @@ async def proxy_terminal(
     if connection is None:
         return JSONResponse({'error': f"Terminal server '{server_id}' not found"}, status_code=404)
 
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
     if not has_connection_access(user, connection, user_group_ids):
         return JSONResponse({'error': 'Access denied'}, status_code=403)
 
@@ -223,7 +223,7 @@ async def _resolve_authenticated_connection(ws: WebSocket, server_id: str):
         await ws.close(code=4004, reason='Terminal server not found')
         return None
 
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
     if not has_connection_access(user, connection, user_group_ids):
         await ws.close(code=4003, reason='Access denied')
         return None
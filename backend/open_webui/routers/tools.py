@@ -159,7 +159,7 @@ async def get_tools(
         # Admin can see all tools
         return tools
     else:
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
         tools = [
             tool
             for tool in tools
@@ -198,7 +198,7 @@ async def get_tool_list(user=Depends(get_verified_user), db: Session = Depends(g
     else:
         tools = Tools.get_tools_by_user_id(user.id, 'read', defer_content=True, db=db)
 
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     result = []
     for tool in tools:
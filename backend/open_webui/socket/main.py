@@ -38,9 +38,21 @@ from open_webui.env import (
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
     WEBSOCKET_EVENT_CALLER_TIMEOUT,
+    DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL,
+    CHAT_SEARCH_INDEX_INTERVAL,
+    WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL,
+    WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.utils.file_status import FILE_STATUS_BROKER
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
+from open_webui.socket.utils import (
+    MessageEventBuffer,
+    PendingMessageEvents,
+    RedisDict,
+    RedisLock,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_permission
@@ -237,6 +249,42 @@ async def periodic_usage_pool_cleanup():
         release_func()
 
 
+async def periodic_chat_message_compaction():
+    """
+    Fold chat_message rows written in message write mode back into the chat
+    history blobs. Compaction is idempotent, so every instance may run it.
+    """
+    while True:
+        await asyncio.sleep(DATABASE_CHAT_MESSAGE_COMPACTION_INTERVAL)
+        try:
+            chat_ids = await asyncio.to_thread(Chats.get_chat_ids_with_pending_messages)
+            for chat_id in chat_ids:
+                await asyncio.to_thread(Chats.compact_chat_messages_by_id, chat_id)
+            if chat_ids:
+                log.debug(f'Compacted messages into {len(chat_ids)} chats')
+        except Exception as e:
+            log.warning(f'Chat message compaction failed: {e}')
+
+
+async def periodic_chat_search_indexing():
+    """
+    Index the chats changed since they were last indexed, in batches, so
+    searches don't have to. Indexing is idempotent, so every instance may run it.
+    """
+    while True:
+        try:
+            indexed, complete = await asyncio.to_thread(Chats.refresh_search_index)
+            if indexed:
+                log.debug(f'Indexed {indexed} chats for search')
+        except Exception as e:
+            log.warning(f'Chat search indexing failed: {e}')
+            indexed, complete = 0, True
+
+        # Straight on to the next batches while catching up
+        if complete or not indexed:
+            await asyncio.sleep(CHAT_SEARCH_INDEX_INTERVAL)
+
+
 app = socketio.ASGIApp(
     sio,
     socketio_path='/ws/socket.io',
@@ -312,6 +360,19 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
         log.debug(f'Failed to make users {user_ids} join room {room}: {e}')
 
 
+async def emit_file_status(event: dict):
+    """Push a file's processing status change to the sessions of its owner."""
+    if event.get('user_id'):
+        await emit_to_users(
+            'events:file',
+            {key: value for key, value in event.items() if key != 'user_id'},
+            [event['user_id']],
+        )
+
+
+FILE_STATUS_BROKER.add_listener(emit_file_status)
+
+
 @sio.on('usage')
 async def usage(sid, data):
     if sid in SESSION_POOL:
@@ -395,7 +456,7 @@ async def heartbeat(sid, data):
     user = SESSION_POOL.get(sid)
     if user:
         SESSION_POOL[sid] = {**user, 'last_seen_at': int(time.time())}
-        await asyncio.to_thread(Users.update_last_active_by_id, user['id'])
+        LAST_ACTIVE_BUFFER.mark(user['id'])
 
 
 @sio.on('join-channels')
@@ -780,6 +841,31 @@ async def disconnect(sid):
         # print(f"Unknown session ID {sid} disconnected")
 
 
+def write_message_events(chat_id: str, message_id: str, pending: PendingMessageEvents):
+    message = Chats.get_message_by_id_and_message_id(chat_id, message_id)
+    if message is None:
+        return
+
+    update = pending.apply(message)
+    if update:
+        Chats.upsert_message_to_chat_by_id_and_message_id(chat_id, message_id, update)
+
+
+MESSAGE_EVENT_BUFFER = MessageEventBuffer(
+    write_func=write_message_events,
+    interval=WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL,
+    max_events=WEBSOCKET_EVENT_WRITE_BUFFER_MAX_EVENTS,
+)
+
+BUFFERED_EVENT_TYPES = {'status', 'message', 'replace', 'embeds', 'files', 'source', 'citation'}
+
+
+async def flush_message_events(chat_id: str, message_id: str):
+    """Persist buffered emitter events for a message before writing it directly."""
+    if WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL > 0 and chat_id and message_id:
+        await MESSAGE_EVENT_BUFFER.flush(chat_id, message_id)
+
+
 def get_event_emitter(request_info, update_db=True):
     async def __event_emitter__(event_data):
         user_id = request_info['user_id']
@@ -799,7 +885,16 @@ def get_event_emitter(request_info, update_db=True):
         if update_db and message_id and not request_info.get('chat_id', '').startswith('local:'):
             event_type = event_data.get('type')
 
-            if event_type == 'status':
+            if WEBSOCKET_EVENT_WRITE_BUFFER_INTERVAL > 0:
+                data = event_data.get('data', {})
+                if event_type in BUFFERED_EVENT_TYPES:
+                    # Citations with a type are not persisted, matching the unbuffered path
+                    if event_type not in ('source', 'citation') or data.get('type') is None:
+                        await MESSAGE_EVENT_BUFFER.add(chat_id, message_id, event_type, data)
+                elif event_type == 'chat:tasks:cancel' or (event_type == 'chat:completion' and data.get('done')):
+                    await MESSAGE_EVENT_BUFFER.flush(chat_id, message_id)
+
+            elif event_type == 'status':
                 await asyncio.to_thread(
                     Chats.add_message_status_to_chat_by_id_and_message_id,
                     request_info['chat_id'],
@@ -1,10 +1,16 @@
+import asyncio
 import json
+import logging
 import uuid
+import weakref
+from dataclasses import dataclass, field
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -261,3 +267,149 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+@dataclass
+class PendingMessageEvents:
+    """Coalesced event-emitter updates for a single chat message."""
+
+    content: str = ''
+    replace: Optional[str] = None
+    statuses: list = field(default_factory=list)
+    sources: list = field(default_factory=list)
+    embeds: list = field(default_factory=list)
+    files: list = field(default_factory=list)
+    count: int = 0
+    attempts: int = 0  # Failed writes so far
+
+    def add(self, event_type: str, data: dict):
+        if event_type == 'message':
+            self.content += data.get('content', '')
+        elif event_type == 'replace':
+            self.replace = data.get('content', '')
+            self.content = ''
+        elif event_type == 'status':
+            self.statuses.append(data)
+        elif event_type in ('source', 'citation'):
+            self.sources.append(data)
+        elif event_type == 'embeds':
+            # Newer embeds and files are listed first
+            self.embeds = data.get('embeds', []) + self.embeds
+        elif event_type == 'files':
+            self.files = data.get('files', []) + self.files
+        self.count += 1
+
+    def merge(self, newer: 'PendingMessageEvents'):
+        """Append the events buffered after these, e.g. while these were being written."""
+        if newer.replace is not None:
+            self.replace = newer.replace
+            self.content = newer.content
+        else:
+            self.content += newer.content
+        self.statuses += newer.statuses
+        self.sources += newer.sources
+        self.embeds = newer.embeds + self.embeds
+        self.files = newer.files + self.files
+        self.count += newer.count
+
+    def apply(self, message: dict) -> dict:
+        """Return the fields to upsert on top of the stored `message`."""
+        update = {}
+        if self.replace is not None:
+            update['content'] = self.replace + self.content
+        elif self.content and message:
+            update['content'] = message.get('content', '') + self.content
+        if self.statuses and message:
+            update['statusHistory'] = message.get('statusHistory', []) + self.statuses
+        if self.sources:
+            update['sources'] = message.get('sources', []) + self.sources
+        if self.embeds:
+            update['embeds'] = self.embeds + message.get('embeds', [])
+        if self.files:
+            update['files'] = self.files + message.get('files', [])
+        return update
+
+
+class MessageEventBuffer:
+    """
+    Write-behind buffer for event-emitter persistence. Events for the same
+    (chat_id, message_id) are merged and written with a single
+    read-modify-write once `interval` seconds have passed, `max_events`
+    events are pending, or flush() is called.
+
+    The events are only in memory until then: a crash loses at most the last
+    `interval` seconds (and `max_events` events) of each message, and
+    shutdown flushes everything with flush_all(). A failed write is retried
+    with the events buffered since, `max_attempts` times in all, before
+    the events are dropped.
+    """
+
+    def __init__(
+        self,
+        write_func: Callable[[str, str, PendingMessageEvents], None],
+        interval: float,
+        max_events: int,
+        max_attempts: int = 3,
+    ):
+        self.write_func = write_func
+        self.interval = interval
+        self.max_events = max_events
+        self.max_attempts = max_attempts
+        self._pending: dict[tuple[str, str], PendingMessageEvents] = {}
+        self._timers: dict[tuple[str, str], asyncio.Task] = {}
+        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    async def add(self, chat_id: str, message_id: str, event_type: str, data: dict):
+        key = (chat_id, message_id)
+        pending = self._pending.setdefault(key, PendingMessageEvents())
+        pending.add(event_type, data)
+
+        if pending.count >= self.max_events:
+            await self.flush(chat_id, message_id)
+        else:
+            self._schedule(key)
+
+    def _schedule(self, key: tuple[str, str]):
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def _flush_later(self, key: tuple[str, str]):
+        await asyncio.sleep(self.interval)
+        self._timers.pop(key, None)
+        await self.flush(*key)
+
+    async def flush(self, chat_id: str, message_id: str):
+        key = (chat_id, message_id)
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+
+        # Writes for one message are serialized so merges never read stale rows
+        async with lock:
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            try:
+                await asyncio.to_thread(self.write_func, chat_id, message_id, pending)
+            except Exception as e:
+                pending.attempts += 1
+                if pending.attempts >= self.max_attempts:
+                    log.error(
+                        f'Dropping {pending.count} events for message {message_id} in chat {chat_id} '
+                        f'after {pending.attempts} failed writes: {e}'
+                    )
+                    return
+
+                log.warning(f'Failed to persist events for message {message_id} in chat {chat_id}, retrying: {e}')
+                newer = self._pending.pop(key, None)
+                if newer is not None:
+                    pending.merge(newer)
+                self._pending[key] = pending
+                self._schedule(key)
+
+    async def flush_all(self):
+        await asyncio.gather(*(self.flush(*key) for key in list(self._pending.keys())))
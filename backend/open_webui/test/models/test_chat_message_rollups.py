@@ -0,0 +1,176 @@
+import uuid
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.config import run_migrations
+from open_webui.internal.db import get_db_context
+from open_webui.models import chat_messages
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessageRollup,
+    ChatMessages,
+    ChatRollup,
+    get_rollup_contribution,
+    get_rollup_contributions,
+)
+
+HOUR = 1_767_225_600  # 2026-01-01 00:00:00 UTC
+
+
+def get_rollups(user_id: str) -> tuple[dict, dict]:
+    """The non-zero rollup rows of a user"""
+    with get_db_context() as db:
+        message_rollups = {
+            (row.bucket, row.model_id): (
+                row.message_count,
+                row.assistant_count,
+                row.usage_count,
+                row.input_tokens,
+                row.output_tokens,
+            )
+            for row in db.query(ChatMessageRollup).filter_by(user_id=user_id)
+            if row.message_count
+        }
+        chat_rollups = {
+            (row.bucket, row.chat_id, row.model_id): row.message_count
+            for row in db.query(ChatRollup).filter_by(user_id=user_id)
+            if row.message_count
+        }
+    return message_rollups, chat_rollups
+
+
+def replay_rollups(user_id: str) -> tuple[dict, dict]:
+    """The rollup rows of a user, recomputed from their messages"""
+    message_rollups = defaultdict(lambda: [0, 0, 0, 0, 0])
+    chat_rollups = defaultdict(int)
+    with get_db_context() as db:
+        for message in db.query(ChatMessage).filter_by(user_id=user_id):
+            contribution = get_rollup_contribution(
+                message.chat_id,
+                message.user_id,
+                message.role,
+                message.model_id,
+                message.usage,
+                message.created_at,
+            )
+            values = message_rollups[(contribution.bucket, contribution.model_id)]
+            for idx, value in enumerate(
+                (
+                    1,
+                    contribution.assistant,
+                    contribution.usage,
+                    contribution.input_tokens,
+                    contribution.output_tokens,
+                )
+            ):
+                values[idx] += value
+            chat_rollups[(contribution.bucket, contribution.chat_id, contribution.model_id)] += 1
+    return {key: tuple(values) for key, values in message_rollups.items()}, dict(chat_rollups)
+
+
+class TestChatMessageRollups:
+    """Test that the rollups follow the messages through upserts and deletes"""
+
+    @pytest.fixture(scope='class', autouse=True)
+    def database(self):
+        run_migrations()
+
+    @pytest.fixture
+    def user_id(self):
+        user_id = f'test-user-{uuid.uuid4()}'
+        yield user_id
+        with get_db_context() as db:
+            db.query(ChatMessage).filter_by(user_id=user_id).delete()
+            db.query(ChatMessageRollup).filter_by(user_id=user_id).delete()
+            db.query(ChatRollup).filter_by(user_id=user_id).delete()
+            db.commit()
+
+    def seed(self, user_id: str, chat_id: str):
+        ChatMessages.upsert_message('m1', chat_id, user_id, {'role': 'user', 'content': 'hi', 'timestamp': HOUR + 10})
+        ChatMessages.upsert_message('m4', chat_id, user_id, {'role': 'user', 'content': 'hey', 'timestamp': HOUR + 30})
+        ChatMessages.upsert_message(
+            'm2',
+            chat_id,
+            user_id,
+            {
+                'role': 'assistant',
+                'model': 'model-a',
+                'content': 'hello',
+                'usage': {'input_tokens': 12, 'output_tokens': 34.7},
+                'timestamp': HOUR + 20,
+            },
+        )
+        ChatMessages.upsert_message(
+            'm3',
+            chat_id,
+            user_id,
+            {
+                'role': 'assistant',
+                'model': 'model-b',
+                'content': 'later',
+                'usage': {'input_tokens': 'n/a'},
+                'timestamp': (HOUR + 3600) * 1000,
+            },
+        )
+
+    def test_upsert_updates_rollups(self, user_id):
+        """Test that inserting and updating messages keeps the rollups equal to a replay"""
+        self.seed(user_id, 'chat-1')
+        assert get_rollups(user_id) == replay_rollups(user_id)
+
+        # Changing the model and usage moves the message between rollup rows
+        ChatMessages.upsert_message(
+            'm2', 'chat-1', user_id, {'model': 'model-b', 'usage': {'input_tokens': 5, 'output_tokens': 6}}
+        )
+        # Updates that don't change the contribution leave the rollups alone
+        ChatMessages.upsert_message('m1', 'chat-1', user_id, {'content': 'edited'})
+
+        message_rollups, chat_rollups = get_rollups(user_id)
+        assert (message_rollups, chat_rollups) == replay_rollups(user_id)
+        assert (HOUR, 'model-a') not in message_rollups
+        assert message_rollups[(HOUR, 'model-b')] == (1, 1, 1, 5, 6)
+
+    def test_delete_subtracts_rollups(self, user_id):
+        """Test that deleting a chat's messages removes exactly their contributions"""
+        self.seed(user_id, 'chat-1')
+        self.seed(user_id, 'chat-2')
+
+        ChatMessages.delete_messages_by_chat_id('chat-1')
+
+        message_rollups, chat_rollups = get_rollups(user_id)
+        assert (message_rollups, chat_rollups) == replay_rollups(user_id)
+        assert {chat_id for _, chat_id, _ in chat_rollups} == {'chat-2'}
+
+        ChatMessages.delete_messages_by_chat_id('chat-2')
+        assert get_rollups(user_id) == ({}, {})
+
+    def test_aggregated_contributions_match_per_message(self, user_id):
+        """Test that the contributions summed by the database match those summed per message"""
+        self.seed(user_id, 'chat-1')
+        self.seed(user_id, 'chat-2')
+
+        def get_totals(contributions):
+            totals = defaultdict(lambda: [0, 0, 0, 0, 0])
+            for contribution in contributions:
+                values = totals[(contribution.bucket, contribution.chat_id, contribution.model_id)]
+                for idx, value in enumerate(
+                    (
+                        contribution.message_count,
+                        contribution.assistant,
+                        contribution.usage,
+                        contribution.input_tokens,
+                        contribution.output_tokens,
+                    )
+                ):
+                    values[idx] += value
+            return {key: tuple(values) for key, values in totals.items()}
+
+        with get_db_context() as db:
+            aggregated = get_rollup_contributions(db, ChatMessage.user_id == user_id)
+            with patch.object(chat_messages, 'ROLLUP_CONTRIBUTION_SQL', {}):
+                per_message = get_rollup_contributions(db, ChatMessage.user_id == user_id)
+
+        assert len(aggregated) < len(per_message)
+        assert get_totals(aggregated) == get_totals(per_message)
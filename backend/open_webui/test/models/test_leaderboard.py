@@ -0,0 +1,155 @@
+import itertools
+import random
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.config import run_migrations
+from open_webui.internal.db import get_db_context
+from open_webui.models import feedbacks
+from open_webui.models.feedbacks import (
+    LEADERBOARD_SNAPSHOT_ID,
+    Feedback,
+    FeedbackForm,
+    Feedbacks,
+    LeaderboardSnapshot,
+    RatingData,
+    add_tag_counts,
+    calculate_elo,
+    get_elo_match,
+)
+
+MODELS = ['model-a', 'model-b', 'model-c', 'model-d']
+TAGS = ['code', 'math', 'writing']
+
+
+def get_rating_form(rng: random.Random, model_id: str = None, rating: int = None) -> FeedbackForm:
+    model_id = model_id or rng.choice(MODELS)
+    return FeedbackForm(
+        type='rating',
+        data=RatingData(
+            rating=rating if rating is not None else rng.choice([1, -1]),
+            model_id=model_id,
+            sibling_model_ids=rng.sample([m for m in MODELS if m != model_id], rng.randint(1, 2)),
+            tags=rng.sample(TAGS, rng.randint(0, 2)),
+        ),
+    )
+
+
+def replay() -> dict:
+    """The leaderboard computed from scratch from all the feedback"""
+    with get_db_context() as db:
+        rows = db.query(Feedback.data).order_by(Feedback.created_at.asc(), Feedback.id.asc()).all()
+
+    tag_counts = {}
+    for (data,) in rows:
+        add_tag_counts(tag_counts, data)
+    matches = [match for (data,) in rows if (match := get_elo_match(data)) is not None]
+    return {'models': calculate_elo(matches), 'tags': tag_counts}
+
+
+def get_snapshot():
+    with get_db_context() as db:
+        return db.query(LeaderboardSnapshot).filter_by(id=LEADERBOARD_SNAPSHOT_ID).first()
+
+
+def assert_matches_replay(data: dict):
+    expected = replay()
+    assert data['tags'] == expected['tags']
+    assert data['models'].keys() == expected['models'].keys()
+    for model_id, stats in expected['models'].items():
+        assert data['models'][model_id]['rating'] == pytest.approx(stats['rating'])
+        assert (data['models'][model_id]['won'], data['models'][model_id]['lost']) == (stats['won'], stats['lost'])
+
+
+class TestLeaderboardSnapshot:
+    """Test that the incrementally updated leaderboard snapshot matches a full replay"""
+
+    @pytest.fixture(scope='class', autouse=True)
+    def migrated(self):
+        run_migrations()
+
+    @pytest.fixture(autouse=True)
+    def clean(self):
+        with get_db_context() as db:
+            db.query(Feedback).delete()
+            db.query(LeaderboardSnapshot).delete()
+            db.commit()
+        Feedbacks._leaderboard_feedbacks = None
+        Feedbacks.get_leaderboard()
+
+    @pytest.fixture
+    def clock(self):
+        """A clock advancing a second per call, so every feedback is given after the previous one"""
+        ticks = itertools.count(1_767_225_600)
+        with patch.object(feedbacks.time, 'time', side_effect=lambda: next(ticks)):
+            yield
+
+    def test_new_ratings_apply_incrementally(self, clock):
+        """Test that new ratings and tag edits keep the snapshot fresh and equal to a replay"""
+        rng = random.Random(0)
+        inserted = []
+        for i in range(30):
+            inserted.append(Feedbacks.insert_new_feedback('user', get_rating_form(rng)))
+            if i % 5 == 4:
+                # Only the tags change
+                feedback = rng.choice(inserted)
+                form = FeedbackForm(type='rating', data=RatingData(**{**feedback.data, 'tags': rng.sample(TAGS, 1)}))
+                Feedbacks.update_feedback_by_id(feedback.id, form)
+
+            snapshot = get_snapshot()
+            assert not snapshot.stale
+            assert_matches_replay(snapshot.data)
+
+        assert_matches_replay(Feedbacks.get_leaderboard())
+
+    def test_rating_sorting_before_the_last_one_marks_stale(self, clock):
+        """Test that a rating a replay would apply earlier isn't appended to the snapshot"""
+        rng = random.Random(1)
+        Feedbacks.insert_new_feedback('user', get_rating_form(rng))
+        last = get_snapshot().data['position']
+
+        with (
+            patch.object(feedbacks.time, 'time', return_value=last[0]),
+            patch.object(feedbacks.uuid, 'uuid4', return_value='0' * 32),
+        ):
+            Feedbacks.insert_new_feedback('user', get_rating_form(rng))
+
+        assert get_snapshot().stale
+        assert_matches_replay(Feedbacks.get_leaderboard())
+        assert not get_snapshot().stale
+
+    @pytest.mark.parametrize(
+        'change',
+        [
+            lambda feedback: Feedbacks.update_feedback_by_id(
+                feedback.id,
+                FeedbackForm(type='rating', data=RatingData(**{**feedback.data, 'rating': -feedback.data['rating']})),
+            ),
+            lambda feedback: Feedbacks.delete_feedback_by_id(feedback.id),
+            lambda feedback: Feedbacks.delete_feedbacks_by_user_id(feedback.user_id),
+        ],
+        ids=['rating changed', 'deleted', 'user deleted'],
+    )
+    def test_rewriting_history_replays(self, clock, change):
+        """Test that changing or removing a past rating marks the snapshot stale, and the next read replays it"""
+        rng = random.Random(2)
+        for i in range(10):
+            feedback = Feedbacks.insert_new_feedback(f'user-{i % 2}', get_rating_form(rng, rating=1))
+        change(feedback)
+
+        assert get_snapshot().stale
+        assert_matches_replay(Feedbacks.get_leaderboard())
+        assert not get_snapshot().stale
+
+    def test_delete_all_clears(self, clock):
+        """Test that deleting all feedback empties the snapshot without a replay"""
+        rng = random.Random(3)
+        for _ in range(5):
+            Feedbacks.insert_new_feedback('user', get_rating_form(rng))
+        Feedbacks.delete_all_feedbacks()
+        Feedbacks.insert_new_feedback('user', get_rating_form(rng))
+
+        snapshot = get_snapshot()
+        assert not snapshot.stale
+        assert_matches_replay(snapshot.data)
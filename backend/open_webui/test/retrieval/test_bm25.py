@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from rank_bm25 import BM25Okapi
+
+from open_webui.retrieval import bm25
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexStore
+from open_webui.retrieval.vector.main import GetResult
+
+TEXTS = [
+    'the quick brown fox jumps over the lazy dog',
+    'a quick brown dog outpaces a lazy fox',
+    'vector databases store embeddings',
+    'bm25 ranks documents by term frequency',
+    'the fox and the hound',
+]
+
+
+def get_result(collection_name: str) -> GetResult:
+    return GetResult(
+        ids=[[f'{collection_name}-{idx}' for idx in range(len(TEXTS))]],
+        documents=[TEXTS],
+        metadatas=[[{'file_id': f'f{idx % 2}'} for idx in range(len(TEXTS))]],
+    )
+
+
+class TestBM25Index:
+    """Test the inverted index against rank_bm25"""
+
+    def test_scores_match_bm25_okapi(self):
+        """Test that the index scores documents like BM25Okapi"""
+        index = BM25Index()
+        index.add([{'id': str(idx), 'text': text} for idx, text in enumerate(TEXTS)])
+
+        okapi = BM25Okapi([text.split() for text in TEXTS])
+        expected = okapi.get_scores('quick fox'.split())
+
+        for text, _, score in index.search('quick fox', k=len(TEXTS)):
+            assert score == pytest.approx(expected[TEXTS.index(text)])
+
+    def test_delete_by_filter_and_rebuild(self):
+        """Test that deleted documents no longer match, before and after compaction"""
+        index = BM25Index()
+        index.add([{'id': str(idx), 'text': text, 'metadata': {'n': idx % 2}} for idx, text in enumerate(TEXTS)])
+
+        index.delete(filter={'n': 0})
+        assert len(index) == 2
+        assert {metadata['n'] for _, metadata, _ in index.search('fox dog', k=10)} == {1}
+
+        index.rebuild()
+        assert len(index.ids) == 2
+        assert {metadata['n'] for _, metadata, _ in index.search('fox dog', k=10)} == {1}
+
+
+class TestBM25IndexStore:
+    """Test the per-collection index store"""
+
+    @pytest.fixture
+    def vector_db(self):
+        return Mock(get=Mock(side_effect=lambda collection_name: get_result(collection_name)))
+
+    @pytest.fixture
+    def store(self, tmp_path, vector_db):
+        with (
+            patch.object(bm25, 'VECTOR_DB_CLIENT', vector_db),
+            patch.object(bm25, 'ENABLE_RAG_BM25_INDEX', True),
+            patch.object(bm25, 'get_redis_client', return_value=None),
+        ):
+            yield BM25IndexStore(tmp_path, max_collections=2)
+
+    def test_evicts_least_recently_used(self, store, vector_db):
+        """Test that only max_collections indexes stay in memory and evicted ones reload from disk"""
+        store.get_index('kb-1')
+        store.get_index('kb-2')
+        store.get_index('kb-1')
+        store.get_index('kb-3')
+
+        assert list(store._indexes) == ['kb-1', 'kb-3']
+        assert vector_db.get.call_count == 3
+
+        # Reloaded from its snapshot, not rebuilt from the vector DB
+        assert len(store.get_index('kb-2')) == len(TEXTS)
+        assert vector_db.get.call_count == 3
+        assert list(store._indexes) == ['kb-3', 'kb-2']
+
+    def test_mutations_survive_eviction(self, store):
+        """Test that journaled mutations are replayed when an evicted index is reloaded"""
+        store.get_index('kb-1')
+        store.add('kb-1', [{'id': 'new', 'text': 'a brand new chunk', 'metadata': {'file_id': 'f2'}}])
+        store.delete('kb-1', filter={'file_id': 'f0'})
+        expected = store.get_index('kb-1').search('new fox', k=10)
+
+        store.get_index('kb-2')
+        store.get_index('kb-3')
+        assert 'kb-1' not in store._indexes
+
+        assert store.get_index('kb-1').search('new fox', k=10) == expected
+        assert {metadata['file_id'] for _, metadata, _ in expected} == {'f1', 'f2'}
+
+    def test_web_search_collections_are_not_persisted(self, store, tmp_path, vector_db):
+        """Test that web search collections are built per query and leave nothing behind"""
+        index = store.get_index('web-search-abc')
+        store.add('web-search-abc', [{'id': 'x', 'text': 'ignored'}])
+        store.drop('web-search-abc')
+
+        assert len(index) == len(TEXTS)
+        assert store.get_index('web-search-abc') is not index
+        assert vector_db.get.call_count == 2
+        assert not store._indexes
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import patch
+
+from open_webui.retrieval import utils
+from open_webui.retrieval.embedding_cache import (
+    DiskEmbeddingCacheBackend,
+    EmbeddingCache,
+    get_embedding_cache_key,
+)
+from open_webui.retrieval.utils import get_cached_embedding_function
+
+
+class FakeEmbeddingFunction:
+    """Embeds a text as [len(text)] and records what it was asked to embed"""
+
+    def __init__(self, drop: int = 0):
+        self.calls = []
+        self.drop = drop
+
+    async def __call__(self, query, prefix=None, user=None):
+        self.calls.append(query)
+        if isinstance(query, list):
+            return [[float(len(text))] for text in query][self.drop :]
+        return [float(len(query))]
+
+
+class TestEmbeddingCache:
+    """Test the two-tier embedding cache"""
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test that the in-process tier keeps only max_size embeddings"""
+        cache = EmbeddingCache(max_size=2)
+        cache.set_many({'a': [1.0], 'b': [2.0]})
+        cache.get_many(['a'])
+        cache.set_many({'c': [3.0]})
+
+        assert cache.get_many(['a', 'b', 'c']) == [[1.0], None, [3.0]]
+
+    def test_shared_tier_fills_lru(self, tmp_path):
+        """Test that a miss in the LRU is served from the shared tier and remembered"""
+        backend = DiskEmbeddingCacheBackend(tmp_path / 'embeddings.db', ttl=0)
+        EmbeddingCache(max_size=10, backend=backend).set_many({'a': [1.0, 2.0]})
+
+        cache = EmbeddingCache(max_size=10, backend=backend)
+        assert cache.get_many(['a', 'b']) == [[1.0, 2.0], None]
+        assert cache._lru == {'a': [1.0, 2.0]}
+
+    def test_key_depends_on_endpoint(self):
+        """Test that the same model behind another endpoint gets its own entries"""
+        key = get_embedding_cache_key('openai', 'http://a/v1', 'model', None, 'text')
+
+        assert key == get_embedding_cache_key('openai', 'http://a/v1/', 'model', None, 'text')
+        assert key != get_embedding_cache_key('openai', 'http://b/v1', 'model', None, 'text')
+        assert key != get_embedding_cache_key('openai', 'http://a/v1', 'model', 'query: ', 'text')
+
+
+class TestCachedEmbeddingFunction:
+    """Test the cache wrapper around an embedding function"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        cache = EmbeddingCache(max_size=100)
+        with patch.object(utils, 'EMBEDDING_CACHE', cache):
+            yield cache
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_embedded(self):
+        """Test that cached and duplicate texts are not sent to the embedding function"""
+        embedding_function = FakeEmbeddingFunction()
+        cached = get_cached_embedding_function(embedding_function, 'openai', 'model', 'http://a/v1')
+
+        assert await cached(['aa', 'bbb', 'aa']) == [[2.0], [3.0], [2.0]]
+        assert await cached(['bbb', 'cccc']) == [[3.0], [4.0]]
+        assert await cached('cccc') == [4.0]
+        assert embedding_function.calls == [['aa', 'bbb'], ['cccc']]
+
+    @pytest.mark.asyncio
+    async def test_endpoints_do_not_share_entries(self):
+        """Test that switching the endpoint of a model embeds the texts again"""
+        embedding_function = FakeEmbeddingFunction()
+
+        await get_cached_embedding_function(embedding_function, 'openai', 'model', 'http://a/v1')(['aa'])
+        await get_cached_embedding_function(embedding_function, 'openai', 'model', 'http://b/v1')(['aa'])
+
+        assert embedding_function.calls == [['aa'], ['aa']]
+
+    @pytest.mark.asyncio
+    async def test_wrong_embedding_count_raises(self, cache):
+        """Test that a response with fewer embeddings than texts is rejected and not cached"""
+        cached = get_cached_embedding_function(FakeEmbeddingFunction(drop=1), 'openai', 'model', 'http://a/v1')
+
+        with pytest.raises(ValueError, match='returned 1 embeddings for 2 texts'):
+            await cached(['aa', 'bbb'])
+        assert not cache._lru
@@ -0,0 +1,194 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from open_webui.retrieval import reindex
+from open_webui.retrieval.reindex import KnowledgeReindexer
+from open_webui.retrieval.vector.main import GetResult
+
+OLD_CONFIG = {'engine': '', 'model': 'old-model'}
+NEW_CONFIG = {'engine': '', 'model': 'new-model'}
+
+
+class FakeVectorDB:
+    """In-memory vector DB that, like Chroma and Qdrant, rejects vectors of another dimension"""
+
+    def __init__(self):
+        self.collections = {}
+        self.fail_file_ids = set()
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        collection = self.collections.setdefault(collection_name, {'dimension': len(items[0]['vector']), 'items': {}})
+        for item in items:
+            if item['metadata'].get('file_id') in self.fail_file_ids:
+                raise RuntimeError('Insert failed')
+            if len(item['vector']) != collection['dimension']:
+                raise ValueError(
+                    f'Collection expecting embedding with dimension of {collection["dimension"]}, '
+                    f'got {len(item["vector"])}'
+                )
+        for item in items:
+            collection['items'][item['id']] = item
+
+    def _result(self, items):
+        return GetResult(
+            ids=[[item['id'] for item in items]],
+            documents=[[item['text'] for item in items]],
+            metadatas=[[item['metadata'] for item in items]],
+        )
+
+    def query(self, collection_name, filter, limit=None):
+        if collection_name not in self.collections:
+            return None
+        items = [
+            item
+            for item in self.collections[collection_name]['items'].values()
+            if all(item['metadata'].get(key) == value for key, value in filter.items())
+        ]
+        return self._result(items[:limit] if limit else items)
+
+    def get(self, collection_name):
+        return self.query(collection_name, {})
+
+    def delete(self, collection_name, ids=None, filter=None):
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            return
+        for item_id, item in list(collection['items'].items()):
+            if (ids is not None and item_id in ids) or (
+                filter is not None and all(item['metadata'].get(key) == value for key, value in filter.items())
+            ):
+                del collection['items'][item_id]
+
+    def file_items(self, collection_name, file_id):
+        return self.query(collection_name, {'file_id': file_id})
+
+
+def seed(vector_db, file_id, dimension, config, count=2):
+    vector_db.insert(
+        'kb',
+        [
+            {
+                'id': f'{file_id}-old-{idx}',
+                'text': f'old chunk {idx}',
+                'vector': [0.0] * dimension,
+                'metadata': {'file_id': file_id, 'hash': 'stale', 'embedding_config': config},
+            }
+            for idx in range(count)
+        ],
+    )
+
+
+class TestKnowledgeReindexer:
+    """Test the knowledge reindex pipeline against an in-memory vector DB"""
+
+    @pytest.fixture
+    def vector_db(self):
+        return FakeVectorDB()
+
+    @pytest.fixture
+    def job_updates(self):
+        return []
+
+    @pytest.fixture(autouse=True)
+    def environment(self, vector_db, job_updates):
+        files = {
+            file_id: SimpleNamespace(
+                id=file_id,
+                filename=f'{file_id}.txt',
+                user_id='user',
+                meta={},
+                data={'content': f'content of {file_id}'},
+            )
+            for file_id in ('f1', 'f2')
+        }
+
+        knowledge_reindex = Mock()
+        knowledge_reindex.get_file_statuses.return_value = {}
+        knowledge_reindex.update_job_by_id.side_effect = lambda job_id, updated: job_updates.append(updated)
+
+        knowledges = Mock()
+        knowledges.get_knowledge_bases.return_value = [SimpleNamespace(id='kb')]
+        knowledges.get_file_ids_by_id.return_value = ['f1', 'f2']
+
+        async def embedding_function(texts, prefix=None, user=None):
+            return [[1.0] * 8 for _ in texts]
+
+        with (
+            patch.object(reindex, 'VECTOR_DB_CLIENT', vector_db),
+            patch.object(reindex, 'BM25_INDEX', Mock()),
+            patch.object(reindex, 'KnowledgeReindex', knowledge_reindex),
+            patch.object(reindex, 'Knowledges', knowledges),
+            patch.object(reindex, 'Files', Mock(get_file_by_id=files.get)),
+            patch.object(reindex, 'split_docs', lambda request, docs: docs),
+            patch.object(reindex, 'get_embedding_config_snapshot', lambda request: NEW_CONFIG),
+            patch.object(reindex, 'get_docs_embedding_function', lambda request: embedding_function),
+        ):
+            yield
+
+    def reindexer(self, force=False):
+        job = SimpleNamespace(id='job', force=force, errors=[])
+        return KnowledgeReindexer(Mock(), Mock(), job, concurrency=2)
+
+    @pytest.mark.asyncio
+    async def test_dimension_change_rebuilds_collection(self, vector_db, job_updates):
+        """Test that a new embedding model of another dimension replaces every file's chunks"""
+        seed(vector_db, 'f1', 4, OLD_CONFIG)
+        seed(vector_db, 'f2', 4, OLD_CONFIG)
+        seed(vector_db, 'removed', 4, OLD_CONFIG)
+
+        await self.reindexer().run()
+
+        assert job_updates[-1]['status'] == 'completed'
+        assert job_updates[-1]['completed'] == 2
+        assert job_updates[-1]['failed'] == 0
+
+        collection = vector_db.collections['kb']
+        assert collection['dimension'] == 8
+        assert {item['metadata']['file_id'] for item in collection['items'].values()} == {'f1', 'f2'}
+        assert all(item['metadata']['embedding_config'] == NEW_CONFIG for item in collection['items'].values())
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_skipped(self, vector_db, job_updates):
+        """Test that files embedded with the current config and content are left alone"""
+        await self.reindexer().run()
+        ids = set(vector_db.collections['kb']['items'])
+
+        await self.reindexer().run()
+
+        assert job_updates[-1]['skipped'] == 2
+        assert set(vector_db.collections['kb']['items']) == ids
+
+    @pytest.mark.asyncio
+    async def test_force_replaces_chunks_and_purges_removed_files(self, vector_db, job_updates):
+        """Test that a forced reindex replaces each file's chunks and drops those of removed files"""
+        seed(vector_db, 'f1', 8, NEW_CONFIG)
+        seed(vector_db, 'f2', 8, NEW_CONFIG)
+        seed(vector_db, 'removed', 8, NEW_CONFIG)
+
+        await self.reindexer(force=True).run()
+
+        assert job_updates[-1]['completed'] == 2
+        items = vector_db.collections['kb']['items'].values()
+        assert {item['metadata']['file_id'] for item in items} == {'f1', 'f2'}
+        assert not any(item['id'].endswith(('-old-0', '-old-1')) for item in items)
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_keeps_previous_chunks(self, vector_db, job_updates):
+        """Test that a file whose insert fails keeps its previous chunks"""
+        seed(vector_db, 'f1', 8, NEW_CONFIG)
+        seed(vector_db, 'f2', 8, NEW_CONFIG)
+        vector_db.fail_file_ids.add('f2')
+
+        await self.reindexer(force=True).run()
+
+        assert job_updates[-1]['completed'] == 1
+        assert job_updates[-1]['failed'] == 1
+        assert vector_db.file_items('kb', 'f2').ids[0] == ['f2-old-0', 'f2-old-1']
+        assert 'f1-old-0' not in vector_db.collections['kb']['items']
@@ -0,0 +1,110 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from open_webui.retrieval.web.cache import SEARCH_NAMESPACE, WebSearchCache
+from open_webui.retrieval.web.main import SearchResult
+from open_webui.routers import retrieval
+from open_webui.routers.retrieval import search_web
+
+
+class TestWebSearchCache:
+    """Test the two-tier web search cache"""
+
+    def test_evicts_by_serialized_size(self):
+        """Test that the in-process tier stays within its size budget"""
+        cache = WebSearchCache(ttl=60, max_size=20)
+        # 11 characters each once serialized
+        cache.set(SEARCH_NAMESPACE, 'a', 'x' * 9)
+        cache.set(SEARCH_NAMESPACE, 'b', 'y' * 9)
+        cache.set(SEARCH_NAMESPACE, 'too-big', 'z' * 30)
+
+        assert cache.get_many(SEARCH_NAMESPACE, ['a', 'b', 'too-big']) == [None, 'y' * 9, None]
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries past their TTL are not served"""
+        cache = WebSearchCache(ttl=60, max_size=1024)
+        with patch('open_webui.retrieval.web.cache.time.monotonic', return_value=1000.0):
+            cache.set(SEARCH_NAMESPACE, 'a', [1, 2])
+        with patch('open_webui.retrieval.web.cache.time.monotonic', return_value=1059.0):
+            assert cache.get(SEARCH_NAMESPACE, 'a') == [1, 2]
+        with patch('open_webui.retrieval.web.cache.time.monotonic', return_value=1061.0):
+            assert cache.get(SEARCH_NAMESPACE, 'a') is None
+
+    def test_shared_tier_failure_is_a_miss(self):
+        """Test that an unreachable shared tier doesn't fail lookups"""
+        backend = Mock(get_many=Mock(side_effect=ConnectionError('down')))
+        cache = WebSearchCache(ttl=60, max_size=1024, backend=backend)
+
+        assert cache.get(SEARCH_NAMESPACE, 'a') is None
+
+
+class TestSearchWebCache:
+    """Test the cache keys of search_web"""
+
+    @pytest.fixture(autouse=True)
+    def search(self):
+        search = Mock(
+            side_effect=lambda request, engine, query, user: [
+                SearchResult(link=f'https://{engine}.test', title=query, snippet=None)
+            ]
+        )
+        with (
+            patch.object(retrieval, 'WEB_SEARCH_CACHE', WebSearchCache(ttl=60, max_size=1024 * 1024)),
+            patch.object(retrieval, '_search_web', search),
+        ):
+            yield search
+
+    @pytest.fixture
+    def request_(self):
+        config = SimpleNamespace(
+            WEB_SEARCH_RESULT_COUNT=3,
+            WEB_SEARCH_DOMAIN_FILTER_LIST=[],
+            SEARXNG_QUERY_URL='http://searxng/search?q=<query>&safesearch=0',
+            SEARXNG_LANGUAGE='all',
+            SERPAPI_ENGINE='google',
+        )
+        return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+    def test_repeated_query_is_cached(self, request_, search):
+        """Test that the same query, up to case and whitespace, hits the cache"""
+        first = search_web(request_, 'searxng', 'Open  WebUI')
+        second = search_web(request_, 'searxng', 'open webui ')
+
+        assert search.call_count == 1
+        assert second == first
+
+    @pytest.mark.parametrize(
+        'engine, key, value',
+        [
+            ('searxng', 'SEARXNG_QUERY_URL', 'http://searxng/search?q=<query>&safesearch=2'),
+            ('searxng', 'SEARXNG_LANGUAGE', 'de'),
+            ('serpapi', 'SERPAPI_ENGINE', 'bing'),
+            ('searxng', 'WEB_SEARCH_RESULT_COUNT', 10),
+        ],
+    )
+    def test_engine_config_change_misses(self, request_, search, engine, key, value):
+        """Test that reconfiguring the engine doesn't serve results fetched with the old settings"""
+        search_web(request_, engine, 'open webui')
+        setattr(request_.app.state.config, key, value)
+        search_web(request_, engine, 'open webui')
+
+        assert search.call_count == 2
+
+    def test_other_engine_config_is_ignored(self, request_, search):
+        """Test that settings of other engines don't split the cache"""
+        search_web(request_, 'searxng', 'open webui')
+        request_.app.state.config.SERPAPI_ENGINE = 'bing'
+        search_web(request_, 'searxng', 'open webui')
+
+        assert search.call_count == 1
+
+    def test_user_scoped_engines_are_cached_per_user(self, request_, search):
+        """Test that engines sent the user don't share results between users"""
+        request_.app.state.config.EXTERNAL_WEB_SEARCH_URL = 'http://search'
+        search_web(request_, 'external', 'open webui', user=SimpleNamespace(id='u1'))
+        search_web(request_, 'external', 'open webui', user=SimpleNamespace(id='u2'))
+        search_web(request_, 'searxng', 'open webui', user=SimpleNamespace(id='u1'))
+        search_web(request_, 'searxng', 'open webui', user=SimpleNamespace(id='u2'))
+
+        assert search.call_count == 3
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from open_webui.socket.utils import MessageEventBuffer
+
+
+class FlakyWriter:
+    """Records what it was asked to write, failing the first `failures` writes"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.writes = []
+
+    def __call__(self, chat_id, message_id, pending):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('database is down')
+        self.writes.append((chat_id, message_id, pending.apply({'content': 'Hi'})))
+
+
+class TestMessageEventBuffer:
+    """Test the write-behind buffer of event-emitter updates"""
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self):
+        """Test that buffered events are written once the interval passes, without flush_all"""
+        writer = FlakyWriter()
+        buffer = MessageEventBuffer(writer, interval=0.01, max_events=100)
+        await buffer.add('chat', 'msg', 'message', {'content': ' there'})
+        await buffer.add('chat', 'msg', 'message', {'content': '!'})
+
+        await asyncio.sleep(0.05)
+        assert writer.writes == [('chat', 'msg', {'content': 'Hi there!'})]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried_with_newer_events(self):
+        """Test that events of a failed write are kept and written with the events buffered since"""
+        writer = FlakyWriter(failures=1)
+        buffer = MessageEventBuffer(writer, interval=0.01, max_events=100)
+        await buffer.add('chat', 'msg', 'message', {'content': ' there'})
+        await buffer.flush('chat', 'msg')
+        await buffer.add('chat', 'msg', 'message', {'content': '!'})
+
+        await asyncio.sleep(0.05)
+        assert writer.writes == [('chat', 'msg', {'content': 'Hi there!'})]
+
+    @pytest.mark.asyncio
+    async def test_events_are_dropped_after_max_attempts(self):
+        """Test that a message whose writes keep failing doesn't stay buffered forever"""
+        writer = FlakyWriter(failures=2)
+        buffer = MessageEventBuffer(writer, interval=0.01, max_events=100, max_attempts=2)
+        await buffer.add('chat', 'msg', 'message', {'content': ' there'})
+
+        await asyncio.sleep(0.05)
+        assert writer.writes == []
+        assert not buffer._pending
+        assert not buffer._timers
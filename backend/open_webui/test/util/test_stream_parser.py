@@ -0,0 +1,345 @@
+import random
+import re
+import time
+
+import pytest
+
+from open_webui.utils.middleware import (
+    DEFAULT_CODE_INTERPRETER_TAGS,
+    DEFAULT_REASONING_TAGS,
+    DEFAULT_SOLUTION_TAGS,
+    StreamingOutputSerializer,
+    apply_stream_tag_events,
+    output_id,
+    serialize_output,
+)
+from open_webui.utils.stream_parser import StreamTagParser
+
+TAGS = (
+    [('reasoning', start_tag, end_tag) for start_tag, end_tag in DEFAULT_REASONING_TAGS]
+    + [('solution', start_tag, end_tag) for start_tag, end_tag in DEFAULT_SOLUTION_TAGS]
+    + [('code_interpreter', start_tag, end_tag) for start_tag, end_tag in DEFAULT_CODE_INTERPRETER_TAGS]
+)
+
+STREAMS = {
+    'plain': 'Hello world, 1 < 2 and 3 > 2.\n\nNo tags <here> at all.',
+    'reasoning': '<think>\nLet me see.\nx < y, so y > x.\n</think>\n\nThe answer is 42.',
+    'reasoning with attributes': '<think type="summary" level="2">First line\nsecond line</think>Done.',
+    'text before reasoning': 'Sure. <thinking>hmm\n> quoted already\nmore</thinking> Result follows.',
+    'empty reasoning': '<think>   \n</think>Only the answer.',
+    'special tokens': '<|begin_of_thought|>plan<|end_of_thought|>x = 1',
+    'open solution': 'Answer: <|begin_of_solution|>x = 1, y < 2',
+    'unicode tags': '◁think▷推理过程◁/think▷答案',
+    'json': 'Result:\n```json\n{"tag": "<think>", "list": [1, 2, {"a": "</", "b": "<thinking"}], "t": "<tho"}\n```',
+    'reasoning then json': '<reasoning>{"step": 1, "why": "a<b"}</reasoning>{"answer": {"value": "<Thought>"}}',
+    'code interpreter': 'Running it.\n<code_interpreter type="code" lang="python">\nprint({"a": 1})\n</code_interpreter>',
+    'unterminated tag': 'Almost a tag at the end <thinkin',
+    'unterminated block': '<think>still thinking when the stream ends',
+}
+
+
+def legacy_tag_output_handler(content_type, tags, output):
+    """
+    The tag detection the streaming handler used before StreamTagParser: search
+    the trailing item's whole text for the start (or end) tag after every delta.
+    Kept verbatim as the reference the parser must agree with.
+    """
+    end_flag = False
+
+    def extract_attributes(tag_content):
+        attributes = {}
+        if not tag_content:
+            return attributes
+        matches = re.findall(r'(\w+)\s*=\s*"([^"]+)"', tag_content)
+        for key, value in matches:
+            attributes[key] = value
+        return attributes
+
+    def get_last_text(out):
+        if out and out[-1].get('type') == 'message':
+            parts = out[-1].get('content', [])
+            if parts and parts[-1].get('type') == 'output_text':
+                return parts[-1].get('text', '')
+        return ''
+
+    def set_last_text(out, text):
+        if out and out[-1].get('type') == 'message':
+            parts = out[-1].get('content', [])
+            if parts and parts[-1].get('type') == 'output_text':
+                parts[-1]['text'] = text
+
+    output_type_map = {
+        'reasoning': 'reasoning',
+        'solution': 'message',
+        'code_interpreter': 'open_webui:code_interpreter',
+    }
+    output_item_type = output_type_map.get(content_type, content_type)
+
+    last_type = output[-1].get('type', '') if output else ''
+
+    if last_type == 'message':
+        item_text = get_last_text(output)
+        for start_tag, end_tag in tags:
+            start_tag_pattern = rf'{re.escape(start_tag)}'
+            if start_tag.startswith('<') and start_tag.endswith('>'):
+                start_tag_pattern = rf'<{re.escape(start_tag[1:-1])}(\s.*?)?>'
+
+            match = re.search(start_tag_pattern, item_text)
+            if match:
+                try:
+                    attr_content = match.group(1) if match.group(1) else ''
+                except Exception:
+                    attr_content = ''
+
+                attributes = extract_attributes(attr_content)
+
+                before_tag = item_text[: match.start()]
+                after_tag = item_text[match.end() :]
+
+                set_last_text(output, before_tag)
+
+                if not before_tag.strip():
+                    if output and output[-1].get('type') == 'message':
+                        output.pop()
+
+                if output_item_type == 'reasoning':
+                    output.append(
+                        {
+                            'type': 'reasoning',
+                            'id': output_id('r'),
+                            'status': 'in_progress',
+                            'start_tag': start_tag,
+                            'end_tag': end_tag,
+                            'attributes': attributes,
+                            'content': [],
+                            'summary': None,
+                            'started_at': time.time(),
+                        }
+                    )
+                elif output_item_type == 'open_webui:code_interpreter':
+                    output.append(
+                        {
+                            'type': 'open_webui:code_interpreter',
+                            'id': output_id('ci'),
+                            'status': 'in_progress',
+                            'start_tag': start_tag,
+                            'end_tag': end_tag,
+                            'attributes': attributes,
+                            'lang': attributes.get('lang', 'python'),
+                            'code': '',
+                            'output': None,
+                            'started_at': time.time(),
+                        }
+                    )
+                else:
+                    output.append(
+                        {
+                            'type': 'message',
+                            'id': output_id('msg'),
+                            'status': 'in_progress',
+                            'role': 'assistant',
+                            'content': [{'type': 'output_text', 'text': ''}],
+                            '_tag_type': content_type,
+                            'start_tag': start_tag,
+                            'end_tag': end_tag,
+                            'attributes': attributes,
+                            'started_at': time.time(),
+                        }
+                    )
+
+                if after_tag:
+                    if output_item_type == 'reasoning':
+                        output[-1]['content'] = [{'type': 'output_text', 'text': after_tag}]
+                    elif output_item_type == 'open_webui:code_interpreter':
+                        output[-1]['code'] = after_tag
+                    else:
+                        set_last_text(output, after_tag)
+
+                    _, recursive_end = legacy_tag_output_handler(content_type, tags, output)
+                    if recursive_end:
+                        end_flag = True
+
+                break
+
+    elif (
+        (last_type == 'reasoning' and content_type == 'reasoning')
+        or (last_type == 'open_webui:code_interpreter' and content_type == 'code_interpreter')
+        or (last_type == 'message' and output[-1].get('_tag_type') == content_type)
+    ):
+        item = output[-1]
+        start_tag = item.get('start_tag', '')
+        end_tag = item.get('end_tag', '')
+
+        end_tag_pattern = rf'{re.escape(end_tag)}'
+
+        if last_type == 'reasoning':
+            parts = item.get('content', [])
+            block_content = ''
+            if parts and parts[-1].get('type') == 'output_text':
+                block_content = parts[-1].get('text', '')
+        elif last_type == 'open_webui:code_interpreter':
+            block_content = item.get('code', '')
+        else:
+            block_content = get_last_text(output)
+
+        if re.search(end_tag_pattern, block_content):
+            end_flag = True
+
+            start_tag_pattern = rf'{re.escape(start_tag)}'
+            if start_tag.startswith('<') and start_tag.endswith('>'):
+                start_tag_pattern = rf'<{re.escape(start_tag[1:-1])}(\s.*?)?>'
+            block_content = re.sub(start_tag_pattern, '', block_content).strip()
+
+            end_tag_regex = re.compile(end_tag_pattern, re.DOTALL)
+            split_content = end_tag_regex.split(block_content, maxsplit=1)
+
+            block_content = split_content[0].strip() if split_content else ''
+            leftover_content = split_content[1].strip() if len(split_content) > 1 else ''
+
+            if block_content:
+                if last_type == 'reasoning':
+                    item['content'] = [{'type': 'output_text', 'text': block_content}]
+                    item['ended_at'] = time.time()
+                    item['duration'] = int(item['ended_at'] - item['started_at'])
+                    item['status'] = 'completed'
+                elif last_type == 'open_webui:code_interpreter':
+                    item['code'] = block_content
+                    item['ended_at'] = time.time()
+                    item['duration'] = int(item['ended_at'] - item['started_at'])
+                else:
+                    set_last_text(output, block_content)
+                    item['ended_at'] = time.time()
+            else:
+                output.pop()
+
+            output.append(
+                {
+                    'type': 'message',
+                    'id': output_id('msg'),
+                    'status': 'in_progress',
+                    'role': 'assistant',
+                    'content': [{'type': 'output_text', 'text': leftover_content}],
+                }
+            )
+
+    return output, end_flag
+
+
+def legacy_append(output: list, value: str):
+    """How the streaming handler appended a delta before running the tag handlers."""
+    last_item = output[-1] if output else None
+    if last_item is not None and last_item.get('type') == 'reasoning':
+        parts = last_item.get('content', [])
+        if parts and parts[-1].get('type') == 'output_text':
+            parts[-1]['text'] += value
+        else:
+            last_item['content'] = [{'type': 'output_text', 'text': value}]
+    elif last_item is not None and last_item.get('type') == 'open_webui:code_interpreter':
+        last_item['code'] = last_item.get('code', '') + value
+    else:
+        if not output or output[-1].get('type') != 'message':
+            output.append(
+                {
+                    'type': 'message',
+                    'id': output_id('msg'),
+                    'status': 'in_progress',
+                    'role': 'assistant',
+                    'content': [{'type': 'output_text', 'text': ''}],
+                }
+            )
+        parts = output[-1].get('content', [])
+        if parts and parts[-1].get('type') == 'output_text':
+            parts[-1]['text'] += value
+        else:
+            output[-1]['content'] = [{'type': 'output_text', 'text': value}]
+
+
+def replay_legacy(deltas: list[str]) -> str:
+    output = []
+    for value in deltas:
+        legacy_append(output, value)
+        legacy_tag_output_handler('reasoning', DEFAULT_REASONING_TAGS, output)
+        legacy_tag_output_handler('solution', DEFAULT_SOLUTION_TAGS, output)
+        _, end = legacy_tag_output_handler('code_interpreter', DEFAULT_CODE_INTERPRETER_TAGS, output)
+        if end:
+            break
+    return serialize_output(output)
+
+
+def replay_incremental(deltas: list[str]) -> str:
+    parser = StreamTagParser(TAGS)
+    serializer = StreamingOutputSerializer()
+    output = []
+    for value in deltas:
+        end = apply_stream_tag_events(output, parser.feed(value))
+        # The tail serializer renders what a full serialization would at every delta
+        assert serializer.serialize(output) == serialize_output(output)
+        if end:
+            break
+    apply_stream_tag_events(output, parser.flush())
+    return serialize_output(output)
+
+
+def split_at(text: str, positions: list[int]) -> list[str]:
+    bounds = [0, *sorted(set(positions)), len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def get_splits(text: str) -> list[list[str]]:
+    """The whole text, one character per delta, every split in two, and random splits"""
+    rng = random.Random(text)
+    return [
+        [text],
+        list(text),
+        *(split_at(text, [idx]) for idx in range(1, len(text))),
+        *(split_at(text, rng.sample(range(1, len(text)), min(len(text) - 1, 8))) for _ in range(20)),
+    ]
+
+
+class TestStreamTagParser:
+    """Test that the incremental tag parser matches the full-rescan handler it replaced"""
+
+    @pytest.mark.parametrize('name', STREAMS)
+    def test_matches_legacy_handler(self, name):
+        """
+        Test that every way of splitting a stream into deltas renders as the
+        legacy handler did when fed one character at a time. The legacy output
+        could change with larger deltas (it stripped the text after an end tag
+        and only scanned it for tags on the next delta), the parser's doesn't.
+        """
+        text = STREAMS[name]
+        expected = replay_legacy(list(text))
+        for deltas in get_splits(text):
+            assert replay_incremental(deltas) == expected, deltas
+
+    def test_solution_block_is_closed(self):
+        """Test the one intended difference: the legacy handler never matched a solution end tag"""
+        text = '<|begin_of_solution|>x = 1<|end_of_solution|> Done.'
+
+        assert replay_legacy(list(text)) == 'x = 1<|end_of_solution|> Done.'
+        for deltas in get_splits(text):
+            assert replay_incremental(deltas) == 'x = 1\nDone.', deltas
+
+    def test_split_start_tag_is_held_back(self):
+        """Test that a start tag split across deltas isn't released as text"""
+        parser = StreamTagParser(TAGS)
+
+        assert parser.feed('Hi <thi') == [{'type': 'text', 'text': 'Hi '}]
+        assert parser.feed('nk type="summary"') == []
+        events = parser.feed('>deep</th')
+
+        assert events[0]['type'] == 'start'
+        assert events[0]['attributes'] == {'type': 'summary'}
+        assert events[1:] == [{'type': 'text', 'text': 'deep'}]
+        assert parser.feed('ink>') == [{'type': 'end', 'content_type': 'reasoning'}]
+
+    def test_open_resumes_block(self):
+        """Test that a parser resumed inside a block only looks for its end tag"""
+        parser = StreamTagParser(TAGS)
+        parser.open('reasoning', '<think>', '</think>')
+
+        assert parser.feed('a <code_interpreter> b</think>c') == [
+            {'type': 'text', 'text': 'a <code_interpreter> b'},
+            {'type': 'end', 'content_type': 'reasoning'},
+            {'type': 'text', 'text': 'c'},
+        ]
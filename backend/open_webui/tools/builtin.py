@@ -731,7 +731,7 @@ async def search_notes(
 
     try:
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         result = Notes.search_notes(
             user_id=user_id,
@@ -816,7 +816,7 @@ async def view_note(
 
         # Check access permission
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         from open_webui.models.access_grants import AccessGrants
 
@@ -929,7 +929,7 @@ async def replace_note_content(
 
         # Check write permission
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         from open_webui.models.access_grants import AccessGrants
 
@@ -1428,7 +1428,7 @@ async def list_knowledge_bases(
         from open_webui.models.knowledge import Knowledges
 
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         result = Knowledges.search_knowledge_bases(
             user_id,
@@ -1487,7 +1487,7 @@ async def search_knowledge_bases(
         from open_webui.models.knowledge import Knowledges
 
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         result = Knowledges.search_knowledge_bases(
             user_id,
@@ -1553,7 +1553,7 @@ async def search_knowledge_files(
 
         user_id = __user__.get('id')
         user_role = __user__.get('role', 'user')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         # When model has attached knowledge, scope to attached KBs/files only
         if __model_knowledge__:
@@ -1812,7 +1812,7 @@ async def view_knowledge_file(
 
         user_id = __user__.get('id')
         user_role = __user__.get('role', 'user')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         file = Files.get_file_by_id(file_id)
         if not file:
@@ -1904,7 +1904,7 @@ async def list_knowledge(
 
         user_id = __user__.get('id')
         user_role = __user__.get('role', 'user')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         knowledge_bases = []
         files = []
@@ -2037,7 +2037,7 @@ async def query_knowledge_files(
 
         user_id = __user__.get('id')
         user_role = __user__.get('role', 'user')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
 
         embedding_function = __request__.app.state.EMBEDDING_FUNCTION
         if not embedding_function:
@@ -2194,7 +2194,7 @@ async def query_knowledge_bases(
         from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
         user_id = __user__.get('id')
-        user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+        user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
         query_embedding = await __request__.app.state.EMBEDDING_FUNCTION(query)
 
         # Min-heap of (distance, knowledge_base_id) - only holds top `count` results
@@ -2216,7 +2216,7 @@ async def query_knowledge_bases(
 
             accessible_ids = [kb.id for kb in accessible_knowledge_bases.items]
 
-            search_results = VECTOR_DB_CLIENT.search(
+            search_results = await VECTOR_DB_CLIENT.asearch(
                 collection_name=KNOWLEDGE_BASES_COLLECTION,
                 vectors=[query_embedding],
                 filter={'knowledge_base_id': {'$in': accessible_ids}},
@@ -2304,7 +2304,7 @@ async def view_skill(
         # Check user access
         user_role = __user__.get('role', 'user')
         if user_role != 'admin' and skill.user_id != user_id:
-            user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+            user_group_ids = list(Groups.get_group_ids_by_member_id(user_id))
             if not AccessGrants.has_access(
                 user_id=user_id,
                 resource_type='skill',
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional
+
+from open_webui.env import (
+    ACCESS_GRANT_CACHE_SIZE,
+    ACCESS_GRANT_CACHE_TTL,
+    ENABLE_ACCESS_GRANT_CACHE,
+)
+from open_webui.utils.redis import RedisChannel
+
+log = logging.getLogger(__name__)
+
+
+class AccessGrantCache:
+    """
+    Resolved permissions per user: the user's group IDs, and for each
+    (resource type, permission) the IDs of every resource the user reaches
+    through a public, direct or group grant.
+
+    Entries are dropped when grants or group memberships change, on this node
+    directly and on the other nodes through a Redis pub/sub message; the TTL
+    only bounds how long a missed message goes unnoticed. Every invalidation
+    bumps a generation counter, and a value computed while one happened is
+    returned but not stored, so a read racing a write never caches the state
+    from before the write.
+    """
+
+    def __init__(
+        self,
+        ttl: float = ACCESS_GRANT_CACHE_TTL,
+        max_size: int = ACCESS_GRANT_CACHE_SIZE,
+        enabled: bool = ENABLE_ACCESS_GRANT_CACHE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.enabled = enabled and ttl > 0 and max_size > 0
+        self.channel = RedisChannel('access_grants:invalidate')
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._group_ids: OrderedDict[str, tuple[float, frozenset[str]]] = OrderedDict()
+        self._resource_ids: OrderedDict[tuple[str, str, str], tuple[float, frozenset[str]]] = OrderedDict()
+
+    def get_group_ids(self, user_id: str, fetch: Callable[[], Iterable[str]]) -> frozenset[str]:
+        return self._get(self._group_ids, user_id, fetch)
+
+    def get_resource_ids(
+        self,
+        user_id: str,
+        resource_type: str,
+        permission: str,
+        fetch: Callable[[], Iterable[str]],
+    ) -> frozenset[str]:
+        return self._get(self._resource_ids, (user_id, resource_type, permission), fetch)
+
+    def invalidate_users(self, user_ids: Iterable[str], publish: bool = True):
+        """Group membership of these users changed."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._group_ids.pop(user_id, None)
+            for key in [key for key in self._resource_ids if key[0] in user_ids]:
+                del self._resource_ids[key]
+
+        if publish:
+            self._publish({'action': 'users', 'user_ids': sorted(user_ids)})
+
+    def invalidate_resource_type(self, resource_type: str, publish: bool = True):
+        """Grants on a resource of this type changed."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._resource_ids if key[1] == resource_type]:
+                del self._resource_ids[key]
+
+        if publish:
+            self._publish({'action': 'resource_type', 'resource_type': resource_type})
+
+    def invalidate_all(self, publish: bool = True):
+        with self._lock:
+            self._generation += 1
+            self._group_ids.clear()
+            self._resource_ids.clear()
+
+        if publish:
+            self._publish({'action': 'all'})
+
+    def apply_message(self, message: dict):
+        """Apply an invalidation published by another node."""
+        action = message.get('action')
+        if action == 'users':
+            self.invalidate_users(message.get('user_ids') or [], publish=False)
+        elif action == 'resource_type':
+            self.invalidate_resource_type(message.get('resource_type'), publish=False)
+        else:
+            self.invalidate_all(publish=False)
+
+    def _get(self, entries: OrderedDict, key: Hashable, fetch: Callable[[], Iterable[str]]) -> frozenset[str]:
+        if not self.enabled:
+            return frozenset(fetch())
+
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+
+        value = frozenset(fetch())
+
+        with self._lock:
+            if generation == self._generation:
+                entries[key] = (time.monotonic() + self.ttl, value)
+                entries.move_to_end(key)
+                while len(entries) > self.max_size:
+                    entries.popitem(last=False)
+        return value
+
+    def _publish(self, message: dict):
+        if self.enabled:
+            self.channel.publish(message)
+
+
+ACCESS_GRANT_CACHE = AccessGrantCache()
+
+
+async def redis_access_grant_cache_listener(redis, cache: Optional[AccessGrantCache] = None):
+    """Apply the access grant cache invalidations published by other nodes."""
+    cache = cache or ACCESS_GRANT_CACHE
+    await cache.channel.listen(redis, cache.apply_message)
@@ -126,8 +126,7 @@ def has_access(
         return False
 
     if user_group_ids is None:
-        user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-        user_group_ids = {group.id for group in user_groups}
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
     for grant in access_grants:
         if not isinstance(grant, dict):
@@ -163,7 +162,7 @@ def has_connection_access(
         return True
 
     if user_group_ids is None:
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id)
 
     access_grants = (connection.get('config') or {}).get('access_grants', [])
     return has_access(user.id, 'read', access_grants, user_group_ids)
@@ -41,7 +41,7 @@ def has_access_to_file(
 
     # Check if the file is associated with any knowledge bases the user has access to
     knowledge_bases = Knowledges.get_knowledges_by_file_id(file_id, db=db)
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
     for knowledge_base in knowledge_bases:
         if knowledge_base.user_id == user.id or AccessGrants.has_access(
             user_id=user.id,
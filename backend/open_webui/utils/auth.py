@@ -23,6 +23,8 @@ from opentelemetry import trace
 
 
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
+from open_webui.utils.user_cache import USER_CACHE, get_api_key_cache_key, get_token_cache_key
 from open_webui.models.users import Users
 from open_webui.models.auths import Auths
 
@@ -332,7 +334,10 @@ async def get_current_user(
                     detail='Invalid token',
                 )
 
-            user = Users.get_user_by_id(data['id'])
+            user = USER_CACHE.get(
+                get_token_cache_key(token, data.get('jti')),
+                lambda: Users.get_user_by_id(data['id']),
+            )
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -355,10 +360,8 @@ async def get_current_user(
                     current_span.set_attribute('client.user.role', user.role)
                     current_span.set_attribute('client.auth.type', 'jwt')
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                # Refresh the user's last active timestamp, written in bulk with the other users'
+                LAST_ACTIVE_BUFFER.mark(user.id)
             return user
         else:
             raise HTTPException(
@@ -382,7 +385,7 @@ async def get_current_user(
 
 def get_current_user_by_api_key(request, api_key: str):
     # Each function call manages its own short-lived session internally
-    user = Users.get_user_by_api_key(api_key)
+    user = USER_CACHE.get(get_api_key_cache_key(api_key), lambda: Users.get_user_by_api_key(api_key))
 
     if user is None:
         raise HTTPException(
@@ -408,7 +411,7 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute('client.user.role', user.role)
         current_span.set_attribute('client.auth.type', 'api_key')
 
-    Users.update_last_active_by_id(user.id)
+    LAST_ACTIVE_BUFFER.mark(user.id)
     return user
 
 
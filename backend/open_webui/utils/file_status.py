@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from open_webui.utils.redis import RedisChannel
+
+log = logging.getLogger(__name__)
+
+
+class FileStatusBroker:
+    """
+    Pushes file processing status changes to whoever waits on them, instead
+    of each waiter polling the file.
+
+    A change is delivered to the subscribers of the file on this node, and
+    through Redis pub/sub to the subscribers on the other nodes. Listeners
+    (e.g. the socket emitter) only get the changes made on this node, as they
+    fan out across nodes on their own.
+    """
+
+    def __init__(self):
+        self.channel = RedisChannel('files:status')
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._listeners: list[Callable[[dict], Awaitable]] = []
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Set the loop listeners run on; publishing may happen on any thread."""
+        self.loop = loop
+
+    def add_listener(self, listener: Callable[[dict], Awaitable]):
+        self._listeners.append(listener)
+
+    @asynccontextmanager
+    async def subscribe(self, file_id: str) -> AsyncIterator[asyncio.Queue]:
+        """A queue receiving the status changes of a file while the context is open."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(file_id, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(file_id)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[file_id]
+
+    def publish(self, file_id: str, user_id: Optional[str], status: str, error: Optional[str] = None):
+        event = {'file_id': file_id, 'user_id': user_id, 'status': status}
+        if error is not None:
+            event['error'] = error
+
+        self._deliver(event)
+        self.channel.publish(event)
+
+        if self.loop is not None and not self.loop.is_closed():
+            for listener in self._listeners:
+                asyncio.run_coroutine_threadsafe(listener(event), self.loop)
+
+    def apply_message(self, message: dict):
+        """Deliver a status change published by another node."""
+        self._deliver(message)
+
+    def _deliver(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event['file_id'], ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                pass
+
+
+FILE_STATUS_BROKER = FileStatusBroker()
+
+
+async def redis_file_status_listener(redis, broker: Optional[FileStatusBroker] = None):
+    """Deliver the file status changes published by other nodes."""
+    broker = broker or FILE_STATUS_BROKER
+    await broker.channel.listen(redis, broker.apply_message)
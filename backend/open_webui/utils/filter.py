@@ -1,5 +1,7 @@
 import inspect
 import logging
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from open_webui.utils.plugin import (
     load_function_module_by_id,
@@ -19,9 +21,8 @@ def get_function_module(request, function_id, load_from_db=True):
 
 
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
+    def get_priority(function_id, function_module):
         try:
-            function_module = get_function_module(request, function_id)
             if function_module and hasattr(function_module, 'Valves'):
                 valves_db = Functions.get_function_valves_by_id(function_id)
                 valves = function_module.Valves(**(valves_db if valves_db else {}))
@@ -36,26 +37,43 @@ def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None)
         filter_ids = list(set(filter_ids))
     active_filter_ids = {function.id for function in Functions.get_functions_by_type('filter', active_only=True)}
 
-    def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
+    # Load each candidate filter's module once, for both its toggle and its priority
+    function_modules = {
+        filter_id: get_function_module(request, filter_id) for filter_id in filter_ids if filter_id in active_filter_ids
+    }
 
-        if getattr(function_module, 'toggle', None):
+    def get_active_status(filter_id):
+        if getattr(function_modules[filter_id], 'toggle', None):
             return filter_id in (enabled_filter_ids or set())
 
         return True
 
-    active_filter_ids = {filter_id for filter_id in active_filter_ids if get_active_status(filter_id)}
-
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=lambda fid: (get_priority(fid), fid))
+    filter_ids = [fid for fid in function_modules if get_active_status(fid)]
+    filter_ids.sort(key=lambda fid: (get_priority(fid, function_modules[fid]), fid))
 
     return filter_ids
 
 
 # Grant these filters the discernment to pass what serves
 # and refuse what harms, for every soul in the house.
-async def process_filter_functions(request, filter_functions, filter_type, form_data, extra_params):
-    skip_files = None
+@dataclass
+class PreparedFilter:
+    """A filter handler with its valves, UserValves and parameters resolved."""
+
+    id: str
+    module: Any
+    handler: Callable
+    valves: Any
+    params: dict
+
+
+def prepare_filter_functions(request, filter_functions, filter_type, extra_params) -> list[PreparedFilter]:
+    """
+    Resolve each filter's handler, valves, UserValves and the parameters its
+    signature accepts once, so a pipeline can be run on many payloads, e.g.
+    every chunk of a streamed response, without DB reads per payload.
+    """
+    prepared_filters = []
 
     for function in filter_functions:
         filter = function
@@ -69,50 +87,78 @@ async def process_filter_functions(request, filter_functions, filter_type, form_
         if not handler:
             continue
 
+        # Resolve valves for the function
+        valves = None
+        if hasattr(function_module, 'valves') and hasattr(function_module, 'Valves'):
+            valves_db = Functions.get_function_valves_by_id(filter_id)
+            valves = function_module.Valves(**(valves_db if valves_db else {}))
+
+        # Prepare parameters
+        sig = inspect.signature(handler)
+        params = {
+            k: v
+            for k, v in {
+                **extra_params,
+                '__id__': filter_id,
+            }.items()
+            if k in sig.parameters
+        }
+
+        # Handle user parameters
+        if '__user__' in sig.parameters:
+            if hasattr(function_module, 'UserValves'):
+                try:
+                    params['__user__'] = {
+                        **params['__user__'],
+                        'valves': function_module.UserValves(
+                            **Functions.get_user_valves_by_id_and_user_id(filter_id, params['__user__']['id'])
+                        ),
+                    }
+                except Exception as e:
+                    log.exception(f'Failed to get user values: {e}')
+
+        prepared_filters.append(
+            PreparedFilter(
+                id=filter_id,
+                module=function_module,
+                handler=handler,
+                valves=valves,
+                params=params,
+            )
+        )
+
+    return prepared_filters
+
+
+async def run_filter_functions(prepared_filters: list[PreparedFilter], filter_type, form_data):
+    skip_files = None
+
+    for prepared_filter in prepared_filters:
+        function_module = prepared_filter.module
+
         # Check if the function has a file_handler variable
         if filter_type == 'inlet' and hasattr(function_module, 'file_handler'):
             skip_files = function_module.file_handler
 
         # Apply valves to the function
-        if hasattr(function_module, 'valves') and hasattr(function_module, 'Valves'):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(**(valves if valves else {}))
+        if prepared_filter.valves is not None:
+            function_module.valves = prepared_filter.valves
 
         try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
-
             params = {'body': form_data}
             if filter_type == 'stream':
                 params = {'event': form_data}
 
-            params = params | {
-                k: v
-                for k, v in {
-                    **extra_params,
-                    '__id__': filter_id,
-                }.items()
-                if k in sig.parameters
-            }
-
-            # Handle user parameters
-            if '__user__' in sig.parameters:
-                if hasattr(function_module, 'UserValves'):
-                    try:
-                        params['__user__']['valves'] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(filter_id, params['__user__']['id'])
-                        )
-                    except Exception as e:
-                        log.exception(f'Failed to get user values: {e}')
+            params = params | prepared_filter.params
 
             # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
+            if inspect.iscoroutinefunction(prepared_filter.handler):
+                form_data = await prepared_filter.handler(**params)
             else:
-                form_data = handler(**params)
+                form_data = prepared_filter.handler(**params)
 
         except Exception as e:
-            log.debug(f'Error in {filter_type} handler {filter_id}: {e}')
+            log.debug(f'Error in {filter_type} handler {prepared_filter.id}: {e}')
             raise e
 
     # Handle file cleanup for inlet
@@ -123,3 +169,8 @@ async def process_filter_functions(request, filter_functions, filter_type, form_
             del form_data['files']
 
     return form_data, {}
+
+
+async def process_filter_functions(request, filter_functions, filter_type, form_data, extra_params):
+    prepared_filters = prepare_filter_functions(request, filter_functions, filter_type, extra_params)
+    return await run_filter_functions(prepared_filters, filter_type, form_data)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import threading
+import time
+
+from open_webui.env import USER_LAST_ACTIVE_FLUSH_INTERVAL
+from open_webui.models.users import Users
+
+log = logging.getLogger(__name__)
+
+
+class LastActiveBuffer:
+    """
+    Write-behind buffer for users' last active timestamps. Activity is
+    recorded in memory, and the latest timestamp of every user active since
+    the previous flush is written in one bulk update every `interval`
+    seconds, rather than a write per authenticated request.
+    """
+
+    def __init__(self, interval: float = USER_LAST_ACTIVE_FLUSH_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: dict[str, int] = {}
+
+    def mark(self, user_id: str):
+        """Record that the user is active now, may be called from any thread."""
+        if self.interval <= 0:
+            Users.update_last_active_by_id(user_id)
+            return
+
+        with self._lock:
+            self._pending[user_id] = int(time.time())
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        try:
+            Users.update_last_active_by_ids(pending)
+        except Exception as e:
+            log.warning(f'Failed to update the last active time of {len(pending)} users: {e}')
+            with self._lock:
+                # Put them back unless the users were active again meanwhile
+                for user_id, timestamp in pending.items():
+                    self._pending.setdefault(user_id, timestamp)
+
+    async def run(self):
+        """Flush the buffer every interval until cancelled."""
+        if self.interval <= 0:
+            return
+
+        while True:
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.flush)
+
+
+LAST_ACTIVE_BUFFER = LastActiveBuffer()
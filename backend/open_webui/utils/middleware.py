@@ -31,6 +31,7 @@ from open_webui.models.chats import Chats
 from open_webui.models.folders import Folders
 from open_webui.models.users import Users
 from open_webui.socket.main import (
+    flush_message_events,
     get_event_call,
     get_event_emitter,
 )
@@ -75,6 +76,7 @@ from open_webui.retrieval.utils import get_sources_from_items
 
 
 from open_webui.utils.sanitize import sanitize_code
+from open_webui.utils.stream_parser import StreamTagParser, get_start_tag_pattern
 from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.task import (
     get_task_model_id,
@@ -109,7 +111,9 @@ from open_webui.utils.access_control import has_connection_access
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
+    prepare_filter_functions,
     process_filter_functions,
+    run_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
@@ -389,6 +393,13 @@ def get_citation_source_from_tool_result(
         ]
 
 
+def render_reasoning_display(reasoning_content: str) -> str:
+    """Quote reasoning text line by line for the reasoning <details> block."""
+    return html.escape(
+        '\n'.join((f'> {line}' if not line.startswith('>') else line) for line in reasoning_content.splitlines())
+    )
+
+
 def split_content_and_whitespace(content):
     content_stripped = content.rstrip()
     original_whitespace = content[len(content_stripped) :] if len(content) > len(content_stripped) else ''
@@ -406,6 +417,11 @@ def serialize_output(output: list) -> str:
     Convert OR-aligned output items to HTML for display.
     For LLM consumption, use convert_output_to_messages() instead.
     """
+    return render_output(output).strip()
+
+
+def render_output(output: list) -> str:
+    """serialize_output() without the final strip."""
     content = ''
 
     # First pass: collect function_call_output items by call_id for lookup
@@ -474,11 +490,7 @@ def serialize_output(output: list) -> str:
             if content and not content.endswith('\n'):
                 content += '\n'
 
-            display = html.escape(
-                '\n'.join(
-                    (f'> {line}' if not line.startswith('>') else line) for line in reasoning_content.splitlines()
-                )
-            )
+            display = render_reasoning_display(reasoning_content)
 
             if status == 'completed' or duration is not None or not is_last_item:
                 content = f'{content}<details type="reasoning" done="true" duration="{duration or 0}">\n<summary>Thought for {duration or 0} seconds</summary>\n{display}\n</details>\n'
@@ -523,7 +535,263 @@ def serialize_output(output: list) -> str:
             else:
                 content += f'<details type="code_interpreter" done="false"{output_attr}>\n<summary>Analyzing…</summary>\n{display}\n</details>\n'
 
-    return content.strip()
+    return content
+
+
+class StreamingOutputSerializer:
+    """
+    serialize_output() for output that is being streamed into.
+
+    Everything before the last item is rendered once and reused for as long as
+    the list holds the same items. A trailing message or in-progress reasoning
+    item, the one receiving deltas, is rendered on its own; quoted reasoning
+    lines are cached as they complete, so each call only quotes the current line.
+    """
+
+    def __init__(self):
+        self._items = None
+        self._prefix = ''
+        self._lines_length = 0
+        self._lines_display = ''
+
+    @staticmethod
+    def _is_streaming_item(item: dict) -> bool:
+        item_type = item.get('type', '')
+        if item_type == 'message':
+            return True
+        return (
+            item_type == 'reasoning'
+            and item.get('status', 'in_progress') != 'completed'
+            and item.get('duration') is None
+        )
+
+    def serialize(self, output: list) -> str:
+        last_item = output[-1] if output else None
+        if last_item is None or not self._is_streaming_item(last_item):
+            self._items = None
+            return serialize_output(output)
+
+        if (
+            self._items is None
+            or len(self._items) != len(output)
+            or any(prev is not item for prev, item in zip(self._items, output))
+        ):
+            self._items = list(output)
+            # A message without text renders nothing, leaving just what precedes the last item
+            self._prefix = render_output(output[:-1] + [{'type': 'message', 'content': []}])
+            self._lines_length = 0
+            self._lines_display = ''
+
+        content = self._prefix
+        if last_item['type'] == 'message':
+            for content_part in last_item.get('content', []):
+                if 'text' in content_part:
+                    text = content_part.get('text', '').strip()
+                    if text:
+                        content = f'{content}{text}\n'
+            return content.strip()
+
+        source_list = last_item.get('summary', []) or last_item.get('content', [])
+        reasoning_content = ''.join(
+            content_part.get('text', '') for content_part in source_list if 'text' in content_part
+        ).strip()
+
+        if len(reasoning_content) < self._lines_length:
+            self._lines_length = 0
+            self._lines_display = ''
+
+        lines_end = reasoning_content.rfind('\n', self._lines_length) + 1
+        if lines_end > self._lines_length:
+            self._lines_display += render_reasoning_display(reasoning_content[self._lines_length : lines_end]) + '\n'
+            self._lines_length = lines_end
+        display = self._lines_display + render_reasoning_display(reasoning_content[self._lines_length :])
+
+        if content and not content.endswith('\n'):
+            content += '\n'
+        content = (
+            f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{display}\n</details>\n'
+        )
+        return content.strip()
+
+
+def get_open_tag_item(output: list) -> Optional[dict]:
+    """The last output item if it is a tag block (reasoning, solution, code interpreter) still receiving content."""
+    item = output[-1] if output else None
+    if (
+        item is not None
+        and item.get('status') == 'in_progress'
+        and item.get('attributes', {}).get('type') != 'reasoning_content'
+        and (
+            item.get('type') in ('reasoning', 'open_webui:code_interpreter')
+            or (item.get('type') == 'message' and item.get('_tag_type') is not None)
+        )
+    ):
+        return item
+    return None
+
+
+def get_tag_item_content_type(item: dict) -> str:
+    if item.get('type') == 'open_webui:code_interpreter':
+        return 'code_interpreter'
+    if item.get('type') == 'reasoning':
+        return 'reasoning'
+    return item.get('_tag_type')
+
+
+def get_last_output_text(item: dict) -> str:
+    """Text of an item's last output_text part, or the code of a code interpreter item."""
+    if item.get('type') == 'open_webui:code_interpreter':
+        return item.get('code', '')
+    parts = item.get('content', [])
+    if parts and parts[-1].get('type') == 'output_text':
+        return parts[-1].get('text', '')
+    return ''
+
+
+def set_last_output_text(item: dict, text: str):
+    if item.get('type') == 'open_webui:code_interpreter':
+        item['code'] = text
+        return
+    parts = item.get('content', [])
+    if parts and parts[-1].get('type') == 'output_text':
+        parts[-1]['text'] = text
+    else:
+        item['content'] = [{'type': 'output_text', 'text': text}]
+
+
+def append_output_text(output: list, text: str):
+    """Append streamed text to the open tag block, or else to the trailing message item."""
+    item = get_open_tag_item(output)
+    if item is None:
+        if not output or output[-1].get('type') != 'message':
+            output.append(
+                {
+                    'type': 'message',
+                    'id': output_id('msg'),
+                    'status': 'in_progress',
+                    'role': 'assistant',
+                    'content': [{'type': 'output_text', 'text': ''}],
+                }
+            )
+        item = output[-1]
+
+    if item.get('type') == 'open_webui:code_interpreter':
+        item['code'] = item.get('code', '') + text
+        return
+    parts = item.get('content', [])
+    if parts and parts[-1].get('type') == 'output_text':
+        parts[-1]['text'] += text
+    else:
+        item['content'] = [{'type': 'output_text', 'text': text}]
+
+
+def apply_stream_tag_events(output: list, events: list[dict]) -> bool:
+    """
+    Apply StreamTagParser events to the output items: text goes to the open tag
+    block or the trailing message, start tags open reasoning, solution and code
+    interpreter items and end tags close them. Returns True when a code
+    interpreter block was closed.
+    """
+    code_interpreter_end = False
+
+    for event in events:
+        if event['type'] == 'text':
+            append_output_text(output, event['text'])
+
+        elif event['type'] == 'start':
+            content_type = event['content_type']
+            start_tag = event['start_tag']
+            end_tag = event['end_tag']
+            attributes = event['attributes']
+
+            # Drop the message the tag was opened from if nothing preceded the tag
+            if (
+                output
+                and output[-1].get('type') == 'message'
+                and output[-1].get('_tag_type') is None
+                and not get_last_output_text(output[-1]).strip()
+            ):
+                output.pop()
+
+            if content_type == 'reasoning':
+                output.append(
+                    {
+                        'type': 'reasoning',
+                        'id': output_id('r'),
+                        'status': 'in_progress',
+                        'start_tag': start_tag,
+                        'end_tag': end_tag,
+                        'attributes': attributes,
+                        'content': [],
+                        'summary': None,
+                        'started_at': time.time(),
+                    }
+                )
+            elif content_type == 'code_interpreter':
+                output.append(
+                    {
+                        'type': 'open_webui:code_interpreter',
+                        'id': output_id('ci'),
+                        'status': 'in_progress',
+                        'start_tag': start_tag,
+                        'end_tag': end_tag,
+                        'attributes': attributes,
+                        'lang': attributes.get('lang', 'python'),
+                        'code': '',
+                        'output': None,
+                        'started_at': time.time(),
+                    }
+                )
+            else:
+                # solution or other text-producing tag
+                output.append(
+                    {
+                        'type': 'message',
+                        'id': output_id('msg'),
+                        'status': 'in_progress',
+                        'role': 'assistant',
+                        'content': [{'type': 'output_text', 'text': ''}],
+                        '_tag_type': content_type,
+                        'start_tag': start_tag,
+                        'end_tag': end_tag,
+                        'attributes': attributes,
+                        'started_at': time.time(),
+                    }
+                )
+
+        elif event['type'] == 'end':
+            if event['content_type'] == 'code_interpreter':
+                code_interpreter_end = True
+
+            item = get_open_tag_item(output)
+            if item is None:
+                continue
+
+            block_content = re.sub(get_start_tag_pattern(item.get('start_tag', '')), '', get_last_output_text(item))
+            block_content = block_content.strip()
+
+            if block_content:
+                set_last_output_text(item, block_content)
+                item['ended_at'] = time.time()
+                if item.get('type') != 'message':
+                    item['duration'] = int(item['ended_at'] - item['started_at'])
+                if item.get('type') == 'reasoning':
+                    item['status'] = 'completed'
+            else:
+                # Remove the block if content is empty
+                output.pop()
+
+            output.append(
+                {
+                    'type': 'message',
+                    'id': output_id('msg'),
+                    'status': 'in_progress',
+                    'role': 'assistant',
+                    'content': [{'type': 'output_text', 'text': ''}],
+                }
+            )
+
+    return code_interpreter_end
 
 
 def deep_merge(target, source):
@@ -3212,229 +3480,6 @@ async def streaming_chat_response_handler(response, ctx):
 
         # Handle as a background task
         async def response_handler(response, events):
-            def tag_output_handler(content_type, tags, output):
-                """
-                Detect special tags (reasoning, solution, code_interpreter) in streaming
-                content and create corresponding OR-aligned output items directly.
-                Operates on output items instead of content_blocks.
-
-                Uses the text from the output items themselves for tag detection,
-                eliminating state divergence between accumulated content and items.
-                """
-                end_flag = False
-
-                def extract_attributes(tag_content):
-                    """Extract attributes from a tag if they exist."""
-                    attributes = {}
-                    if not tag_content:
-                        return attributes
-                    matches = re.findall(r'(\w+)\s*=\s*"([^"]+)"', tag_content)
-                    for key, value in matches:
-                        attributes[key] = value
-                    return attributes
-
-                def get_last_text(out):
-                    """Get text from last message item, or empty string."""
-                    if out and out[-1].get('type') == 'message':
-                        parts = out[-1].get('content', [])
-                        if parts and parts[-1].get('type') == 'output_text':
-                            return parts[-1].get('text', '')
-                    return ''
-
-                def set_last_text(out, text):
-                    """Set text on last message item's output_text."""
-                    if out and out[-1].get('type') == 'message':
-                        parts = out[-1].get('content', [])
-                        if parts and parts[-1].get('type') == 'output_text':
-                            parts[-1]['text'] = text
-
-                # Map content_type to output item type
-                output_type_map = {
-                    'reasoning': 'reasoning',
-                    'solution': 'message',  # solution tags just produce text
-                    'code_interpreter': 'open_webui:code_interpreter',
-                }
-                output_item_type = output_type_map.get(content_type, content_type)
-
-                last_type = output[-1].get('type', '') if output else ''
-
-                if last_type == 'message':
-                    # Use the output item's own text for tag detection
-                    item_text = get_last_text(output)
-                    for start_tag, end_tag in tags:
-                        start_tag_pattern = rf'{re.escape(start_tag)}'
-                        if start_tag.startswith('<') and start_tag.endswith('>'):
-                            start_tag_pattern = rf'<{re.escape(start_tag[1:-1])}(\s.*?)?>'
-
-                        match = re.search(start_tag_pattern, item_text)
-                        if match:
-                            try:
-                                attr_content = match.group(1) if match.group(1) else ''
-                            except Exception:
-                                attr_content = ''
-
-                            attributes = extract_attributes(attr_content)
-
-                            before_tag = item_text[: match.start()]
-                            after_tag = item_text[match.end() :]
-
-                            # Keep only text before the tag in the message
-                            set_last_text(output, before_tag)
-
-                            if not before_tag.strip():
-                                # Remove empty message item
-                                if output and output[-1].get('type') == 'message':
-                                    output.pop()
-
-                            # Append the new output item
-                            if output_item_type == 'reasoning':
-                                output.append(
-                                    {
-                                        'type': 'reasoning',
-                                        'id': output_id('r'),
-                                        'status': 'in_progress',
-                                        'start_tag': start_tag,
-                                        'end_tag': end_tag,
-                                        'attributes': attributes,
-                                        'content': [],
-                                        'summary': None,
-                                        'started_at': time.time(),
-                                    }
-                                )
-                            elif output_item_type == 'open_webui:code_interpreter':
-                                output.append(
-                                    {
-                                        'type': 'open_webui:code_interpreter',
-                                        'id': output_id('ci'),
-                                        'status': 'in_progress',
-                                        'start_tag': start_tag,
-                                        'end_tag': end_tag,
-                                        'attributes': attributes,
-                                        'lang': attributes.get('lang', 'python'),
-                                        'code': '',
-                                        'output': None,
-                                        'started_at': time.time(),
-                                    }
-                                )
-                            else:
-                                # solution or other text-producing tag
-                                output.append(
-                                    {
-                                        'type': 'message',
-                                        'id': output_id('msg'),
-                                        'status': 'in_progress',
-                                        'role': 'assistant',
-                                        'content': [{'type': 'output_text', 'text': ''}],
-                                        '_tag_type': content_type,
-                                        'start_tag': start_tag,
-                                        'end_tag': end_tag,
-                                        'attributes': attributes,
-                                        'started_at': time.time(),
-                                    }
-                                )
-
-                            if after_tag:
-                                # Set the after_tag content on the new item
-                                if output_item_type == 'reasoning':
-                                    output[-1]['content'] = [{'type': 'output_text', 'text': after_tag}]
-                                elif output_item_type == 'open_webui:code_interpreter':
-                                    output[-1]['code'] = after_tag
-                                else:
-                                    set_last_text(output, after_tag)
-
-                                _, recursive_end = tag_output_handler(content_type, tags, output)
-                                if recursive_end:
-                                    end_flag = True
-
-                            break
-
-                elif (
-                    (last_type == 'reasoning' and content_type == 'reasoning')
-                    or (last_type == 'open_webui:code_interpreter' and content_type == 'code_interpreter')
-                    or (last_type == 'message' and output[-1].get('_tag_type') == content_type)
-                ):
-                    item = output[-1]
-                    start_tag = item.get('start_tag', '')
-                    end_tag = item.get('end_tag', '')
-
-                    end_tag_pattern = rf'{re.escape(end_tag)}'
-
-                    # Get the block content from the item itself
-                    if last_type == 'reasoning':
-                        parts = item.get('content', [])
-                        block_content = ''
-                        if parts and parts[-1].get('type') == 'output_text':
-                            block_content = parts[-1].get('text', '')
-                    elif last_type == 'open_webui:code_interpreter':
-                        block_content = item.get('code', '')
-                    else:
-                        block_content = get_last_text(output)
-
-                    if re.search(end_tag_pattern, block_content):
-                        end_flag = True
-
-                        # Strip start and end tags from content
-                        start_tag_pattern = rf'{re.escape(start_tag)}'
-                        if start_tag.startswith('<') and start_tag.endswith('>'):
-                            start_tag_pattern = rf'<{re.escape(start_tag[1:-1])}(\s.*?)?>'
-                        block_content = re.sub(start_tag_pattern, '', block_content).strip()
-
-                        end_tag_regex = re.compile(end_tag_pattern, re.DOTALL)
-                        split_content = end_tag_regex.split(block_content, maxsplit=1)
-
-                        block_content = split_content[0].strip() if split_content else ''
-                        leftover_content = split_content[1].strip() if len(split_content) > 1 else ''
-
-                        if block_content:
-                            # Update the item with final content
-                            if last_type == 'reasoning':
-                                item['content'] = [{'type': 'output_text', 'text': block_content}]
-                                item['ended_at'] = time.time()
-                                item['duration'] = int(item['ended_at'] - item['started_at'])
-                                item['status'] = 'completed'
-                            elif last_type == 'open_webui:code_interpreter':
-                                item['code'] = block_content
-                                item['ended_at'] = time.time()
-                                item['duration'] = int(item['ended_at'] - item['started_at'])
-                            else:
-                                set_last_text(output, block_content)
-                                item['ended_at'] = time.time()
-
-                            # Reset by appending a new message item for leftover
-                            output.append(
-                                {
-                                    'type': 'message',
-                                    'id': output_id('msg'),
-                                    'status': 'in_progress',
-                                    'role': 'assistant',
-                                    'content': [
-                                        {
-                                            'type': 'output_text',
-                                            'text': leftover_content,
-                                        }
-                                    ],
-                                }
-                            )
-                        else:
-                            # Remove the block if content is empty
-                            output.pop()
-                            output.append(
-                                {
-                                    'type': 'message',
-                                    'id': output_id('msg'),
-                                    'status': 'in_progress',
-                                    'role': 'assistant',
-                                    'content': [
-                                        {
-                                            'type': 'output_text',
-                                            'text': leftover_content,
-                                        }
-                                    ],
-                                }
-                            )
-
-                return output, end_flag
-
             message = Chats.get_message_by_id_and_message_id(metadata['chat_id'], metadata['message_id'])
 
             tool_calls = []
@@ -3487,6 +3532,14 @@ async def streaming_chat_response_handler(response, ctx):
                 else:
                     reasoning_tags = DEFAULT_REASONING_TAGS
 
+            stream_tags = [('reasoning', start_tag, end_tag) for start_tag, end_tag in reasoning_tags]
+            if DETECT_REASONING_TAGS:
+                stream_tags += [('solution', start_tag, end_tag) for start_tag, end_tag in DEFAULT_SOLUTION_TAGS]
+            if DETECT_CODE_INTERPRETER:
+                stream_tags += [
+                    ('code_interpreter', start_tag, end_tag) for start_tag, end_tag in DEFAULT_CODE_INTERPRETER_TAGS
+                ]
+
             try:
                 for event in events:
                     await event_emitter(
@@ -3521,6 +3574,28 @@ async def streaming_chat_response_handler(response, ctx):
                     )
                     last_delta_data = None
 
+                    # Tags are detected as deltas arrive, picking up a block left open by a previous round
+                    tag_parser = StreamTagParser(stream_tags)
+                    open_tag_item = get_open_tag_item(output)
+                    if open_tag_item and open_tag_item.get('end_tag'):
+                        tag_parser.open(
+                            get_tag_item_content_type(open_tag_item),
+                            open_tag_item.get('start_tag', ''),
+                            open_tag_item['end_tag'],
+                        )
+                    output_serializer = StreamingOutputSerializer()
+
+                    # Stream filters run on every chunk, resolve their valves and parameters once per round
+                    stream_filter_params = {'__body__': form_data, **extra_params}
+                    try:
+                        stream_filters = prepare_filter_functions(
+                            request, filter_functions, 'stream', stream_filter_params
+                        )
+                    except Exception as e:
+                        # Resolved per chunk instead, which raises (and skips the chunk) like before
+                        log.debug(f'Error preparing stream filters: {e}')
+                        stream_filters = None
+
                     async def flush_pending_delta_data(threshold: int = 0):
                         nonlocal delta_count
                         nonlocal last_delta_data
@@ -3553,13 +3628,16 @@ async def streaming_chat_response_handler(response, ctx):
                         try:
                             data = json.loads(data)
 
-                            data, _ = await process_filter_functions(
-                                request=request,
-                                filter_functions=filter_functions,
-                                filter_type='stream',
-                                form_data=data,
-                                extra_params={'__body__': form_data, **extra_params},
-                            )
+                            if stream_filters is not None:
+                                data, _ = await run_filter_functions(stream_filters, 'stream', data)
+                            else:
+                                data, _ = await process_filter_functions(
+                                    request=request,
+                                    filter_functions=filter_functions,
+                                    filter_type='stream',
+                                    form_data=data,
+                                    extra_params=stream_filter_params,
+                                )
 
                             if data:
                                 if 'event' in data and not getattr(request.state, 'direct', False):
@@ -3794,7 +3872,7 @@ async def streaming_chat_response_handler(response, ctx):
                                                 }
                                             ]
 
-                                        data = {'content': serialize_output(full_output())}
+                                        data = {'content': output_serializer.serialize(full_output())}
 
                                     if value:
                                         if (
@@ -3837,107 +3915,9 @@ async def streaming_chat_response_handler(response, ctx):
 
                                         content = f'{content}{value}'
 
-                                        # Check if we're inside a tag-based block
-                                        # (reasoning, code_interpreter, or solution).
-                                        # If so, append to the existing in-progress
-                                        # item instead of creating a new message —
-                                        # otherwise tag_output_handler re-detects the
-                                        # start tag on every chunk and fragments the
-                                        # output.
-                                        last_item = output[-1] if output else None
-                                        last_item_type = last_item.get('type', '') if last_item else ''
-                                        inside_tag_block = (
-                                            last_item is not None
-                                            and last_item.get('status') == 'in_progress'
-                                            and last_item.get('attributes', {}).get('type') != 'reasoning_content'
-                                            and (
-                                                last_item_type == 'reasoning'
-                                                or last_item_type == 'open_webui:code_interpreter'
-                                                or (
-                                                    last_item_type == 'message'
-                                                    and last_item.get('_tag_type') is not None
-                                                )
-                                            )
-                                        )
-
-                                        if inside_tag_block:
-                                            # Append to the existing tag-based item
-                                            if last_item_type == 'open_webui:code_interpreter':
-                                                last_item['code'] = last_item.get('code', '') + value
-                                            elif last_item_type == 'reasoning':
-                                                parts = last_item.get('content', [])
-                                                if parts and parts[-1].get('type') == 'output_text':
-                                                    parts[-1]['text'] += value
-                                                else:
-                                                    last_item['content'] = [
-                                                        {
-                                                            'type': 'output_text',
-                                                            'text': value,
-                                                        }
-                                                    ]
-                                            else:
-                                                # solution or other _tag_type message
-                                                msg_parts = last_item.get('content', [])
-                                                if msg_parts and msg_parts[-1].get('type') == 'output_text':
-                                                    msg_parts[-1]['text'] += value
-                                                else:
-                                                    last_item['content'] = [
-                                                        {
-                                                            'type': 'output_text',
-                                                            'text': value,
-                                                        }
-                                                    ]
-                                        else:
-                                            if not output or output[-1].get('type') != 'message':
-                                                output.append(
-                                                    {
-                                                        'type': 'message',
-                                                        'id': output_id('msg'),
-                                                        'status': 'in_progress',
-                                                        'role': 'assistant',
-                                                        'content': [
-                                                            {
-                                                                'type': 'output_text',
-                                                                'text': '',
-                                                            }
-                                                        ],
-                                                    }
-                                                )
-
-                                            # Append value to last message item's text
-                                            msg_parts = output[-1].get('content', [])
-                                            if msg_parts and msg_parts[-1].get('type') == 'output_text':
-                                                msg_parts[-1]['text'] += value
-                                            else:
-                                                output[-1]['content'] = [
-                                                    {
-                                                        'type': 'output_text',
-                                                        'text': value,
-                                                    }
-                                                ]
-
-                                        if DETECT_REASONING_TAGS:
-                                            output, _ = tag_output_handler(
-                                                'reasoning',
-                                                reasoning_tags,
-                                                output,
-                                            )
-
-                                            output, _ = tag_output_handler(
-                                                'solution',
-                                                DEFAULT_SOLUTION_TAGS,
-                                                output,
-                                            )
-
-                                        if DETECT_CODE_INTERPRETER:
-                                            output, end = tag_output_handler(
-                                                'code_interpreter',
-                                                DEFAULT_CODE_INTERPRETER_TAGS,
-                                                output,
-                                            )
-
-                                            if end:
-                                                break
+                                        end = apply_stream_tag_events(output, tag_parser.feed(value))
+                                        if end:
+                                            break
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
@@ -3945,13 +3925,13 @@ async def streaming_chat_response_handler(response, ctx):
                                                 metadata['chat_id'],
                                                 metadata['message_id'],
                                                 {
-                                                    'content': serialize_output(full_output()),
+                                                    'content': output_serializer.serialize(full_output()),
                                                     'output': full_output(),
                                                 },
                                             )
                                         else:
                                             data = {
-                                                'content': serialize_output(full_output()),
+                                                'content': output_serializer.serialize(full_output()),
                                             }
 
                                 if delta:
@@ -3973,6 +3953,9 @@ async def streaming_chat_response_handler(response, ctx):
                             else:
                                 log.debug(f'Error: {e}')
                                 continue
+
+                    # Release text held back as a possible partial tag
+                    apply_stream_tag_events(output, tag_parser.flush())
                     await flush_pending_delta_data()
 
                     if output:
@@ -4609,6 +4592,9 @@ async def streaming_chat_response_handler(response, ctx):
                     'title': title,
                 }
 
+                # Buffered emitter events must land before the final content overwrites them
+                await flush_message_events(metadata['chat_id'], metadata['message_id'])
+
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
                     Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -4691,26 +4677,16 @@ async def streaming_chat_response_handler(response, ctx):
             def wrap_item(item):
                 return f'data: {item}\n\n'
 
+            stream_filters = prepare_filter_functions(request, filter_functions, 'stream', extra_params)
+
             for event in events:
-                event, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type='stream',
-                    form_data=event,
-                    extra_params=extra_params,
-                )
+                event, _ = await run_filter_functions(stream_filters, 'stream', event)
 
                 if event:
                     yield wrap_item(json.dumps(event))
 
             async for data in original_generator:
-                data, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type='stream',
-                    form_data=data,
-                    extra_params=extra_params,
-                )
+                data, _ = await run_filter_functions(stream_filters, 'stream', data)
 
                 if data:
                     yield data
@@ -14,6 +14,7 @@ import mimeparse
 
 import collections.abc
 from open_webui.env import CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 log = logging.getLogger(__name__)
 
@@ -905,9 +906,10 @@ async def cleanup_response(
     session: Optional[aiohttp.ClientSession],
 ):
     if response:
-        response.close()
+        # Release rather than close, so a pooled connection can be reused
+        response.release()
     if session:
-        await session.close()
+        await CLIENT_SESSION_POOL.release_session(session)
 
 
 async def stream_wrapper(response, session, content_handler=None):
@@ -1,4 +1,5 @@
 import copy
+import json
 import time
 import logging
 import asyncio
@@ -30,7 +31,13 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    GLOBAL_LOG_LEVEL,
+    MODELS_CACHE_MAX_ENTRIES,
+    MODELS_FILTER_CACHE_TTL,
+)
+from open_webui.utils.models_cache import MODEL_LIST_CACHE
 from open_webui.models.users import UserModel
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -78,6 +85,9 @@ async def get_all_base_models(request: Request, user: UserModel = None):
 
 
 async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    if refresh:
+        MODEL_LIST_CACHE.clear()
+
     if (
         request.app.state.MODELS
         and request.app.state.BASE_MODELS
@@ -405,11 +415,38 @@ def check_model_access(user, model, db=None):
             raise Exception('Model not found')
 
 
+# user id -> (expires at, (role, models fingerprint), ids of the models the user can access)
+FILTERED_MODEL_IDS: dict[str, tuple[float, tuple, set]] = {}
+
+
+def get_models_fingerprint(models) -> int:
+    """Hash of what access filtering depends on, so a cached filtered view is reused only for the same models."""
+    return hash(
+        tuple(
+            (
+                model['id'],
+                bool(model.get('arena')),
+                (model.get('info') or {}).get('updated_at'),
+                json.dumps((model.get('info') or {}).get('meta', {}).get('access_grants', []), sort_keys=True)
+                if model.get('arena')
+                else None,
+            )
+            for model in models
+        )
+    )
+
+
 def get_filtered_models(models, user, db=None):
     # Filter out models that the user does not have access to
     if (
         user.role == 'user' or (user.role == 'admin' and not BYPASS_ADMIN_ACCESS_CONTROL)
     ) and not BYPASS_MODEL_ACCESS_CONTROL:
+        # Reuse the user's precomputed view while the model list is unchanged
+        cache_key = (user.role, get_models_fingerprint(models))
+        cached = FILTERED_MODEL_IDS.get(user.id)
+        if cached and cached[0] > time.monotonic() and cached[1] == cache_key:
+            return [model for model in models if model['id'] in cached[2]]
+
         model_infos = {}
         for model in models:
             if model.get('arena'):
@@ -418,7 +455,7 @@ def get_filtered_models(models, user, db=None):
             if info:
                 model_infos[model['id']] = info
 
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id, db=db)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
         # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
         accessible_model_ids = AccessGrants.get_accessible_resource_ids(
@@ -457,6 +494,17 @@ def get_filtered_models(models, user, db=None):
                 # only admins can see unconfigured models.
                 filtered_models.append(model)
 
+        if MODELS_FILTER_CACHE_TTL:
+            # Re-inserted so the dict stays in last-set order and the oldest entries go first
+            FILTERED_MODEL_IDS.pop(user.id, None)
+            FILTERED_MODEL_IDS[user.id] = (
+                time.monotonic() + MODELS_FILTER_CACHE_TTL,
+                cache_key,
+                {model['id'] for model in filtered_models},
+            )
+            while len(FILTERED_MODEL_IDS) > MODELS_CACHE_MAX_ENTRIES:
+                FILTERED_MODEL_IDS.pop(next(iter(FILTERED_MODEL_IDS)))
+
         return filtered_models
     else:
         return models
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_CACHE_MAX_ENTRIES,
+    MODELS_CONNECTION_CACHE_STALE_TTL,
+    MODELS_CONNECTION_CACHE_TTL,
+)
+from open_webui.models.users import UserModel
+
+log = logging.getLogger(__name__)
+
+# Connections authenticating as the requesting user may return a different list per user
+USER_SCOPED_AUTH_TYPES = ('session', 'system_oauth')
+
+
+def get_connection_cache_key(
+    provider: str,
+    url: str,
+    key: Optional[str] = None,
+    api_config: Optional[dict] = None,
+    user: Optional[UserModel] = None,
+) -> str:
+    """
+    Cache key of one upstream connection's model list. Any change to the
+    connection's key or config yields a new key.
+    """
+    api_config = api_config or {}
+    connection_hash = hashlib.sha256(
+        json.dumps([url, key or '', api_config], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    user_scope = ''
+    if user and (ENABLE_FORWARD_USER_INFO_HEADERS or api_config.get('auth_type') in USER_SCOPED_AUTH_TYPES):
+        user_scope = user.id
+
+    return f'{provider}:{connection_hash}:{user_scope}'
+
+
+def get_connection_cache_ttl(api_config: Optional[dict] = None) -> Optional[int]:
+    """
+    The `models_cache_ttl` of a connection's config: how many seconds its model
+    list stays fresh, overriding MODELS_CONNECTION_CACHE_TTL. Configs are edited
+    as free-form JSON, so anything that isn't a non-negative whole number of
+    seconds falls back to the default (None).
+    """
+    value = (api_config or {}).get('models_cache_ttl')
+    if value is None or value == '':
+        return None
+
+    try:
+        ttl = -1 if isinstance(value, bool) else int(value)
+    except (TypeError, ValueError):
+        ttl = -1
+
+    if ttl < 0:
+        log.warning(f'Ignoring invalid models_cache_ttl {value!r}, using {MODELS_CONNECTION_CACHE_TTL}s')
+        return None
+    return ttl
+
+
+def copy_model_list_response(response: Any) -> Any:
+    """
+    Copy a cached model list response (a list, or a dict holding `data` or
+    `models`) down to the model dicts, so callers can modify the models.
+    """
+    if isinstance(response, list):
+        return [dict(model) if isinstance(model, dict) else model for model in response]
+    if isinstance(response, dict):
+        response = dict(response)
+        for field in ('data', 'models'):
+            if isinstance(response.get(field), list):
+                response[field] = copy_model_list_response(response[field])
+    return response
+
+
+class ModelListCache:
+    """
+    Model lists per upstream connection with stale-while-revalidate.
+
+    A list is served from cache while fresh. Once past its TTL it is still
+    served, for up to `stale_ttl` more seconds, while a single background
+    refresh runs, so a slow or unreachable node only delays its own refresh
+    instead of every caller. Only cold or fully expired entries are awaited,
+    and concurrent callers share that one fetch. A failed fetch (None) does
+    not replace a list that was fetched successfully. Entries are scoped per
+    user for user-scoped connections, so at most `max_entries` are kept, the
+    least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float = MODELS_CONNECTION_CACHE_TTL,
+        stale_ttl: float = MODELS_CONNECTION_CACHE_STALE_TTL,
+        max_entries: int = MODELS_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        ttl = self.ttl if ttl is None else ttl
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            fetched_at, value = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                return value
+            if age < ttl + self.stale_ttl:
+                self._refresh(key, fetch)
+                return value
+
+        return await self._refresh(key, fetch)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, fetch))
+            self._tasks[key] = task
+        return task
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+        except Exception as e:
+            log.warning(f'Failed to refresh model list: {e}')
+            value = None
+        finally:
+            self._tasks.pop(key, None)
+
+        entry = self._entries.get(key)
+        if value is None and entry is not None and entry[1] is not None:
+            return entry[1]
+
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+
+MODEL_LIST_CACHE = ModelListCache()
@@ -16,6 +16,7 @@ from open_webui.env import (
 )
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.plugin_cache import PLUGIN_MODULE_VERSIONS, get_content_hash, get_plugin_version
 
 log = logging.getLogger(__name__)
 
@@ -298,11 +299,17 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
 
 def get_tool_module_from_cache(request, tool_id, load_from_db=True):
     if load_from_db:
-        # Always load from the database by default
+        # Reuse the loaded module while its version is current, without fetching the tool
+        if hasattr(request.app.state, 'TOOLS') and tool_id in request.app.state.TOOLS:
+            if PLUGIN_MODULE_VERSIONS.is_current('tool', tool_id, lambda: Tools.get_tool_version_by_id(tool_id)):
+                return request.app.state.TOOLS[tool_id], None
+
+        generation = PLUGIN_MODULE_VERSIONS.generation
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f'Tool not found: {tool_id}')
         content = tool.content
+        version = get_plugin_version(tool.updated_at, get_content_hash(tool.content))
 
         new_content = replace_imports(content)
         if new_content != content:
@@ -314,13 +321,17 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
             hasattr(request.app.state, 'TOOLS') and tool_id in request.app.state.TOOLS
         ):
             if request.app.state.TOOL_CONTENTS[tool_id] == content:
+                PLUGIN_MODULE_VERSIONS.set('tool', tool_id, version, generation)
                 return request.app.state.TOOLS[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
+        PLUGIN_MODULE_VERSIONS.set('tool', tool_id, version, generation)
     else:
         if hasattr(request.app.state, 'TOOLS') and tool_id in request.app.state.TOOLS:
             return request.app.state.TOOLS[tool_id], None
 
+        # Content is read by the loader, a later load from the database compares it again
+        content = None
         tool_module, frontmatter = load_tool_module_by_id(tool_id)
 
     if not hasattr(request.app.state, 'TOOLS'):
@@ -337,14 +348,20 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
 
 def get_function_module_from_cache(request, function_id, load_from_db=True):
     if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+        # Ensure the latest content is used for hooks like "inlet" or "outlet" where the content might change.
+        # The loaded module is reused while its version is current, without fetching the function.
+        if hasattr(request.app.state, 'FUNCTIONS') and function_id in request.app.state.FUNCTIONS:
+            if PLUGIN_MODULE_VERSIONS.is_current(
+                'function', function_id, lambda: Functions.get_function_version_by_id(function_id)
+            ):
+                return request.app.state.FUNCTIONS[function_id], None, None
 
+        generation = PLUGIN_MODULE_VERSIONS.generation
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f'Function not found: {function_id}')
         content = function.content
+        version = get_plugin_version(function.updated_at, get_content_hash(function.content))
 
         new_content = replace_imports(content)
         if new_content != content:
@@ -356,9 +373,11 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
             hasattr(request.app.state, 'FUNCTION_CONTENTS') and function_id in request.app.state.FUNCTION_CONTENTS
         ) and (hasattr(request.app.state, 'FUNCTIONS') and function_id in request.app.state.FUNCTIONS):
             if request.app.state.FUNCTION_CONTENTS[function_id] == content:
+                PLUGIN_MODULE_VERSIONS.set('function', function_id, version, generation)
                 return request.app.state.FUNCTIONS[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(function_id, content)
+        PLUGIN_MODULE_VERSIONS.set('function', function_id, version, generation)
     else:
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
@@ -366,6 +385,8 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         if hasattr(request.app.state, 'FUNCTIONS') and function_id in request.app.state.FUNCTIONS:
             return request.app.state.FUNCTIONS[function_id], None, None
 
+        # Content is read by the loader, a later load from the database compares it again
+        content = None
         function_module, function_type, frontmatter = load_function_module_by_id(function_id)
 
     if not hasattr(request.app.state, 'FUNCTIONS'):
@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from open_webui.env import PLUGIN_MODULE_CACHE_TTL
+from open_webui.utils.redis import RedisChannel
+
+log = logging.getLogger(__name__)
+
+
+def get_content_hash(content: Optional[str]) -> str:
+    """The hash of a plugin's source, stored in its `content_hash` column on every write of its content."""
+    return hashlib.sha256((content or '').encode()).hexdigest()
+
+
+def get_plugin_version(updated_at: Optional[int], content_hash: Optional[str]) -> tuple:
+    """The version of a plugin's module, which changes with any edit of its content."""
+    return (updated_at, content_hash)
+
+
+class PluginModuleVersions:
+    """
+    The version (`updated_at` and `content_hash`) of each function and tool
+    module loaded into app.state, so the hot path can reuse a module without
+    fetching its row and comparing its source.
+
+    A version is trusted without any DB access for `ttl` seconds after it was
+    last confirmed, then confirmed again with a lookup of those two columns,
+    without reading or hashing the source. Writes to
+    a plugin's content drop its version here and, through Redis pub/sub, on
+    the other nodes, so the next call reloads it. Every drop bumps a
+    generation counter, and a version read before a drop is not stored.
+    """
+
+    def __init__(self, ttl: float = PLUGIN_MODULE_CACHE_TTL):
+        self.ttl = ttl
+        self.channel = RedisChannel('plugins:invalidate')
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._versions: dict[tuple[str, str], tuple[float, Any]] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_current(self, kind: str, id: str, get_version: Callable[[], Any]) -> bool:
+        """Whether the loaded module of a plugin is still its latest version."""
+        key = (kind, id)
+        with self._lock:
+            entry = self._versions.get(key)
+            generation = self._generation
+        if entry is None:
+            return False
+
+        confirmed_at, version = entry
+        if time.monotonic() - confirmed_at < self.ttl:
+            return True
+
+        if get_version() != version:
+            return False
+
+        with self._lock:
+            if generation == self._generation:
+                self._versions[key] = (time.monotonic(), version)
+        return True
+
+    def set(self, kind: str, id: str, version: Any, generation: int):
+        """Record the version a module was loaded from, read at `generation`."""
+        with self._lock:
+            if generation == self._generation:
+                self._versions[(kind, id)] = (time.monotonic(), version)
+
+    def invalidate(self, kind: str, id: str, publish: bool = True):
+        with self._lock:
+            self._generation += 1
+            self._versions.pop((kind, id), None)
+
+        if publish:
+            self.channel.publish({'kind': kind, 'id': id})
+
+    def invalidate_all(self, publish: bool = True):
+        with self._lock:
+            self._generation += 1
+            self._versions.clear()
+
+        if publish:
+            self.channel.publish({})
+
+    def apply_message(self, message: dict):
+        """Apply an invalidation published by another node."""
+        if message.get('kind') and message.get('id'):
+            self.invalidate(message['kind'], message['id'], publish=False)
+        else:
+            self.invalidate_all(publish=False)
+
+
+PLUGIN_MODULE_VERSIONS = PluginModuleVersions()
+
+
+async def redis_plugin_module_listener(redis, versions: Optional[PluginModuleVersions] = None):
+    """Apply the plugin module invalidations published by other nodes."""
+    versions = versions or PLUGIN_MODULE_VERSIONS
+    await versions.channel.listen(redis, versions.apply_message)
@@ -1,7 +1,10 @@
 import inspect
 from urllib.parse import urlparse
 import asyncio
+import json
 import time
+import uuid
+from typing import Callable
 
 import logging
 
@@ -9,6 +12,7 @@ import redis
 
 from open_webui.env import (
     REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
     REDIS_SOCKET_CONNECT_TIMEOUT,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_MAX_RETRY_COUNT,
@@ -264,3 +268,46 @@ def get_sentinel_url_from_env(redis_url, sentinel_hosts_env, sentinel_port_env):
         auth_part = f'{username}:{password}@'
     hosts_part = ','.join(f'{host}:{sentinel_port_env}' for host in sentinel_hosts_env.split(','))
     return f'redis+sentinel://{auth_part}{hosts_part}/{redis_config["db"]}/{redis_config["service"]}'
+
+
+class RedisChannel:
+    """
+    A pub/sub channel between the nodes sharing the Redis of REDIS_URL, used
+    e.g. to drop cache entries on every node. A node doesn't receive the
+    messages it published itself. Without Redis, publishing does nothing.
+    """
+
+    def __init__(self, name: str):
+        self.name = f'{REDIS_KEY_PREFIX}:{name}'
+        self.node_id = str(uuid.uuid4())
+
+    def publish(self, message: dict):
+        redis = get_redis_client()
+        if redis is None:
+            return
+
+        try:
+            message_json = json.dumps({**message, 'node_id': self.node_id})
+            # RedisCluster doesn't expose publish() directly, PUBLISH is broadcast server-side
+            if hasattr(redis, 'nodes_manager'):
+                redis.execute_command('PUBLISH', self.name, message_json)
+            else:
+                redis.publish(self.name, message_json)
+        except Exception as e:
+            log.warning(f'Failed to publish to {self.name}: {e}')
+
+    async def listen(self, redis, handler: Callable[[dict], None]):
+        """Pass the messages published by the other nodes to `handler`, until cancelled."""
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(self.name)
+
+        async for message in pubsub.listen():
+            if message['type'] != 'message':
+                continue
+            try:
+                data = json.loads(message['data'])
+                if data.pop('node_id', None) == self.node_id:
+                    continue
+                handler(data)
+            except Exception as e:
+                log.exception(f'Error handling message on {self.name}: {e}')
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_HOST_LIMITS,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+)
+
+log = logging.getLogger(__name__)
+
+
+def get_origin(url: str) -> str:
+    parsed_url = urlparse(url)
+    return f'{parsed_url.scheme}://{parsed_url.netloc}'
+
+
+class ClientSessionPool:
+    """
+    Long-lived aiohttp sessions for upstream providers, one per origin, so
+    connections (and their TLS sessions) are kept alive and reused across chat
+    completions, model listing and embeddings instead of being opened per request.
+
+    Sessions are bound to the event loop the pool was started on. Before the
+    pool is started, when it is disabled, or when called from another loop
+    (e.g. a worker thread running its own), get_session() hands out a standalone
+    session that release_session() closes, which is how requests were made
+    before. Timeouts are passed per request since the sessions are shared.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+        host_limits: Optional[dict] = None,
+        keepalive_timeout: float = AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    ):
+        self.limit_per_host = limit_per_host
+        self.host_limits = host_limits or {}
+        self.keepalive_timeout = keepalive_timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._metrics: dict[str, dict] = {}
+
+    def start(self):
+        """Bind the pool to the running event loop, called at startup."""
+        self._loop = asyncio.get_running_loop()
+
+    async def close(self):
+        sessions, self._sessions = self._sessions, {}
+        self._loop = None
+        for session in sessions.values():
+            try:
+                await session.close()
+            except Exception as e:
+                log.debug(f'Error closing pooled session: {e}')
+
+    def is_pooled(self, session: aiohttp.ClientSession) -> bool:
+        return any(session is pooled for pooled in self._sessions.values())
+
+    def get_limit(self, origin: str) -> int:
+        host = urlparse(origin).netloc
+        return int(self.host_limits.get(host, self.host_limits.get(origin, self.limit_per_host)))
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """
+        The pooled session for the origin of `url`. Hand it back through
+        release_session() (or cleanup_response/stream_wrapper), never close it.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if self._loop is None or loop is not self._loop:
+            return aiohttp.ClientSession(trust_env=True)
+
+        origin = get_origin(url)
+        session = self._sessions.get(origin)
+        if session is None or session.closed:
+            session = self._create_session(origin)
+            self._sessions[origin] = session
+        return session
+
+    async def release_session(self, session: Optional[aiohttp.ClientSession]):
+        """Close a session from get_session() unless it belongs to the pool."""
+        if session is not None and not self.is_pooled(session):
+            await session.close()
+
+    @asynccontextmanager
+    async def session(self, url: str):
+        session = self.get_session(url)
+        try:
+            yield session
+        finally:
+            await self.release_session(session)
+
+    def get_metrics(self) -> dict:
+        """Per-origin request and connection counters since startup."""
+        return {
+            origin: {
+                **metrics,
+                'limit': self.get_limit(origin),
+                'open': origin in self._sessions and not self._sessions[origin].closed,
+            }
+            for origin, metrics in self._metrics.items()
+        }
+
+    def _create_session(self, origin: str) -> aiohttp.ClientSession:
+        metrics = self._metrics.setdefault(
+            origin,
+            {
+                'requests': 0,
+                'connections_created': 0,
+                'connections_reused': 0,
+                'connections_queued': 0,
+            },
+        )
+
+        async def on_request_start(session, context, params):
+            metrics['requests'] += 1
+
+        async def on_connection_create_end(session, context, params):
+            metrics['connections_created'] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            metrics['connections_reused'] += 1
+
+        async def on_connection_queued_start(session, context, params):
+            if not metrics['connections_queued']:
+                log.warning(
+                    f'Connection limit ({self.get_limit(origin)}) reached for {origin}, requests are waiting '
+                    'for a free connection (see AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST/AIOHTTP_CLIENT_POOL_HOST_LIMITS)'
+                )
+            metrics['connections_queued'] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.get_limit(origin),
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        log.debug(f'Opening pooled session for {origin} (limit {self.get_limit(origin) or "none"})')
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            # Shared between users, so cookies set by upstream responses must not be kept
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[trace_config],
+        )
+
+
+CLIENT_SESSION_POOL = ClientSessionPool(host_limits=AIOHTTP_CLIENT_POOL_HOST_LIMITS)
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import SPEECH_CACHE_MAX_AGE, SPEECH_CACHE_MAX_SIZE_MB
+
+log = logging.getLogger(__name__)
+
+SPEECH_CACHE_DIR = CACHE_DIR / 'audio' / 'speech'
+SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class SpeechCache:
+    """
+    Synthesized speech on disk, `{name}.mp3` with the request payload in
+    `{name}.json`, within a size and age budget.
+
+    A file's mtime is its last use, so the least recently used entries are
+    the first evicted once the cache grows past `max_size` bytes, and
+    entries unused for `max_age` seconds are dropped, across restarts too.
+    The index is rebuilt from the directory whenever the cache goes over
+    budget, since other workers write to the same directory.
+    """
+
+    def __init__(
+        self,
+        directory: Path = SPEECH_CACHE_DIR,
+        max_size: int = int(SPEECH_CACHE_MAX_SIZE_MB * 1024 * 1024),
+        max_age: int = SPEECH_CACHE_MAX_AGE,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        # name -> (last used, size in bytes), least recently used first
+        self._entries: Optional[OrderedDict[str, tuple[float, int]]] = None
+        self._size = 0
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_path(self, name: str) -> Path:
+        return self.directory.joinpath(f'{name}.mp3')
+
+    def get(self, name: str) -> Optional[Path]:
+        """The cached audio of `name`, or None on a miss."""
+        file_path = self.get_path(name)
+        now = time.time()
+
+        try:
+            last_used = file_path.stat().st_mtime
+        except OSError:
+            last_used = None
+
+        if last_used is None or (self.max_age and now - last_used > self.max_age):
+            with self._lock:
+                self._metrics['misses'] += 1
+            if last_used is not None:
+                self._remove(name)
+            return None
+
+        try:
+            os.utime(file_path, (now, now))
+        except OSError:
+            pass
+
+        with self._lock:
+            self._metrics['hits'] += 1
+            entries = self._get_entries()
+            if name in entries:
+                entries[name] = (now, entries[name][1])
+                entries.move_to_end(name)
+        return file_path
+
+    def put(self, name: str, audio: bytes, payload: Optional[dict] = None) -> Path:
+        """Store the audio of `name`, evicting entries beyond the budget."""
+        file_path = self.get_path(name)
+
+        # Write then rename, so a concurrent reader never serves a partial file
+        tmp_path = self.directory.joinpath(f'.{name}.{uuid.uuid4().hex}.tmp')
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, file_path)
+
+        size = len(audio)
+        if payload is not None:
+            body = json.dumps(payload)
+            self.directory.joinpath(f'{name}.json').write_text(body)
+            size += len(body)
+
+        with self._lock:
+            entries = self._get_entries()
+            if name in entries:
+                self._size -= entries[name][1]
+            entries[name] = (time.time(), size)
+            entries.move_to_end(name)
+            self._size += size
+
+            if self.max_size and self._size > self.max_size:
+                self._scan()
+        self._evict()
+        return file_path
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            entries = self._get_entries()
+            return {**self._metrics, 'entries': len(entries), 'size': self._size}
+
+    def _get_entries(self) -> OrderedDict:
+        if self._entries is None:
+            self._scan()
+        return self._entries
+
+    def _scan(self):
+        entries = []
+        sizes = {}
+        for path in self.directory.iterdir():
+            if path.suffix not in ('.mp3', '.json') or path.name.startswith('.'):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            sizes[path.stem] = sizes.get(path.stem, 0) + stat.st_size
+            if path.suffix == '.mp3':
+                entries.append((stat.st_mtime, path.stem))
+
+        self._entries = OrderedDict((name, (last_used, sizes[name])) for last_used, name in sorted(entries))
+        self._size = sum(size for _, size in self._entries.values())
+
+    def _evict(self):
+        now = time.time()
+        evicted = []
+        with self._lock:
+            entries = self._get_entries()
+            while entries:
+                name, (last_used, size) = next(iter(entries.items()))
+                if not (
+                    (self.max_size and self._size > self.max_size) or (self.max_age and now - last_used > self.max_age)
+                ):
+                    break
+                del entries[name]
+                self._size -= size
+                self._metrics['evictions'] += 1
+                evicted.append(name)
+
+        for name in evicted:
+            self._unlink(name)
+
+    def _remove(self, name: str):
+        with self._lock:
+            entry = self._get_entries().pop(name, None)
+            if entry is not None:
+                self._size -= entry[1]
+                self._metrics['evictions'] += 1
+        self._unlink(name)
+
+    def _unlink(self, name: str):
+        for suffix in ('.mp3', '.json'):
+            try:
+                self.directory.joinpath(f'{name}{suffix}').unlink(missing_ok=True)
+            except OSError as e:
+                log.debug(f'Failed to remove cached speech {name}{suffix}: {e}')
+
+
+SPEECH_CACHE = SpeechCache()
@@ -0,0 +1,161 @@
+import re
+from typing import Optional
+
+# How far past `<tag` a start tag with attributes, e.g. `<think type="summary">`,
+# is held back waiting for its closing `>` before it is released as plain text
+MAX_TAG_ATTRIBUTES_LENGTH = 256
+
+
+def get_start_tag_pattern(start_tag: str) -> str:
+    """`<tag>` also matches with attributes (`<tag key="value">`); any other tag matches literally."""
+    if start_tag.startswith('<') and start_tag.endswith('>'):
+        return rf'<{re.escape(start_tag[1:-1])}(\s.*?)?>'
+    return re.escape(start_tag)
+
+
+def extract_tag_attributes(tag_content: str) -> dict:
+    """Extract `key="value"` attributes from the inside of a tag."""
+    attributes = {}
+    if not tag_content:
+        return attributes
+    for key, value in re.findall(r'(\w+)\s*=\s*"([^"]+)"', tag_content):
+        attributes[key] = value
+    return attributes
+
+
+class StreamTagParser:
+    """
+    Incremental detector for the block tags (reasoning, solution, code interpreter)
+    models emit inline in their streamed content.
+
+    Each delta is consumed once: text is scanned only from where the previous
+    scan stopped, and only a possible partial tag at the end of a delta is held
+    back until the next one arrives. `feed` returns the block transitions found
+    as a list of events:
+
+        {'type': 'text', 'text': str}
+        {'type': 'start', 'content_type': str, 'start_tag': str, 'end_tag': str, 'attributes': dict}
+        {'type': 'end', 'content_type': str}
+
+    Inside a block only its end tag is looked for, blocks do not nest.
+    """
+
+    def __init__(self, tags: list[tuple[str, str, str]]):
+        """`tags` is a list of (content_type, start_tag, end_tag)."""
+        self.tags = tags
+        self.block: Optional[tuple[str, str, str]] = None
+        self.buffer = ''
+
+        self._start_patterns = [re.compile(get_start_tag_pattern(start_tag)) for _, start_tag, _ in tags]
+        self._start_regex = (
+            re.compile('|'.join(f'(?P<t{idx}>{pattern.pattern})' for idx, pattern in enumerate(self._start_patterns)))
+            if tags
+            else None
+        )
+        self._start_char_regex = (
+            re.compile('[' + ''.join(sorted({re.escape(start_tag[0]) for _, start_tag, _ in tags})) + ']')
+            if tags
+            else None
+        )
+        self._hold_window = max(
+            [len(start_tag) + MAX_TAG_ATTRIBUTES_LENGTH for _, start_tag, _ in tags],
+            default=0,
+        )
+
+    def open(self, content_type: str, start_tag: str, end_tag: str):
+        """Resume inside a block that was started before this parser existed."""
+        self.block = (content_type, start_tag, end_tag)
+
+    def feed(self, text: str) -> list[dict]:
+        self.buffer += text
+        events = []
+
+        while self.buffer:
+            if self.block:
+                content_type, _, end_tag = self.block
+                idx = self.buffer.find(end_tag)
+                if idx == -1:
+                    self._emit_text(events, self._get_end_tag_hold(end_tag))
+                    break
+
+                self._emit_text(events, len(self.buffer) - idx)
+                self.buffer = self.buffer[len(end_tag) :]
+                self.block = None
+                events.append({'type': 'end', 'content_type': content_type})
+            else:
+                match = self._start_regex.search(self.buffer) if self._start_regex else None
+                if not match:
+                    self._emit_text(events, self._get_start_tag_hold())
+                    break
+
+                idx = int(match.lastgroup[1:])
+                content_type, start_tag, end_tag = self.tags[idx]
+                tag_match = self._start_patterns[idx].fullmatch(match.group(0))
+                attributes = extract_tag_attributes(tag_match.group(1) if tag_match.groups() else '')
+
+                self._emit_text(events, len(self.buffer) - match.start())
+                self.buffer = self.buffer[match.end() - match.start() :]
+                self.block = (content_type, start_tag, end_tag)
+                events.append(
+                    {
+                        'type': 'start',
+                        'content_type': content_type,
+                        'start_tag': start_tag,
+                        'end_tag': end_tag,
+                        'attributes': attributes,
+                    }
+                )
+
+        return events
+
+    def flush(self) -> list[dict]:
+        """Release any held back text at the end of the stream."""
+        events = []
+        self._emit_text(events, 0)
+        return events
+
+    def _emit_text(self, events: list[dict], hold: int):
+        """Emit the buffer as text, keeping its last `hold` characters."""
+        size = len(self.buffer) - hold
+        if size <= 0:
+            return
+
+        text, self.buffer = self.buffer[:size], self.buffer[size:]
+        if events and events[-1]['type'] == 'text':
+            events[-1]['text'] += text
+        else:
+            events.append({'type': 'text', 'text': text})
+
+    def _get_end_tag_hold(self, end_tag: str) -> int:
+        for size in range(min(len(end_tag) - 1, len(self.buffer)), 0, -1):
+            if self.buffer.endswith(end_tag[:size]):
+                return size
+        return 0
+
+    def _get_start_tag_hold(self) -> int:
+        if not self._start_char_regex:
+            return 0
+
+        start = max(len(self.buffer) - self._hold_window, 0)
+        for match in self._start_char_regex.finditer(self.buffer, start):
+            if self._is_partial_start_tag(self.buffer[match.start() :]):
+                return len(self.buffer) - match.start()
+        return 0
+
+    def _is_partial_start_tag(self, text: str) -> bool:
+        for _, start_tag, _ in self.tags:
+            if start_tag.startswith('<') and start_tag.endswith('>'):
+                name = start_tag[:-1]
+                if len(text) <= len(name):
+                    if name.startswith(text):
+                        return True
+                elif (
+                    text.startswith(name)
+                    and text[len(name)].isspace()
+                    and '>' not in text
+                    and '\n' not in text[len(name) + 1 :]
+                ):
+                    return True
+            elif len(text) < len(start_tag) and start_tag.startswith(text):
+                return True
+        return False
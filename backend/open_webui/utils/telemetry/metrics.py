@@ -47,6 +47,9 @@ from open_webui.env import (
     OTEL_METRICS_EXPORT_INTERVAL_MILLIS,
 )
 from open_webui.models.users import Users
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+from open_webui.utils.speech_cache import SPEECH_CACHE
+from open_webui.utils.whisper_pool import WHISPER_MODEL_POOL
 
 
 def _build_meter_provider(resource: Resource) -> MeterProvider:
@@ -171,6 +174,103 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_upstream_pool(key: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [
+                metrics.Observation(value=values[key], attributes={'server.address': origin})
+                for origin, values in CLIENT_SESSION_POOL.get_metrics().items()
+            ]
+
+        return callback
+
+    for key, description in [
+        ('requests', 'Requests sent to upstream providers'),
+        ('connections_created', 'Upstream connections opened'),
+        ('connections_reused', 'Upstream requests served on a kept-alive connection'),
+        ('connections_queued', 'Upstream requests that waited for a free connection'),
+    ]:
+        meter.create_observable_counter(
+            name=f'webui.upstream.{key}',
+            description=description,
+            unit='1',
+            callbacks=[observe_upstream_pool(key)],
+        )
+
+    def observe_speech_cache(key: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=SPEECH_CACHE.get_metrics()[key])]
+
+        return callback
+
+    for key, description in [
+        ('hits', 'Speech requests served from the speech cache'),
+        ('misses', 'Speech requests synthesized'),
+        ('evictions', 'Speech cache entries evicted'),
+    ]:
+        meter.create_observable_counter(
+            name=f'webui.speech_cache.{key}',
+            description=description,
+            unit='1',
+            callbacks=[observe_speech_cache(key)],
+        )
+
+    meter.create_observable_gauge(
+        name='webui.speech_cache.size',
+        description='Size of the speech cache',
+        unit='By',
+        callbacks=[observe_speech_cache('size')],
+    )
+
+    def observe_whisper_pool(key: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=WHISPER_MODEL_POOL.get_metrics()[key])]
+
+        return callback
+
+    for key, description in [
+        ('clips', 'Clips transcribed by the local whisper model'),
+        ('batches', 'Inference calls of the local whisper model'),
+        ('batched_clips', 'Clips transcribed in a batch with others'),
+        ('errors', 'Clips the local whisper model failed to transcribe'),
+    ]:
+        meter.create_observable_counter(
+            name=f'webui.whisper.{key}',
+            description=description,
+            unit='1',
+            callbacks=[observe_whisper_pool(key)],
+        )
+
+    for key, description in [
+        ('queue_depth', 'Clips waiting for a whisper model replica'),
+        ('busy', 'Whisper model replicas transcribing'),
+        ('replicas', 'Whisper model replicas loaded'),
+    ]:
+        meter.create_observable_gauge(
+            name=f'webui.whisper.{key}',
+            description=description,
+            unit='1',
+            callbacks=[observe_whisper_pool(key)],
+        )
+
+    for key, description in [
+        ('wait_p50', 'Median time recent clips waited for a whisper model replica'),
+        ('wait_p95', '95th percentile time recent clips waited for a whisper model replica'),
+        ('latency_p50', 'Median time to transcribe recent clips, including the wait'),
+        ('latency_p95', '95th percentile time to transcribe recent clips, including the wait'),
+    ]:
+        meter.create_observable_gauge(
+            name=f'webui.whisper.{key}',
+            description=description,
+            unit='s',
+            callbacks=[observe_whisper_pool(key)],
+        )
+
     # FastAPI middleware
     @app.middleware('http')
     async def _metrics_middleware(request: Request, call_next):
@@ -153,7 +153,7 @@ async def get_tools(request: Request, tool_ids: list[str], user: UserModel, extr
     tools_dict = {}
 
     # Get user's group memberships for access control checks
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
 
     for tool_id in tool_ids:
         tool = Tools.get_tool_by_id(tool_id)
@@ -970,7 +970,7 @@ async def get_terminal_tools(
         log.warning(f'Terminal server not found: {terminal_id}')
         return {}
 
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
     if not has_connection_access(user, connection, user_group_ids):
         log.warning(f'Access denied to terminal {terminal_id} for user {user.id}')
         return {}
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from open_webui.env import (
+    ENABLE_USER_CACHE,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
+from open_webui.utils.redis import RedisChannel
+
+if TYPE_CHECKING:
+    from open_webui.models.users import UserModel
+
+log = logging.getLogger(__name__)
+
+
+def get_token_cache_key(token: str, jti: Optional[str] = None) -> str:
+    """Cache key of a JWT session, its `jti` when it has one."""
+    return f'jwt:{jti}' if jti else f'jwt:{hashlib.sha256(token.encode()).hexdigest()}'
+
+
+def get_api_key_cache_key(api_key: str) -> str:
+    return f'api_key:{hashlib.sha256(api_key.encode()).hexdigest()}'
+
+
+class UserCache:
+    """
+    Authenticated users by session, so authenticating a request doesn't read
+    the user every time. A session is a JWT (by its `jti`) or an API key (by
+    its hash); the token itself is still verified on every request.
+
+    Entries are dropped when the user changes (role, profile, settings, API
+    key, deletion), on this node directly and on the other nodes through a
+    Redis pub/sub message; the short TTL only bounds how long a missed message
+    goes unnoticed. A user read while an invalidation happened is returned
+    but not stored.
+    """
+
+    def __init__(
+        self,
+        ttl: float = USER_CACHE_TTL,
+        max_size: int = USER_CACHE_SIZE,
+        enabled: bool = ENABLE_USER_CACHE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.enabled = enabled and ttl > 0 and max_size > 0
+        self.channel = RedisChannel('users:invalidate')
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._entries: OrderedDict[str, tuple[float, 'UserModel']] = OrderedDict()
+        self._metrics = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str, fetch: Callable[[], Optional['UserModel']]) -> Optional['UserModel']:
+        """The user of session `key`, fetched on a miss; users not found are not cached."""
+        if not self.enabled:
+            return fetch()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._metrics['hits'] += 1
+                # A copy, so a caller changing the user doesn't change the cached one
+                return entry[1].model_copy()
+            self._metrics['misses'] += 1
+            generation = self._generation
+
+        user = fetch()
+        if user is None:
+            return None
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, user.model_copy())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate_users(self, user_ids: Iterable[str], publish: bool = True):
+        """These users changed or were deleted."""
+        user_ids = set(user_ids)
+        if not user_ids or not self.enabled:
+            return
+
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (_, user) in self._entries.items() if user.id in user_ids]:
+                del self._entries[key]
+
+        if publish:
+            self.channel.publish({'action': 'users', 'user_ids': sorted(user_ids)})
+
+    def invalidate_all(self, publish: bool = True):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+        if publish:
+            self.channel.publish({'action': 'all'})
+
+    def apply_message(self, message: dict):
+        """Apply an invalidation published by another node."""
+        if message.get('action') == 'users':
+            self.invalidate_users(message.get('user_ids') or [], publish=False)
+        else:
+            self.invalidate_all(publish=False)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {**self._metrics, 'entries': len(self._entries)}
+
+
+USER_CACHE = UserCache()
+
+
+async def redis_user_cache_listener(redis, cache: Optional[UserCache] = None):
+    """Apply the user cache invalidations published by other nodes."""
+    cache = cache or USER_CACHE
+    await cache.channel.listen(redis, cache.apply_message)
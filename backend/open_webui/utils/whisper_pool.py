@@ -0,0 +1,301 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple, Optional
+
+from open_webui.config import WHISPER_BATCH_SIZE, WHISPER_MODEL_REPLICAS
+
+log = logging.getLogger(__name__)
+
+SAMPLING_RATE = 16000
+
+# Whisper decodes 30 second windows, so only clips up to that long are batched as one window each
+MAX_BATCHED_CLIP_DURATION = 30
+
+
+class WhisperTranscription(NamedTuple):
+    text: str
+    language: Optional[str]
+    language_probability: float
+
+
+@dataclass(eq=False)
+class TranscriptionJob:
+    audio: Any
+    language: Optional[str]
+    options: dict
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / SAMPLING_RATE
+
+
+class WhisperModelPool:
+    """
+    Local faster-whisper transcription on `replicas` model instances, each
+    driven by its own worker thread and pulling from one shared queue.
+
+    Clips short enough to fit in a single Whisper window (voice mode
+    utterances) that are queued while the replicas are busy are decoded
+    together in one batched inference call; longer audio is transcribed on
+    its own. Batches only form under load, so an idle pool adds no latency.
+    """
+
+    def __init__(self, replicas: int = 1, batch_size: int = 8):
+        self.replicas = max(replicas, 1)
+        self.batch_size = max(batch_size, 1)
+        self.model_name: Optional[str] = None
+
+        self._condition = threading.Condition()
+        self._load_lock = threading.Lock()
+        self._queue: deque[TranscriptionJob] = deque()
+        self._generation = 0
+        self._models: list = []
+        self._busy = 0
+
+        self._metrics = {'clips': 0, 'batches': 0, 'batched_clips': 0, 'errors': 0}
+        # (seconds queued, seconds until done) of recent clips
+        self._latencies: deque[tuple[float, float]] = deque(maxlen=1000)
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._models)
+
+    def load(self, model: str, device: str, compute_type: str, download_root: str, auto_update: bool = False):
+        """(Re)load the replicas of `model`, the queued clips are picked up by the new ones."""
+        from faster_whisper import WhisperModel
+
+        faster_whisper_kwargs = {
+            'model_size_or_path': model,
+            'device': device,
+            'compute_type': compute_type,
+            'download_root': download_root,
+            'local_files_only': not auto_update,
+        }
+        if device == 'cpu' and self.replicas > 1:
+            # Split the cores across the replicas instead of each one claiming them all
+            faster_whisper_kwargs['cpu_threads'] = max((os.cpu_count() or 1) // self.replicas, 1)
+
+        with self._load_lock:
+            models = []
+            for _ in range(self.replicas):
+                try:
+                    models.append(WhisperModel(**faster_whisper_kwargs))
+                except Exception:
+                    if faster_whisper_kwargs['local_files_only'] is False:
+                        raise
+                    log.warning('WhisperModel initialization failed, attempting download with local_files_only=False')
+                    faster_whisper_kwargs['local_files_only'] = False
+                    models.append(WhisperModel(**faster_whisper_kwargs))
+
+            with self._condition:
+                self._generation += 1
+                self._models = models
+                self.model_name = model
+                for model_instance in models:
+                    threading.Thread(
+                        target=self._run,
+                        args=(model_instance, self._generation),
+                        name='whisper-replica',
+                        daemon=True,
+                    ).start()
+                # Wake the workers of the previous generation so they exit
+                self._condition.notify_all()
+
+        log.info(f'Loaded {len(models)} replica(s) of whisper model {model}')
+
+    def unload(self):
+        """Drop the replicas, failing the clips still queued."""
+        with self._condition:
+            self._generation += 1
+            self._models = []
+            self.model_name = None
+            pending = list(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+
+        for job in pending:
+            job.future.set_exception(RuntimeError('Whisper model unloaded'))
+
+    def transcribe(self, audio, language: Optional[str] = None, **options) -> WhisperTranscription:
+        """
+        Transcribe `audio` (a file path or 16kHz samples) on the next free
+        replica, blocking until done. `options` are passed to
+        WhisperModel.transcribe.
+        """
+        if isinstance(audio, str):
+            from faster_whisper import decode_audio
+
+            audio = decode_audio(audio, sampling_rate=SAMPLING_RATE)
+
+        job = TranscriptionJob(audio=audio, language=language, options=options)
+        with self._condition:
+            if not self._models:
+                raise RuntimeError('Whisper model is not loaded')
+            self._queue.append(job)
+            self._condition.notify()
+
+        return job.future.result()
+
+    def get_metrics(self) -> dict:
+        with self._condition:
+            metrics = {
+                **self._metrics,
+                'replicas': len(self._models),
+                'busy': self._busy,
+                'queue_depth': len(self._queue),
+            }
+            latencies = list(self._latencies)
+
+        for index, key in enumerate(('wait', 'latency')):
+            values = sorted(latency[index] for latency in latencies)
+            metrics[f'{key}_p50'] = values[len(values) // 2] if values else 0.0
+            metrics[f'{key}_p95'] = values[int(len(values) * 0.95)] if values else 0.0
+        return metrics
+
+    def _run(self, model, generation: int):
+        pipeline = None
+        while True:
+            batch = self._take_batch(generation)
+            if batch is None:
+                return
+
+            started_at = time.monotonic()
+            try:
+                if len(batch) > 1:
+                    if pipeline is None:
+                        from faster_whisper import BatchedInferencePipeline
+
+                        pipeline = BatchedInferencePipeline(model=model)
+                    self._transcribe_batch(model, pipeline, batch)
+                else:
+                    self._transcribe_one(model, batch[0])
+            except Exception as e:
+                log.exception(f'Error transcribing a batch of {len(batch)} clips: {e}')
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                finished_at = time.monotonic()
+                with self._condition:
+                    self._busy -= 1
+                    self._metrics['clips'] += len(batch)
+                    self._metrics['batches'] += 1
+                    if len(batch) > 1:
+                        self._metrics['batched_clips'] += len(batch)
+                    for job in batch:
+                        if job.future.done() and job.future.exception() is not None:
+                            self._metrics['errors'] += 1
+                        self._latencies.append((started_at - job.enqueued_at, finished_at - job.enqueued_at))
+
+    def _is_batchable(self, job: TranscriptionJob) -> bool:
+        return self.batch_size > 1 and job.duration <= MAX_BATCHED_CLIP_DURATION
+
+    def _take_batch(self, generation: int) -> Optional[list[TranscriptionJob]]:
+        with self._condition:
+            while not self._queue and generation == self._generation:
+                self._condition.wait()
+            if generation != self._generation:
+                return None
+
+            job = self._queue.popleft()
+            batch = [job]
+            if self._is_batchable(job):
+                for queued in list(self._queue):
+                    if len(batch) >= self.batch_size:
+                        break
+                    if self._is_batchable(queued) and queued.options == job.options:
+                        self._queue.remove(queued)
+                        batch.append(queued)
+
+            self._busy += 1
+            return batch
+
+    def _transcribe_one(self, model, job: TranscriptionJob):
+        try:
+            segments, info = model.transcribe(job.audio, language=job.language, **job.options)
+            text = ''.join([segment.text for segment in list(segments)])
+            job.future.set_result(WhisperTranscription(text, info.language, info.language_probability))
+        except Exception as e:
+            job.future.set_exception(e)
+
+    def _transcribe_batch(self, model, pipeline, batch: list[TranscriptionJob]):
+        """
+        Transcribe short clips in one batched call per language, each clip
+        (or, with the VAD filter, each of its speech regions) being one window
+        of the batch.
+        """
+        import numpy as np
+
+        languages = {}
+        for job in batch:
+            language, probability = job.language, 1.0
+            try:
+                if language is None:
+                    if model.model.is_multilingual:
+                        language, probability, _ = model.detect_language(audio=job.audio)
+                    else:
+                        language = 'en'
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+            languages.setdefault(language, []).append((job, probability))
+
+        for language, jobs in languages.items():
+            options = {**jobs[0][0].options}
+            vad_filter = options.pop('vad_filter', False)
+
+            offsets, clip_timestamps = [], []
+            offset = 0.0
+            for job, _ in jobs:
+                offsets.append(offset)
+                if vad_filter:
+                    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+                    speech_chunks = get_speech_timestamps(
+                        job.audio,
+                        VadOptions(max_speech_duration_s=MAX_BATCHED_CLIP_DURATION, min_silence_duration_ms=160),
+                    )
+                    clip_timestamps.extend(
+                        {
+                            'start': offset + chunk['start'] / SAMPLING_RATE,
+                            'end': offset + chunk['end'] / SAMPLING_RATE,
+                        }
+                        for chunk in speech_chunks
+                    )
+                else:
+                    clip_timestamps.append({'start': offset, 'end': offset + job.duration})
+                offset += job.duration
+
+            texts = [''] * len(jobs)
+            try:
+                if clip_timestamps:
+                    segments, _ = pipeline.transcribe(
+                        np.concatenate([job.audio for job, _ in jobs]),
+                        language=language,
+                        clip_timestamps=clip_timestamps,
+                        batch_size=len(clip_timestamps),
+                        **options,
+                    )
+                    for segment in segments:
+                        # Segments start at the offset of the window they were decoded from
+                        index = max(bisect.bisect_right(offsets, segment.start + 1e-3) - 1, 0)
+                        texts[index] += segment.text
+            except Exception as e:
+                log.warning(f'Batched transcription of {len(jobs)} clips failed, transcribing one by one: {e}')
+                for job, _ in jobs:
+                    self._transcribe_one(model, job)
+                continue
+
+            for (job, probability), text in zip(jobs, texts):
+                job.future.set_result(WhisperTranscription(text, language, probability))
+
+
+WHISPER_MODEL_POOL = WhisperModelPool(WHISPER_MODEL_REPLICAS, WHISPER_BATCH_SIZE)
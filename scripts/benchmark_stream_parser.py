@@ -0,0 +1,117 @@
+"""
+Replay recorded chat completion SSE streams through the streaming response
+tag parser and output serializer, and compare against re-scanning and
+re-serializing the whole response on every delta.
+
+A recording is the raw body of a streamed /chat/completions response, one
+`data: {...}` line per chunk. Without recordings a synthetic reasoning stream
+is generated.
+
+    cd backend
+    python ../scripts/benchmark_stream_parser.py recording.sse [recording.sse ...]
+    python ../scripts/benchmark_stream_parser.py --synthetic 50000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from open_webui.utils.middleware import (  # noqa: E402
+    DEFAULT_CODE_INTERPRETER_TAGS,
+    DEFAULT_REASONING_TAGS,
+    DEFAULT_SOLUTION_TAGS,
+    StreamingOutputSerializer,
+    apply_stream_tag_events,
+    serialize_output,
+)
+from open_webui.utils.stream_parser import StreamTagParser, get_start_tag_pattern  # noqa: E402
+
+TAGS = (
+    [('reasoning', start_tag, end_tag) for start_tag, end_tag in DEFAULT_REASONING_TAGS]
+    + [('solution', start_tag, end_tag) for start_tag, end_tag in DEFAULT_SOLUTION_TAGS]
+    + [('code_interpreter', start_tag, end_tag) for start_tag, end_tag in DEFAULT_CODE_INTERPRETER_TAGS]
+)
+
+
+def read_deltas(path: Path) -> list[str]:
+    deltas = []
+    for line in path.read_text(encoding='utf-8', errors='replace').splitlines():
+        if not line.startswith('data:'):
+            continue
+        try:
+            data = json.loads(line[len('data:') :].strip())
+        except json.JSONDecodeError:
+            continue
+        for choice in data.get('choices', [])[:1]:
+            value = choice.get('delta', {}).get('content')
+            if value:
+                deltas.append(value)
+    return deltas
+
+
+def generate_deltas(tokens: int) -> list[str]:
+    words = ['the', 'model', 'considers', 'whether', 'x', '<', 'y', 'and', 'so', 'on', 'because', 'of', 'that']
+    deltas = ['<think>']
+    for idx in range(tokens):
+        deltas.append(random.choice(words) + ('\n' if idx % 20 == 19 else ' '))
+    deltas += ['</', 'think>', '\n\nThe answer is ', '42.']
+    return deltas
+
+
+def replay_incremental(deltas: list[str]) -> str:
+    parser = StreamTagParser(TAGS)
+    serializer = StreamingOutputSerializer()
+    output = []
+    for value in deltas:
+        apply_stream_tag_events(output, parser.feed(value))
+        serializer.serialize(output)
+    apply_stream_tag_events(output, parser.flush())
+    return serialize_output(output)
+
+
+def replay_full_scan(deltas: list[str]) -> None:
+    """Cost model of searching the accumulated text for every tag and serializing all output per delta."""
+    patterns = [re.compile(get_start_tag_pattern(start_tag)) for _, start_tag, _ in TAGS]
+    parser = StreamTagParser(TAGS)
+    output = []
+    content = ''
+    for value in deltas:
+        content += value
+        for pattern in patterns:
+            pattern.search(content)
+        apply_stream_tag_events(output, parser.feed(value))
+        serialize_output(output)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argparser.add_argument('recordings', nargs='*', type=Path)
+    argparser.add_argument('--synthetic', type=int, default=20000, help='tokens in the generated stream')
+    args = argparser.parse_args()
+
+    streams = [(str(path), read_deltas(path)) for path in args.recordings]
+    if not streams:
+        streams = [(f'synthetic ({args.synthetic} tokens)', generate_deltas(args.synthetic))]
+
+    for name, deltas in streams:
+        start = time.perf_counter()
+        replay_incremental(deltas)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        replay_full_scan(deltas)
+        full_scan = time.perf_counter() - start
+
+        print(f'{name}: {len(deltas)} deltas')
+        print(f'  incremental: {incremental * 1000:.1f} ms ({incremental / len(deltas) * 1e6:.1f} us/delta)')
+        print(f'  full scan:   {full_scan * 1000:.1f} ms ({full_scan / len(deltas) * 1e6:.1f} us/delta)')
+
+
+if __name__ == '__main__':
+    main()